@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Append-only journal of agent activities behind WORK_STATUS.md's "Recent Activities".
+Activities are JSON lines in numbered segment files. Logging one is a single O_APPEND write,
+so it costs the same however long the history is, needs no lock and never rewrites earlier
+entries; the segment and index files stay open between appends. The newest segment is
+sealed once it reaches SEGMENT_BYTES or SEGMENT_SECONDS of age - made read-only, which
+tells every writer holding it open to move on, once the appends under way (each holds a
+shared flock on it) have landed, so whoever sees the next segment has seen all of this one -
+and sealing compacts the journal: segments beyond the newest SEGMENTS_KEPT are deleted whole. Each segment keeps a per-agent index
+(one file of 8-byte entry offsets per agent), so "the last N activities of agent X" reads
+N index records and N lines instead of the history. Other logs keep their own fields the
+same way (orchestration_log.py) and read forward from a position with since().
+"""
+
+import json
+import os
+import re
+import shutil
+import stat
+import struct
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from coordination_files import file_lock
+
+try:
+    import fcntl
+except ImportError:  # Windows: an append racing a seal may land in the sealed segment
+    fcntl = None
+
+# A segment is sealed when it grows past this many bytes or this many seconds since it was opened
+SEGMENT_BYTES = 1 << 20
+SEGMENT_SECONDS = 24 * 3600
+
+# Sealed segments kept by compaction, besides the one being appended to
+SEGMENTS_KEPT = 16
+
+ACTIVITY_FIELDS = ("at", "operation", "agent", "path", "status", "details")
+
+# An index entry: where in its segment an activity's line starts
+INDEX_ENTRY = struct.Struct("<Q")
+
+SEGMENT_NAME = re.compile(r"(\d{8})-(\d+)\.jsonl$")
+
+# Directory mtimes are coarse: a listing is only reused once its mtime is this old, so a
+# rotation in the same clock tick as the listing cannot go unnoticed
+SETTLED_NS = 1_000_000_000
+
+# Bytes read at a time when walking a segment backwards, and first read for an indexed line
+TAIL_CHUNK = 8192
+LINE_CHUNK = 512
+
+# Segments and indexes are written through raw descriptors, which Windows opens in text mode otherwise
+O_BINARY = getattr(os, "O_BINARY", 0)
+
+
+def agent_file(agent: str) -> str:
+    """File name of an agent's index; names that collide are told apart when the entries are read"""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", agent) or "_"
+
+
+class ActivityJournal:
+    """Rotating JSONL segments of activities (or other entries of fields), each with per-agent offset indexes"""
+
+    def __init__(self, directory: Union[str, Path], segment_bytes: int = SEGMENT_BYTES,
+                 segment_seconds: float = SEGMENT_SECONDS, segments_kept: int = SEGMENTS_KEPT,
+                 fields: Tuple[str, ...] = ACTIVITY_FIELDS):
+        self.directory = Path(directory)
+        self.fields = fields
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.segments_kept = segments_kept
+        # The segment being appended to: (segment, its fd, agent index fds)
+        self._open: Optional[Tuple[Tuple[int, float, Path], int, Dict[str, int]]] = None
+        self._pid = os.getpid()
+        # The last listing of the directory, by its mtime
+        self._listed: Tuple[Optional[int], List[Tuple[int, float, Path]]] = (None, [])
+
+    def _settled_mtime(self) -> Optional[int]:
+        """The directory's mtime if it is old enough to detect any later change by, else None"""
+        mtime = os.stat(self.directory).st_mtime_ns
+        return mtime if time.time_ns() - mtime > SETTLED_NS else None
+
+    def segments(self, fresh: bool = False) -> List[Tuple[int, float, Path]]:
+        """(number, opened at, path) of every segment, oldest first"""
+        try:
+            mtime = self._settled_mtime()
+            if mtime is not None and mtime == self._listed[0] and not fresh:
+                return self._listed[1]
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        found = []
+        for name in names:
+            match = SEGMENT_NAME.match(name)
+            if match:
+                found.append((int(match.group(1)), float(match.group(2)), self.directory / name))
+        found.sort()
+        self._listed = (mtime, found)
+        return found
+
+    def _index_dir(self, segment: Path) -> Path:
+        return segment.with_suffix(".idx")
+
+    def _active(self) -> Tuple[int, float, Path]:
+        """The segment to append to, sealing the current one first when it is full or old"""
+        segments = self.segments()
+        if segments and not self._full(segments[-1]):
+            return segments[-1]
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.directory / "rotate"):
+            # Another writer may have rotated while this one waited
+            segments = self.segments(fresh=True)
+            if segments and not self._full(segments[-1]):
+                return segments[-1]
+            number = segments[-1][0] + 1 if segments else 1
+            opened_at = int(time.time())
+            segment = self.directory / f"{number:08d}-{opened_at}.jsonl"
+            if segments:
+                self._seal(segments[-1][2])
+            self._index_dir(segment).mkdir(exist_ok=True)
+            segment.touch()
+            self._compact(segments + [(number, opened_at, segment)])
+            return number, opened_at, segment
+
+    def _seal(self, path: Path):
+        """Make a segment read-only, once the appends already under way in it have landed"""
+        try:
+            fd = os.open(path, os.O_RDONLY)
+        except FileNotFoundError:
+            return
+        try:
+            if fcntl is not None:
+                # Appends hold a shared lock from checking the segment until their write is done
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            os.chmod(path, 0o444)
+        finally:
+            os.close(fd)
+
+    def _full(self, segment: Tuple[int, float, Path]) -> bool:
+        _, opened_at, path = segment
+        try:
+            return self._sealed(path.stat(), opened_at)
+        except FileNotFoundError:
+            return True
+
+    def _sealed(self, status: os.stat_result, opened_at: float) -> bool:
+        """Whether a segment is read-only or deleted already, or should be sealed now"""
+        return (not status.st_mode & stat.S_IWUSR or not status.st_nlink or status.st_size >= self.segment_bytes
+                or time.time() - opened_at >= self.segment_seconds)
+
+    def compact(self) -> int:
+        """Delete the segments past the newest segments_kept sealed ones, returning how many went"""
+        if not self.directory.exists():
+            return 0
+        with file_lock(self.directory / "rotate"):
+            return self._compact(self.segments(fresh=True))
+
+    def _compact(self, segments: List[Tuple[int, float, Path]]) -> int:
+        expired = segments[:max(0, len(segments) - 1 - self.segments_kept)]
+        for _, _, path in expired:
+            # Index first: a reader that still finds the segment just sees no agent entries in it
+            shutil.rmtree(self._index_dir(path), ignore_errors=True)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+        return len(expired)
+
+    def append(self, entry: Dict[str, str]) -> Tuple[int, int]:
+        """Add an activity (a dict of the journal's fields) at the end, returning its segment number and offset"""
+        line = (json.dumps({field: entry.get(field, "") for field in self.fields}, ensure_ascii=False)
+                + "\n").encode("utf-8")
+        fd, indexes, (number, _, segment) = self._writer()
+        try:
+            os.write(fd, line)
+            # With O_APPEND the position is now just past this line, whatever others appended since
+            offset = os.lseek(fd, 0, os.SEEK_CUR) - len(line)
+        finally:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        name = agent_file(entry.get("agent", ""))
+        index = indexes.get(name)
+        if index is None:
+            try:
+                index = indexes[name] = os.open(self._index_dir(segment) / name,
+                                                os.O_WRONLY | os.O_APPEND | os.O_CREAT | O_BINARY, 0o644)
+            except FileNotFoundError:
+                # Compacted away underneath this writer: the entry is already gone with its segment
+                return number, offset
+        os.write(index, INDEX_ENTRY.pack(offset))
+        return number, offset
+
+    def _writer(self) -> Tuple[int, Dict[str, int], Tuple[int, float, Path]]:
+        """Open descriptors of the segment to append to and its indexes, reopened after a rotation.
+        The segment comes back under a shared lock, which append() releases once its line is written"""
+        if self._pid != os.getpid():
+            # A forked child shares the parent's file offsets, which the index entries are read from
+            self._open, self._pid = None, os.getpid()
+        while True:
+            if self._open is None:
+                segment = self._active()
+                try:
+                    self._open = (segment, os.open(segment[2], os.O_WRONLY | os.O_APPEND | O_BINARY), {})
+                except (FileNotFoundError, PermissionError):
+                    continue  # sealed or compacted between finding it and opening it
+            segment, fd, indexes = self._open
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_SH)
+            if not self._sealed(os.fstat(fd), segment[1]):
+                return fd, indexes, segment
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self.close()
+
+    def close(self):
+        """Close the descriptors kept open for appending"""
+        if self._open is not None:
+            _, fd, indexes = self._open
+            self._open = None
+            for descriptor in (fd, *indexes.values()):
+                os.close(descriptor)
+
+    def extend(self, entries: Iterable[Dict[str, str]]):
+        for entry in entries:
+            self.append(entry)
+
+    def recent(self, limit: int, agent: Optional[str] = None) -> List[Dict[str, str]]:
+        """The newest limit activities, or agent's newest limit from its index, newest first"""
+        entries = []
+        if limit <= 0:
+            return entries
+        for _, _, segment in reversed(self.segments()):
+            lines = self._tail(segment) if agent is None else self._indexed(segment, agent)
+            for line in lines:
+                try:
+                    entry = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    continue  # a line still being written
+                if agent is None or entry.get("agent") == agent:
+                    entries.append(entry)
+                    if len(entries) >= limit:
+                        return entries
+        return entries
+
+    def since(self, position: Tuple[int, int] = (0, 0)) -> Iterator[Tuple[Tuple[int, int], Dict[str, str]]]:
+        """Every entry after position (segment number, byte offset), oldest first, each with the position past it"""
+        for number, _, segment in self.segments():
+            if number < position[0]:
+                continue
+            start = position[1] if number == position[0] else 0
+            try:
+                with open(segment, "rb") as f:
+                    f.seek(start)
+                    data = f.read()
+            except FileNotFoundError:
+                return  # compacted since it was listed: the entries between are gone, and the caller must know
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines(keepends=True):
+                start += len(line)
+                try:
+                    entry = json.loads(line.decode("utf-8"))
+                except ValueError:
+                    continue
+                yield (number, start), entry
+            if end < len(data):
+                return  # a line still being written: read on from it next time, not from a later segment
+
+    def _tail(self, segment: Path) -> Iterator[bytes]:
+        """A segment's lines, last first, reading it backwards a chunk at a time"""
+        try:
+            f = open(segment, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            position = f.seek(0, os.SEEK_END)
+            partial = b""
+            while position > 0:
+                step = min(TAIL_CHUNK, position)
+                position -= step
+                f.seek(position)
+                lines = (f.read(step) + partial).split(b"\n")
+                partial = lines.pop(0)
+                for line in reversed(lines):
+                    if line:
+                        yield line
+            if partial:
+                yield partial
+
+    def _indexed(self, segment: Path, agent: str) -> Iterator[bytes]:
+        """agent's lines in a segment, last first, located through its index"""
+        try:
+            index = (self._index_dir(segment) / agent_file(agent)).read_bytes()
+            f = open(segment, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            for end in range(len(index) - len(index) % INDEX_ENTRY.size, 0, -INDEX_ENTRY.size):
+                # seek and read rather than os.pread, which Windows lacks
+                f.seek(INDEX_ENTRY.unpack_from(index, end - INDEX_ENTRY.size)[0])
+                line = b""
+                while True:
+                    chunk = f.read(LINE_CHUNK)
+                    line += chunk
+                    if b"\n" in chunk or len(chunk) < LINE_CHUNK:
+                        break
+                yield line.split(b"\n", 1)[0]
+
+    def count(self) -> int:
+        """Activities kept, from the sizes of the agent indexes"""
+        total = 0
+        for _, _, segment in self.segments():
+            try:
+                with os.scandir(self._index_dir(segment)) as entries:
+                    total += sum(entry.stat().st_size // INDEX_ENTRY.size for entry in entries)
+            except FileNotFoundError:
+                pass
+        return total
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Catastrophic-backtracking audit for the rule pack
+Classifies every rule statically (rule_audit.backtracking_risk), then times each
+non-linear rule on adversarial single-line inputs of growing size to measure how its
+cost actually scales, with and without the linear chain matcher hooks use at runtime
+"""
+
+import argparse
+import json
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+sys.path.append(str(Path(__file__).parent))
+from rule_audit import RISK_LEVELS, adversarial_input
+from rule_registry import Rule, RuleTimeout, load_rule_pack, run_with_budget
+
+# Growth exponent above which a rule counts as super-linear in practice
+SUPERLINEAR_EXPONENT = 1.5
+
+# Fast calls are repeated until they add up to this many seconds, so their growth can be measured too
+MIN_TIMED = 0.002
+
+# A runtime still under this many seconds at the largest size is timed again on inputs RUNTIME_GROWTH times
+# larger (up to RUNTIME_MAX_SIZE characters), so its exponent is read from times well above timer jitter
+RUNTIME_RESOLUTION = 0.0005
+RUNTIME_GROWTH = 4
+RUNTIME_MAX_SIZE = 256_000
+
+# Times a runtime that reads super-linear is timed again before the reading stands
+RETIMES = 2
+
+
+def time_call(func, budget: float, *args) -> Optional[float]:
+    """Seconds func(*args) took (the fastest of the repeats when fast), or None when it ran past the budget"""
+    total = 0.0
+    fastest = None
+    for _ in range(1000):
+        start = time.perf_counter()
+        try:
+            run_with_budget(func, budget, *args)
+        except RuleTimeout:
+            return None
+        elapsed = time.perf_counter() - start
+        fastest = elapsed if fastest is None else min(fastest, elapsed)
+        total += elapsed
+        if total >= MIN_TIMED:
+            break
+    return fastest
+
+
+def sized_input(rule: Rule, size: int) -> str:
+    """An adversarial input for rule of about size characters"""
+    text = adversarial_input(rule.pattern, rule.flags, 1)
+    return adversarial_input(rule.pattern, rule.flags, max(1, size // max(1, len(text))))
+
+
+def measure_rule(rule: Rule, sizes: List[int], budget: float) -> Dict[str, object]:
+    """Time plain re.search and the runtime matcher on adversarial inputs of each size"""
+    result: Dict[str, object] = {"rule": rule.rule_id, "risk": rule.risk, "chain": rule.chain is not None}
+    regex_times: List[Optional[float]] = []
+    runtime_times: List[Optional[float]] = []
+    for size in sizes:
+        text = sized_input(rule, size)
+        if rule.regex.search(text[:200]):
+            result["note"] = "adversarial input matches"
+        regex_times.append(time_call(rule.regex.search, budget, text))
+        # rule.search arms its own hook budget, so a None here means that budget fired
+        runtime_times.append(time_call(rule.search, budget, text))
+    runtime_sizes = sizes
+    while (runtime_times[-1] is not None and runtime_times[-1] < RUNTIME_RESOLUTION
+           and runtime_sizes[-1] * RUNTIME_GROWTH <= RUNTIME_MAX_SIZE):
+        runtime_sizes = [size * RUNTIME_GROWTH for size in runtime_sizes]
+        runtime_times = [time_call(rule.search, budget, sized_input(rule, size)) for size in runtime_sizes]
+    for _ in range(RETIMES):
+        if (growth_exponent(runtime_sizes, runtime_times) or 0) < SUPERLINEAR_EXPONENT:
+            break
+        # Load on the machine only ever adds time, so the faster of two timings of a size is the truer one
+        runtime_times = [None if before is None else min(before, after or before)
+                         for before, after in zip(runtime_times, [time_call(rule.search, budget, sized_input(rule, size))
+                                                                  for size in runtime_sizes])]
+    result["regex_ms"] = [None if t is None else round(t * 1000, 3) for t in regex_times]
+    result["runtime_sizes"] = runtime_sizes
+    result["runtime_ms"] = [None if t is None else round(t * 1000, 3) for t in runtime_times]
+    result["exponent"] = growth_exponent(sizes, regex_times)
+    result["runtime_exponent"] = growth_exponent(runtime_sizes, runtime_times)
+    return result
+
+
+def growth_exponent(sizes: List[int], times: List[Optional[float]]) -> Optional[float]:
+    """Slope of log(time) against log(size) over the two largest finished sizes"""
+    points = [(size, elapsed) for size, elapsed in zip(sizes, times) if elapsed]
+    if any(elapsed is None for elapsed in times):
+        return math.inf
+    if len(points) < 2:
+        return None
+    (small, t_small), (large, t_large) = points[-2], points[-1]
+    if t_small < 1e-6:
+        return None
+    return round(math.log(t_large / t_small) / math.log(large / small), 2)
+
+
+def format_exponent(value: Optional[float]) -> str:
+    if value is None:
+        return "   -"
+    if value == math.inf:
+        return " >budget"
+    return f"{value:5.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find rules whose matching time grows super-linearly")
+    parser.add_argument("--sizes", default="1000,2000,4000", help="Adversarial input sizes in characters")
+    parser.add_argument("--budget-ms", type=float, default=1000, help="Give up on one search after this long")
+    parser.add_argument("--rules", nargs="*", help="Only audit rule ids starting with these prefixes")
+    parser.add_argument("--json", help="Also write the full results to this file")
+    parser.add_argument("--strict", action="store_true",
+                        help="Fail if any super-linear rule is still super-linear through the runtime matcher")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    budget = args.budget_ms / 1000
+    pack = load_rule_pack()
+    rules = [rule for rule_set in pack.rule_sets.values() for rule in rule_set]
+    if args.rules:
+        rules = [rule for rule in rules if any(rule.rule_id.startswith(prefix) for prefix in args.rules)]
+
+    counts = {level: 0 for level in RISK_LEVELS}
+    for rule in rules:
+        counts[rule.risk] += 1
+    print(f"🔍 BACKTRACKING AUDIT: pack {pack.version}, {len(rules)} rules")
+    print("   static: " + ", ".join(f"{counts[level]} {level}" for level in RISK_LEVELS))
+    print("=" * 80)
+
+    results = [measure_rule(rule, sizes, budget) for rule in rules if rule.risk != "linear"]
+    results.sort(key=lambda result: -(result["exponent"] or 0))
+
+    superlinear = [result for result in results if (result["exponent"] or 0) >= SUPERLINEAR_EXPONENT]
+    # Only a measured runtime exponent below the threshold counts as made linear; a runtime too fast
+    # to time says nothing about growth, and anything else still depends on the budget
+    linear = [result for result in superlinear
+              if result["runtime_exponent"] is not None and result["runtime_exponent"] < SUPERLINEAR_EXPONENT]
+    unmeasured = [result for result in superlinear if result["runtime_exponent"] is None]
+    unresolved = [result for result in superlinear if result not in linear and result not in unmeasured]
+    print(f"{'rule':44} {'static':11} {'re':>8} {'runtime':>8}  largest input (re / runtime)")
+    for result in superlinear:
+        regex_ms, runtime_ms = result["regex_ms"][-1], result["runtime_ms"][-1]
+        largest = (f"{'timeout' if regex_ms is None else f'{regex_ms:.1f} ms'} / "
+                   f"{'budget' if runtime_ms is None else f'{runtime_ms:.1f} ms'}")
+        if result["runtime_sizes"] != sizes:
+            largest += f" at {result['runtime_sizes'][-1]} chars"
+        note = f"  ({result['note']})" if result.get("note") else ""
+        print(f"{result['rule']:44} {result['risk']:11} {format_exponent(result['exponent']):>8} "
+              f"{format_exponent(result['runtime_exponent']):>8}  {largest}{note}")
+
+    print("-" * 80)
+    print(f"{len(superlinear)} of {len(results)} non-linear rules measured super-linear "
+          f"(exponent >= {SUPERLINEAR_EXPONENT}); through the runtime matcher {len(linear)} measured below "
+          f"{SUPERLINEAR_EXPONENT}, {len(unmeasured)} too fast to measure, {len(unresolved)} still super-linear "
+          f"and bounded by the time budget (by input length where no alarm is available)")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({"pack": pack.version, "sizes": sizes, "results": results}, f, indent=2, default=str)
+        print(f"📝 Results written to {args.json}")
+
+    if args.strict and unresolved:
+        print("\n❌ Super-linear rules without a linear matcher:")
+        for result in unresolved:
+            print(f"  • {result['rule']}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
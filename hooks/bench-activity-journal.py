@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Measure activity logging and per-agent queries against a long history
+Logs --activities entries from --agents agents into a scratch project and times each
+append at the start and at the end of the history, against the SQLite insert-and-trim
+that logging used to be. Then times "the last --limit activities of one agent" through
+the journal's per-agent index against reading every kept segment, checks both agree,
+and checks that rotation and compaction kept the journal to its segment budget
+"""
+
+import argparse
+import json
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from activity_journal import ActivityJournal
+
+ACTIVITY_HISTORY = 1000
+
+
+def sqlite_log(conn, entry: dict):
+    """What logging an activity used to do: insert and trim the table to ACTIVITY_HISTORY rows"""
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute("INSERT INTO activities (at, operation, agent, path, status, details) VALUES (?, ?, ?, ?, ?, ?)",
+                 tuple(entry.values()))
+    conn.execute("DELETE FROM activities WHERE id <= (SELECT MAX(id) FROM activities) - ?", (ACTIVITY_HISTORY,))
+    conn.execute("COMMIT")
+
+
+def full_scan(journal: ActivityJournal, agent: str, limit: int) -> list:
+    """The same query without the index: parse every line of every segment"""
+    entries = []
+    for _, _, segment in journal.segments():
+        for line in segment.read_bytes().splitlines():
+            entry = json.loads(line)
+            if entry["agent"] == agent:
+                entries.append(entry)
+    return entries[::-1][:limit]
+
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    return f"p50 {statistics.median(samples):8.3f} ms   p99 {samples[int(0.99 * (len(samples) - 1))]:8.3f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time journal appends and indexed agent queries")
+    parser.add_argument("--activities", type=int, default=50000, help="Activities logged")
+    parser.add_argument("--agents", type=int, default=40, help="Distinct agents logging them")
+    parser.add_argument("--segment-kb", type=int, default=256, help="Segment size before rotation")
+    parser.add_argument("--kept", type=int, default=8, help="Sealed segments compaction keeps")
+    parser.add_argument("--limit", type=int, default=20, help="Activities per agent query")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as project_dir:
+        journal = ActivityJournal(Path(project_dir) / "journal", segment_bytes=args.segment_kb * 1024,
+                                  segments_kept=args.kept)
+        conn = sqlite3.connect(str(Path(project_dir) / "activities.sqlite"), isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE activities (id INTEGER PRIMARY KEY AUTOINCREMENT, at TEXT, operation TEXT, "
+                     "agent TEXT, path TEXT, status TEXT, details TEXT)")
+
+        window = min(1000, args.activities // 2)
+        journal_samples, sqlite_samples = {"first": [], "last": []}, {"first": [], "last": []}
+        for index in range(args.activities):
+            entry = {"at": f"2025-01-01 00:00:{index % 60:02d} UTC", "operation": "WRITE OPERATION",
+                     "agent": f"agent-{index % args.agents}", "path": f"src/module_{index % 500}.py",
+                     "status": "completed", "details": ""}
+            phase = "first" if index < window else "last" if index >= args.activities - window else None
+            start = time.perf_counter()
+            journal.append(entry)
+            middle = time.perf_counter()
+            sqlite_log(conn, entry)
+            if phase:
+                journal_samples[phase].append((middle - start) * 1000)
+                sqlite_samples[phase].append((time.perf_counter() - middle) * 1000)
+        conn.close()
+
+        segments = journal.segments()
+        print(f"📓 ACTIVITY JOURNAL: {args.activities} activities from {args.agents} agents, "
+              f"{len(segments)} segments kept ({journal.count()} activities)")
+        print("=" * 80)
+        for phase in ("first", "last"):
+            print(f"journal append   {phase:5} {window}   {percentiles(journal_samples[phase])}")
+            print(f"sqlite + trim    {phase:5} {window}   {percentiles(sqlite_samples[phase])}")
+        if len(segments) > args.kept + 1:
+            failures.append(f"{len(segments)} segments kept, budget {args.kept + 1}")
+
+        agents = [f"agent-{index}" for index in range(0, args.agents, max(1, args.agents // 10))]
+        indexed, scanned = [], []
+        for agent in agents:
+            start = time.perf_counter()
+            from_index = journal.recent(args.limit, agent)
+            middle = time.perf_counter()
+            from_scan = full_scan(journal, agent, args.limit)
+            indexed.append((middle - start) * 1000)
+            scanned.append((time.perf_counter() - middle) * 1000)
+            if from_index != from_scan:
+                failures.append(f"index and scan disagree for {agent}")
+        print(f"\nlast {args.limit} of one agent")
+        print(f"per-agent index         {percentiles(indexed)}")
+        print(f"scan every segment      {percentiles(scanned)}")
+
+    if failures:
+        print(f"\n❌ {'; '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ Indexed queries agree with a full scan and compaction kept the segment budget")
+
+
+if __name__ == "__main__":
+    main()
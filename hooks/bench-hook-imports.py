@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Startup-time budget for hooks
+Imports each hook under `python -X importtime`, totals the time spent in the
+hook's own imports, and fails when a hook regresses past the stored baseline.
+Budgets are scaled by a reference import timed in the same run and stored with the
+baseline, so a faster or slower machine than the one that recorded it does not pass or fail by itself
+Run with --update after an intentional change to re-record the baseline
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+sys.path.append(str(Path(__file__).parent))
+from hook_runtime import HOOKS_DIR, HOSTED_HOOKS
+
+BASELINE_FILE = HOOKS_DIR / "import-baseline.json"
+
+# Every hook entry point that starts a fresh interpreter per tool call
+BENCH_HOOKS = HOSTED_HOOKS + ["hook-client", "session-init-hook"]
+
+# Import the script without running main(), mirroring a cold start minus the payload work
+LOADER = "import runpy, sys; runpy.run_path(sys.argv[1], run_name='__hook_import__')"
+
+# Timed alongside the hooks as a yardstick for this machine's import speed
+REFERENCE_SCRIPT = "import json, pathlib, fnmatch, ipaddress, urllib.parse, typing\n"
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """Return (module, cumulative_us, depth) for every -X importtime line"""
+    entries = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            entries.append((match.group(4), int(match.group(2)), len(match.group(3))))
+    return entries
+
+
+def measure_script(path: Path) -> List[Tuple[str, int, int]]:
+    """Import a script once in a fresh interpreter and return its import entries"""
+    env = os.environ.copy()
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", LOADER, str(path)],
+        capture_output=True, text=True, env=env, cwd=str(HOOKS_DIR)
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {path.name} failed:\n{proc.stderr[-2000:]}")
+    return parse_importtime(proc.stderr)
+
+
+def startup_modules() -> set:
+    """Modules the interpreter and the loader pull in before any hook code runs"""
+    with tempfile.TemporaryDirectory() as tmp:
+        empty = Path(tmp) / "empty.py"
+        empty.write_text("")
+        return {module for module, _, _ in measure_script(empty)}
+
+
+def measure_hook(script: Path, runs: int, baseline_modules: set) -> Dict[str, object]:
+    """Best-of-N import cost of a script's own top-level imports, in microseconds"""
+    best = None
+    modules: List[str] = []
+    for _ in range(runs):
+        entries = measure_script(script)
+        # Top-level entries already include their children's time in the cumulative column
+        top_level = [cumulative for module, cumulative, depth in entries if depth == 1 and module not in baseline_modules]
+        total = sum(top_level)
+        if best is None or total < best:
+            best = total
+        modules = sorted({module for module, _, _ in entries if module not in baseline_modules})
+    return {"import_us": best, "modules": modules}
+
+
+def measure_reference(runs: int, baseline_modules: set) -> int:
+    """Best-of-N import cost of REFERENCE_SCRIPT on this machine, in microseconds"""
+    with tempfile.TemporaryDirectory() as tmp:
+        script = Path(tmp) / "reference.py"
+        script.write_text(REFERENCE_SCRIPT)
+        return measure_hook(script, runs, baseline_modules)["import_us"]
+
+
+def check_regressions(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float, slack_us: int,
+                      scale: float = 1.0) -> List[str]:
+    """Compare each hook against its baseline (times scale, this machine's speed relative to the recording one)
+    and describe any regression"""
+    failures = []
+    for hook, result in results.items():
+        recorded = baseline.get(hook)
+        if not recorded:
+            continue
+        budget = recorded["import_us"] * scale * (1 + tolerance) + slack_us
+        if result["import_us"] > budget:
+            added = sorted(set(result["modules"]) - set(recorded.get("modules", [])))
+            detail = f" (new imports: {', '.join(added)})" if added else ""
+            failures.append(f"{hook}: {result['import_us'] / 1000:.2f} ms > budget {budget / 1000:.2f} ms{detail}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check hook cold-start import time against a stored baseline")
+    parser.add_argument("--runs", type=int, default=7, help="Fresh interpreters per hook; the fastest run counts")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed relative regression (0.5 = 50%%)")
+    parser.add_argument("--slack-ms", type=float, default=3.0, help="Absolute allowance on top of the tolerance")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE), help="Baseline JSON file")
+    parser.add_argument("--update", action="store_true", help="Record the current timings as the new baseline")
+    args = parser.parse_args()
+
+    baseline_path = Path(args.baseline)
+    recorded_run = {}
+    if baseline_path.exists():
+        with open(baseline_path, 'r') as f:
+            recorded_run = json.load(f)
+    baseline = recorded_run.get("hooks", {})
+
+    excluded = startup_modules()
+    reference_us = measure_reference(args.runs, excluded)
+    results = {hook: measure_hook(HOOKS_DIR / f"{hook}.py", args.runs, excluded) for hook in BENCH_HOOKS}
+    # Baselines recorded without a reference are compared as they are
+    scale = reference_us / recorded_run["reference_us"] if recorded_run.get("reference_us") else 1.0
+
+    print(f"⏱️ HOOK IMPORT TIME (best of {args.runs}, python {sys.version.split()[0]})")
+    print("=" * 80)
+    print(f"{'reference imports':30} {reference_us / 1000:7.2f} ms  baseline budgets scaled {scale:.2f}x")
+    for hook, result in results.items():
+        recorded = baseline.get(hook, {}).get("import_us")
+        versus = f"  baseline {recorded * scale / 1000:7.2f} ms" if recorded else "  (no baseline)"
+        print(f"{hook:30} {result['import_us'] / 1000:7.2f} ms  {len(result['modules']):3} modules{versus}")
+
+    if args.update:
+        with open(baseline_path, 'w') as f:
+            json.dump({"python": sys.version.split()[0], "reference_us": reference_us, "hooks": results}, f, indent=2)
+            f.write("\n")
+        print(f"\n📝 Baseline written to {baseline_path}")
+        return
+
+    failures = check_regressions(results, baseline, args.tolerance, int(args.slack_ms * 1000), scale)
+    if failures:
+        print("\n❌ Import-time regressions:")
+        for failure in failures:
+            print(f"  • {failure}")
+        sys.exit(1)
+
+    print("\n✅ All hooks within their startup budget")
+
+
+if __name__ == "__main__":
+    main()
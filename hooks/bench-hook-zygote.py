@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Benchmark cold-spawn hook latency against zygote-fork latency
+Runs security-agent-hooks.py and infrastructure-agent-hooks.py three ways:
+  cold    - fresh `python <hook>.py` per call (today's behaviour)
+  client  - `python hook-client.py <hook>` against a running hook-zygote.py
+  fork    - raw socket round trip to the zygote (fork + run, no client interpreter)
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).parent
+
+PAYLOADS = {
+    "security-agent-hooks": {
+        "tool_name": "Write",
+        "tool_input": {
+            "filePath": "src/payments.py",
+            "content": "import os\nimport hashlib\n\ndef charge(card):\n    password = 'hunter2hunter2'\n    os.system('charge ' + card)\n    return hashlib.md5(card.encode()).hexdigest()\n" * 20
+        }
+    },
+    "infrastructure-agent-hooks": {
+        "tool_name": "Write",
+        "tool_input": {
+            "filePath": "docker-compose.yml",
+            "content": "version: '3.8'\nservices:\n  api:\n    image: api:latest\n    privileged: true\n    ports:\n      - '8000:8000'\n"
+        }
+    },
+}
+
+
+def summarize(samples: list) -> str:
+    """Format latency samples as median / mean / p95 in milliseconds"""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"median {statistics.median(ordered) * 1000:7.2f} ms | mean {statistics.mean(ordered) * 1000:7.2f} ms | p95 {p95 * 1000:7.2f} ms"
+
+
+def time_subprocess(argv: list, payload: str, env: dict, runs: int) -> tuple:
+    """Time a hook command launched as a fresh process"""
+    samples = []
+    output = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(argv, input=payload, text=True, capture_output=True, env=env)
+        samples.append(time.perf_counter() - start)
+        output = (proc.returncode, proc.stdout)
+    return samples, output
+
+
+def time_fork(socket_path: str, hook: str, payload: str, env: dict, runs: int) -> tuple:
+    """Time raw request/response round trips to the zygote"""
+    request = json.dumps({
+        "hook": hook,
+        "stdin": payload,
+        "env": {k: v for k, v in env.items() if k.startswith("CLAUDE_")},
+        "cwd": os.getcwd(),
+    }).encode("utf-8")
+
+    samples = []
+    output = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(request)
+            sock.shutdown(socket.SHUT_WR)
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+        samples.append(time.perf_counter() - start)
+        response = json.loads(b"".join(chunks))
+        output = (response["exit_code"], response["stdout"])
+    return samples, output
+
+
+def wait_for_socket(path: str, timeout: float = 10.0):
+    """Block until the zygote is accepting connections"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(path):
+            try:
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(path)
+                return
+            except OSError:
+                pass
+        time.sleep(0.05)
+    raise RuntimeError(f"zygote did not start on {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cold-spawn and zygote-fork hook latency")
+    parser.add_argument("--runs", type=int, default=30, help="Invocations per hook and mode")
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+        print("Zygote benchmark requires fork() and Unix domain sockets", file=sys.stderr)
+        sys.exit(1)
+
+    with tempfile.TemporaryDirectory() as project_dir:
+        socket_path = os.path.join(project_dir, "zygote.sock")
+        env = os.environ.copy()
+        env["CLAUDE_PROJECT_DIR"] = project_dir
+        # Verdict cache off: every run must scan, and must not touch the user's cache
+        env["CLAUDE_VERDICT_CACHE"] = "0"
+
+        zygote = subprocess.Popen(
+            [sys.executable, str(HOOKS_DIR / "hook-zygote.py"), "--socket", socket_path],
+            env=env, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_for_socket(socket_path)
+
+            print(f"⏱️ HOOK LATENCY: cold spawn vs zygote fork ({args.runs} runs each)")
+            print("=" * 80)
+            for hook, payload_data in PAYLOADS.items():
+                payload = json.dumps(payload_data)
+                cold, cold_out = time_subprocess([sys.executable, str(HOOKS_DIR / f"{hook}.py")], payload, env, args.runs)
+                client, client_out = time_subprocess(
+                    [sys.executable, str(HOOKS_DIR / "hook-client.py"), "--socket", socket_path, hook], payload, env, args.runs
+                )
+                fork, fork_out = time_fork(socket_path, hook, payload, env, args.runs)
+
+                print(f"\n{hook}")
+                print(f"  cold    {summarize(cold)}")
+                print(f"  client  {summarize(client)}")
+                print(f"  fork    {summarize(fork)}")
+                print(f"  speedup {statistics.median(cold) / statistics.median(client):.1f}x via client, "
+                      f"{statistics.median(cold) / statistics.median(fork):.1f}x raw fork")
+
+                if not (cold_out == client_out == fork_out):
+                    print("  ❌ outputs differ between modes")
+                    sys.exit(1)
+        finally:
+            zygote.terminate()
+            zygote.wait()
+
+
+if __name__ == "__main__":
+    main()
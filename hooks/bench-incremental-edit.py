@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Measure Edit-aware incremental scanning
+Writes one large file per agent hook, records its scan in a scratch verdict cache, then
+applies one-line Edits and times each hook scanning them in full (cache off) and
+incrementally (only the edit windows, merged with the recorded spans), checking that
+both reach the same decision. Then times MultiEdits of a growing number of hunks across
+all hooks against the same hunks sent as separate Edits
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+sys.path.append(str(Path(__file__).parent))
+from hook_runtime import AGENT_HOOKS, run_hook
+
+REPO_DIR = Path(__file__).parent.parent
+
+# A file path each hook treats as its own (see bench-rule-prefilter.py)
+HOOK_PATHS = {
+    "python-agent-hooks": "src/service.py",
+    "frontend-agent-hooks": "src/components/App.jsx",
+    "infrastructure-agent-hooks": "docker-compose.yml",
+    "security-agent-hooks": "src/service.py",
+    "database-agent-hooks": "db/queries.sql",
+    "business-agent-hooks": "src/api/orders.py",
+    "testing-agent-hooks": "tests/test_service.py",
+    "mobile-agent-hooks": "app/src/MainActivity.kt",
+    "game-agent-hooks": "Assets/Scripts/Player.cs",
+    "data-ai-agent-hooks": "notebooks/train_model.py",
+    "creative-agent-hooks": "docs/brand-guide.md",
+}
+
+# Project files some hooks insist on before they scan anything
+PROJECT_FILES = {
+    "requirements.txt": "requests\n",
+    "package.json": "{}\n",
+    "vite.config.js": "export default {}\n",
+    "Dockerfile": "FROM python:3.11-slim\n",
+    ".venv/pyvenv.cfg": "home = /usr/bin\n",
+}
+
+
+# Every this many lines build_content() inserts a numbered marker line, which Edits target
+MARKER_EVERY = 50
+
+
+def build_content(size_kb: int) -> str:
+    """Repository sources repeated until the file reaches size_kb, with a unique marker line every MARKER_EVERY lines"""
+    sources = "".join(path.read_text(encoding="utf-8", errors="replace") for path in sorted(REPO_DIR.glob("hooks/*.py")))
+    source_lines = sources.splitlines(keepends=True)
+    chunks = []
+    total = 0
+    marker = 0
+    while total < size_kb * 1024:
+        for start in range(0, len(source_lines), MARKER_EVERY):
+            chunk = f"# marker {marker}\n" + "".join(source_lines[start:start + MARKER_EVERY])
+            chunks.append(chunk)
+            total += len(chunk)
+            marker += 1
+    return "".join(chunks)[:size_kb * 1024]
+
+
+def spread_lines(content: str, count: int) -> List[str]:
+    """count marker lines spread evenly through content"""
+    lines = []
+    for step in range(count):
+        start = content.index("# marker ", len(content) * step // count)
+        lines.append(content[start:content.index("\n", start) + 1])
+    return lines
+
+
+def decision(stdout: str) -> object:
+    """A hook's verdict without the inconclusive note or the per-edit note, which depend on how it was scanned"""
+    if not stdout.strip():
+        return None
+    data = json.loads(stdout)
+    data.pop("systemMessage", None)
+    specific = data.get("hookSpecificOutput") or {}
+    if "permissionDecisionReason" in specific:
+        specific["permissionDecisionReason"] = specific["permissionDecisionReason"].split("\n\n✂️")[0]
+        data.pop("reason", None)
+    return data
+
+
+def timed_edit(hook: str, file_path: str, old: str, new: str, env: Dict[str, str], project_dir: str) -> tuple:
+    payload = json.dumps({"tool_name": "Edit", "tool_input": {"file_path": file_path, "old_string": old, "new_string": new}})
+    start = time.perf_counter()
+    result = run_hook(hook, payload, env, project_dir)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare full and incremental scanning of one-line Edits")
+    parser.add_argument("--size-kb", type=int, default=1024, help="Size of the edited file")
+    parser.add_argument("--edits", type=int, default=3, help="Edits per hook; the fastest counts")
+    parser.add_argument("--hunks", default="1,4,16,64", help="Comma-separated MultiEdit sizes")
+    args = parser.parse_args()
+
+    content = build_content(args.size_kb)
+    # One marker line from the middle of the file, edited a little differently each time
+    middle = content.index("# marker ", len(content) // 2)
+    line = content[middle:content.index("\n", middle) + 1]
+    mismatches = []
+
+    print(f"⏱️ INCREMENTAL EDIT: one-line Edits to a {len(content) // 1024} KB file, best of {args.edits}")
+    print("=" * 80)
+    with tempfile.TemporaryDirectory() as project_dir:
+        for name, text in PROJECT_FILES.items():
+            path = Path(project_dir, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        cache_env = {"CLAUDE_PROJECT_DIR": project_dir, "CLAUDE_VERDICT_CACHE": os.path.join(project_dir, "verdicts.sqlite")}
+        full_env = dict(cache_env, CLAUDE_VERDICT_CACHE="0")
+
+        for hook in AGENT_HOOKS:
+            file_path = os.path.join(project_dir, HOOK_PATHS[hook])
+            Path(file_path).parent.mkdir(parents=True, exist_ok=True)
+            Path(file_path).write_text(content)
+            # A Write of the current content records the base spans the Edits merge with
+            run_hook(hook, json.dumps({"tool_name": "Write", "tool_input": {"filePath": file_path, "content": content}}),
+                     cache_env, project_dir)
+
+            timings = {"full": [], "incremental": []}
+            for attempt in range(args.edits):
+                new = f"{line.rstrip()}  # edit {attempt}\n"
+                full_time, full = timed_edit(hook, file_path, line, new, full_env, project_dir)
+                incremental_time, incremental = timed_edit(hook, file_path, line, new, cache_env, project_dir)
+                timings["full"].append(full_time)
+                timings["incremental"].append(incremental_time)
+                if (full.exit_code, decision(full.stdout)) != (incremental.exit_code, decision(incremental.stdout)):
+                    mismatches.append(hook)
+
+            full_ms, incremental_ms = min(timings["full"]) * 1000, min(timings["incremental"]) * 1000
+            print(f"{hook:28} full {full_ms:9.2f} ms   incremental {incremental_ms:8.2f} ms   {full_ms / incremental_ms:6.1f}x")
+
+        print(f"\n✂️ MULTIEDIT: all {len(AGENT_HOOKS)} hooks, one MultiEdit vs the same hunks as separate Edits")
+        print("=" * 80)
+        for count in [int(size) for size in args.hunks.split(",")]:
+            edits = [{"old_string": line, "new_string": f"{line.rstrip()}  # hunk {index}\n"}
+                     for index, line in enumerate(spread_lines(content, count))]
+            batched = separate = 0.0
+            for hook in AGENT_HOOKS:
+                file_path = os.path.join(project_dir, HOOK_PATHS[hook])
+                payload = json.dumps({"tool_name": "MultiEdit", "tool_input": {"file_path": file_path, "edits": edits}})
+                start = time.perf_counter()
+                result = run_hook(hook, payload, cache_env, project_dir)
+                batched += time.perf_counter() - start
+                # Different text from the batch, so these cannot reuse its verdict
+                for edit in edits:
+                    separate += timed_edit(hook, file_path, edit["old_string"], f"{edit['new_string']}# alone\n",
+                                           cache_env, project_dir)[0]
+
+                # The batch must decide as a full scan of the text it leaves would (the same MultiEdit with the cache
+                # off, so a hook that scans only around the hunks of a file too large for it does so in both)
+                full = run_hook(hook, payload, full_env, project_dir)
+                if (full.exit_code, decision(full.stdout)) != (result.exit_code, decision(result.stdout)):
+                    mismatches.append(hook)
+            print(f"{count:4} hunks   MultiEdit {batched * 1000:9.2f} ms   separate Edits {separate * 1000:9.2f} ms   "
+                  f"{separate / batched:6.1f}x")
+
+    if mismatches:
+        print(f"\n❌ Incremental scanning changed the decision of: {', '.join(sorted(set(mismatches)))}")
+        sys.exit(1)
+    print("\n✅ Hook decisions identical with full and incremental scanning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Measure file-lock lookups against a long activity history
+Fills a scratch project's work status store with locks and activities, then times
+WorkStatusManager.is_file_locked (one indexed lookup) against the LOCKED: line scan over
+an equally long WORK_STATUS.md that it replaced, and checks that a lock on data.py does
+not cover a.py. Then adds directory and glob locks and times the trie lookup, which probes
+only the nodes on a file's path, against matching the file against every pattern
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from hook_utils import HookUtils, WorkStatusManager
+from work_status_store import lock_key, scopes_overlap
+
+
+def line_scan(content: str, relative_path: str):
+    """The lookup is_file_locked used to do: substring match on every LOCKED: line"""
+    for line in content.split("\n"):
+        if line.strip().startswith("LOCKED:") and relative_path in line:
+            return True, line.strip()
+    return False, ""
+
+
+def timed(lookup, paths, rounds: int) -> list:
+    samples = []
+    for _ in range(rounds):
+        for path in paths:
+            start = time.perf_counter()
+            lookup(path)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time indexed lock lookups against the markdown line scan")
+    parser.add_argument("--activities", type=int, default=5000, help="Activities logged before timing")
+    parser.add_argument("--locks", type=int, default=200, help="Locked files")
+    parser.add_argument("--scopes", type=int, default=2000, help="Directory and glob locks, half each")
+    parser.add_argument("--rounds", type=int, default=20, help="Lookups per path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as project_dir:
+        work_status = WorkStatusManager(project_dir)
+        store = work_status.store
+        timestamp = HookUtils.get_timestamp()
+        expires_at = time.time() + 3600
+        for index in range(args.locks):
+            store.lock(f"src/module_{index}.py", "python-pro", "editing", timestamp, expires_at)
+        for index in range(args.activities):
+            store.log(timestamp, "WRITE OPERATION", "python-pro", f"src/module_{index % 500}.py", "completed")
+        store.lock("src/data.py", "python-pro", "editing", timestamp, expires_at)
+        work_status.render()
+
+        # The markdown the old lookup read: every activity kept, locks at the top
+        legacy = store.render() + "".join(
+            f"\n## {timestamp} - WRITE OPERATION\n- **Agent**: python-pro\n- **File**: `src/module_{index % 500}.py`\n"
+            for index in range(args.activities)
+        )
+        paths = [f"{project_dir}/src/module_{index}.py" for index in range(0, args.locks, max(1, args.locks // 10))]
+        paths += [f"{project_dir}/src/unlocked_{index}.py" for index in range(10)]
+
+        indexed = timed(work_status.is_file_locked, paths, args.rounds)
+        scanned = timed(lambda path: line_scan(legacy, HookUtils.get_relative_path(path, project_dir)),
+                        paths, max(1, args.rounds // 10))
+
+        print(f"🔒 LOCK LOOKUP: {args.locks} locks, {args.activities} activities "
+              f"({store.activity_count()} kept), {len(legacy) // 1024} KB of legacy markdown")
+        print("=" * 80)
+        for name, samples in (("indexed store", indexed), ("LOCKED: line scan", scanned)):
+            samples.sort()
+            print(f"{name:20} p50 {statistics.median(samples):8.3f} ms   "
+                  f"p99 {samples[int(len(samples) * 0.99) - 1]:8.3f} ms   max {samples[-1]:8.3f} ms")
+
+        a_locked = work_status.is_file_locked(f"{project_dir}/src/a.py")[0]
+        data_locked = work_status.is_file_locked(f"{project_dir}/src/data.py")[0]
+        legacy_a = line_scan(legacy, "a.py")[0]
+        print(f"\nlock on src/data.py covers a.py: indexed {a_locked}, line scan {legacy_a}")
+        if a_locked or not data_locked:
+            print("❌ Indexed lookup is not exact")
+            sys.exit(1)
+        print("✅ Indexed lookup matches exact paths only")
+
+        # Directory locks (pkg_N/**) and glob locks (lib_N/*/*.py), each held by its own agent
+        for index in range(args.scopes // 2):
+            store.lock(f"pkg_{index}/**", f"agent-{index}", "refactoring", timestamp, expires_at)
+            store.lock(f"lib_{index}/*/*.py", f"agent-{index}", "refactoring", timestamp, expires_at)
+        patterns = [lock["path"] for lock in store.locks() if "*" in lock["path"]]
+        step = max(1, args.scopes // 20)
+        scoped_paths = [f"{project_dir}/pkg_{index}/core/deep/x.py" for index in range(0, args.scopes // 2, step)]
+        scoped_paths += [f"{project_dir}/lib_{index}/core/x.py" for index in range(0, args.scopes // 2, step)]
+        scoped_paths += [f"{project_dir}/lib_{index}/core/deep/x.py" for index in range(0, args.scopes // 2, step)]
+
+        def pattern_scan(path: str) -> bool:
+            key = lock_key(HookUtils.get_relative_path(path, project_dir))
+            return any(scopes_overlap(lock_key(pattern), key) for pattern in patterns)
+
+        trie = timed(work_status.is_file_locked, scoped_paths, args.rounds)
+        scan = timed(pattern_scan, scoped_paths, max(1, args.rounds // 10))
+        print(f"\n🌳 SCOPED LOCKS: {len(patterns)} directory and glob locks")
+        print("=" * 80)
+        for name, samples in (("path trie", trie), ("scan every pattern", scan)):
+            samples.sort()
+            print(f"{name:20} p50 {statistics.median(samples):8.3f} ms   "
+                  f"p99 {samples[int(len(samples) * 0.99) - 1]:8.3f} ms   max {samples[-1]:8.3f} ms")
+        wrong = [path for path in scoped_paths if work_status.is_file_locked(path)[0] != pattern_scan(path)]
+        if wrong:
+            print(f"❌ Trie lookup disagrees with the pattern scan for {len(wrong)} files")
+            sys.exit(1)
+        print("✅ Trie lookup agrees with matching every pattern")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark queued lock acquisition against deny-and-retry
+--writers processes want the same hot file, arriving --stagger ms apart. Each holds the
+lock for --hold ms (the tool call) and releases it the way orchestration-sync-hook does.
+"deny" is the behaviour without $CLAUDE_LOCK_WAIT: a refused writer backs off for --retry
+ms and tries again, as an agent re-issuing its tool call would. "wait" queues through
+WorkStatusManager.wait_for_lock. Reports attempts, latency and, for "wait", whether
+writers were served in the order they joined the queue (watched from the waiters table;
+arrival order itself is only approximate, as SQLite's busy handler is not fair).
+Before that it checks that the lease pretooluse-dispatcher takes for a queued write is
+released by orchestration-sync-hook, whichever spelling of the path key the payload uses
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from coordination_renderer import flush
+from hook_utils import WorkStatusManager
+
+HOT_FILE = "src/hot.py"
+HOOKS_DIR = Path(__file__).resolve().parent
+
+
+def writer(project_dir: str, index: int, mode: str, args, start_at: float, results):
+    time.sleep(max(0.0, start_at + index * args.stagger / 1000 - time.time()))
+    work_status = WorkStatusManager(project_dir)
+    agent = f"agent-{index}"
+    file_path = f"{project_dir}/{HOT_FILE}"
+    arrived = time.time()
+    attempts = 1
+    if mode == "wait":
+        acquired, _ = work_status.wait_for_lock(file_path, agent, args.timeout)
+    else:
+        acquired, _ = work_status.lock_file(file_path, agent)
+        while not acquired and time.time() - arrived < args.timeout:
+            time.sleep(args.retry / 1000)
+            attempts += 1
+            acquired, _ = work_status.lock_file(file_path, agent)
+    granted = time.time()
+    if acquired:
+        time.sleep(args.hold / 1000)
+        work_status.unlock_file(file_path)
+    results.put((index, acquired, attempts, granted - arrived, granted))
+
+
+def watch_queue(project_dir: str, seen: dict, stop: threading.Event):
+    """Record the queue position of every waiter that shows up"""
+    conn = sqlite3.connect(WorkStatusManager(project_dir).store.path, timeout=5)
+    while not stop.wait(0.001):
+        for waiter_id, agent in conn.execute("SELECT id, agent FROM waiters").fetchall():
+            seen.setdefault(int(agent.split("-")[1]), waiter_id)
+    conn.close()
+
+
+def run(mode: str, args) -> dict:
+    with tempfile.TemporaryDirectory() as project_dir:
+        with WorkStatusManager(project_dir).store.transaction():
+            pass  # creates the store, so the queue can be watched from the start
+        results = multiprocessing.Queue()
+        start_at = time.time() + 0.5
+        processes = [multiprocessing.Process(target=writer, args=(project_dir, index, mode, args, start_at, results))
+                     for index in range(args.writers)]
+        for process in processes:
+            process.start()
+        # Only once the writers are forked: a thread inside SQLite must not be copied into them
+        seen, stop = {}, threading.Event()
+        watcher = threading.Thread(target=watch_queue, args=(project_dir, seen, stop))
+        watcher.start()
+        rows = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        stop.set()
+        watcher.join()
+        makespan = max(row[4] for row in rows) - start_at
+        leftovers = list(WorkStatusManager(project_dir).store.wait_dir.glob("*"))
+        flush(project_dir)
+    served = [row[0] for row in sorted(rows, key=lambda row: row[4]) if row[1]]
+    queued = [index for index in served if index in seen]
+    latencies = sorted(row[3] * 1000 for row in rows)
+    return {
+        "granted": len(served),
+        "attempts": sum(row[2] for row in rows),
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(0.95 * (len(latencies) - 1))],
+        "makespan": makespan,
+        "queued": len(queued),
+        "in_order": queued == sorted(queued, key=seen.get),
+        "leftovers": len(leftovers),
+    }
+
+
+def lease_released(key: str) -> bool:
+    """Whether a write's lease taken in PreToolUse is gone after PostToolUse, with the path under key"""
+    with tempfile.TemporaryDirectory() as project_dir:
+        settings = Path(project_dir) / "settings.json"
+        # A hook with nothing to say about the write, so the dispatcher lets it go ahead holding the lease
+        settings.write_text(json.dumps({"claude.dispatcher": {"routes": {"creative-agent-hooks": ["*"]}}}))
+        env = dict(os.environ, CLAUDE_PROJECT_DIR=project_dir, CLAUDE_AGENT_NAME="agent-0",
+                   CLAUDE_LOCK_WAIT="2", CLAUDE_HOOK_SETTINGS=str(settings), CLAUDE_VERDICT_CACHE="0")
+        file_path = f"{project_dir}/{HOT_FILE}"
+        payload = {"session_id": "lease-check", "tool_name": "Write",
+                   "tool_input": {key: file_path, "content": "VALUE = 1\n"}}
+        for hook, event in (("pretooluse-dispatcher.py", "PreToolUse"), ("orchestration-sync-hook.py", "PostToolUse")):
+            subprocess.run([sys.executable, str(HOOKS_DIR / hook)], input=json.dumps(dict(payload, hook_event_name=event)),
+                           text=True, capture_output=True, env=env, cwd=project_dir)
+        locked, _ = WorkStatusManager(project_dir).is_file_locked(file_path)
+        flush(project_dir)
+    return not locked
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare queued lock waits with deny-and-retry on one hot file")
+    parser.add_argument("--writers", type=int, default=20, help="Concurrent writer processes")
+    parser.add_argument("--hold", type=float, default=50, help="Milliseconds each writer holds the lock")
+    parser.add_argument("--stagger", type=float, default=5, help="Milliseconds between writer arrivals")
+    parser.add_argument("--retry", type=float, default=250, help="Milliseconds a refused writer waits before retrying")
+    parser.add_argument("--timeout", type=float, default=30, help="Seconds a writer keeps trying")
+    args = parser.parse_args()
+
+    print(f"⏳ LOCK WAIT BENCHMARK: {args.writers} writers, {args.hold:.0f}ms hold, "
+          f"{args.retry:.0f}ms retry delay")
+    print("=" * 80)
+    print(f"{'mode':8}{'granted':>9}{'attempts':>10}{'p50 ms':>10}{'p95 ms':>10}{'total s':>9}  queue order")
+    failures = [f"a lease taken for a `{key}` payload was not released by the sync hook"
+                for key in ("filePath", "file_path") if not lease_released(key)]
+    for mode in ("deny", "wait"):
+        result = run(mode, args)
+        order = "-" if not result["queued"] else "kept" if result["in_order"] else "broken"
+        print(f"{mode:8}{result['granted']:9}{result['attempts']:10}{result['p50']:10.1f}{result['p95']:10.1f}"
+              f"{result['makespan']:9.2f}  {order}")
+        if mode == "wait":
+            if result["granted"] != args.writers:
+                failures.append(f"{args.writers - result['granted']} waiting writers never got the lock")
+            if not result["queued"]:
+                failures.append("no writer was seen queueing")
+            elif not result["in_order"]:
+                failures.append("waiting writers were not served first come, first served")
+            if result["attempts"] != args.writers:
+                failures.append("waiting writers retried")
+            if result["leftovers"]:
+                failures.append(f"{result['leftovers']} wait pipes left behind")
+
+    if failures:
+        print(f"\n❌ {'; '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ Every lease was released after the write, and every waiting writer got the lock once, in queue order")
+
+
+if __name__ == "__main__":
+    main()
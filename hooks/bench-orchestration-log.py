@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Measure orchestration events against rewriting orchestration-index.md for each one
+Raises --alerts containerization alerts, so the index has grown, then records --events
+progress updates two ways: appended to the orchestration log only, and appended then
+rendered into the index, which is what every update used to cost (a locked read-modify-write
+of the whole file). Times signalling --subscribers agents about a file as one bulk event against
+one progress update per agent, the current-state queries from the warm in-memory reduction and
+from a new process's checkpoint, and checks the reduction and the rendered view against a fold
+of the whole log
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from coordination_renderer import flush
+from hook_utils import HookUtils, OrchestrationManager
+from orchestration_log import SIGNALS_KEPT, OrchestrationLog, OrchestrationState
+
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    return f"p50 {statistics.median(samples):8.3f} ms   p99 {samples[int(0.99 * (len(samples) - 1))]:8.3f} ms"
+
+
+def timed(action) -> float:
+    start = time.perf_counter()
+    action()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time orchestration events, state queries and index renders")
+    parser.add_argument("--alerts", type=int, default=200, help="Containerization alerts raised first")
+    parser.add_argument("--events", type=int, default=1000, help="Progress updates timed each way")
+    parser.add_argument("--agents", type=int, default=40, help="Distinct agents reporting progress")
+    parser.add_argument("--subscribers", type=int, default=40, help="Agents signalled about each file")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as project_dir:
+        orchestration = OrchestrationManager(project_dir)
+        orchestration.ensure_exists()
+        with orchestration.transaction():
+            for index in range(args.alerts):
+                orchestration.signal_containerization_needed(f"agent-{index % args.agents}", [f"module_{index}.py"])
+        orchestration.materialize()
+        size = len(HookUtils.read_file(project_dir, "orchestration-index.md"))
+
+        subscribers = [f"reviewer-{index}" for index in range(args.subscribers)]
+        bulk, looped = [], []
+        for index in range(args.events // 10):
+            file_path = f"{project_dir}/src/signalled_{index}.py"
+            bulk.append(timed(lambda: orchestration.signal_agents(subscribers, file_path, "pending_review", "agent-0")))
+            looped.append(timed(lambda: [orchestration.update_progress(agent, "coordination_signal", file_path,
+                                                                      "pending_review") for agent in subscribers]))
+        logged, rendered, queried = [], [], []
+        for index in range(2 * args.events):
+            def record():
+                orchestration.update_progress(f"agent-{index % args.agents}", "write operation",
+                                              f"{project_dir}/src/module_{index}.py", "completed")
+            if index < args.events:
+                logged.append(timed(record))
+                queried.append(timed(lambda: (orchestration.latest_progress(), orchestration.open_alerts())))
+            else:
+                rendered.append(timed(lambda: (record(), orchestration.materialize())))
+        cold = timed(lambda: OrchestrationLog(project_dir).state())
+
+        print(f"📊 ORCHESTRATION LOG: {args.alerts} alerts ({size // 1024} KB of index), "
+              f"{args.events} progress updates from {args.agents} agents")
+        print("=" * 80)
+        print(f"log the event            {percentiles(logged)}")
+        print(f"log and rewrite index    {percentiles(rendered)}")
+        print(f"latest progress + alerts {percentiles(queried)}")
+        print(f"{f'signal {args.subscribers} at once':25}{percentiles(bulk)}")
+        print(f"signal them one by one    {percentiles(looped)}")
+        print(f"new process's state      {cold:8.3f} ms (from the checkpoint)")
+
+        log = OrchestrationLog(project_dir)
+        folded = OrchestrationState()
+        for position, event in log.journal.since():
+            folded.apply(event)
+            folded.position = position
+        if folded.to_dict() != orchestration.log.state().to_dict():
+            failures.append("the reduction differs from a fold of the whole log")
+        view = HookUtils.read_file(project_dir, "orchestration-index.md")
+        if view.count("CONTAINERIZATION REVIEW REQUIRED") != args.alerts or view.count("### Latest Progress") != 1:
+            failures.append("orchestration-index.md does not show every alert and the latest progress")
+        if len(orchestration.latest_progress()) != args.agents + args.subscribers:
+            failures.append("latest progress is missing agents")
+        signals = orchestration.signals()
+        kept = min(args.events // 10, SIGNALS_KEPT)
+        if len(signals) != args.subscribers or any(len(by_path) != kept for by_path in signals.values()):
+            failures.append("signals were not kept for every agent and file")
+        flush(project_dir)
+
+    if failures:
+        print(f"\n❌ {'; '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ The reduction matches the log and the view shows it")
+
+
+if __name__ == "__main__":
+    main()
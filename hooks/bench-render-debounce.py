@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Measure the PostToolUse sync hook with WORK_STATUS.md rendered synchronously against the debounced
+background renderer
+Runs --writes sync hooks back to back (a burst of Writes) in-process, once with
+CLAUDE_RENDER_DEBOUNCE=0, where each call renders WORK_STATUS.md before returning, and once with
+--debounce, where each only schedules a render. Counts the renders that reach the file in each
+mode, and checks that after a flush both views show every write's activity and progress
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from coordination_renderer import flush
+from hook_runtime import run_hook
+from hook_utils import HookUtils
+
+
+def watch_renders(path: Path, renders: list, stop: threading.Event):
+    """Count the times path is replaced (every render swaps a new file in)"""
+    seen = None
+    while not stop.wait(0.0005):
+        try:
+            inode = path.stat().st_ino
+        except FileNotFoundError:
+            continue
+        if inode != seen:
+            seen = inode
+            renders.append(inode)
+
+
+def burst(writes: int, debounce: str) -> dict:
+    with tempfile.TemporaryDirectory() as project_dir:
+        env = {"CLAUDE_PROJECT_DIR": project_dir, "CLAUDE_AGENT_NAME": "python-pro", "CLAUDE_RENDER_DEBOUNCE": debounce,
+               "CLAUDE_VERDICT_CACHE": "0"}
+        renders, stop = [], threading.Event()
+        watcher = threading.Thread(target=watch_renders, args=(Path(project_dir) / "WORK_STATUS.md", renders, stop))
+        watcher.start()
+        samples = []
+        start = time.perf_counter()
+        for index in range(writes):
+            payload = json.dumps({"tool_name": "Write",
+                                  "tool_input": {"filePath": f"{project_dir}/src/module_{index}.py", "content": "x"}})
+            began = time.perf_counter()
+            run_hook("orchestration-sync-hook", payload, env, project_dir)
+            samples.append((time.perf_counter() - began) * 1000)
+        elapsed = time.perf_counter() - start
+        # The renderer's last render lands one debounce after the burst
+        time.sleep(float(debounce) + 0.2)
+        stop.set()
+        watcher.join()
+        flush(project_dir)
+        status = HookUtils.read_file(project_dir, "WORK_STATUS.md")
+        index = HookUtils.read_file(project_dir, "orchestration-index.md")
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p99": samples[int(0.99 * (len(samples) - 1))],
+        "elapsed": elapsed,
+        "renders": len(renders),
+        "complete": (all(f"src/module_{index}.py" in status for index in range(max(0, writes - 10), writes))
+                     and f"src/module_{writes - 1}.py" in index),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the sync hook with synchronous and debounced rendering")
+    parser.add_argument("--writes", type=int, default=200, help="Sync hook calls in the burst")
+    parser.add_argument("--debounce", type=float, default=0.5, help="Debounce window of the background renderer")
+    args = parser.parse_args()
+
+    results = {"synchronous render": burst(args.writes, "0"),
+               f"debounced ({args.debounce:g}s)": burst(args.writes, str(args.debounce))}
+
+    print(f"🖋️ RENDER DEBOUNCE: {args.writes} sync hook calls in a burst")
+    print("=" * 80)
+    print(f"{'mode':24}{'p50 ms':>10}{'p99 ms':>10}{'burst s':>10}{'renders':>10}")
+    for name, result in results.items():
+        print(f"{name:24}{result['p50']:10.2f}{result['p99']:10.2f}{result['elapsed']:10.2f}{result['renders']:10}")
+
+    if not all(result["complete"] for result in results.values()):
+        print("\n❌ A flushed view is missing writes")
+        sys.exit(1)
+    print("\n✅ Both modes end with every write in WORK_STATUS.md and orchestration-index.md")
+
+
+if __name__ == "__main__":
+    main()
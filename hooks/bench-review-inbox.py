@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Measure per-agent review inboxes as they fill up
+Queues --items reviews spread over --agents agents (each a signal for one file at one content
+hash), timing the enqueues, then times draining --take items from one agent's inbox at a time
+while the other inboxes stay full, and peeking at the next --take. Checks that re-signalling
+unchanged content queues nothing, that changed content queues a new review, and that the drains
+hand every review back once, oldest first
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from coordination_renderer import flush
+from hook_utils import OrchestrationManager
+
+
+def percentiles(samples: list) -> str:
+    samples = sorted(samples)
+    return f"p50 {statistics.median(samples):8.3f} ms   p99 {samples[int(0.99 * (len(samples) - 1))]:8.3f} ms"
+
+
+def timed(action) -> float:
+    start = time.perf_counter()
+    action()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time review inbox enqueues and drains")
+    parser.add_argument("--items", type=int, default=20000, help="Reviews queued in all")
+    parser.add_argument("--agents", type=int, default=50, help="Agents the reviews are spread over")
+    parser.add_argument("--take", type=int, default=10, help="Reviews drained or peeked at a time")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as project_dir:
+        orchestration = OrchestrationManager(project_dir)
+        agents = [f"reviewer-{index}" for index in range(args.agents)]
+        queued = []
+        for index in range(args.items):
+            agent = agents[index % args.agents]
+            queued.append(timed(lambda: orchestration.signal_agents([agent], f"{project_dir}/src/module_{index}.py",
+                                                                    "pending_review", "python-pro", f"v{index}")))
+
+        again = orchestration.signal_agents(agents[:1], f"{project_dir}/src/module_0.py", "pending_review",
+                                            "python-pro", "v0")
+        changed = orchestration.signal_agents(agents[:1], f"{project_dir}/src/module_0.py", "pending_review",
+                                              "python-pro", "v0, edited")
+        if again != 0 or changed != 1:
+            failures.append(f"re-signalling queued {again} for unchanged content and {changed} for changed")
+
+        target = agents[-1]
+        peeked, drained, order = [], [], []
+        while True:
+            peeked.append(timed(lambda: orchestration.inbox(target, args.take)))
+            items = []
+            drained.append(timed(lambda: items.extend(orchestration.drain_inbox(target, args.take))))
+            if not items:
+                break
+            order.extend(int(item["path"].split("_")[1].split(".")[0]) for item in items)
+        expected = list(range(args.agents - 1, args.items, args.agents))
+        if order != expected:
+            failures.append(f"drained {len(order)} of {len(expected)} reviews, or out of order")
+        waiting = orchestration.inbox(agents[0])
+        flush(project_dir)
+
+    print(f"📥 REVIEW INBOX: {args.items} reviews over {args.agents} agents, taken {args.take} at a time")
+    print("=" * 80)
+    print(f"signal and enqueue       {percentiles(queued)}")
+    print(f"peek at the next {args.take:<7} {percentiles(peeked)}")
+    print(f"drain the next {args.take:<9} {percentiles(drained)}")
+    print(f"{len(waiting)} reviews still waiting for {agents[0]}")
+
+    if failures:
+        print(f"\n❌ {'; '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ Duplicates were dropped and every review came back once, oldest first")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the rule-set scan engines against each other
+Scans every rule set of the active pack over a corpus of repository files with the
+per_rule and combined engines, checks they report identical rules and spans,
+and prints the time each engine spends per set
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+sys.path.append(str(Path(__file__).parent))
+from rule_registry import ENGINES, RuleSet, load_rule_pack
+
+REPO_DIR = Path(__file__).parent.parent
+
+# Agent definitions and hook sources stand in for the files agents write
+CORPUS_GLOBS = ["agents/*.md", "hooks/*.py", "*.md"]
+
+
+def load_corpus(limit: int) -> List[str]:
+    """Repository documents used as scan input, capped at limit characters each"""
+    documents = []
+    for pattern in CORPUS_GLOBS:
+        for path in sorted(REPO_DIR.glob(pattern)):
+            documents.append(path.read_text(encoding="utf-8", errors="replace")[:limit])
+    return documents
+
+
+def time_engine(rule_set: RuleSet, engine: str, documents: List[str], runs: int) -> tuple:
+    """Best-of-N time to scan every document, plus the scan results"""
+    scanner = RuleSet(rule_set.name, rule_set.flag_names, rule_set.rules, engine)
+    scanner.compile()
+    best = None
+    results = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        results = [[(hit.rule.rule_id, hit.span) for hit in scanner.scan(document)] for document in documents]
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-rule and combined rule-set scanning")
+    parser.add_argument("--runs", type=int, default=3, help="Passes over the corpus; the fastest counts")
+    parser.add_argument("--limit", type=int, default=20000, help="Characters kept from each corpus file")
+    parser.add_argument("--sets", nargs="*", help="Only benchmark these rule sets")
+    args = parser.parse_args()
+
+    pack = load_rule_pack()
+    documents = load_corpus(args.limit)
+    names = args.sets or list(pack.rule_sets)
+    totals: Dict[str, float] = {engine: 0.0 for engine in ENGINES}
+    mismatches = []
+
+    print(f"⏱️ RULE ENGINES: {len(documents)} documents, {sum(map(len, documents)) // 1024} KB, pack {pack.version}")
+    print("=" * 80)
+    for name in names:
+        timings = {}
+        outputs = {}
+        for engine in ENGINES:
+            timings[engine], outputs[engine] = time_engine(pack[name], engine, documents, args.runs)
+            totals[engine] += timings[engine]
+        if len({repr(output) for output in outputs.values()}) != 1:
+            mismatches.append(name)
+        row = "  ".join(f"{engine} {timings[engine] * 1000:8.2f} ms" for engine in ENGINES)
+        print(f"{name:42} {row}")
+
+    print("-" * 80)
+    print(f"{'total':42} " + "  ".join(f"{engine} {totals[engine] * 1000:8.2f} ms" for engine in ENGINES))
+
+    if mismatches:
+        print(f"\n❌ Engines disagree on: {', '.join(mismatches)}")
+        sys.exit(1)
+    print("\n✅ Engines report identical rules and spans")
+
+
+if __name__ == "__main__":
+    main()
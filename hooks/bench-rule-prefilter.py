@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Measure the literal prefilter on large Writes
+Runs every agent hook in-process against one large Write built from repository
+files, with the prefilter on and off, and reports per hook how many regex
+evaluations the prefilter skipped, the time saved, and that decisions are unchanged
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+sys.path.append(str(Path(__file__).parent))
+from hook_runtime import AGENT_HOOKS, run_hook
+from rule_registry import load_rule_pack, prefilter_stats, reset_prefilter_stats
+
+REPO_DIR = Path(__file__).parent.parent
+
+# A file path each hook treats as its own, so every rule set it owns gets scanned
+HOOK_PATHS = {
+    "python-agent-hooks": "src/service.py",
+    "frontend-agent-hooks": "src/components/App.jsx",
+    "infrastructure-agent-hooks": "docker-compose.yml",
+    "security-agent-hooks": "src/service.py",
+    "database-agent-hooks": "db/queries.sql",
+    "business-agent-hooks": "src/api/orders.py",
+    "testing-agent-hooks": "tests/test_service.py",
+    "mobile-agent-hooks": "app/src/MainActivity.kt",
+    "game-agent-hooks": "Assets/Scripts/Player.cs",
+    "data-ai-agent-hooks": "notebooks/train_model.py",
+    "creative-agent-hooks": "docs/brand-guide.md",
+}
+
+# Project files some hooks insist on before they scan anything
+PROJECT_FILES = {
+    "requirements.txt": "requests\n",
+    "package.json": "{}\n",
+    "vite.config.js": "export default {}\n",
+    "Dockerfile": "FROM python:3.11-slim\n",
+    ".venv/pyvenv.cfg": "home = /usr/bin\n",
+}
+
+
+def build_content(size_kb: int) -> str:
+    """Concatenate repository sources until the Write reaches size_kb"""
+    chunks = []
+    total = 0
+    for pattern in ["hooks/*.py", "agents/*.md", "*.md"]:
+        for path in sorted(REPO_DIR.glob(pattern)):
+            text = path.read_text(encoding="utf-8", errors="replace")
+            chunks.append(text)
+            total += len(text)
+            if total >= size_kb * 1024:
+                return "".join(chunks)[:size_kb * 1024]
+    return "".join(chunks)
+
+
+def set_prefilter(enabled: bool):
+    """Toggle the prefilter on every loaded rule set"""
+    for rule_set in load_rule_pack().rule_sets.values():
+        rule_set.prefilter = enabled
+
+
+def run_once(hook: str, payload: str, project_dir: str) -> tuple:
+    """Run a hook and return (elapsed seconds, result, evaluated, skipped)"""
+    reset_prefilter_stats()
+    start = time.perf_counter()
+    # Verdict cache off: every run must scan, and must not touch the user's cache
+    result = run_hook(hook, payload, {"CLAUDE_PROJECT_DIR": project_dir, "CLAUDE_VERDICT_CACHE": "0"}, project_dir)
+    elapsed = time.perf_counter() - start
+    stats = prefilter_stats().values()
+    evaluated = sum(counts["evaluated"] for counts in stats)
+    skipped = sum(counts["skipped"] for counts in stats)
+    return elapsed, (result.exit_code, result.stdout), evaluated, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report regex evaluations skipped by the literal prefilter")
+    parser.add_argument("--size-kb", type=int, default=96, help="Size of the simulated Write (security skips files over 100000 characters)")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per hook and mode; the fastest counts")
+    args = parser.parse_args()
+
+    content = build_content(args.size_kb)
+    load_rule_pack().compile_all()
+    mismatches = []
+
+    print(f"⏱️ RULE PREFILTER: {len(content) // 1024} KB Write, best of {args.runs}")
+    print("=" * 80)
+    with tempfile.TemporaryDirectory() as project_dir:
+        for name, text in PROJECT_FILES.items():
+            path = Path(project_dir, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text)
+        for hook in AGENT_HOOKS:
+            payload = json.dumps({
+                "tool_name": "Write",
+                "tool_input": {"filePath": os.path.join(project_dir, HOOK_PATHS[hook]), "content": content}
+            })
+            timings: Dict[bool, float] = {}
+            outputs = {}
+            for enabled in (False, True):
+                set_prefilter(enabled)
+                for _ in range(args.runs):
+                    elapsed, outputs[enabled], evaluated, skipped = run_once(hook, payload, project_dir)
+                    timings[enabled] = min(timings.get(enabled, elapsed), elapsed)
+            set_prefilter(True)
+
+            if outputs[False] != outputs[True]:
+                mismatches.append(hook)
+            total = evaluated + skipped
+            share = f"{skipped / total:6.1%}" if total else "   n/a"
+            print(f"{hook:28} skipped {skipped:4}/{total:<4} {share}  "
+                  f"{timings[False] * 1000:8.2f} ms -> {timings[True] * 1000:8.2f} ms")
+
+    if mismatches:
+        print(f"\n❌ Prefilter changed the decision of: {', '.join(mismatches)}")
+        sys.exit(1)
+    print("\n✅ Hook decisions identical with and without the prefilter")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Measure review-signal routing through the compiled table against trying every route
+Adds --routes directory routes (svc_N/api/** and svc_N/*/models/*.py, half each, with their own
+subscribers) to the default SIGNAL_ROUTES, then routes paths inside and outside them with
+RoutingTable.route (an extension dict probe plus the glob trie nodes on the path) and with a
+linear scan matching the path against every route's extensions and globs, and checks both
+pick the same agents. Also checks the routes the old if/elif chain in orchestration-sync-hook.py
+got wrong: a model .py file now reaches database-expert as well as the .py subscribers
+"""
+
+import argparse
+import os
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from signal_routing import SIGNAL_ROUTES, RoutingTable, glob_regex
+
+
+def compile_linear(routes: list) -> list:
+    """Each route's extensions, compiled globs, markers and agents, to be tried in turn"""
+    return [({extension.lower() for extension in route.get("extensions", [])},
+             [re.compile(glob_regex(glob.lower())) for glob in route.get("paths", [])],
+             route.get("markers", []), route["agents"]) for route in routes]
+
+
+def linear_route(compiled: list, relative_path: str, content: str = "") -> list:
+    """Every route tried in turn"""
+    key = relative_path.lower()
+    agents = []
+    for extensions, globs, markers, subscribers in compiled:
+        if (os.path.splitext(key)[1] in extensions or any(glob.match(key) for glob in globs)
+                or any(marker in content for marker in markers)):
+            agents.extend(subscribers)
+    return list(dict.fromkeys(agents))
+
+
+def timed(route, paths, rounds: int) -> list:
+    samples = []
+    for _ in range(rounds):
+        for path in paths:
+            start = time.perf_counter()
+            route(path)
+            samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time indexed signal routing against trying every route")
+    parser.add_argument("--routes", type=int, default=2000, help="Directory routes added to the defaults")
+    parser.add_argument("--rounds", type=int, default=20, help="Routings per path")
+    args = parser.parse_args()
+
+    routes = list(SIGNAL_ROUTES)
+    for index in range(args.routes // 2):
+        routes.append({"paths": [f"svc_{index}/api/**"], "agents": [f"api-reviewer-{index}"]})
+        routes.append({"paths": [f"svc_{index}/*/models/*.py"], "agents": [f"model-reviewer-{index}"]})
+    start = time.perf_counter()
+    table = RoutingTable(routes)
+    compiled = (time.perf_counter() - start) * 1000
+    linear = compile_linear(routes)
+
+    step = max(1, args.routes // 20)
+    paths = [f"svc_{index}/api/v1/handlers/x.py" for index in range(0, args.routes // 2, step)]
+    paths += [f"svc_{index}/billing/models/invoice.py" for index in range(0, args.routes // 2, step)]
+    paths += [f"other_{index}/deep/tree/of/dirs/x.ts" for index in range(10)]
+
+    indexed = timed(table.route, paths, args.rounds)
+    scanned = timed(lambda path: linear_route(linear, path), paths, max(1, args.rounds // 10))
+
+    print(f"📣 SIGNAL ROUTING: {len(routes)} routes, compiled in {compiled:.0f} ms")
+    print("=" * 80)
+    for name, samples in (("compiled table", indexed), ("every route", scanned)):
+        samples.sort()
+        print(f"{name:20} p50 {statistics.median(samples):8.3f} ms   "
+              f"p99 {samples[int(len(samples) * 0.99) - 1]:8.3f} ms   max {samples[-1]:8.3f} ms")
+
+    failures = [path for path in paths if table.route(path) != linear_route(linear, path)]
+    defaults = RoutingTable(SIGNAL_ROUTES)
+    model = defaults.route("src/models/user.py")
+    if "database-expert" not in model or "test-automation-expert" not in model:
+        failures.append("src/models/user.py")
+    if defaults.route("db/schema.sql", "CREATE TABLE users (id INT);") != ["database-expert"]:
+        failures.append("db/schema.sql")
+    if failures:
+        print(f"\n❌ Routed differently: {', '.join(failures[:5])}")
+        sys.exit(1)
+    print(f"\n✅ Both pick the same subscribers; src/models/user.py reaches {', '.join(model)}")
+
+
+if __name__ == "__main__":
+    main()
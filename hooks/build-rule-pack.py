@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Build the versioned rule pack (rule-pack.json) from rule_definitions.py
+Validates that every pattern compiles with its flags before writing, extracts each
+rule's required literals for the prefilter, and confirms the prefilter's case-folding
+table matches this interpreter's Unicode data;
+--check exits non-zero when the committed pack is out of date
+"""
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import List
+sys.path.append(str(Path(__file__).parent))
+from rule_definitions import RULE_PACK_SCHEMA, RULE_SETS
+from rule_literals import non_ascii_case_folds
+from rule_registry import NON_ASCII_CASE_FOLDS, RULE_PACK_FILE, build_pack_data, flags_from_names
+
+
+def validate_rule_sets(rule_sets: dict) -> List[str]:
+    """Compile every rule and report anything that would fail at hook runtime"""
+    errors = []
+    for name, spec in rule_sets.items():
+        try:
+            flags = flags_from_names(spec["flags"])
+        except ValueError as e:
+            errors.append(f"{name}: {e}")
+            continue
+        for index, (pattern, description) in enumerate(spec["rules"]):
+            try:
+                re.compile(pattern, flags)
+            except re.error as e:
+                errors.append(f"{name}.{index:02d}: {e} in {pattern!r}")
+            if not description:
+                errors.append(f"{name}.{index:02d}: missing description")
+    return errors
+
+
+def validate_case_folds() -> List[str]:
+    """A fold the prefilter misses would skip rules that re.IGNORECASE still matches"""
+    actual = non_ascii_case_folds()
+    if actual == NON_ASCII_CASE_FOLDS:
+        return []
+    expected = {f"U+{ord(char):04X}->{letter}" for char, letter in NON_ASCII_CASE_FOLDS.items()}
+    found = {f"U+{ord(char):04X}->{letter}" for char, letter in actual.items()}
+    return [f"rule_registry.NON_ASCII_CASE_FOLDS is out of date: missing {sorted(found - expected)}, extra {sorted(expected - found)}"]
+
+
+def render_pack(data: dict) -> str:
+    """Stable JSON text so rebuilding unchanged rules produces no diff"""
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile rule_definitions.py into a versioned rule pack")
+    parser.add_argument("--output", default=str(RULE_PACK_FILE), help="Rule pack path")
+    parser.add_argument("--check", action="store_true", help="Fail if the rule pack is missing or stale")
+    args = parser.parse_args()
+
+    errors = validate_rule_sets(RULE_SETS) + validate_case_folds()
+    if errors:
+        print("❌ Invalid rules:", file=sys.stderr)
+        for error in errors:
+            print(f"  • {error}", file=sys.stderr)
+        sys.exit(1)
+
+    data = build_pack_data(RULE_SETS, RULE_PACK_SCHEMA)
+    text = render_pack(data)
+    output = Path(args.output)
+    rule_count = sum(len(spec["rules"]) for spec in data["rule_sets"].values())
+    prefiltered = sum(1 for spec in data["rule_sets"].values() for rule in spec["rules"] if "literals" in rule)
+
+    if args.check:
+        current = output.read_text(encoding="utf-8") if output.exists() else ""
+        if current != text:
+            print(f"❌ {output} is stale - run build-rule-pack.py (expected version {data['version']})", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ Rule pack {data['version']} is up to date ({len(data['rule_sets'])} sets, {rule_count} rules, {prefiltered} prefiltered)")
+        return
+
+    output.write_text(text, encoding="utf-8")
+    print(f"📦 Wrote rule pack {data['version']} to {output} ({len(data['rule_sets'])} sets, {rule_count} rules, {prefiltered} prefiltered)")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,46 +11,23 @@ import re
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 from hook_utils import HookUtils, WorkStatusManager, OrchestrationManager
+from rule_registry import load_rule_pack
+
+RULES = load_rule_pack()
 
 def validate_api_design_standards(content: str, file_path: str) -> tuple[str, list]:
     """Validate API design against REST and GraphQL best practices"""
     
     api_issues = []
     
-    # REST API patterns
-    rest_patterns = [
-        (r"@app\.route\(['\"].*[A-Z].*['\"]", "REST: Avoid uppercase in URL paths"),
-        (r"@app\.route\(['\"].*/\{[^}]+\}\{[^}]+\}['\"]", "REST: Avoid consecutive path parameters"),
-        (r"/api/v\d+/.*get.*", "REST: Avoid verbs in URL paths (GET is implicit)"),
-        (r"/api/v\d+/.*post.*", "REST: Avoid verbs in URL paths (POST is implicit)"),
-        (r"@app\.route.*methods=.*GET.*POST", "REST: Single endpoint should not handle both GET and POST"),
-    ]
-    
-    # GraphQL patterns
-    graphql_patterns = [
-        (r"type.*\{[^}]*String[^!][^}]*\}", "GraphQL: Consider making required fields non-nullable (!)"),
-        (r"query.*\{[^}]*\{[^}]*\{[^}]*\{", "GraphQL: Query nesting too deep (>3 levels)"),
-        (r"mutation.*[A-Z][a-z]", "GraphQL: Mutations should use camelCase"),
-    ]
-    
-    # HTTP status code patterns
-    status_code_patterns = [
-        (r"return.*200.*error", "HTTP: Don't return 200 for error conditions"),
-        (r"return.*404.*created", "HTTP: Don't return 404 for successful creation"),
-        (r"return.*500.*validation", "HTTP: Use 400 for validation errors, not 500"),
-    ]
+    for rule in RULES["business.api.rest"].matching(content):
+        api_issues.append(f"🌐 REST: {rule.description}")
     
-    for pattern, description in rest_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            api_issues.append(f"🌐 REST: {description}")
+    for rule in RULES["business.api.graphql"].matching(content):
+        api_issues.append(f"📊 GraphQL: {rule.description}")
     
-    for pattern, description in graphql_patterns:
-        if re.search(pattern, content):
-            api_issues.append(f"📊 GraphQL: {description}")
-    
-    for pattern, description in status_code_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            api_issues.append(f"📟 HTTP: {description}")
+    for rule in RULES["business.api.status_codes"].matching(content):
+        api_issues.append(f"📟 HTTP: {rule.description}")
     
     if len(api_issues) >= 3:
         return "MEDIUM", api_issues
@@ -64,39 +41,14 @@ def check_business_logic_patterns(content: str, file_path: str) -> tuple[str, li
     
     business_issues = []
     
-    # Business rule validation
-    validation_patterns = [
-        (r"if.*age.*<.*0", "Business: Age cannot be negative - add validation"),
-        (r"if.*price.*<.*0", "Business: Price cannot be negative - add validation"),
-        (r"if.*quantity.*<.*0", "Business: Quantity cannot be negative - add validation"),
-        (r"email.*@.*\..*", "Business: Email validation should use proper regex or library"),
-        (r"phone.*\d{10}", "Business: Phone validation too simplistic - consider international formats"),
-    ]
-    
-    # Domain-driven design patterns
-    ddd_patterns = [
-        (r"class.*Service.*\{", "DDD: Services should focus on domain logic, not data access"),
-        (r"def.*calculate.*total.*\(.*\).*:", "DDD: Business calculations should be in domain entities"),
-        (r"class.*Repository.*save.*business", "DDD: Repositories should not contain business logic"),
-    ]
-    
-    # Error handling in business logic
-    error_patterns = [
-        (r"try:.*business.*except.*pass", "Business: Empty exception handling can hide business rule violations"),
-        (r"if.*business.*:.*raise.*Exception\(", "Business: Use specific business exceptions instead of generic Exception"),
-    ]
+    for rule in RULES["business.logic.validation"].matching(content):
+        business_issues.append(f"✅ VALIDATION: {rule.description}")
     
-    for pattern, description in validation_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            business_issues.append(f"✅ VALIDATION: {description}")
+    for rule in RULES["business.logic.ddd"].matching(content):
+        business_issues.append(f"🏗️ ARCHITECTURE: {rule.description}")
     
-    for pattern, description in ddd_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            business_issues.append(f"🏗️ ARCHITECTURE: {description}")
-    
-    for pattern, description in error_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            business_issues.append(f"⚠️ ERROR HANDLING: {description}")
+    for rule in RULES["business.logic.errors"].matching(content):
+        business_issues.append(f"⚠️ ERROR HANDLING: {rule.description}")
     
     if len(business_issues) >= 3:
         return "MEDIUM", business_issues
@@ -128,15 +80,8 @@ def validate_requirements_coverage(content: str, file_path: str) -> tuple[str, l
             requirements_issues.append("🔗 TRACEABILITY: Add requirement IDs for traceability")
     
     # Check for incomplete implementations
-    incomplete_patterns = [
-        (r"NotImplementedError", "Implementation incomplete - NotImplementedError found"),
-        (r"pass\s*#.*implement", "Implementation incomplete - placeholder found"),
-        (r"raise.*NotImplemented", "Implementation incomplete - NotImplementedError raised"),
-    ]
-    
-    for pattern, description in incomplete_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            requirements_issues.append(f"⚠️ INCOMPLETE: {description}")
+    for rule in RULES["business.requirements.incomplete"].matching(content):
+        requirements_issues.append(f"⚠️ INCOMPLETE: {rule.description}")
     
     if len([issue for issue in requirements_issues if "INCOMPLETE" in issue]) >= 1:
         return "HIGH", requirements_issues
@@ -152,38 +97,14 @@ def check_product_compliance(content: str, file_path: str) -> tuple[str, list]:
     
     compliance_issues = []
     
-    # Feature flag patterns
-    feature_patterns = [
-        (r"if.*feature[_-]?flag", "FEATURE: Feature flag detected - ensure proper rollout strategy"),
-        (r"experiment.*enabled", "A/B TEST: Experiment code detected - ensure proper metrics tracking"),
-        (r"beta[_-]?feature", "BETA: Beta feature detected - ensure feedback collection"),
-    ]
-    
-    # User experience patterns  
-    ux_patterns = [
-        (r"loading.*true.*false.*true", "UX: Loading state flickering - improve user experience"),
-        (r"error.*message.*generic", "UX: Generic error messages - provide specific user guidance"),
-        (r"timeout.*30\d\d\d", "UX: Long timeout (>30s) - consider user experience impact"),
-    ]
-    
-    # Analytics and metrics
-    analytics_patterns = [
-        (r"track[_-]?event", "ANALYTICS: Event tracking found - ensure privacy compliance"),
-        (r"user[_-]?id.*log", "PRIVACY: User ID in logs - review data privacy requirements"),
-        (r"metrics.*user", "METRICS: User metrics collection - ensure consent obtained"),
-    ]
-    
-    for pattern, description in feature_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            compliance_issues.append(f"🚩 {description}")
+    for rule in RULES["business.product.features"].matching(content):
+        compliance_issues.append(f"🚩 {rule.description}")
     
-    for pattern, description in ux_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            compliance_issues.append(f"👥 {description}")
+    for rule in RULES["business.product.ux"].matching(content):
+        compliance_issues.append(f"👥 {rule.description}")
     
-    for pattern, description in analytics_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            compliance_issues.append(f"📊 {description}")
+    for rule in RULES["business.product.analytics"].matching(content):
+        compliance_issues.append(f"📊 {rule.description}")
     
     if len(compliance_issues) >= 2:
         return "MEDIUM", compliance_issues
@@ -227,12 +148,14 @@ def main():
         
         tool_name = input_data.get("tool_name", "")
         tool_input = input_data.get("tool_input", {})
+        # Edit/MultiEdit carry replacements, not content; scan the file as they would leave it
+        tool_input = HookUtils.resolve_edit(tool_name, tool_input)
         
         # Only process file operations
         if tool_name not in ["Write", "Edit", "MultiEdit", "Task"]:
             sys.exit(0)
         
-        file_path = tool_input.get("filePath", "")
+        file_path = HookUtils.tool_file_path(tool_input)
         content = tool_input.get("content", "")
         
         # Skip if no content
@@ -242,18 +165,21 @@ def main():
         work_status = WorkStatusManager(project_dir)
         orchestration = OrchestrationManager(project_dir)
         
-        # Check file locks
+        # Check file locks (with $CLAUDE_LOCK_WAIT set, queue for a held lock instead of refusing)
         if file_path:
-            is_locked, lock_info = work_status.is_file_locked(file_path)
+            is_locked, lock_info = work_status.check_write(file_path, HookUtils.lock_holder(input_data))
             if is_locked:
                 HookUtils.block_with_error(f"🔒 FILE LOCKED: {lock_info}")
         
-        # Business validation analysis
-        api_risk, api_issues = validate_api_design_standards(content, file_path)
-        business_risk, business_issues = check_business_logic_patterns(content, file_path)
-        req_risk, req_issues = validate_requirements_coverage(content, file_path)
-        compliance_risk, compliance_issues = check_product_compliance(content, file_path)
-        recommendations = get_business_recommendations(content, file_path)
+        # Business validation analysis (reused from the verdict cache when this content was already scanned)
+        (api_risk, api_issues), (business_risk, business_issues), (req_risk, req_issues), (compliance_risk, compliance_issues), recommendations = HookUtils.cached_scan(
+            __file__, file_path, content, lambda: (
+                validate_api_design_standards(content, file_path),
+                check_business_logic_patterns(content, file_path),
+                validate_requirements_coverage(content, file_path),
+                check_product_compliance(content, file_path),
+                get_business_recommendations(content, file_path),
+            ))
         
         # Determine overall risk
         all_risks = [api_risk, business_risk, req_risk, compliance_risk]
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Background renderer of WORK_STATUS.md and orchestration-index.md for one project
+Started by the first hook that schedules a render when none is running (see coordination_renderer.py),
+which hands it the renderer lock as --lock-fd; run by hand it takes the lock itself, or exits when
+another renderer holds it. Coalesces the changes of each --debounce window into one render and
+exits after --idle seconds without a change
+"""
+
+import argparse
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from coordination_renderer import IDLE_SECONDS, debounce_seconds, run_renderer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render a project's coordination files in the background")
+    parser.add_argument("project", help="Project directory")
+    parser.add_argument("--lock-fd", type=int, help="Renderer lock already taken by the parent")
+    parser.add_argument("--debounce", type=float, default=debounce_seconds(),
+                        help="Seconds of changes coalesced into one render ($CLAUDE_RENDER_DEBOUNCE)")
+    parser.add_argument("--idle", type=float, default=IDLE_SECONDS, help="Seconds without a change before exiting")
+    args = parser.parse_args()
+
+    if not Path(args.project).is_dir():
+        print(f"❌ No project directory {args.project}", file=sys.stderr)
+        sys.exit(1)
+    run_renderer(args.project, args.lock_fd, args.debounce, args.idle)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Concurrency-safe writes for the shared coordination files (WORK_STATUS.md, orchestration-index.md).
+Several agents' PostToolUse hooks fire at once, so every read-modify-write of one of these files
+runs under an advisory lock on a sidecar `<name>.lock` file in the project's state directory
+(STATE_DIR; fcntl.flock, msvcrt.locking on Windows) and commits by writing a temporary file beside it and os.replace()-ing it into place:
+no update is lost to a concurrent writer, and readers never see a half-written file.
+A lock that stays busy is retried with jittered exponential backoff for up to LOCK_TIMEOUT
+seconds, then FileLockTimeout is raised rather than writing unguarded.
+"""
+
+import os
+import stat
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Seconds to keep retrying a busy lock before giving up
+LOCK_TIMEOUT = 10.0
+
+# Backoff between attempts: doubles from BACKOFF_START up to BACKOFF_MAX, with jitter
+BACKOFF_START = 0.001
+BACKOFF_MAX = 0.05
+
+
+# Directory in the project holding all of the hooks' own state: the lock store, journals,
+# wake-up pipes and lock sidecars. session-init-hook.py gives it a .gitignore of its own
+STATE_DIR = Path(".claude", "state")
+
+
+class FileLockTimeout(TimeoutError):
+    """Another process held a coordination file's lock for longer than LOCK_TIMEOUT"""
+
+
+def state_dir(project_dir: Union[str, Path]) -> Path:
+    """The project's state directory"""
+    return Path(project_dir) / STATE_DIR
+
+
+def lock_path(path: Union[str, Path]) -> Path:
+    """The sidecar a file's lock is taken on (the file itself is swapped out by every commit): beside
+    it when it is state itself, else in the state directory of the file's directory"""
+    path = Path(path)
+    parts = path.parent.parts
+    if any(parts[index:index + len(STATE_DIR.parts)] == STATE_DIR.parts for index in range(len(parts))):
+        return path.with_name(f".{path.name}.lock")
+    return state_dir(path.parent) / f"{path.name}.lock"
+
+
+def _try_lock(handle) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(handle):
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path: Union[str, Path], timeout: float = LOCK_TIMEOUT) -> Iterator[None]:
+    """Hold the exclusive lock on path, retrying with backoff; raises FileLockTimeout"""
+    sidecar = lock_path(path)
+    sidecar.parent.mkdir(parents=True, exist_ok=True)
+    with open(sidecar, "a+b") as handle:
+        import random  # kept off the import path of hooks that never write a coordination file
+        deadline = time.monotonic() + timeout
+        delay = BACKOFF_START
+        while not _try_lock(handle):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise FileLockTimeout(f"{path} stayed locked for {timeout:.0f}s")
+            time.sleep(min(remaining, delay * random.uniform(0.5, 1.5)))
+            delay = min(delay * 2, BACKOFF_MAX)
+        try:
+            yield
+        finally:
+            _unlock(handle)
+
+
+def atomic_write(path: Union[str, Path], content: str):
+    """Replace path with content in one step, keeping its permissions"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    import random
+    temp = path.with_name(f".{path.name}.{os.getpid()}.{random.getrandbits(32):08x}.tmp")
+    try:
+        with open(temp, "x", encoding="utf-8") as f:
+            f.write(content)
+        try:
+            os.chmod(temp, stat.S_IMODE(path.stat().st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(temp, path)
+    except BaseException:
+        try:
+            os.unlink(temp)
+        except OSError:
+            pass
+        raise
+
+
+def read_text(path: Union[str, Path]) -> str:
+    """Current content of path, "" when it does not exist yet"""
+    try:
+        return Path(path).read_text(encoding="utf-8", errors="replace")
+    except FileNotFoundError:
+        return ""
+
+
+def update_file(path: Union[str, Path], transform: Callable[[str], str]) -> str:
+    """Read path, apply transform and commit the result atomically, all under the file's lock"""
+    with file_lock(path):
+        current = read_text(path)
+        content = transform(current)
+        if content != current or not Path(path).exists():
+            atomic_write(path, content)
+        return content
+
+
+def append_file(path: Union[str, Path], content: str):
+    """Append content under the file's lock"""
+    with file_lock(path):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(content)
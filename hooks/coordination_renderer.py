@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Debounced background rendering of WORK_STATUS.md and orchestration-index.md.
+A hook that changed the lock store or the orchestration log only schedules a render: it marks
+one pending in RENDER_DIR and writes a byte to the renderer's named pipe, then returns. The
+renderer (coordination-renderer.py, one per project, started by the first hook that finds none
+and holding RENDER_DIR's lock while it runs) waits out the debounce window after a wake-up, so
+every change made inside it lands in a single render of both files. It exits after IDLE_SECONDS
+without a change. flush() renders now, once the renderer has finished what it was doing and
+stopped. Where named pipes or flock are missing (Windows), or $CLAUDE_RENDER_DEBOUNCE is 0,
+schedule_render() returns False and the caller renders synchronously as before.
+"""
+
+import os
+import select
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no background renderer
+    fcntl = None
+
+# Directory in the project's state directory holding the renderer's wake-up pipe, lock and pending marker
+RENDER_DIR = "render"
+WAKE_NAME = "wake"
+LOCK_NAME = "renderer.lock"
+PENDING_NAME = "pending"
+
+# Seconds of changes coalesced into one render when $CLAUDE_RENDER_DEBOUNCE does not say; 0 renders synchronously
+DEBOUNCE_SECONDS = 0.5
+
+# Seconds the renderer waits for a change before exiting
+IDLE_SECONDS = 60.0
+
+# Seconds flush() waits for a running renderer to stop before rendering anyway
+FLUSH_TIMEOUT = 10.0
+
+# Written to the pipe: a change to render after the debounce, or a flush (render now, then exit)
+WAKE = b"!"
+STOP = b"."
+
+RENDERER_SCRIPT = Path(__file__).parent / "coordination-renderer.py"
+
+
+def debounce_seconds() -> float:
+    """How long the renderer coalesces changes, from $CLAUDE_RENDER_DEBOUNCE"""
+    try:
+        return max(0.0, float(os.environ.get("CLAUDE_RENDER_DEBOUNCE", DEBOUNCE_SECONDS)))
+    except ValueError:
+        return DEBOUNCE_SECONDS
+
+
+def _directory(project_dir: str) -> Path:
+    from coordination_files import state_dir  # off the dispatcher's import path
+    return state_dir(project_dir) / RENDER_DIR
+
+
+def _send(directory: Path, message: bytes) -> bool:
+    """Write message to the renderer's pipe; False when no renderer has it open"""
+    try:
+        fd = os.open(directory / WAKE_NAME, os.O_WRONLY | os.O_NONBLOCK)
+    except OSError:
+        return False  # ENXIO: nobody reading; ENOENT: no renderer ever ran
+    try:
+        os.write(fd, message)
+    except BlockingIOError:
+        pass  # the pipe is full of wake-ups already
+    except OSError:
+        return False
+    finally:
+        os.close(fd)
+    return True
+
+
+def _try_lock(directory: Path) -> Optional[int]:
+    """The renderer lock's descriptor if it was free, else None"""
+    fd = os.open(directory / LOCK_NAME, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def schedule_render(project_dir: str) -> bool:
+    """Have both files rendered in the background after the debounce; False if the caller must render itself"""
+    if fcntl is None or not hasattr(os, "mkfifo") or debounce_seconds() <= 0:
+        return False
+    directory = _directory(project_dir)
+    pending = directory / PENDING_NAME
+    try:
+        # Marked before the wake-up: a renderer about to exit for idleness looks here once more
+        if not pending.exists():
+            directory.mkdir(parents=True, exist_ok=True)
+            os.close(os.open(pending, os.O_WRONLY | os.O_CREAT, 0o644))
+        if _send(directory, WAKE):
+            return True
+        lock = _try_lock(directory)
+        if lock is None:
+            return True  # a renderer is starting or exiting, and finds the mark
+        import subprocess  # only the hook that starts a renderer pays for the import
+        try:
+            subprocess.Popen([sys.executable, str(RENDERER_SCRIPT), project_dir, "--lock-fd", str(lock)],
+                             pass_fds=(lock,), start_new_session=True, stdin=subprocess.DEVNULL,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        finally:
+            os.close(lock)  # the renderer holds it now
+    except OSError:
+        return False
+    return True
+
+
+def render_pending(project_dir: str) -> bool:
+    """Whether a scheduled render has not started yet"""
+    return (_directory(project_dir) / PENDING_NAME).exists()
+
+
+def render(project_dir: str):
+    """Render WORK_STATUS.md from the lock store, and orchestration-index.md if the project has one"""
+    from hook_utils import OrchestrationManager, WorkStatusManager
+    WorkStatusManager(project_dir).render()
+    orchestration = OrchestrationManager(project_dir)
+    if orchestration.file_path.exists() or orchestration.log.directory.exists():
+        orchestration.materialize()
+
+
+def flush(project_dir: str, timeout: float = FLUSH_TIMEOUT):
+    """Stop the background renderer once its render is done, then render both files now"""
+    directory = _directory(project_dir)
+    if fcntl is not None and directory.exists():
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            lock = _try_lock(directory)
+            if lock is not None:
+                os.close(lock)
+                break
+            _send(directory, STOP)
+            time.sleep(0.01)
+    try:
+        (directory / PENDING_NAME).unlink()
+    except FileNotFoundError:
+        pass
+    render(project_dir)
+
+
+def _drain(fd: int) -> bytes:
+    data = b""
+    while True:
+        try:
+            chunk = os.read(fd, 4096)
+        except BlockingIOError:
+            return data
+        if not chunk:
+            return data
+        data += chunk
+
+
+def _serve(project_dir: str, wake: int, debounce: float, idle: float) -> bool:
+    """Render after each wake-up's debounce until idle seconds pass without one; True when told to stop"""
+    pending = _directory(project_dir) / PENDING_NAME
+    woken = True  # whoever started the renderer has a change waiting
+    while True:
+        if not woken and not select.select([wake], [], [], idle)[0]:
+            return False
+        woken = False
+        received = _drain(wake)
+        # Wait out the debounce, taking in the wake-ups it coalesces; a flush cuts it short
+        deadline = time.monotonic() + debounce
+        while STOP not in received:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([wake], [], [], remaining)[0]:
+                break
+            received += _drain(wake)
+        # Cleared before reading the store: a change committed after this marks it again
+        try:
+            pending.unlink()
+        except FileNotFoundError:
+            pass
+        if not Path(project_dir).is_dir():
+            return True
+        try:
+            render(project_dir)
+        except Exception as e:
+            print(f"Render failed: {e}", file=sys.stderr)
+        if STOP in received:
+            return True
+
+
+def run_renderer(project_dir: str, lock: Optional[int] = None, debounce: Optional[float] = None,
+                 idle: float = IDLE_SECONDS):
+    """Serve render requests for a project until it goes idle, holding the renderer lock (taken here if not handed over)"""
+    directory = _directory(project_dir)
+    debounce = debounce_seconds() if debounce is None else debounce
+    if lock is None:
+        directory.mkdir(parents=True, exist_ok=True)
+        lock = _try_lock(directory)
+        if lock is None:
+            return  # one is running already
+    while True:
+        try:
+            os.mkfifo(directory / WAKE_NAME, 0o600)
+        except FileExistsError:
+            pass
+        # Read-write, so the pipe always has a writer and select() never reports a spurious EOF
+        wake = os.open(directory / WAKE_NAME, os.O_RDWR | os.O_NONBLOCK)
+        try:
+            stopped = _serve(project_dir, wake, debounce, idle)
+        finally:
+            # Closed before the lock is let go: from here a hook's wake-up fails and it takes the lock itself
+            os.close(wake)
+            os.close(lock)
+        if stopped or not (directory / PENDING_NAME).exists():
+            return
+        # A change marked while this renderer was going: serve it, unless a new renderer already does
+        lock = _try_lock(directory)
+        if lock is None:
+            return
@@ -11,43 +11,17 @@ import re
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 from hook_utils import HookUtils, WorkStatusManager, OrchestrationManager
+from rule_registry import load_rule_pack
+
+RULES = load_rule_pack()
 
 def check_data_quality_patterns(content: str, file_path: str) -> tuple[str, list]:
     """Check for data quality and validation issues"""
     
     data_issues = []
     
-    # Data loading patterns
-    loading_patterns = [
-        (r'pd\.read_csv\([^)]*\)(?!.*na_values)', "Pandas: read_csv without na_values - missing data handling"),
-        (r'pd\.read_csv\([^)]*\)(?!.*dtype)', "Pandas: read_csv without dtype specification - memory inefficiency"),
-        (r'\.dropna\(\)(?!.*subset)', "Pandas: dropna() without subset - may remove too much data"),
-        (r'\.fillna\(0\)(?!.*method)', "Pandas: fillna(0) without method - may introduce bias"),
-        (r'df\[.*\]\.values(?!.*copy)', "Pandas: .values without copy() - may cause view issues"),
-    ]
-    
-    # Data validation patterns
-    validation_patterns = [
-        (r'df\.shape(?!.*print|.*log)', "Data: Checking shape without logging - missing data validation"),
-        (r'df\.head\(\)(?!.*print|.*display)', "Data: head() without display - missing data inspection"),
-        (r'df\.isnull\(\)(?!.*sum|.*any)', "Data: isnull() without aggregation - incomplete null check"),
-        (r'df\.duplicated\(\)(?!.*sum|.*any)', "Data: duplicated() without aggregation - incomplete duplicate check"),
-        (r'df.*==.*df.*(?!.*all|.*any)', "Data: DataFrame comparison without all()/any() - boolean array"),
-    ]
-    
-    # Statistical patterns
-    stats_patterns = [
-        (r'\.mean\(\)(?!.*axis)', "Stats: mean() without axis specification - may aggregate incorrectly"),
-        (r'np\.random\.seed\(\d+\)(?!.*reproducib)', "Random: Fixed seed without documentation - reproducibility concern"),
-        (r'train_test_split(?!.*random_state)', "ML: train_test_split without random_state - not reproducible"),
-        (r'\.sample\((?!.*random_state)', "Sampling: sample() without random_state - not reproducible"),
-    ]
-    
-    all_patterns = loading_patterns + validation_patterns + stats_patterns
-    
-    for pattern, description in all_patterns:
-        if re.search(pattern, content):
-            data_issues.append(f"📊 {description}")
+    for rule in RULES["data_ai.data_quality"].matching(content):
+        data_issues.append(f"📊 {rule.description}")
     
     if len(data_issues) >= 4:
         return "MEDIUM", data_issues
@@ -61,36 +35,8 @@ def check_ml_model_patterns(content: str, file_path: str) -> tuple[str, list]:
     
     ml_issues = []
     
-    # Model training patterns
-    training_patterns = [
-        (r'\.fit\(X.*y\)(?!.*validation)', "ML: fit() without validation - no overfitting check"),
-        (r'GridSearchCV(?!.*cv=)', "ML: GridSearchCV without explicit CV - default may not be appropriate"),
-        (r'RandomForestClassifier\(\)(?!.*n_estimators)', "ML: RandomForest without n_estimators - using default"),
-        (r'\.predict\((?!.*reshape|.*values)', "ML: predict() on raw data - may need preprocessing"),
-        (r'accuracy_score(?!.*average)', "ML: accuracy_score without average parameter for multiclass"),
-    ]
-    
-    # Feature engineering patterns
-    feature_patterns = [
-        (r'StandardScaler\(\)\.fit_transform\(X\)(?!.*train)', "ML: StandardScaler on full dataset - data leakage"),
-        (r'LabelEncoder\(\)\.fit_transform(?!.*train)', "ML: LabelEncoder on full dataset - data leakage"),
-        (r'df\.get_dummies\((?!.*drop_first)', "ML: get_dummies without drop_first - multicollinearity"),
-        (r'from sklearn\.preprocessing import \*', "ML: Wildcard sklearn imports - namespace pollution"),
-    ]
-    
-    # Model evaluation patterns
-    evaluation_patterns = [
-        (r'\.score\(X.*y\)(?!.*cross_val)', "ML: model.score() without cross-validation - single metric"),
-        (r'confusion_matrix(?!.*normalize)', "ML: confusion_matrix without normalization - hard to interpret"),
-        (r'classification_report(?!.*target_names)', "ML: classification_report without target_names"),
-        (r'roc_auc_score(?!.*multi_class)', "ML: roc_auc_score for multiclass without multi_class parameter"),
-    ]
-    
-    all_ml_patterns = training_patterns + feature_patterns + evaluation_patterns
-    
-    for pattern, description in all_ml_patterns:
-        if re.search(pattern, content):
-            ml_issues.append(f"🤖 {description}")
+    for rule in RULES["data_ai.ml_model"].matching(content):
+        ml_issues.append(f"🤖 {rule.description}")
     
     if len(ml_issues) >= 3:
         return "MEDIUM", ml_issues
@@ -104,32 +50,8 @@ def check_data_leakage_patterns(content: str, file_path: str) -> tuple[str, list
     
     leakage_issues = []
     
-    # Time series leakage
-    time_patterns = [
-        (r'train_test_split.*shuffle=True.*time|date', "LEAKAGE: Shuffling time series data - future information leak"),
-        (r'\.sort_values.*train_test_split(?!.*shuffle=False)', "LEAKAGE: Sorting before split without shuffle=False"),
-        (r'pd\.to_datetime.*train_test_split.*shuffle=True', "LEAKAGE: Time data with shuffle=True - temporal order lost"),
-    ]
-    
-    # Target leakage
-    target_patterns = [
-        (r'X.*=.*df.*y.*=.*df.*X.*y', "LEAKAGE: Features include target variable"),
-        (r'StandardScaler.*fit.*X.*y.*transform.*X_test', "LEAKAGE: Scaler fitted on target - indirect information"),
-        (r'df\.corr\(\).*target.*\.drop.*target', "LEAKAGE: Feature selection using target correlation on full dataset"),
-    ]
-    
-    # Cross-validation leakage
-    cv_patterns = [
-        (r'cross_val_score.*StandardScaler.*fit_transform', "LEAKAGE: Preprocessing before CV - information leak"),
-        (r'SelectKBest.*fit.*cross_val_score', "LEAKAGE: Feature selection before CV - selection bias"),
-        (r'SMOTE.*fit_resample.*cross_val_score', "LEAKAGE: SMOTE before CV - data generation bias"),
-    ]
-    
-    all_leakage = time_patterns + target_patterns + cv_patterns
-    
-    for pattern, description in all_leakage:
-        if re.search(pattern, content):
-            leakage_issues.append(f"🔐 {description}")
+    for rule in RULES["data_ai.leakage"].matching(content):
+        leakage_issues.append(f"🔐 {rule.description}")
     
     if len(leakage_issues) >= 1:
         return "HIGH", leakage_issues
@@ -141,33 +63,8 @@ def check_data_privacy_patterns(content: str, file_path: str) -> tuple[str, list
     
     privacy_issues = []
     
-    # PII patterns
-    pii_patterns = [
-        (r'df.*name.*email.*phone', "PRIVACY: PII columns detected - ensure anonymization"),
-        (r'social.*security|ssn', "PRIVACY: SSN data detected - high sensitivity"),
-        (r'credit.*card|payment.*info', "PRIVACY: Payment data detected - PCI compliance required"),
-        (r'medical.*record|health.*data', "PRIVACY: Health data detected - HIPAA compliance required"),
-    ]
-    
-    # Data export patterns
-    export_patterns = [
-        (r'\.to_csv\(.*personal|\.to_excel\(.*personal', "PRIVACY: Exporting personal data - review data handling"),
-        (r'plt\.savefig.*personal|sns\..*personal', "PRIVACY: Visualizing personal data - anonymize before plotting"),
-        (r'print\(df.*personal\)|display\(df.*personal\)', "PRIVACY: Displaying personal data - potential exposure"),
-    ]
-    
-    # Bias patterns
-    bias_patterns = [
-        (r'gender.*==.*male.*female', "ETHICS: Gender binary assumption - consider inclusivity"),
-        (r'race.*ethnicity.*model', "ETHICS: Race/ethnicity features - potential discrimination"),
-        (r'age.*>\s*\d+.*reject|age.*<\s*\d+.*reject', "ETHICS: Age-based filtering - potential age discrimination"),
-    ]
-    
-    all_privacy = pii_patterns + export_patterns + bias_patterns
-    
-    for pattern, description in all_privacy:
-        if re.search(pattern, content, re.IGNORECASE):
-            privacy_issues.append(f"🔒 {description}")
+    for rule in RULES["data_ai.privacy"].matching(content):
+        privacy_issues.append(f"🔒 {rule.description}")
     
     if len(privacy_issues) >= 2:
         return "HIGH", privacy_issues
@@ -181,34 +78,8 @@ def check_performance_patterns(content: str, file_path: str) -> tuple[str, list]
     
     performance_issues = []
     
-    # Pandas performance patterns
-    pandas_perf = [
-        (r'for.*in.*df\.iterrows\(\)', "PERFORMANCE: iterrows() is slow - use vectorized operations or itertuples()"),
-        (r'df\.apply.*lambda.*axis=1', "PERFORMANCE: apply with lambda on rows - slow for large datasets"),
-        (r'pd\.concat.*for.*in.*loop', "PERFORMANCE: concat in loop - collect then concat once"),
-        (r'df\[df\[.*\] == .*\]\[df\[.*\] == .*\]', "PERFORMANCE: Multiple boolean indexing - combine conditions"),
-        (r'df\.groupby.*\.apply.*lambda', "PERFORMANCE: groupby.apply with lambda - consider agg() or transform()"),
-    ]
-    
-    # NumPy performance patterns
-    numpy_perf = [
-        (r'for.*in.*range.*arr\[i\]', "PERFORMANCE: Manual array iteration - use vectorized operations"),
-        (r'np\.append.*for.*in', "PERFORMANCE: np.append in loop - preallocate array"),
-        (r'list\(arr\).*for.*in', "PERFORMANCE: Converting array to list in loop - unnecessary overhead"),
-    ]
-    
-    # Memory patterns
-    memory_patterns = [
-        (r'df\.copy\(\)(?!.*deep=False)', "MEMORY: Deep copy without necessity - memory usage"),
-        (r'pd\.read_csv.*chunksize(?!.*iterator)', "MEMORY: chunksize without iterator - not processing chunks"),
-        (r'np\.zeros\(\d{6,}\)', "MEMORY: Large array allocation - consider memory constraints"),
-    ]
-    
-    all_perf = pandas_perf + numpy_perf + memory_patterns
-    
-    for pattern, description in all_perf:
-        if re.search(pattern, content):
-            performance_issues.append(f"⚡ {description}")
+    for rule in RULES["data_ai.performance"].matching(content):
+        performance_issues.append(f"⚡ {rule.description}")
     
     if len(performance_issues) >= 3:
         return "MEDIUM", performance_issues
@@ -255,12 +126,14 @@ def main():
         
         tool_name = input_data.get("tool_name", "")
         tool_input = input_data.get("tool_input", {})
+        # Edit/MultiEdit carry replacements, not content; scan the file as they would leave it
+        tool_input = HookUtils.resolve_edit(tool_name, tool_input)
         
         # Only process file operations
         if tool_name not in ["Write", "Edit", "MultiEdit", "Task"]:
             sys.exit(0)
         
-        file_path = tool_input.get("filePath", "")
+        file_path = HookUtils.tool_file_path(tool_input)
         content = tool_input.get("content", "")
         
         # Skip if no content
@@ -277,19 +150,22 @@ def main():
         work_status = WorkStatusManager(project_dir)
         orchestration = OrchestrationManager(project_dir)
         
-        # Check file locks
+        # Check file locks (with $CLAUDE_LOCK_WAIT set, queue for a held lock instead of refusing)
         if file_path:
-            is_locked, lock_info = work_status.is_file_locked(file_path)
+            is_locked, lock_info = work_status.check_write(file_path, HookUtils.lock_holder(input_data))
             if is_locked:
                 HookUtils.block_with_error(f"🔒 FILE LOCKED: {lock_info}")
         
-        # Data science analysis
-        data_risk, data_issues = check_data_quality_patterns(content, file_path)
-        ml_risk, ml_issues = check_ml_model_patterns(content, file_path)
-        leakage_risk, leakage_issues = check_data_leakage_patterns(content, file_path)
-        privacy_risk, privacy_issues = check_data_privacy_patterns(content, file_path)
-        perf_risk, perf_issues = check_performance_patterns(content, file_path)
-        recommendations = get_data_science_recommendations(content, file_path)
+        # Data science analysis (reused from the verdict cache when this content was already scanned)
+        (data_risk, data_issues), (ml_risk, ml_issues), (leakage_risk, leakage_issues), (privacy_risk, privacy_issues), (perf_risk, perf_issues), recommendations = HookUtils.cached_scan(
+            __file__, file_path, content, lambda: (
+                check_data_quality_patterns(content, file_path),
+                check_ml_model_patterns(content, file_path),
+                check_data_leakage_patterns(content, file_path),
+                check_data_privacy_patterns(content, file_path),
+                check_performance_patterns(content, file_path),
+                get_data_science_recommendations(content, file_path),
+            ))
         
         # Determine overall risk
         all_risks = [data_risk, ml_risk, leakage_risk, privacy_risk, perf_risk]
@@ -11,44 +11,25 @@ import re
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 from hook_utils import HookUtils, WorkStatusManager, OrchestrationManager
+from rule_registry import load_rule_pack
+
+RULES = load_rule_pack()
 
 def detect_sql_injection_risks(content: str, file_path: str) -> tuple[str, list]:
     """Detect SQL injection vulnerabilities"""
     
     vulnerabilities = []
     
-    # High-risk SQL injection patterns
-    high_risk_patterns = [
-        (r"SELECT.*\+.*input\(", "SQL injection via string concatenation with user input"),
-        (r"INSERT.*\+.*input\(", "SQL injection in INSERT statement"),
-        (r"UPDATE.*\+.*input\(", "SQL injection in UPDATE statement"),
-        (r"DELETE.*\+.*input\(", "SQL injection in DELETE statement"),
-        (r"WHERE.*\+.*input\(", "SQL injection in WHERE clause"),
-        (r"execute\s*\(\s*['\"].*\+", "SQL injection via execute() with concatenation"),
-        (r"query\s*\(\s*['\"].*\+", "SQL injection via query() with concatenation"),
-        (r"f['\"].*\{.*input\(.*\}.*['\"].*execute", "SQL injection via f-string with user input"),
-        (r"%s.*format.*input\(", "SQL injection via string formatting"),
-    ]
-    
-    # Medium-risk patterns
-    medium_risk_patterns = [
-        (r"ORDER BY.*\+", "Potential SQL injection in ORDER BY clause"),
-        (r"LIMIT.*\+", "Potential SQL injection in LIMIT clause"),
-        (r"raw\(\s*['\"].*\+", "Raw SQL with concatenation"),
-        (r"\.sql\s*=.*\+", "SQL property assignment with concatenation"),
-    ]
+    high_risk = RULES["database.injection.high"].matching(content)
+    for rule in high_risk:
+        vulnerabilities.append(f"🚨 HIGH RISK: {rule.description}")
     
-    for pattern, description in high_risk_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            vulnerabilities.append(f"🚨 HIGH RISK: {description}")
-    
-    for pattern, description in medium_risk_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            vulnerabilities.append(f"⚠️ MEDIUM RISK: {description}")
+    for rule in RULES["database.injection.medium"].matching(content):
+        vulnerabilities.append(f"⚠️ MEDIUM RISK: {rule.description}")
     
     # Check for parameterized queries (good practice)
     has_parameterized = bool(re.search(r"\?|%s|\$\d+|:[\w]+", content))
-    if not has_parameterized and any(re.search(pat, content, re.IGNORECASE) for pat, _ in high_risk_patterns):
+    if not has_parameterized and high_risk:
         vulnerabilities.append("💡 RECOMMENDATION: Use parameterized queries instead of string concatenation")
     
     if len([v for v in vulnerabilities if "HIGH RISK" in v]) >= 1:
@@ -65,43 +46,14 @@ def check_dangerous_database_operations(content: str, file_path: str) -> tuple[s
     
     dangerous_ops = []
     
-    # Schema-altering operations
-    schema_patterns = [
-        (r"DROP\s+TABLE", "DROP TABLE - permanent data loss risk"),
-        (r"DROP\s+DATABASE", "DROP DATABASE - catastrophic data loss risk"),
-        (r"TRUNCATE", "TRUNCATE - all data deletion risk"),
-        (r"DELETE\s+FROM.*WHERE", "DELETE operation - verify WHERE clause"),
-        (r"ALTER\s+TABLE.*DROP", "ALTER TABLE DROP - column/data loss risk"),
-        (r"UPDATE.*WHERE", "UPDATE operation - verify WHERE clause scope"),
-    ]
-    
-    # Privilege escalation
-    privilege_patterns = [
-        (r"GRANT\s+ALL", "GRANT ALL privileges - excessive permissions"),
-        (r"GRANT.*SUPER", "SUPER privilege grant - administrative access"),
-        (r"CREATE\s+USER.*IDENTIFIED\s+BY\s*['\"][^'\"]*['\"]", "Hardcoded password in user creation"),
-        (r"ALTER\s+USER.*PASSWORD", "Password change operation"),
-    ]
+    for rule in RULES["database.dangerous.schema"].matching(content):
+        dangerous_ops.append(f"🗂️ SCHEMA: {rule.description}")
     
-    # Mass operations
-    mass_op_patterns = [
-        (r"DELETE\s+FROM\s+\w+\s*;", "DELETE without WHERE - all records deletion"),
-        (r"UPDATE\s+\w+\s+SET.*[^WHERE]", "UPDATE without WHERE - all records modification"),
-        (r"INSERT.*SELECT.*FROM", "Mass INSERT operation"),
-        (r"LOAD\s+DATA", "LOAD DATA operation - bulk import"),
-    ]
+    for rule in RULES["database.dangerous.privileges"].matching(content):
+        dangerous_ops.append(f"🔑 PRIVILEGE: {rule.description}")
     
-    for pattern, description in schema_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            dangerous_ops.append(f"🗂️ SCHEMA: {description}")
-    
-    for pattern, description in privilege_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            dangerous_ops.append(f"🔑 PRIVILEGE: {description}")
-    
-    for pattern, description in mass_op_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            dangerous_ops.append(f"⚡ MASS OP: {description}")
+    for rule in RULES["database.dangerous.mass_operations"].matching(content):
+        dangerous_ops.append(f"⚡ MASS OP: {rule.description}")
     
     # Determine risk level based on operation types
     schema_ops = len([op for op in dangerous_ops if "SCHEMA:" in op])
@@ -158,17 +110,8 @@ def validate_database_schema_changes(content: str, file_path: str) -> tuple[str,
     schema_issues = []
     
     # Check for migration patterns
-    migration_patterns = [
-        (r"ADD\s+COLUMN.*NOT\s+NULL", "Adding NOT NULL column without default - may fail on existing data"),
-        (r"ALTER.*COLUMN.*TYPE", "Column type change - potential data loss"),
-        (r"DROP\s+COLUMN", "Column drop - permanent data loss"),
-        (r"ADD.*UNIQUE", "Adding unique constraint - may fail if duplicates exist"),
-        (r"ADD.*FOREIGN\s+KEY", "Adding foreign key - may fail if referential integrity violated"),
-    ]
-    
-    for pattern, description in migration_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            schema_issues.append(f"📋 MIGRATION: {description}")
+    for rule in RULES["database.migrations"].matching(content):
+        schema_issues.append(f"📋 MIGRATION: {rule.description}")
     
     # Check for data migration scripts
     if re.search(r"INSERT.*SELECT", content, re.IGNORECASE) and len(schema_issues) > 0:
@@ -188,12 +131,14 @@ def main():
         
         tool_name = input_data.get("tool_name", "")
         tool_input = input_data.get("tool_input", {})
+        # Edit/MultiEdit carry replacements, not content; scan the file as they would leave it
+        tool_input = HookUtils.resolve_edit(tool_name, tool_input)
         
         # Only process file operations that might contain database code
         if tool_name not in ["Write", "Edit", "MultiEdit", "Task"]:
             sys.exit(0)
         
-        file_path = tool_input.get("filePath", "")
+        file_path = HookUtils.tool_file_path(tool_input)
         content = tool_input.get("content", "")
         
         # Skip if no content or not database-related
@@ -208,17 +153,20 @@ def main():
         work_status = WorkStatusManager(project_dir)
         orchestration = OrchestrationManager(project_dir)
         
-        # Check file locks
+        # Check file locks (with $CLAUDE_LOCK_WAIT set, queue for a held lock instead of refusing)
         if file_path:
-            is_locked, lock_info = work_status.is_file_locked(file_path)
+            is_locked, lock_info = work_status.check_write(file_path, HookUtils.lock_holder(input_data))
             if is_locked:
                 HookUtils.block_with_error(f"🔒 FILE LOCKED: {lock_info}")
         
-        # Database security analysis
-        injection_risk, injection_issues = detect_sql_injection_risks(content, file_path)
-        dangerous_risk, dangerous_ops = check_dangerous_database_operations(content, file_path)
-        schema_risk, schema_issues = validate_database_schema_changes(content, file_path)
-        recommendations = check_database_best_practices(content, file_path)
+        # Database security analysis (reused from the verdict cache when this content was already scanned)
+        (injection_risk, injection_issues), (dangerous_risk, dangerous_ops), (schema_risk, schema_issues), recommendations = HookUtils.cached_scan(
+            __file__, file_path, content, lambda: (
+                detect_sql_injection_risks(content, file_path),
+                check_dangerous_database_operations(content, file_path),
+                validate_database_schema_changes(content, file_path),
+                check_database_best_practices(content, file_path),
+            ))
         
         # Determine overall risk
         all_risks = [injection_risk, dangerous_risk, schema_risk]
@@ -7,17 +7,19 @@ Validates frontend frameworks, dependencies, build processes, and accessibility
 import json
 import sys
 import os
-import re
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 from hook_utils import HookUtils, WorkStatusManager, OrchestrationManager
+from rule_registry import load_rule_pack
+
+RULES = load_rule_pack()
 
 def validate_frontend_environment(project_dir: str, tool_input: dict) -> tuple[bool, str]:
     """Validate frontend project structure and dependencies"""
     
     # Check for package.json
     if not HookUtils.file_exists(project_dir, "package.json"):
-        file_path = tool_input.get("filePath", "")
+        file_path = HookUtils.tool_file_path(tool_input)
         if any(ext in file_path for ext in [".js", ".jsx", ".ts", ".tsx", ".vue"]):
             return False, "🌐 FRONTEND PROJECT: Missing package.json for JavaScript/TypeScript project"
     
@@ -36,7 +38,7 @@ def check_accessibility_compliance(tool_input: dict) -> tuple[str, list]:
     """Check for accessibility issues in frontend code"""
     
     content = tool_input.get("content", "")
-    file_path = tool_input.get("filePath", "")
+    file_path = HookUtils.tool_file_path(tool_input)
     
     if not any(ext in file_path for ext in [".jsx", ".tsx", ".vue", ".html"]):
         return "LOW", []
@@ -44,17 +46,8 @@ def check_accessibility_compliance(tool_input: dict) -> tuple[str, list]:
     accessibility_issues = []
     
     # Check for common accessibility issues
-    a11y_patterns = [
-        (r"<img(?![^>]*alt=)", "Images without alt attributes"),
-        (r"<button(?![^>]*aria-label)(?![^>]*>.*</button>)", "Buttons without accessible labels"),
-        (r"<input(?![^>]*aria-label)(?![^>]*id=)", "Form inputs without labels"),
-        (r"onClick.*div|onClick.*span", "Non-interactive elements with click handlers"),
-        (r"style.*color.*#[0-9a-fA-F]{6}.*background.*#[0-9a-fA-F]{6}", "Potential color contrast issues"),
-    ]
-    
-    for pattern, issue in a11y_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            accessibility_issues.append(issue)
+    for rule in RULES["frontend.accessibility"].matching(content):
+        accessibility_issues.append(rule.description)
     
     if len(accessibility_issues) >= 3:
         return "HIGH", accessibility_issues
@@ -67,7 +60,7 @@ def check_frontend_security(tool_input: dict) -> tuple[str, list]:
     """Check for frontend security issues"""
     
     content = tool_input.get("content", "")
-    file_path = tool_input.get("filePath", "")
+    file_path = HookUtils.tool_file_path(tool_input)
     
     if not any(ext in file_path for ext in [".js", ".jsx", ".ts", ".tsx", ".vue"]):
         return "LOW", []
@@ -75,18 +68,8 @@ def check_frontend_security(tool_input: dict) -> tuple[str, list]:
     security_issues = []
     
     # Check for security vulnerabilities
-    security_patterns = [
-        (r"innerHTML\s*=", "innerHTML usage - XSS risk"),
-        (r"dangerouslySetInnerHTML", "dangerouslySetInnerHTML usage - XSS risk"),
-        (r"eval\s*\(", "eval() usage - code injection risk"),
-        (r"document\.write\s*\(", "document.write() usage - security risk"),
-        (r"window\.location\s*=.*\+", "Dynamic window.location - open redirect risk"),
-        (r"localStorage\.setItem.*token|sessionStorage\.setItem.*token", "Token storage in localStorage - security risk"),
-    ]
-    
-    for pattern, issue in security_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            security_issues.append(issue)
+    for rule in RULES["frontend.security"].matching(content):
+        security_issues.append(rule.description)
     
     if len(security_issues) >= 2:
         return "HIGH", security_issues
@@ -99,21 +82,13 @@ def check_performance_issues(tool_input: dict) -> tuple[str, list]:
     """Check for frontend performance issues"""
     
     content = tool_input.get("content", "")
-    file_path = tool_input.get("filePath", "")
+    file_path = HookUtils.tool_file_path(tool_input)
     
     performance_issues = []
     
     # Check for performance anti-patterns
-    perf_patterns = [
-        (r"useEffect\s*\(\s*[^,]*,\s*\[\s*\]", "useEffect with empty dependency array - consider optimization"),
-        (r"useState\s*\(\s*.*\.map\(", "useState with map operation - consider useMemo"),
-        (r"\.map\s*\([^)]*\)\s*\.map\s*\(", "Chained map operations - performance concern"),
-        (r"document\.querySelector.*loop|for.*document\.querySelector", "DOM queries in loops"),
-    ]
-    
-    for pattern, issue in perf_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            performance_issues.append(issue)
+    for rule in RULES["frontend.performance"].matching(content):
+        performance_issues.append(rule.description)
     
     if len(performance_issues) >= 2:
         return "MEDIUM", performance_issues
@@ -129,13 +104,15 @@ def main():
         
         tool_name = input_data.get("tool_name", "")
         tool_input = input_data.get("tool_input", {})
+        # Edit/MultiEdit carry replacements, not content; scan the file as they would leave it
+        tool_input = HookUtils.resolve_edit(tool_name, tool_input)
         
         # Only process frontend-related tools
         if tool_name not in ["Write", "Edit", "MultiEdit", "Task"]:
             sys.exit(0)
         
         # Check if this is frontend-related
-        file_path = tool_input.get("filePath", "")
+        file_path = HookUtils.tool_file_path(tool_input)
         frontend_extensions = [".js", ".jsx", ".ts", ".tsx", ".vue", ".html", ".css", ".scss", ".json"]
         if file_path and not any(ext in file_path for ext in frontend_extensions):
             sys.exit(0)
@@ -143,9 +120,9 @@ def main():
         work_status = WorkStatusManager(project_dir)
         orchestration = OrchestrationManager(project_dir)
         
-        # Check file locks
+        # Check file locks (with $CLAUDE_LOCK_WAIT set, queue for a held lock instead of refusing)
         if file_path:
-            is_locked, lock_info = work_status.is_file_locked(file_path)
+            is_locked, lock_info = work_status.check_write(file_path, HookUtils.lock_holder(input_data))
             if is_locked:
                 HookUtils.block_with_error(f"🔒 FILE LOCKED: {lock_info}")
         
@@ -154,14 +131,13 @@ def main():
         if not env_valid:
             HookUtils.block_with_error(env_msg)
         
-        # Check accessibility
-        a11y_level, a11y_issues = check_accessibility_compliance(tool_input)
-        
-        # Check security
-        security_level, security_issues = check_frontend_security(tool_input)
-        
-        # Check performance
-        perf_level, perf_issues = check_performance_issues(tool_input)
+        # Check accessibility, security and performance (reused from the verdict cache when this content was already scanned)
+        (a11y_level, a11y_issues), (security_level, security_issues), (perf_level, perf_issues) = HookUtils.cached_scan(
+            __file__, file_path, tool_input.get("content", ""), lambda: (
+                check_accessibility_compliance(tool_input),
+                check_frontend_security(tool_input),
+                check_performance_issues(tool_input),
+            ))
         
         # Determine overall risk level
         all_levels = [a11y_level, security_level, perf_level]
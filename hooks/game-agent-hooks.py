@@ -11,45 +11,17 @@ import re
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 from hook_utils import HookUtils, WorkStatusManager, OrchestrationManager
+from rule_registry import load_rule_pack
+
+RULES = load_rule_pack()
 
 def check_game_performance_patterns(content: str, file_path: str) -> tuple[str, list]:
     """Check for game performance anti-patterns"""
     
     performance_issues = []
     
-    # Unity C# patterns
-    unity_patterns = [
-        (r'Update\(\).*GameObject\.Find|Update\(\).*FindObjectOfType', "Unity: GameObject.Find in Update() - cache references"),
-        (r'Update\(\).*GetComponent', "Unity: GetComponent in Update() - cache component references"),
-        (r'Update\(\).*Instantiate.*Destroy', "Unity: Instantiate/Destroy in Update() - use object pooling"),
-        (r'foreach.*GameObject.*FindObjectsOfType', "Unity: FindObjectsOfType in loop - expensive operation"),
-        (r'OnGUI\(\).*GUI\..*for.*in', "Unity: Complex GUI operations in OnGUI() - use UI system"),
-        (r'String\.Concat.*\+.*Update\(\)', "Unity: String concatenation in Update() - causes GC pressure"),
-        (r'new.*Vector3.*Update\(\)', "Unity: Vector3 allocation in Update() - cache or use static"),
-    ]
-    
-    # Unreal C++ patterns
-    unreal_patterns = [
-        (r'Tick.*GetWorld\(\)->GetAllActorsOfClass', "Unreal: GetAllActorsOfClass in Tick - cache results"),
-        (r'Tick.*FVector.*new', "Unreal: Vector allocation in Tick - use stack allocation"),
-        (r'BeginPlay.*while.*true', "Unreal: Infinite loop in BeginPlay - will freeze game"),
-        (r'UPROPERTY.*BlueprintReadWrite.*private', "Unreal: Private BlueprintReadWrite - inconsistent access"),
-        (r'TArray.*Add.*RemoveAt.*for', "Unreal: TArray manipulation in tight loops - performance hit"),
-    ]
-    
-    # General game patterns
-    game_patterns = [
-        (r'while.*true.*update|while.*true.*render', "Game: Infinite loop without frame limiting - CPU overuse"),
-        (r'sleep\(\d+\).*game.*loop', "Game: Sleep in game loop - inconsistent frame timing"),
-        (r'render.*for.*in.*objects.*\d{3,}', "Game: Rendering large object collections - batch operations"),
-        (r'physics.*calculate.*\d+.*times', "Game: Excessive physics calculations - optimize timestep"),
-    ]
-    
-    all_patterns = unity_patterns + unreal_patterns + game_patterns
-    
-    for pattern, description in all_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            performance_issues.append(f"🎮 {description}")
+    for rule in RULES["game.performance"].matching(content):
+        performance_issues.append(f"🎮 {rule.description}")
     
     if len(performance_issues) >= 3:
         return "HIGH", performance_issues
@@ -63,35 +35,8 @@ def check_game_memory_patterns(content: str, file_path: str) -> tuple[str, list]
     
     memory_issues = []
     
-    # Unity memory patterns
-    unity_memory = [
-        (r'Resources\.Load.*Update\(\)', "Unity: Resources.Load in Update() - memory fragmentation"),
-        (r'Instantiate.*gameObject.*Destroy.*null', "Unity: Missing null check after Destroy - memory reference"),
-        (r'StartCoroutine.*while.*true.*yield.*null', "Unity: Infinite coroutine without break condition"),
-        (r'OnDestroy.*StopAllCoroutines', "Unity: StopAllCoroutines in OnDestroy - may be too late"),
-        (r'List<GameObject>.*Clear\(\).*Add\(.*Update', "Unity: List operations in Update() - GC pressure"),
-    ]
-    
-    # Unreal memory patterns
-    unreal_memory = [
-        (r'NewObject.*BeginPlay.*EndPlay', "Unreal: Object creation without proper cleanup"),
-        (r'UPROPERTY.*TArray.*UPROPERTY.*TArray.*class', "Unreal: Multiple large arrays - memory fragmentation"),
-        (r'FString.*Append.*for.*in.*Tick', "Unreal: String operations in Tick - memory allocation"),
-        (r'UGameInstance.*static.*TMap', "Unreal: Static containers in GameInstance - memory leak risk"),
-    ]
-    
-    # General memory patterns
-    general_memory = [
-        (r'new.*\[\].*delete.*for.*i.*<.*1000', "Memory: Large array allocations in loops - fragment memory"),
-        (r'malloc.*free.*game.*loop', "Memory: Manual memory management in game loop - error prone"),
-        (r'std::vector.*reserve.*push_back.*erase', "Memory: Vector without proper capacity planning"),
-    ]
-    
-    all_memory = unity_memory + unreal_memory + general_memory
-    
-    for pattern, description in all_memory:
-        if re.search(pattern, content, re.IGNORECASE):
-            memory_issues.append(f"💾 {description}")
+    for rule in RULES["game.memory"].matching(content):
+        memory_issues.append(f"💾 {rule.description}")
     
     if len(memory_issues) >= 3:
         return "HIGH", memory_issues
@@ -105,34 +50,8 @@ def check_game_mechanics_patterns(content: str, file_path: str) -> tuple[str, li
     
     mechanics_issues = []
     
-    # Physics and movement patterns
-    physics_patterns = [
-        (r'transform\.position.*=.*Input\.|rigidbody\.velocity.*Input\.', "Physics: Direct transform manipulation with input - bypasses physics"),
-        (r'FixedUpdate\(\).*Time\.deltaTime', "Unity: Time.deltaTime in FixedUpdate - use fixedDeltaTime"),
-        (r'Rigidbody\.velocity.*=.*new.*Vector3\(0.*0.*0\)', "Physics: Zeroing velocity directly - use physics methods"),
-        (r'collision.*health.*--.*death', "Game: Direct health manipulation - missing validation"),
-    ]
-    
-    # Game state patterns
-    state_patterns = [
-        (r'static.*bool.*gameState|static.*int.*score', "Game: Static game state - multiplayer issues"),
-        (r'PlayerPrefs.*Save.*Update\(\)', "Unity: PlayerPrefs.Save in Update() - performance hit"),
-        (r'if.*gameState.*==.*"playing".*gameState.*=.*"paused"', "Game: String-based state - error prone"),
-        (r'public.*health.*public.*score.*class.*Player', "Game: Public game variables - encapsulation issue"),
-    ]
-    
-    # Input patterns
-    input_patterns = [
-        (r'Input\.GetKey.*Update\(\).*Input\.GetKey', "Input: Multiple Input.GetKey calls - cache input state"),
-        (r'Input\.mousePosition.*Screen\.width.*Update', "Input: Screen calculations in Update() - cache screen data"),
-        (r'KeyCode\..*KeyCode\..*KeyCode\..*Update', "Input: Multiple key checks - use input mapping"),
-    ]
-    
-    all_mechanics = physics_patterns + state_patterns + input_patterns
-    
-    for pattern, description in all_mechanics:
-        if re.search(pattern, content, re.IGNORECASE):
-            mechanics_issues.append(f"⚙️ {description}")
+    for rule in RULES["game.mechanics"].matching(content):
+        mechanics_issues.append(f"⚙️ {rule.description}")
     
     if len(mechanics_issues) >= 3:
         return "MEDIUM", mechanics_issues
@@ -146,33 +65,8 @@ def check_game_audio_visual_patterns(content: str, file_path: str) -> tuple[str,
     
     av_issues = []
     
-    # Audio patterns
-    audio_patterns = [
-        (r'AudioSource\.Play\(\).*Update\(\)', "Audio: AudioSource.Play in Update() - audio spam"),
-        (r'AudioClip.*Resources\.Load.*Play', "Audio: Loading audio clips synchronously - hitches"),
-        (r'AudioSource.*volume.*Random\.Range.*Update', "Audio: Random volume changes in Update() - jarring"),
-    ]
-    
-    # Visual patterns
-    visual_patterns = [
-        (r'Camera\.main\..*Update\(\)', "Unity: Camera.main access in Update() - cache camera reference"),
-        (r'Renderer\.material.*Update\(\)', "Unity: Material access in Update() - creates instances"),
-        (r'Light\.intensity.*Mathf\.Sin.*Update', "Unity: Light calculations in Update() - performance hit"),
-        (r'Shader\.SetGlobalFloat.*Update\(\)', "Unity: Global shader properties in Update() - expensive"),
-    ]
-    
-    # Rendering patterns
-    rendering_patterns = [
-        (r'Graphics\.DrawMesh.*for.*in.*Update', "Rendering: DrawMesh in loops - batch draw calls"),
-        (r'Material.*new.*Material.*Renderer', "Rendering: Creating materials at runtime - memory leak"),
-        (r'Texture2D.*SetPixel.*Apply.*Update', "Rendering: SetPixel operations in Update() - very slow"),
-    ]
-    
-    all_av = audio_patterns + visual_patterns + rendering_patterns
-    
-    for pattern, description in all_av:
-        if re.search(pattern, content, re.IGNORECASE):
-            av_issues.append(f"🎨 {description}")
+    for rule in RULES["game.audio_visual"].matching(content):
+        av_issues.append(f"🎨 {rule.description}")
     
     if len(av_issues) >= 2:
         return "MEDIUM", av_issues
@@ -219,12 +113,14 @@ def main():
         
         tool_name = input_data.get("tool_name", "")
         tool_input = input_data.get("tool_input", {})
+        # Edit/MultiEdit carry replacements, not content; scan the file as they would leave it
+        tool_input = HookUtils.resolve_edit(tool_name, tool_input)
         
         # Only process file operations
         if tool_name not in ["Write", "Edit", "MultiEdit", "Task"]:
             sys.exit(0)
         
-        file_path = tool_input.get("filePath", "")
+        file_path = HookUtils.tool_file_path(tool_input)
         content = tool_input.get("content", "")
         
         # Skip if no content
@@ -244,18 +140,21 @@ def main():
         work_status = WorkStatusManager(project_dir)
         orchestration = OrchestrationManager(project_dir)
         
-        # Check file locks
+        # Check file locks (with $CLAUDE_LOCK_WAIT set, queue for a held lock instead of refusing)
         if file_path:
-            is_locked, lock_info = work_status.is_file_locked(file_path)
+            is_locked, lock_info = work_status.check_write(file_path, HookUtils.lock_holder(input_data))
             if is_locked:
                 HookUtils.block_with_error(f"🔒 FILE LOCKED: {lock_info}")
         
-        # Game development analysis
-        perf_risk, perf_issues = check_game_performance_patterns(content, file_path)
-        memory_risk, memory_issues = check_game_memory_patterns(content, file_path)
-        mechanics_risk, mechanics_issues = check_game_mechanics_patterns(content, file_path)
-        av_risk, av_issues = check_game_audio_visual_patterns(content, file_path)
-        recommendations = get_game_recommendations(content, file_path)
+        # Game development analysis (reused from the verdict cache when this content was already scanned)
+        (perf_risk, perf_issues), (memory_risk, memory_issues), (mechanics_risk, mechanics_issues), (av_risk, av_issues), recommendations = HookUtils.cached_scan(
+            __file__, file_path, content, lambda: (
+                check_game_performance_patterns(content, file_path),
+                check_game_memory_patterns(content, file_path),
+                check_game_mechanics_patterns(content, file_path),
+                check_game_audio_visual_patterns(content, file_path),
+                get_game_recommendations(content, file_path),
+            ))
         
         # Determine overall risk
         all_risks = [perf_risk, memory_risk, mechanics_risk, av_risk]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Thin hook client - forwards stdin JSON to hook-server.py and relays the decision
+Falls back to running the hook script in this process when no server is listening,
+so output and exit-code semantics are identical either way
+"""
+
+import json
+import os
+import socket
+import sys
+from hook_socket_path import default_socket_path
+
+HOOKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESPONSE_TIMEOUT = 60
+
+
+def parse_args(argv: list) -> tuple:
+    """Parse `[--socket PATH] hook-name`"""
+    socket_path = default_socket_path()
+    rest = []
+    i = 0
+    while i < len(argv):
+        if argv[i] == "--socket" and i + 1 < len(argv):
+            socket_path = argv[i + 1]
+            i += 2
+            continue
+        rest.append(argv[i])
+        i += 1
+
+    if len(rest) != 1:
+        print("Usage: hook-client.py [--socket PATH] <hook-name>", file=sys.stderr)
+        sys.exit(1)
+
+    return socket_path, rest[0]
+
+
+def connect(socket_path: str):
+    """Connect to the hook server, or return None if it isn't reachable"""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def run_locally(hook: str, stdin_text: str):
+    """Run the hook script directly, exactly as a standalone command would"""
+    import io
+    import runpy
+
+    script = os.path.join(HOOKS_DIR, f"{os.path.basename(hook)}.py")
+    sys.stdin = io.StringIO(stdin_text)
+    sys.argv = [script]
+    runpy.run_path(script, run_name="__main__")
+    sys.exit(0)
+
+
+def main():
+    socket_path, hook = parse_args(sys.argv[1:])
+    stdin_text = sys.stdin.read()
+
+    sock = connect(socket_path)
+    if sock is None:
+        run_locally(hook, stdin_text)
+
+    env = {k: v for k, v in os.environ.items() if k.startswith("CLAUDE_")}
+    request = {"hook": hook, "stdin": stdin_text, "env": env, "cwd": os.getcwd()}
+
+    try:
+        sock.settimeout(RESPONSE_TIMEOUT)
+        sock.sendall(json.dumps(request).encode("utf-8"))
+        sock.shutdown(socket.SHUT_WR)
+
+        chunks = []
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        response = json.loads(b"".join(chunks).decode("utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"Hook client error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        sock.close()
+
+    sys.stdout.write(response.get("stdout", ""))
+    sys.stderr.write(response.get("stderr", ""))
+    sys.exit(int(response.get("exit_code", 1)))
+
+
+if __name__ == "__main__":
+    main()
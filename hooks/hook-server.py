@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Long-lived hook server - hosts every agent hook in one warm process
+Listens on a Unix socket; hook-client.py forwards each tool call's stdin JSON
+and relays the captured output and exit code back to Claude Code
+"""
+
+import argparse
+import os
+import socket
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from hook_runtime import may_wait_for_lock, preload_hooks
+from hook_socket_path import default_socket_path
+from hook_sockets import HookRequestHandler, UnixHookServer, read_all, respond, serve
+
+
+class HookServer(UnixHookServer):
+    """Serial server - hooks swap process-wide stdio, so requests never overlap.
+    A write that may queue for a held lock ($CLAUDE_LOCK_WAIT) is served by a forked child instead:
+    waiting here would hold back the holder's sync hook, the request that releases the lock"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.children = set()
+        # Connections a child answers: the server only closes its copy, without shutting them down
+        self.handed_off = set()
+
+    def serve_forked(self, request, raw: bytes) -> bool:
+        """Answer request from a forked child; False when fork() failed"""
+        try:
+            pid = os.fork()
+        except OSError:
+            return False
+        if pid == 0:
+            status = 1
+            try:
+                self.socket.close()
+                respond(request, raw)
+                status = 0
+            finally:
+                os._exit(status)
+        self.children.add(pid)
+        self.handed_off.add(request)
+        return True
+
+    def shutdown_request(self, request):
+        if request in self.handed_off:
+            self.handed_off.discard(request)
+            self.close_request(request)
+        else:
+            super().shutdown_request(request)
+
+    def service_actions(self):
+        """Reap children that have answered"""
+        for pid in list(self.children):
+            try:
+                done, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                done = pid
+            if done:
+                self.children.discard(pid)
+
+
+class HookServerRequestHandler(HookRequestHandler):
+    """Runs a forwarded hook invocation in the server, or in a child when it may wait for a lock"""
+
+    def handle(self):
+        raw = read_all(self.request)
+        if not raw:
+            return
+        if may_wait_for_lock(raw) and self.server.serve_forked(self.request, raw):
+            return
+        respond(self.request, raw)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve agent hooks from a warm process")
+    parser.add_argument("--socket", default=default_socket_path(), help="Unix socket path")
+    parser.add_argument("--no-preload", action="store_true", help="Import hooks on first use instead of at startup")
+    args = parser.parse_args()
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Hook server requires Unix domain sockets", file=sys.stderr)
+        sys.exit(1)
+
+    if not args.no_preload:
+        loaded = preload_hooks()
+        print(f"Preloaded {len(loaded)} hooks", file=sys.stderr)
+
+    server = HookServer(args.socket, HookServerRequestHandler)
+    print(f"Hook server listening on {args.socket}", file=sys.stderr)
+    serve(server, args.socket)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Fork-server (zygote) execution mode for hooks
+Imports hook_utils and every agent hook once, warms their regex tables,
+then forks a child per request: copy-on-write warm state with full per-request
+isolation, so a crashing rule only takes down its own child
+Speaks the same protocol as hook-server.py, so hook-client.py works unchanged
+"""
+
+import argparse
+import gc
+import socket
+import socketserver
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from hook_runtime import load_hook_module, preload_hooks, warm_hook_module
+from hook_socket_path import default_socket_path
+from hook_sockets import HookRequestHandler, UnixHookServer, serve
+
+
+class ZygoteServer(socketserver.ForkingMixIn, UnixHookServer):
+    """Forks one child per connection from the pre-warmed parent"""
+
+    max_children = 64
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve agent hooks from a pre-forked zygote")
+    parser.add_argument("--socket", default=default_socket_path(), help="Unix socket path")
+    args = parser.parse_args()
+
+    if not hasattr(socket, "AF_UNIX") or not hasattr(socketserver, "ForkingMixIn"):
+        print("Hook zygote requires fork() and Unix domain sockets", file=sys.stderr)
+        sys.exit(1)
+
+    loaded = preload_hooks()
+    warmed = sum(warm_hook_module(load_hook_module(name)) for name in loaded)
+
+    # Move warm objects out of the collector's reach so children don't dirty shared pages
+    gc.collect()
+    gc.freeze()
+
+    server = ZygoteServer(args.socket, HookRequestHandler)
+    print(f"Hook zygote listening on {args.socket} ({len(loaded)} hooks, {warmed} check functions warmed)", file=sys.stderr)
+    serve(server, args.socket)
+
+
+if __name__ == "__main__":
+    main()
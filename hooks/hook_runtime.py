@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+In-process hook runtime shared by the hook server, the zygote and the dispatcher.
+Loads hook scripts once and runs their main() against a forwarded request,
+capturing stdout, stderr and the exit code exactly as a fresh interpreter would.
+"""
+
+import importlib.util
+import io
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+HOOKS_DIR = Path(__file__).parent
+
+# Hook scripts that may be hosted in-process (file names without .py)
+AGENT_HOOKS = [
+    "python-agent-hooks",
+    "frontend-agent-hooks",
+    "infrastructure-agent-hooks",
+    "security-agent-hooks",
+    "database-agent-hooks",
+    "business-agent-hooks",
+    "testing-agent-hooks",
+    "mobile-agent-hooks",
+    "game-agent-hooks",
+    "data-ai-agent-hooks",
+    "creative-agent-hooks",
+]
+
+HOSTED_HOOKS = AGENT_HOOKS + ["pretooluse-dispatcher", "orchestration-sync-hook"]
+
+# Environment variables forwarded from the client for each request
+FORWARDED_ENV_PREFIX = "CLAUDE_"
+
+# Tools whose PreToolUse lock check queues for a held lock when $CLAUDE_LOCK_WAIT is set
+LOCK_WAIT_TOOLS = ("Write", "Edit", "MultiEdit")
+
+
+def settings_path() -> Path:
+    """The hook settings file: the dispatcher's routing table and the orchestration signal routes"""
+    return Path(os.environ.get("CLAUDE_HOOK_SETTINGS", HOOKS_DIR / "master-settings.json"))
+
+
+class HookResult:
+    """Captured outcome of a single hook invocation"""
+
+    def __init__(self, exit_code: int = 0, stdout: str = "", stderr: str = ""):
+        self.exit_code = exit_code
+        self.stdout = stdout
+        self.stderr = stderr
+
+    def to_dict(self) -> dict:
+        return {"exit_code": self.exit_code, "stdout": self.stdout, "stderr": self.stderr}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HookResult":
+        return cls(int(data.get("exit_code", 1)), data.get("stdout", ""), data.get("stderr", ""))
+
+
+_modules: Dict[str, object] = {}
+
+
+def load_hook_module(name: str):
+    """Import a hook script by name once per process"""
+    if name in _modules:
+        return _modules[name]
+
+    if name not in HOSTED_HOOKS:
+        raise ValueError(f"Unknown hook: {name}")
+
+    path = HOOKS_DIR / f"{name}.py"
+    module_name = name.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    _modules[name] = module
+    return module
+
+
+def preload_hooks(names: Optional[List[str]] = None) -> List[str]:
+    """Import every hosted hook up front so requests only pay for main()"""
+    loaded = []
+    for name in names or HOSTED_HOOKS:
+        load_hook_module(name)
+        loaded.append(name)
+
+    # A warm process pays for deferred imports and regex compilation once instead of on the first matching call
+    from hook_utils import resolve_lazy_imports
+    from rule_registry import load_rule_pack
+    resolve_lazy_imports()
+    load_rule_pack().compile_all()
+    return loaded
+
+
+def warm_hook_module(module) -> int:
+    """Exercise a hook's pure check functions so their regexes are compiled and cached"""
+    sample = "import os\nSELECT * FROM users WHERE id = 1\nclass Player(MonoBehaviour): pass\n"
+    args_by_signature = {
+        ("content", "file_path"): (sample, "warmup.py"),
+        ("tool_input",): ({"filePath": "warmup.py", "content": sample},),
+    }
+
+    # Only the zygote warms modules; keep inspect off the dispatcher's cold path
+    import inspect
+
+    warmed = 0
+    for name, func in inspect.getmembers(module, inspect.isfunction):
+        if func.__module__ != module.__name__ or name == "main":
+            continue
+        params = tuple(inspect.signature(func).parameters)
+        if params not in args_by_signature:
+            continue
+        try:
+            func(*args_by_signature[params])
+            warmed += 1
+        except Exception:
+            pass
+    return warmed
+
+
+def _exit_code_from(exc: SystemExit, stderr: io.StringIO) -> int:
+    """Translate SystemExit the same way the interpreter does"""
+    code = exc.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=stderr)
+    return 1
+
+
+def run_hook(name: str, stdin_text: str, env: Optional[Dict[str, str]] = None, cwd: str = "") -> HookResult:
+    """Run a hook's main() in-process with redirected stdio
+
+    When env is given it replaces the CLAUDE_* environment for the duration of the call;
+    when it is None the current environment is left untouched (nested dispatch).
+    """
+    module = load_hook_module(name)
+
+    stdout, stderr = io.StringIO(), io.StringIO()
+    saved_stdio = (sys.stdin, sys.stdout, sys.stderr)
+    saved_env = {key: os.environ[key] for key in os.environ if key.startswith(FORWARDED_ENV_PREFIX)}
+    saved_cwd = os.getcwd()
+
+    exit_code = 0
+    try:
+        if env is not None:
+            for key in saved_env:
+                del os.environ[key]
+            os.environ.update(env)
+        if cwd and os.path.isdir(cwd):
+            os.chdir(cwd)
+
+        sys.stdin, sys.stdout, sys.stderr = io.StringIO(stdin_text), stdout, stderr
+        try:
+            module.main()
+        except SystemExit as e:
+            exit_code = _exit_code_from(e, stderr)
+        except Exception:
+            import traceback
+            traceback.print_exc(file=stderr)
+            exit_code = 1
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved_stdio
+        if env is not None:
+            for key in [k for k in os.environ if k.startswith(FORWARDED_ENV_PREFIX)]:
+                del os.environ[key]
+            os.environ.update(saved_env)
+            # Locks queued for by this tool call are now the sync hook's to release, not the next call's
+            hook_utils = sys.modules.get("hook_utils")
+            if hook_utils is not None:
+                hook_utils.WorkStatusManager._grants.clear()
+        if cwd:
+            os.chdir(saved_cwd)
+
+    return HookResult(exit_code, stdout.getvalue(), stderr.getvalue())
+
+
+def may_wait_for_lock(raw: bytes) -> bool:
+    """Whether a forwarded request can block queueing for a file lock: a write's PreToolUse with $CLAUDE_LOCK_WAIT set"""
+    try:
+        request = json.loads(raw.decode("utf-8"))
+        if request.get("hook") not in HOSTED_HOOKS or request.get("hook") == "orchestration-sync-hook":
+            return False
+        if float(request.get("env", {}).get("CLAUDE_LOCK_WAIT") or 0) <= 0:
+            return False
+        return json.loads(request.get("stdin") or "{}").get("tool_name") in LOCK_WAIT_TOOLS
+    except (ValueError, AttributeError):
+        return False
+
+
+def handle_request(raw: bytes) -> bytes:
+    """Decode a request, run the hook and serialize its result"""
+    try:
+        request = json.loads(raw.decode("utf-8"))
+        env = {k: v for k, v in request.get("env", {}).items() if k.startswith(FORWARDED_ENV_PREFIX)}
+        result = run_hook(request["hook"], request.get("stdin", ""), env, request.get("cwd", ""))
+    except Exception as e:
+        result = HookResult(1, "", f"Hook server error: {e}\n")
+    return json.dumps(result.to_dict()).encode("utf-8")
+
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+"""
+Where the hook server listens - shared by hook-client.py, which must stay cheap to start,
+and hook-server.py / hook-zygote.py, so they can never disagree
+"""
+
+import os
+
+
+def default_socket_path() -> str:
+    """Get the hook server socket path"""
+    explicit = os.environ.get("CLAUDE_HOOK_SOCKET", "")
+    if explicit:
+        return explicit
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(os.environ.get("TMPDIR", "/tmp"), f"claude-hooks-{uid}.sock")
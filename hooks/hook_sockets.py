@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Unix socket plumbing shared by hook-server.py and hook-zygote.py
+"""
+
+import os
+import signal
+import socket
+import socketserver
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from hook_runtime import handle_request
+
+
+def read_all(sock) -> bytes:
+    """Read from a socket until the peer closes its write side"""
+    chunks = []
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def respond(sock, raw: bytes):
+    """Run a forwarded hook invocation and send its result back"""
+    sock.sendall(handle_request(raw))
+    sock.shutdown(socket.SHUT_WR)
+
+
+class HookRequestHandler(socketserver.BaseRequestHandler):
+    """Runs one forwarded hook invocation per connection"""
+
+    def handle(self):
+        raw = read_all(self.request)
+        if not raw:
+            return
+        respond(self.request, raw)
+
+
+class UnixHookServer(socketserver.UnixStreamServer):
+    """Unix socket server that replaces stale sockets and restricts access to the owner"""
+
+    allow_reuse_address = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+        os.chmod(self.server_address, 0o600)
+
+
+def serve(server: UnixHookServer, socket_path: str):
+    """Serve until interrupted or terminated, then remove the socket"""
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
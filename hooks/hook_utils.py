@@ -6,15 +6,114 @@ Core hook utilities and shared functions for the Claude Code hooks system.
 import json
 import sys
 import os
+import importlib.util
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
-from typing import Dict, List, Tuple, Optional
-import subprocess
+from types import ModuleType
+from typing import Callable, Dict, List, Tuple, Optional
 import re
 
+# Modules deferred with lazy_import(), by name
+_lazy_modules: Dict[str, ModuleType] = {}
+
+def lazy_import(name: str) -> ModuleType:
+    """Import a module on first attribute access instead of at hook startup"""
+    if name in sys.modules:
+        return sys.modules[name]
+    
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named '{name}'", name=name)
+    
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    _lazy_modules[name] = module
+    return module
+
+def resolve_lazy_imports() -> List[str]:
+    """Force every deferred module to load - for long-lived processes that fork or serve many calls"""
+    for module in _lazy_modules.values():
+        getattr(module, "__dict__")
+    return list(_lazy_modules)
+
+datetime = lazy_import("datetime")
+threading = lazy_import("threading")
+time = lazy_import("time")
+
 class HookUtils:
     """Shared utilities for all hooks"""
     
+    # Request-scoped state set by the dispatcher so co-hosted hooks share one parse
+    _request_input: Optional[dict] = None
+    _request_memo: Optional[Dict[tuple, object]] = None
+    
+    @staticmethod
+    @contextmanager
+    def request_scope(input_data: dict):
+        """Share parsed input and file facts across hooks run for one tool call"""
+        saved = (HookUtils._request_input, HookUtils._request_memo)
+        HookUtils._request_input, HookUtils._request_memo = input_data, {}
+        try:
+            yield
+        finally:
+            HookUtils._request_input, HookUtils._request_memo = saved
+    
+    @staticmethod
+    def memoize(key: tuple, compute: Callable):
+        """Compute a fact once per request scope (always recomputed outside one)"""
+        memo = HookUtils._request_memo
+        if memo is None:
+            return compute()
+        if key not in memo:
+            memo[key] = compute()
+        return memo[key]
+    
+    @staticmethod
+    def forget(project_dir: str, filename: str):
+        """Drop memoized facts about a file after it has been written"""
+        memo = HookUtils._request_memo
+        if memo:
+            path = str(Path(project_dir) / filename)
+            for key in [k for k in memo if path in k]:
+                del memo[key]
+    
+    @staticmethod
+    def cached_scan(hook_file: str, file_path: str, content: str, scan: Callable):
+        """Run a hook's content scan through the persistent verdict cache (see verdict_cache.py)"""
+        from verdict_cache import cached_scan
+        return cached_scan(hook_file, file_path, content, scan)
+
+    @staticmethod
+    def tool_file_path(tool_input: dict) -> str:
+        """The path a tool call operates on, whichever spelling of the key its payload uses"""
+        return tool_input.get("filePath") or tool_input.get("file_path", "")
+
+    @staticmethod
+    def resolve_edit(tool_name: str, tool_input: dict) -> dict:
+        """For an Edit or MultiEdit, tool_input plus the file's content as the edits would leave it (see incremental_scan.py)"""
+        if tool_name not in ("Edit", "MultiEdit") or "content" in tool_input:
+            return tool_input
+        from incremental_scan import edited_content
+        file_path = HookUtils.tool_file_path(tool_input)
+        edits = (tool_input.get("edits") or []) if tool_name == "MultiEdit" else [tool_input]
+        # Co-hosted hooks share one read of the file and one content string per request
+        key = ("edited_content", file_path, tuple(
+            (edit.get("old_string", ""), edit.get("new_string", ""), bool(edit.get("replace_all"))) for edit in edits))
+        content = HookUtils.memoize(key, lambda: edited_content(file_path, edits))
+        if content is None:
+            return tool_input
+        return dict(tool_input, filePath=file_path, content=content)
+
+    @staticmethod
+    def edit_windows(content: str) -> Optional[str]:
+        """Just the text around the hunks of the edit that left content, None when no edit did (see incremental_scan.py)"""
+        incremental_scan = sys.modules.get("incremental_scan")
+        # Only resolve_edit() loads it, so content that is not an edit's costs no import
+        return None if incremental_scan is None else incremental_scan.edit_windows(content)
+
     @staticmethod
     def get_project_dir() -> str:
         """Get the project directory from environment"""
@@ -26,6 +125,15 @@ class HookUtils:
     @staticmethod
     def read_json_input() -> dict:
         """Read and parse JSON input from stdin"""
+        # A new hook input starts a new verdict; forget rules that timed out on the last one
+        registry = sys.modules.get("rule_registry")
+        if registry is not None:
+            registry.reset_inconclusive()
+        edits = sys.modules.get("incremental_scan")
+        if edits is not None:
+            edits.reset_findings()
+        if HookUtils._request_input is not None:
+            return HookUtils._request_input
         try:
             return json.load(sys.stdin)
         except json.JSONDecodeError as e:
@@ -34,6 +142,20 @@ class HookUtils:
     @staticmethod
     def output_json(data: dict):
         """Output JSON response and exit successfully"""
+        registry = sys.modules.get("rule_registry")
+        timed_out = registry.inconclusive_rules() if registry is not None else []
+        if timed_out and "systemMessage" not in data:
+            rule_ids = ", ".join(rule.rule_id for rule in timed_out)
+            data = dict(data, systemMessage=f"⏱️ INCONCLUSIVE: {len(timed_out)} rule(s) ran out of time and were not evaluated ({rule_ids})")
+        # A MultiEdit's visible verdict says which of its edits the matched rules came from
+        edits = sys.modules.get("incremental_scan")
+        note = edits.findings_note() if edits is not None else ""
+        specific = data.get("hookSpecificOutput") or {}
+        if note and specific.get("permissionDecisionReason") and not data.get("suppressOutput"):
+            reason = f"{specific['permissionDecisionReason']}\n\n{note}"
+            data = dict(data, hookSpecificOutput=dict(specific, permissionDecisionReason=reason))
+            if "reason" in data:
+                data["reason"] = reason
         print(json.dumps(data, indent=2))
         sys.exit(0)
     
@@ -49,6 +171,8 @@ class HookUtils:
             "decision": "block",
             "reason": reason
         }
+        # A denied write never reaches the sync hook that would release a lock it queued for
+        WorkStatusManager.release_grants()
         HookUtils.output_json(output)
     
     @staticmethod
@@ -67,7 +191,7 @@ class HookUtils:
     @staticmethod
     def get_timestamp() -> str:
         """Get formatted timestamp"""
-        return datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
+        return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S UTC")
     
     @staticmethod
     def get_agent_from_context(tool_input: dict) -> str:
@@ -93,6 +217,14 @@ class HookUtils:
                 
         return "system-agent"
     
+    @staticmethod
+    def lock_holder(input_data: dict) -> str:
+        """Who a lock taken for this tool call belongs to: the agent, else its session"""
+        agent = os.environ.get("CLAUDE_AGENT_NAME") or input_data.get("agent_name")
+        if agent:
+            return agent
+        return f"session-{str(input_data.get('session_id') or os.getppid())[:8]}"
+    
     @staticmethod
     def get_relative_path(file_path: str, project_dir: str) -> str:
         """Get relative path from project directory"""
@@ -104,7 +236,8 @@ class HookUtils:
     @staticmethod
     def file_exists(project_dir: str, filename: str) -> bool:
         """Check if file exists in project"""
-        return (Path(project_dir) / filename).exists()
+        path = Path(project_dir) / filename
+        return HookUtils.memoize(("file_exists", str(path)), path.exists)
     
     @staticmethod
     def read_file(project_dir: str, filename: str) -> str:
@@ -117,19 +250,27 @@ class HookUtils:
     
     @staticmethod
     def write_file(project_dir: str, filename: str, content: str):
-        """Write content to file"""
+        """Replace a file's content atomically, under its lock (see coordination_files.py)"""
+        from coordination_files import atomic_write, file_lock
         file_path = Path(project_dir) / filename
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, 'w') as f:
-            f.write(content)
+        with file_lock(file_path):
+            atomic_write(file_path, content)
+        HookUtils.forget(project_dir, filename)
+    
+    @staticmethod
+    def update_file(project_dir: str, filename: str, transform: Callable[[str], str]) -> str:
+        """Read, transform and rewrite a shared file without losing concurrent updates"""
+        from coordination_files import update_file
+        content = update_file(Path(project_dir) / filename, transform)
+        HookUtils.forget(project_dir, filename)
+        return content
     
     @staticmethod
     def append_to_file(project_dir: str, filename: str, content: str):
         """Append content to file"""
-        file_path = Path(project_dir) / filename
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(file_path, 'a') as f:
-            f.write(content)
+        from coordination_files import append_file
+        append_file(Path(project_dir) / filename, content)
+        HookUtils.forget(project_dir, filename)
     
     @staticmethod
     def human_confirmation_required(message: str, details: str = "") -> bool:
@@ -147,134 +288,218 @@ class HookUtils:
         return any(re.search(pattern, combined_text) for pattern in high_risk_patterns)
 
 class WorkStatusManager:
-    """Manages WORK_STATUS.md file operations"""
+    """Manages file locks and activities, and WORK_STATUS.md as their view (see work_status_store.py)"""
+    
+    # Locks check_write() queued for and was granted in this process, as (project_dir, file_path, agent)
+    _grants: List[Tuple[str, str, str]] = []
     
     def __init__(self, project_dir: str):
         self.project_dir = project_dir
         self.file_path = Path(project_dir) / "WORK_STATUS.md"
+        # Inside transaction(): whether WORK_STATUS.md needs rendering at commit; None outside one
+        self._dirty: Optional[bool] = None
+    
+    @property
+    def store(self):
+        from work_status_store import work_status_store
+        return work_status_store(self.project_dir)
+    
+    @contextmanager
+    def transaction(self):
+        """Apply locks, unlocks and activities in one store transaction and refresh WORK_STATUS.md once, at commit"""
+        if self._dirty is not None:
+            yield self
+            return
+        self._dirty = False
+        try:
+            with self.store.transaction():
+                yield self
+            dirty = self._dirty
+        finally:
+            self._dirty = None
+        if dirty:
+            self.refresh()
+    
+    def _changed(self):
+        """Refresh the view now, or at commit inside a transaction"""
+        if self._dirty is None:
+            self.refresh()
+        else:
+            self._dirty = True
+            HookUtils.forget(self.project_dir, "WORK_STATUS.md")
     
     def ensure_exists(self):
         """Create WORK_STATUS.md if it doesn't exist"""
         if not self.file_path.exists():
-            content = """# Work Status
-
-This file tracks agent activities and file locks to prevent conflicts.
-
-## File Locks
-<!-- Active file locks will be listed here -->
-
-## Recent Activities  
-<!-- Agent activities will be logged here -->
-
-"""
-            HookUtils.write_file(self.project_dir, "WORK_STATUS.md", content)
+            self._changed()
     
-    def is_file_locked(self, file_path: str) -> Tuple[bool, str]:
-        """Check if file is locked by another agent"""
-        if not self.file_path.exists():
-            return False, ""
-        
-        content = HookUtils.read_file(self.project_dir, "WORK_STATUS.md")
-        relative_path = HookUtils.get_relative_path(file_path, self.project_dir)
+    def refresh(self):
+        """Have WORK_STATUS.md re-rendered by the background renderer (see coordination_renderer.py), or render
+        it now when there is none or the file does not exist yet"""
+        from coordination_renderer import schedule_render
+        HookUtils.forget(self.project_dir, "WORK_STATUS.md")
+        if not self.file_path.exists() or not schedule_render(self.project_dir):
+            self.render()
+    
+    def render(self):
+        """Regenerate WORK_STATUS.md from the lock and activity store"""
+        # Read the store under the file's lock, so the last render to land includes every change
+        HookUtils.update_file(self.project_dir, "WORK_STATUS.md", lambda _: self.store.render())
+    
+    def is_file_locked(self, file_path: str, mode: str = "exclusive") -> Tuple[bool, str]:
+        """Check if file is locked against access in mode: any lock bars a write, only an exclusive one a read"""
+        return HookUtils.memoize(("is_file_locked", str(self.file_path), file_path, mode),
+                                 lambda: self._find_lock(file_path, mode))
+    
+    def check_write(self, file_path: str, agent: str) -> Tuple[bool, str]:
+        """The PreToolUse lock check for a write by agent. When $CLAUDE_LOCK_WAIT is set, a held lock is
+        queued for instead of refused, and the write goes ahead holding agent's exclusive lease, which
+        the sync hook releases afterwards"""
+        from work_status_store import lock_wait_seconds
+        wait = lock_wait_seconds()
         
-        for line in content.split('\n'):
-            if line.strip().startswith("LOCKED:") and relative_path in line:
-                return True, line.strip()
+        def check():
+            locked, holder = self.is_file_locked(file_path)
+            if locked:
+                self._denied(file_path, agent)
+            return locked, holder
         
+        def queue():
+            acquired, holder = self.wait_for_lock(file_path, agent, wait)
+            if acquired:
+                WorkStatusManager._grants.append((self.project_dir, file_path, agent))
+            return not acquired, holder
+        return HookUtils.memoize(("check_write", str(self.file_path), file_path, agent), queue if wait else check)
+    
+    def _denied(self, file_path: str, agent: str):
+        """Count a refused lock request in the contention metrics"""
+        from work_status_store import lock_key
+        self.store.observe("denied", lock_key(self.lock_target(file_path)), agent, 0)
+    
+    @staticmethod
+    def release_grants():
+        """Give back the locks check_write() took for a write that is not going ahead"""
+        while WorkStatusManager._grants:
+            project_dir, file_path, agent = WorkStatusManager._grants.pop()
+            WorkStatusManager(project_dir).unlock_file(file_path, silent=True, agent=agent)
+    
+    def _find_lock(self, file_path: str, mode: str) -> Tuple[bool, str]:
+        """Look up the leases covering file_path, reclaiming any that have expired"""
+        from work_status_store import lock_line, modes_conflict
+        relative_path = HookUtils.get_relative_path(file_path, self.project_dir)
+        now = time.time()
+        for lease in self.store.covering(relative_path):
+            if lease["expires_at"] is not None and lease["expires_at"] <= now:
+                if self.store.reclaim(lease, HookUtils.get_timestamp()):
+                    self._changed()
+            elif modes_conflict(lease["mode"], mode):
+                return True, lock_line(**lease)
         return False, ""
     
-    def lock_file(self, file_path: str, agent: str, operation: str = "editing"):
-        """Lock a file for exclusive access"""
-        self.ensure_exists()
+    def lock_target(self, file_path: str) -> str:
+        """Project-relative lock key spelling: a directory stands for everything below it (dir/**)"""
         relative_path = HookUtils.get_relative_path(file_path, self.project_dir)
-        timestamp = HookUtils.get_timestamp()
-        
-        lock_entry = f"LOCKED: `{relative_path}` by {agent} ({operation}) at {timestamp}\n"
-        
-        # Remove existing locks for this file
-        self.unlock_file(file_path, silent=True)
+        if file_path.endswith(("/", os.sep)) or Path(self.project_dir, file_path).is_dir():
+            relative_path = f"{relative_path.rstrip('/' + os.sep)}/**"
+        return relative_path
+    
+    def lock_file(self, file_path: str, agent: str, operation: str = "editing",
+                  ttl: Optional[float] = None, mode: str = "exclusive") -> Tuple[bool, str]:
+        """Lock a file, a directory or a glob (src/api/**) as a lease of ttl seconds ($CLAUDE_LOCK_TTL by default).
+        mode "shared" lets other readers hold it too (reviews); "exclusive" is for writers. Returns
+        (False, the other agent's lock) when it overlaps one in a conflicting mode"""
+        from work_status_store import lease_seconds, lock_line
+        relative_path = self.lock_target(file_path)
+        ttl = lease_seconds() if ttl is None else ttl
+        conflict = self.store.lock(relative_path, agent, operation, HookUtils.get_timestamp(), time.time() + ttl, mode)
+        if conflict:
+            self._denied(file_path, agent)
+            return False, lock_line(**conflict)
+        self._changed()
+        return True, ""
+    
+    def wait_for_lock(self, file_path: str, agent: str, timeout: float, operation: str = "editing",
+                      ttl: Optional[float] = None, mode: str = "exclusive") -> Tuple[bool, str]:
+        """lock_file, but a conflicting lock is waited out for up to timeout seconds in a FIFO queue,
+        sleeping until a release wakes the waiter. Must not be called inside a transaction()"""
+        from work_status_store import lease_seconds, lock_key, lock_line
+        relative_path = self.lock_target(file_path)
+        ttl = lease_seconds() if ttl is None else ttl
+        started = time.time()
+        deadline = started + timeout
         
-        # Add new lock
-        content = HookUtils.read_file(self.project_dir, "WORK_STATUS.md")
-        if "## File Locks" in content:
-            content = content.replace("## File Locks\n<!-- Active file locks will be listed here -->", 
-                                    f"## File Locks\n<!-- Active file locks will be listed here -->\n{lock_entry}")
-        else:
-            content += f"\n{lock_entry}"
+        def attempt(waiter_id: Optional[int] = None) -> Optional[Dict]:
+            return self.store.lock(relative_path, agent, operation, HookUtils.get_timestamp(), time.time() + ttl,
+                                   mode, waiter_id, started if waiter_id is not None else None)
         
-        HookUtils.write_file(self.project_dir, "WORK_STATUS.md", content)
+        conflict = attempt()
+        if conflict:
+            with self.store.queued(relative_path, agent, mode, HookUtils.get_timestamp(), deadline) as waiter:
+                while True:
+                    conflict = attempt(waiter.id)
+                    if not conflict:
+                        break
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        self.store.observe("wait", lock_key(relative_path), agent, (time.time() - started) * 1000)
+                        return False, lock_line(**conflict)
+                    # An unreleased lease or a vanished waiter ahead stops blocking when it expires
+                    if conflict["expires_at"] is not None:
+                        remaining = min(remaining, conflict["expires_at"] - time.time())
+                    waiter.wait(remaining)
+        self._changed()
+        return True, ""
     
-    def unlock_file(self, file_path: str, silent: bool = False):
-        """Unlock a file"""
-        if not self.file_path.exists():
-            return
-        
-        relative_path = HookUtils.get_relative_path(file_path, self.project_dir)
-        content = HookUtils.read_file(self.project_dir, "WORK_STATUS.md")
+    def renew_lock(self, file_path: str, agent: str, ttl: Optional[float] = None) -> bool:
+        """Heartbeat: extend agent's lease on file_path; False once it has expired or been released"""
+        from work_status_store import lease_seconds
+        relative_path = self.lock_target(file_path)
+        ttl = lease_seconds() if ttl is None else ttl
+        renewed = self.store.renew(relative_path, agent, time.time() + ttl)
+        if renewed:
+            self._changed()
+        return renewed
+    
+    @contextmanager
+    def hold_lock(self, file_path: str, agent: str, operation: str = "editing", ttl: Optional[float] = None,
+                  mode: str = "exclusive"):
+        """Lock file_path for the block, renewing the lease every third of its TTL from a background thread"""
+        from work_status_store import LockConflict, lease_seconds
+        ttl = lease_seconds() if ttl is None else ttl
+        acquired, holder = self.lock_file(file_path, agent, operation, ttl, mode)
+        if not acquired:
+            raise LockConflict(holder)
+        stop = threading.Event()
         
-        lines = content.split('\n')
-        filtered_lines = [line for line in lines if not (line.strip().startswith("LOCKED:") and relative_path in line)]
+        def heartbeat():
+            while not stop.wait(ttl / 3) and self.renew_lock(file_path, agent, ttl):
+                pass
         
-        if len(filtered_lines) != len(lines):
-            HookUtils.write_file(self.project_dir, "WORK_STATUS.md", '\n'.join(filtered_lines))
+        thread = threading.Thread(target=heartbeat, name=f"lease-heartbeat-{agent}", daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+            self.unlock_file(file_path, agent=agent, mode=mode)
+    
+    def unlock_file(self, file_path: str, silent: bool = False, agent: Optional[str] = None,
+                    mode: Optional[str] = "exclusive") -> bool:
+        """Unlock a file, directory or glob; False when it was not locked. By default this releases the
+        writer's exclusive lock and leaves reviewers' shared locks; agent and mode (None: any) select others"""
+        released = self.store.unlock(self.lock_target(file_path), agent, mode)
+        if released:
+            self._changed()
+        return released
     
     def log_activity(self, agent: str, operation: str, file_path: str, status: str, details: str = ""):
         """Log agent activity"""
-        self.ensure_exists()
-        timestamp = HookUtils.get_timestamp()
         relative_path = HookUtils.get_relative_path(file_path, self.project_dir)
-        
-        entry = f"""
-## {timestamp} - {operation.upper()}
-- **Agent**: {agent}
-- **File**: `{relative_path}`
-- **Status**: {status}
-{f"- **Details**: {details}" if details else ""}
-"""
-        
-        content = HookUtils.read_file(self.project_dir, "WORK_STATUS.md")
-        
-        # Insert after "Recent Activities" section
-        if "## Recent Activities" in content:
-            content = content.replace("## Recent Activities\n<!-- Agent activities will be logged here -->", 
-                                    f"## Recent Activities\n<!-- Agent activities will be logged here -->{entry}")
-        else:
-            content += entry
-        
-        # Keep only last 20 activities
-        self._trim_activities(content)
-    
-    def _trim_activities(self, content: str):
-        """Keep only the most recent activities"""
-        lines = content.split('\n')
-        activity_count = sum(1 for line in lines if re.match(r'## \d{4}-\d{2}-\d{2}', line))
-        
-        if activity_count > 20:
-            # Keep header and first 15 activities
-            keep_lines = []
-            activity_seen = 0
-            for line in lines:
-                if re.match(r'## \d{4}-\d{2}-\d{2}', line):
-                    activity_seen += 1
-                    if activity_seen > 15:
-                        break
-                keep_lines.append(line)
-            
-            content = '\n'.join(keep_lines) + "\n\n<!-- Older activities trimmed -->"
-        
-        HookUtils.write_file(self.project_dir, "WORK_STATUS.md", content)
+        self.store.log(HookUtils.get_timestamp(), operation.upper(), agent, relative_path, status, details)
+        self._changed()
 
-class OrchestrationManager:
-    """Manages orchestration-index.md operations"""
-    
-    def __init__(self, project_dir: str):
-        self.project_dir = project_dir
-        self.file_path = Path(project_dir) / "orchestration-index.md"
-    
-    def ensure_exists(self):
-        """Create orchestration-index.md if it doesn't exist"""
-        if not self.file_path.exists():
-            content = """# Orchestration Index
+ORCHESTRATION_TEMPLATE = """# Orchestration Index
 
 This file coordinates multi-agent development activities and tracks project progress.
 
@@ -291,65 +516,148 @@ This file coordinates multi-agent development activities and tracks project prog
 <!-- Docker and deployment readiness -->
 
 """
-            HookUtils.write_file(self.project_dir, "orchestration-index.md", content)
+
+class OrchestrationManager:
+    """Records orchestration events, and materializes orchestration-index.md as their view (see orchestration_log.py)"""
+    
+    def __init__(self, project_dir: str):
+        self.project_dir = project_dir
+        self.file_path = Path(project_dir) / "orchestration-index.md"
+        # Events queued by transaction(), None outside one, and whether to materialize the view at commit
+        self._pending: Optional[List[dict]] = None
+        self._materialize = False
+    
+    @property
+    def log(self):
+        from orchestration_log import orchestration_log
+        return orchestration_log(self.project_dir)
+    
+    @contextmanager
+    def transaction(self):
+        """Queue events and append them all at commit, materializing the view then if it was asked for"""
+        if self._pending is not None:
+            yield self
+            return
+        self._pending, self._materialize = [], False
+        try:
+            yield self
+            pending, materialize = self._pending, self._materialize
+        finally:
+            self._pending = None
+        if pending:
+            self.log.record(pending)
+        if materialize:
+            self.materialize()
+        elif pending:
+            self._changed()
+    
+    def _record(self, event: dict):
+        """Log an event now, or at commit inside a transaction"""
+        if self._pending is None:
+            self.log.record([event])
+            self._changed()
+        else:
+            self._pending.append(event)
+    
+    def _changed(self):
+        """Have the background renderer bring the view up to date; without one it waits to be read"""
+        from coordination_renderer import schedule_render
+        schedule_render(self.project_dir)
+    
+    def ensure_exists(self):
+        """Create orchestration-index.md if it doesn't exist"""
+        if not self.file_path.exists():
+            if self._pending is None:
+                self.materialize()
+            else:
+                self._materialize = True
+    
+    def materialize(self, force: bool = False) -> bool:
+        """Bring orchestration-index.md's generated sections up to date with the log, if they are behind"""
+        from orchestration_log import view_position
+        log = self.log
+        if not force and view_position(HookUtils.read_file(self.project_dir, "orchestration-index.md")) \
+                == log.state().position:
+            return False
+        # Rendered under the file's lock, so the last render to land includes every event
+        HookUtils.update_file(self.project_dir, "orchestration-index.md",
+                              lambda content: log.render(content or ORCHESTRATION_TEMPLATE))
+        log.checkpoint()
+        return True
     
     def update_progress(self, agent: str, operation: str, file_path: str, status: str):
         """Update orchestration progress"""
-        self.ensure_exists()
-        timestamp = HookUtils.get_timestamp()
+        from orchestration_log import PROGRESS
+        self._record({
+            "at": HookUtils.get_timestamp(),
+            "kind": PROGRESS,
+            "agent": agent,
+            "operation": operation,
+            "path": HookUtils.get_relative_path(file_path, self.project_dir),
+            "status": status,
+        })
+    
+    def signal_agents(self, agents: List[str], file_path: str, status: str, source: str = "",
+                      content: Optional[str] = None) -> int:
+        """Signal every agent concerned with a file in one event, however many there are, and queue the review
+        in each one's inbox unless this content (the file's, when not given) is queued there already; returns
+        how many reviews were queued"""
+        from orchestration_log import SIGNAL
+        from verdict_cache import content_digest
+        from work_status_store import work_status_store
+        agents = list(dict.fromkeys(agents))
+        if not agents:
+            return 0
+        at = HookUtils.get_timestamp()
         relative_path = HookUtils.get_relative_path(file_path, self.project_dir)
-        
-        progress_entry = f"""
-### Latest Progress ({timestamp})
-- **Agent**: {agent}
-- **Operation**: {operation}
-- **File**: `{relative_path}`
-- **Status**: {status}
-
-"""
-        
-        content = HookUtils.read_file(self.project_dir, "orchestration-index.md")
-        
-        # Remove previous "Latest Progress" section
-        lines = content.split('\n')
-        filtered_lines = []
-        skip_section = False
-        
-        for line in lines:
-            if line.startswith("### Latest Progress"):
-                skip_section = True
-                continue
-            elif line.startswith("###") or line.startswith("##"):
-                if skip_section:
-                    skip_section = False
-                    filtered_lines.append(line)
-            elif not skip_section:
-                filtered_lines.append(line)
-            elif skip_section and line.strip() == "":
-                continue
-        
-        content = '\n'.join(filtered_lines) + progress_entry
-        HookUtils.write_file(self.project_dir, "orchestration-index.md", content)
+        self._record({"at": at, "kind": SIGNAL, "agent": source, "path": relative_path, "status": status,
+                      "agents": agents})
+        if content is None:
+            try:
+                with open(file_path, "r", encoding="utf-8", errors="surrogateescape") as f:
+                    content = f.read()
+            except OSError:
+                content = ""
+        return work_status_store(self.project_dir).enqueue(agents, relative_path, content_digest(content), source,
+                                                           status, at)
+    
+    def inbox(self, agent: str, limit: Optional[int] = None) -> List[dict]:
+        """The reviews waiting in agent's inbox, oldest first, without taking them out"""
+        from work_status_store import work_status_store
+        return work_status_store(self.project_dir).inbox(agent, limit)
+    
+    def drain_inbox(self, agent: str, limit: Optional[int] = None) -> List[dict]:
+        """Take agent's oldest limit (or all) reviews out of its inbox, and clear their signals from the view"""
+        from orchestration_log import SIGNALS_DRAINED
+        from work_status_store import work_status_store
+        items = work_status_store(self.project_dir).drain(agent, limit)
+        if items:
+            self._record({"at": HookUtils.get_timestamp(), "kind": SIGNALS_DRAINED, "agent": agent,
+                          "files": list(dict.fromkeys(item["path"] for item in items))})
+        return items
     
     def signal_containerization_needed(self, agent: str, files: List[str]):
         """Signal that containerization review is needed"""
-        self.ensure_exists()
-        timestamp = HookUtils.get_timestamp()
-        
-        container_alert = f"""
-### 🐳 CONTAINERIZATION REVIEW REQUIRED ({timestamp})
-- **Requested by**: {agent}
-- **Files needing containerization**: {', '.join([f"`{f}`" for f in files])}
-- **Status**: PENDING docker-expert review
-- **Action Required**: docker-expert must review and approve containerization
-
-"""
-        
-        content = HookUtils.read_file(self.project_dir, "orchestration-index.md")
-        
-        # Add to containerization status section
-        if "## Containerization Status" in content:
-            content = content.replace("## Containerization Status\n<!-- Docker and deployment readiness -->", 
-                                    f"## Containerization Status\n<!-- Docker and deployment readiness -->{container_alert}")
-        
-        HookUtils.write_file(self.project_dir, "orchestration-index.md", content)
+        from orchestration_log import CONTAINERIZATION
+        self._record({"at": HookUtils.get_timestamp(), "kind": CONTAINERIZATION, "agent": agent, "files": list(files)})
+    
+    def resolve_containerization(self, agent: str):
+        """Close every open containerization alert (docker-expert approved the containerization)"""
+        from orchestration_log import CONTAINERIZATION_RESOLVED
+        self._record({"at": HookUtils.get_timestamp(), "kind": CONTAINERIZATION_RESOLVED, "agent": agent})
+    
+    def latest_progress(self) -> Dict[str, dict]:
+        """Each agent's latest progress event, from the in-memory reduction of the log"""
+        return dict(self.log.state().agents)
+    
+    def signals(self, agent: Optional[str] = None) -> Dict[str, Dict[str, dict]]:
+        """The latest signal each agent (or just agent) was sent per file, for its most recently signalled
+        files, oldest first"""
+        signals = self.log.state().signals
+        if agent is not None:
+            return {agent: dict(signals[agent])} if agent in signals else {}
+        return {name: dict(by_path) for name, by_path in signals.items()}
+    
+    def open_alerts(self) -> List[dict]:
+        """Containerization alerts not yet resolved, oldest first"""
+        return list(self.log.state().alerts)
@@ -0,0 +1,552 @@
+#!/usr/bin/env python3
+"""
+Edit-aware incremental scanning.
+An Edit carries old_string/new_string rather than content, so the edited file is rebuilt
+virtually from disk. Rather than rescanning it whole, each rule set scans only line-aligned
+windows around the changed hunks (plus $CLAUDE_EDIT_WINDOW_LINES lines of context). It then
+merges those results with the first-match spans recorded for the file's previous content
+in the verdict cache, shifted past the edit. A one-line edit to a large file costs a few KB of
+regex work.
+Matches are assumed not to reach across a window's context lines into unchanged text;
+files smaller than INCREMENTAL_MIN_CHARS, and edits without a recorded base, are scanned
+in full (and recorded, so the next edit is incremental).
+A MultiEdit is applied as one batch and scanned in the same single pass; rules that
+matched are then traced to the hunks they match inside, for the hook's message.
+"""
+
+import bisect
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import rule_registry
+from rule_registry import RuleMatch, RuleSet
+
+DEFAULT_WINDOW_LINES = 5
+
+# Below this size a full scan is as cheap as bookkeeping, so nothing is recorded or merged
+INCREMENTAL_MIN_CHARS = 32 * 1024
+
+# Past this share of the file the windows are scanned as one full pass instead
+MAX_WINDOW_SHARE = 0.5
+
+# Verdict cache "hook" under which per-set spans are recorded, independent of file path
+RECORD_KIND = "rule-sets"
+
+# Edited file produced by the last edited_content() call, matched to scans by identity
+_edited: Optional["EditedFile"] = None
+
+# Descriptions of the rules matched inside each hunk of the current MultiEdit, per hook run
+_hunk_findings: Dict["Hunk", List[str]] = {}
+
+# Rule descriptions listed per hunk before the rest are counted
+MAX_FINDINGS_PER_HUNK = 3
+
+# Syntax that looks past a window's edges, or commits before reaching them (atomic groups,
+# possessive quantifiers), so a miss in the joined windows proves nothing
+EDGE_SENSITIVE = ("$", "\\Z", "\\B", "(?=", "(?!", "(?<", "(?>", "*+", "++", "?+", "}+")
+
+
+def window_lines() -> int:
+    """Context lines scanned on either side of an edit, from $CLAUDE_EDIT_WINDOW_LINES"""
+    try:
+        return max(0, int(os.environ.get("CLAUDE_EDIT_WINDOW_LINES", DEFAULT_WINDOW_LINES)))
+    except ValueError:
+        return DEFAULT_WINDOW_LINES
+
+
+class Hunk:
+    """A changed range, as [old_start, old_end) in the original and [new_start, new_end) in the result"""
+
+    __slots__ = ("old_start", "old_end", "new_start", "new_end", "edits")
+
+    def __init__(self, old_start: int, old_end: int, new_start: int, new_end: int, edits: Tuple[int, ...]):
+        self.old_start = old_start
+        self.old_end = old_end
+        self.new_start = new_start
+        self.new_end = new_end
+        # Indexes of the edits that produced this hunk (several when replacements touch)
+        self.edits = edits
+
+    @property
+    def delta(self) -> int:
+        return (self.new_end - self.new_start) - (self.old_end - self.old_start)
+
+    def __repr__(self) -> str:
+        return f"Hunk(old={self.old_start}:{self.old_end}, new={self.new_start}:{self.new_end}, edits={self.edits})"
+
+
+def _fold(hunks: List[Hunk], start: int, end: int, length: int, edit: int) -> List[Hunk]:
+    """Add the replacement of current text [start, end) by length characters to hunks"""
+    delta = length - (end - start)
+    before = [hunk for hunk in hunks if hunk.new_end < start]
+    touching = [hunk for hunk in hunks if hunk.new_end >= start and hunk.new_start <= end]
+    after = [hunk for hunk in hunks if hunk.new_start > end]
+
+    shift_before = sum(hunk.delta for hunk in before)
+    shift_touching = sum(hunk.delta for hunk in touching)
+    # Ends inside a touching hunk resolve to that hunk's own bounds through min/max
+    merged = Hunk(
+        min([start - shift_before] + [hunk.old_start for hunk in touching]),
+        max([end - shift_before - shift_touching] + [hunk.old_end for hunk in touching]),
+        min([start] + [hunk.new_start for hunk in touching]),
+        max([end] + [hunk.new_end for hunk in touching]) + delta,
+        tuple(sorted({edit}.union(*(hunk.edits for hunk in touching)))),
+    )
+    for hunk in after:
+        hunk.new_start += delta
+        hunk.new_end += delta
+    return before + [merged] + after
+
+
+def _apply_spread(original: str, edits: List[dict]) -> Optional[Tuple[str, List[Hunk]]]:
+    """
+    The usual batch in one join: single replacements whose old_strings first occur well
+    apart in the original, and whose new text creates no earlier occurrence of a later
+    edit's old_string. Such edits land where they would in sequence; anything else is None.
+    """
+    if not edits or any(edit.get("replace_all") or not edit.get("old_string") for edit in edits):
+        return None
+    reach = max(len(edit["old_string"]) for edit in edits) - 1
+    places = []
+    for index, edit in enumerate(edits):
+        start = original.find(edit["old_string"])
+        if start < 0:
+            return None
+        places.append((start, start + len(edit["old_string"]), index))
+    places.sort()
+    for (_, end, _), (start, _, _) in zip(places, places[1:]):
+        if start <= end + reach:
+            return None
+
+    # Each replacement with reach characters of context either side, in file order
+    seams = [original[max(0, start - reach):start] + edits[index].get("new_string", "") + original[end:end + reach]
+             for start, end, index in places]
+    if len(edits) > 1 and not any("\0" in edit["old_string"] for edit in edits):
+        joined = "\0".join(seams)
+        bounds = []
+        total = 0
+        for seam in seams:
+            total += len(seam) + 1
+            bounds.append(total)
+        for rank, (_, _, index) in enumerate(places):
+            old = edits[index]["old_string"]
+            # An occurrence in an earlier-placed seam of an earlier edit would be found first
+            limit = bounds[rank - 1] if rank else 0
+            found = joined.find(old, 0, limit)
+            while found >= 0:
+                if places[bisect.bisect_right(bounds, found)][2] < index:
+                    return None
+                found = joined.find(old, found + 1, limit)
+    elif len(edits) > 1:
+        for rank, (_, _, index) in enumerate(places):
+            old = edits[index]["old_string"]
+            if any(places[before][2] < index and old in seams[before] for before in range(rank)):
+                return None
+
+    pieces = []
+    hunks = []
+    previous = 0
+    delta = 0
+    for start, end, index in places:
+        new = edits[index].get("new_string", "")
+        pieces.append(original[previous:start])
+        pieces.append(new)
+        hunks.append(Hunk(start, end, start + delta, start + delta + len(new), (index,)))
+        delta += len(new) - (end - start)
+        previous = end
+    pieces.append(original[previous:])
+    return "".join(pieces), hunks
+
+
+def apply_edits(original: str, edits: List[dict]) -> Optional[Tuple[str, List[Hunk]]]:
+    """
+    Apply Edit/MultiEdit replacements in order, as the tool would, returning the new
+    text and its hunks; None when an old_string is not found (the tool will reject it)
+    """
+    spread = _apply_spread(original, edits)
+    if spread is not None:
+        return spread
+    text = original
+    hunks: List[Hunk] = []
+    for index, edit in enumerate(edits):
+        old = edit.get("old_string", "")
+        new = edit.get("new_string", "")
+        if not old:
+            # An empty old_string only creates a file that does not exist yet
+            if text:
+                return None
+            hunks = _fold(hunks, 0, 0, len(new), index)
+            text = new
+            continue
+        start = text.find(old)
+        if start < 0:
+            return None
+        starts = [start]
+        if edit.get("replace_all"):
+            while True:
+                start = text.find(old, start + len(old))
+                if start < 0:
+                    break
+                starts.append(start)
+        pieces = []
+        previous = 0
+        for offset, start in enumerate(starts):
+            pieces.append(text[previous:start])
+            pieces.append(new)
+            previous = start + len(old)
+            # Earlier replacements in this edit have already moved the text by offset * delta
+            current = start + offset * (len(new) - len(old))
+            hunks = _fold(hunks, current, current + len(old), len(new), index)
+        pieces.append(text[previous:])
+        text = "".join(pieces)
+    return text, hunks
+
+
+class EditedFile:
+    """A file's on-disk text, the text the edits would leave, and where they differ"""
+
+    def __init__(self, path: str, original: str, content: str, hunks: List[Hunk], edits: List[dict]):
+        self.path = path
+        self.original = original
+        self.content = content
+        self.hunks = hunks
+        self.edits = edits
+        self._ends = [hunk.new_end for hunk in hunks]
+        self._starts = [hunk.new_start for hunk in hunks]
+        # _shifts[k] is the total delta of the first k hunks
+        self._shifts = [0]
+        for hunk in hunks:
+            self._shifts.append(self._shifts[-1] + hunk.delta)
+        self._windows: Optional[List[Tuple[int, int, int, int]]] = None
+
+    def to_old(self, pos: int) -> int:
+        """Position in the original of an unchanged position in content (before any hunk starting there)"""
+        return pos - self._shifts[bisect.bisect_left(self._starts, pos)]
+
+    def hunks_in(self, start: int, end: int) -> List[Hunk]:
+        """Hunks overlapping content[start:end]; a deletion counts when the span reaches across it"""
+        index = bisect.bisect_right(self._ends, start)
+        found = []
+        while index < len(self.hunks) and self.hunks[index].new_start < end:
+            found.append(self.hunks[index])
+            index += 1
+        return found
+
+    def windows(self, lines: int) -> List[Tuple[int, int, int, int]]:
+        """Merged (new_start, new_end, old_start, old_end) windows: each hunk's lines plus context"""
+        if self._windows is not None:
+            return self._windows
+        content = self.content
+        spans: List[List[int]] = []
+        for hunk in self.hunks:
+            start = content.rfind("\n", 0, hunk.new_start) + 1
+            for _ in range(lines):
+                if start == 0:
+                    break
+                start = content.rfind("\n", 0, start - 1) + 1
+            end = hunk.new_end
+            for _ in range(lines + 1):
+                newline = content.find("\n", end)
+                if newline < 0:
+                    end = len(content)
+                    break
+                end = newline + 1
+            if spans and start <= spans[-1][1]:
+                spans[-1][1] = max(spans[-1][1], end)
+            else:
+                spans.append([start, end])
+        # Window edges sit in unchanged text, so they map straight back to the original
+        self._windows = [(start, end, self.to_old(start), self.to_old(end)) for start, end in spans]
+        return self._windows
+
+
+def resolve_path(file_path: str) -> Path:
+    """Edit paths are absolute in practice; relative ones are taken from the project directory"""
+    path = Path(file_path)
+    if not path.is_absolute():
+        path = Path(os.environ.get("CLAUDE_PROJECT_DIR", "")) / path
+    return path
+
+
+def edited_content(file_path: str, edits: List[dict]) -> Optional[str]:
+    """The file as the edits would leave it, remembered so scans of it can go incremental"""
+    global _edited
+    if not file_path:
+        return None
+    path = resolve_path(file_path)
+    try:
+        original = path.read_text(encoding="utf-8", errors="surrogateescape")
+    except FileNotFoundError:
+        original = ""
+    except OSError:
+        return None
+    applied = apply_edits(original, edits)
+    if applied is None:
+        return None
+    content, hunks = applied
+    _edited = EditedFile(str(path), original, content, hunks, edits)
+    return content
+
+
+def edited_file(content: str) -> Optional[EditedFile]:
+    """The EditedFile content came from, if it is the result of the last edited_content()"""
+    if _edited is not None and _edited.content is content:
+        return _edited
+    return None
+
+
+def edit_windows(content: str) -> Optional[str]:
+    """The text around the hunks (with $CLAUDE_EDIT_WINDOW_LINES lines of context) of the edit that left
+    content, joined; None when content is not the last edited file's"""
+    edited = edited_file(content)
+    if edited is None:
+        return None
+    return "\n".join(content[start:end] for start, end, _, _ in edited.windows(window_lines()))
+
+
+def attributes(content: str) -> bool:
+    """True when content is a MultiEdit's result, whose findings are traced to its hunks"""
+    edited = edited_file(content)
+    return edited is not None and len(edited.edits) > 1
+
+
+def reset_findings() -> None:
+    """Forget the last hook run's per-hunk findings"""
+    _hunk_findings.clear()
+
+
+def findings_note() -> str:
+    """The current MultiEdit's findings by edit and line, or "" when no rule matched inside a hunk"""
+    edited = _edited
+    if edited is None or not _hunk_findings:
+        return ""
+    content = edited.content
+    lines = ["✂️ Matches by edit:"]
+    for hunk in sorted(_hunk_findings, key=lambda hunk: hunk.new_start):
+        first = content.count("\n", 0, hunk.new_start) + 1
+        last = first + content.count("\n", hunk.new_start, max(hunk.new_start, hunk.new_end - 1))
+        where = f"line {first}" if first == last else f"lines {first}-{last}"
+        label = ", ".join(str(index + 1) for index in hunk.edits)
+        descriptions = _hunk_findings[hunk]
+        shown = "; ".join(descriptions[:MAX_FINDINGS_PER_HUNK])
+        if len(descriptions) > MAX_FINDINGS_PER_HUNK:
+            shown += f" (+{len(descriptions) - MAX_FINDINGS_PER_HUNK} more)"
+        lines.append(f"• edit{'s' if len(hunk.edits) > 1 else ''} {label} ({where}): {shown}")
+    return "\n".join(lines)
+
+
+def _encode(rule_set: RuleSet, matches: List[RuleMatch]) -> list:
+    """[[rule index, start, end], ...] - the form spans are recorded in"""
+    indexes = {id(rule): index for index, rule in enumerate(rule_set.rules)}
+    return [[indexes[id(hit.rule)], *hit.span] for hit in matches]
+
+
+class ScanSession:
+    """
+    Scans of one content, recorded per rule set for the next edit; for an edited file
+    with a recorded base, each set scans only the edit windows and merges the base spans
+    """
+
+    def __init__(self, content: str, base: Optional[dict], edited: Optional[EditedFile], lines: int,
+                 attribute: bool = False):
+        self.content = content
+        self.base = base or {}
+        self.edited = edited if base else None
+        # The MultiEdit whose hunks matched rules are traced to
+        self.source = edited if attribute else None
+        self.lines = lines
+        self.record: Dict[str, list] = {}
+        self.windows: List[Tuple[int, int, int, int]] = []
+        self._window_text = ""
+        self._source_text: Optional[str] = None
+        # (id(rule), source windows?) -> whether it can match inside them, from one search of their joined text
+        self._in_windows: Dict[Tuple[int, bool], bool] = {}
+        if self.edited is not None:
+            windows = self.edited.windows(lines)
+            if sum(end - start for start, end, _, _ in windows) <= MAX_WINDOW_SHARE * len(content):
+                self.windows = windows
+                self._window_text = "\n".join(content[start:end] for start, end, _, _ in windows)
+
+    def _shift(self, span: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """A base span moved past the edits, or None when it overlaps a window"""
+        start, end = span
+        offset = 0
+        for new_start, new_end, old_start, old_end in self.windows:
+            if end <= old_start and start < old_start:
+                break
+            if start < old_end:
+                return None
+            offset = new_end - old_end
+        return start + offset, end + offset
+
+    def scan(self, rule_set: RuleSet) -> Tuple[List[RuleMatch], List]:
+        base = self.base.get(rule_set.name)
+        if base is None or not self.windows:
+            matches, timed_out = rule_set.scan_full(self.content)
+        else:
+            matches, timed_out = self._merge_first(rule_set, {index: (start, end) for index, start, end in base})
+        if not timed_out:
+            self.record[rule_set.name] = _encode(rule_set, matches)
+        if self.source is not None:
+            self._attribute(matches)
+        return matches, timed_out
+
+    def _merge_first(self, rule_set: RuleSet, base: Dict[int, Tuple[int, int]]) -> Tuple[List[RuleMatch], List]:
+        content = self.content
+        in_windows = set(rule_set._eligible(self._window_text))
+        first_old = self.windows[0][2]
+        matches: List[RuleMatch] = []
+        timed_out: List = []
+        for index, rule in enumerate(rule_set.rules):
+            span = base.get(index)
+            if span is not None and span[1] <= first_old and span[0] < first_old:
+                # Untouched text before every edit: still the first match
+                matches.append(RuleMatch(rule, span))
+                continue
+            try:
+                searchable = index in in_windows and self._may_match(rule, self._window_text)
+                found = self._first_after_edits(rule, span, searchable)
+            except rule_registry.RuleTimeout as timeout:
+                rule_registry.record_inconclusive(rule, timeout)
+                timed_out.append(rule)
+                continue
+            if found is not None:
+                matches.append(RuleMatch(rule, found))
+        return matches, timed_out
+
+    def _first_after_edits(self, rule, span: Optional[Tuple[int, int]], searchable: bool) -> Optional[Tuple[int, int]]:
+        """First match given the base's first match span, searching only windows where possible"""
+        content = self.content
+        for new_start, new_end, old_start, old_end in self.windows:
+            if span is not None and span[1] <= old_start and span[0] < old_start:
+                # The base match sits in unchanged text before this window
+                return self._shift(span)
+            if searchable:
+                match = rule.search(content, new_start, new_end)
+                if match is not None:
+                    return match.span()
+            if span is not None and span[0] < old_end:
+                # The base match was inside this window; past it the base says nothing
+                match = rule.search(content, new_end)
+                return match.span() if match is not None else None
+        return self._shift(span) if span is not None else None
+
+    def find_all(self, rule_set: RuleSet) -> List[RuleMatch]:
+        key = f"{rule_set.name}*"
+        base = self.base.get(key)
+        inconclusive = len(rule_registry.inconclusive_rules())
+        if base is None or not self.windows:
+            matches = rule_set.find_all_full(self.content)
+        else:
+            matches = self._merge_all(rule_set, base)
+        if len(rule_registry.inconclusive_rules()) == inconclusive:
+            self.record[key] = _encode(rule_set, matches)
+        if self.source is not None:
+            self._attribute(matches)
+        return matches
+
+    def _may_match(self, rule, joined: str, source: bool = False) -> bool:
+        """
+        False only when rule cannot match inside any window. Windows start at line starts and
+        are joined by newlines, so for patterns that do not look past a match's own text, a
+        match in one window is also a match in the joined text.
+        """
+        key = (id(rule), source)
+        known = self._in_windows.get(key)
+        if known is None:
+            if any(token in rule.pattern for token in EDGE_SENSITIVE):
+                known = True
+            else:
+                try:
+                    known = rule.search(joined) is not None
+                except rule_registry.RuleTimeout:
+                    known = True
+            self._in_windows[key] = known
+        return known
+
+    def _attribute(self, matches: List[RuleMatch]):
+        """Search each matched rule through the edit windows and note the hunks its matches overlap"""
+        source = self.source
+        content = self.content
+        if self._source_text is None:
+            self._source_text = "\n".join(content[start:end] for start, end, _, _ in source.windows(self.lines))
+        seen = set()
+        for hit in matches:
+            rule = hit.rule
+            if id(rule) in seen:
+                continue
+            seen.add(id(rule))
+            if not self._may_match(rule, self._source_text, source=True):
+                continue
+            for start, end, _, _ in source.windows(self.lines):
+                pos = start
+                while pos <= end:
+                    try:
+                        match = rule.search(content, pos, end)
+                    except rule_registry.RuleTimeout:
+                        # The rule already matched; only its place in the edit is unknown
+                        break
+                    if match is None:
+                        break
+                    for hunk in source.hunks_in(*match.span()):
+                        found = _hunk_findings.setdefault(hunk, [])
+                        if rule.description not in found:
+                            found.append(rule.description)
+                    pos = max(match.end(), match.start() + 1)
+
+    def _merge_all(self, rule_set: RuleSet, base: list) -> List[RuleMatch]:
+        found: Dict[int, List[Tuple[int, int]]] = {}
+        for index, start, end in base:
+            span = self._shift((start, end))
+            if span is not None:
+                found.setdefault(index, []).append(span)
+        for index in rule_set._eligible(self._window_text):
+            rule = rule_set.rules[index]
+            if not self._may_match(rule, self._window_text):
+                continue
+            for new_start, new_end, _, _ in self.windows:
+                found.setdefault(index, []).extend(match.span() for match in rule.finditer(self.content, new_start, new_end))
+        return [RuleMatch(rule_set.rules[index], span) for index in sorted(found) for span in sorted(found[index])]
+
+
+@contextmanager
+def scan_session(content: str, cache, pack_version: str):
+    """
+    While active, rule-set scans of content go through a ScanSession; on exit the spans
+    it recorded are stored in the verdict cache as the base for the next edit
+    """
+    edited = edited_file(content)
+    attribute = edited is not None and len(edited.edits) > 1
+    recording = cache is not None and len(content) >= INCREMENTAL_MIN_CHARS
+    if not (recording or attribute):
+        yield None
+        return
+
+    from verdict_cache import verdict_key
+
+    base = None
+    if recording and edited is not None and len(edited.original) >= INCREMENTAL_MIN_CHARS:
+        try:
+            base = cache.get(verdict_key(pack_version, RECORD_KIND, "", edited.original))
+        except Exception as e:
+            cache.record_error(e)
+
+    session = ScanSession(content, base, edited, window_lines(), attribute)
+    previous = rule_registry._scan_session
+    rule_registry.set_scan_session(session)
+    try:
+        yield session
+    finally:
+        rule_registry.set_scan_session(previous)
+
+    if recording and session.record:
+        key = verdict_key(pack_version, RECORD_KIND, "", content)
+        try:
+            known = cache.peek(key) or {}
+            if any(known.get(name) != spans for name, spans in session.record.items()):
+                cache.put(key, RECORD_KIND, "", json.dumps(dict(known, **session.record), separators=(",", ":")))
+        except Exception as e:
+            cache.record_error(e)
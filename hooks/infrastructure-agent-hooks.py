@@ -8,15 +8,20 @@ import json
 import sys
 import os
 import re
-import yaml
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
-from hook_utils import HookUtils, WorkStatusManager, OrchestrationManager
+from hook_utils import HookUtils, WorkStatusManager, OrchestrationManager, lazy_import
+from rule_registry import load_rule_pack
+
+RULES = load_rule_pack()
+
+# Only docker-compose writes parse YAML
+yaml = lazy_import("yaml")
 
 def validate_docker_configuration(project_dir: str, tool_input: dict) -> tuple[bool, str, str]:
     """Validate Docker configuration files"""
     
-    file_path = tool_input.get("filePath", "")
+    file_path = HookUtils.tool_file_path(tool_input)
     content = tool_input.get("content", "")
     
     if "dockerfile" not in file_path.lower() and "docker-compose" not in file_path.lower():
@@ -27,18 +32,9 @@ def validate_docker_configuration(project_dir: str, tool_input: dict) -> tuple[b
     
     if "dockerfile" in file_path.lower():
         # Dockerfile validation
-        dockerfile_issues = [
-            (r"FROM.*:latest", "Using :latest tag - specify explicit versions"),
-            (r"RUN.*apt-get update.*&&.*apt-get install", "apt-get without cleanup - increases image size"),
-            (r"ADD\s+http", "Using ADD for URLs - prefer RUN with wget/curl"),
-            (r"USER\s+root", "Running as root user - security risk"),
-            (r"COPY\s+\.\s+", "Copying entire context - use .dockerignore"),
-        ]
-        
-        for pattern, issue in dockerfile_issues:
-            if re.search(pattern, content, re.IGNORECASE):
-                issues.append(f"🐳 DOCKERFILE: {issue}")
-                risk_level = "MEDIUM"
+        for rule in RULES["infrastructure.dockerfile"].matching(content):
+            issues.append(f"🐳 DOCKERFILE: {rule.description}")
+            risk_level = "MEDIUM"
     
     elif "docker-compose" in file_path.lower():
         # Docker Compose validation
@@ -52,17 +48,9 @@ def validate_docker_configuration(project_dir: str, tool_input: dict) -> tuple[b
             issues.append("🐳 COMPOSE: Invalid YAML syntax")
             risk_level = "HIGH"
         
-        compose_patterns = [
-            (r"image:.*:latest", "Using :latest tag in compose - specify versions"),
-            (r"privileged:\s*true", "privileged mode enabled - security risk"),
-            (r"network_mode:\s*host", "host network mode - security concern"),
-            (r"volumes:.*:/var/run/docker.sock", "Mounting docker socket - high security risk"),
-        ]
-        
-        for pattern, issue in compose_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                issues.append(f"🐳 COMPOSE: {issue}")
-                risk_level = "HIGH" if "security risk" in issue else "MEDIUM"
+        for rule in RULES["infrastructure.compose"].matching(content):
+            issues.append(f"🐳 COMPOSE: {rule.description}")
+            risk_level = "HIGH" if "security risk" in rule.description else "MEDIUM"
     
     if issues:
         return False, risk_level, "; ".join(issues)
@@ -72,7 +60,7 @@ def validate_docker_configuration(project_dir: str, tool_input: dict) -> tuple[b
 def validate_kubernetes_configuration(tool_input: dict) -> tuple[bool, str, str]:
     """Validate Kubernetes manifests"""
     
-    file_path = tool_input.get("filePath", "")
+    file_path = HookUtils.tool_file_path(tool_input)
     content = tool_input.get("content", "")
     
     k8s_extensions = [".yaml", ".yml"]
@@ -87,29 +75,14 @@ def validate_kubernetes_configuration(tool_input: dict) -> tuple[bool, str, str]
     issues = []
     risk_level = "LOW"
     
-    k8s_security_issues = [
-        (r"runAsUser:\s*0", "Running as root user (UID 0) - security risk"),
-        (r"privileged:\s*true", "Privileged container - high security risk"),
-        (r"hostNetwork:\s*true", "Host network access - security risk"),
-        (r"hostPID:\s*true", "Host PID namespace - security risk"),
-        (r"allowPrivilegeEscalation:\s*true", "Privilege escalation allowed - security risk"),
-    ]
-    
-    k8s_best_practices = [
-        (r"resources:", "Resource limits/requests not defined"),
-        (r"livenessProbe:", "Liveness probe not configured"),
-        (r"readinessProbe:", "Readiness probe not configured"),
-    ]
-    
-    for pattern, issue in k8s_security_issues:
-        if re.search(pattern, content, re.IGNORECASE):
-            issues.append(f"☸️ K8S SECURITY: {issue}")
-            risk_level = "HIGH"
+    for rule in RULES["infrastructure.kubernetes.security"].matching(content):
+        issues.append(f"☸️ K8S SECURITY: {rule.description}")
+        risk_level = "HIGH"
     
     # Check for missing best practices (inverse logic)
-    for pattern, issue in k8s_best_practices:
-        if not re.search(pattern, content, re.IGNORECASE) and "kind: Deployment" in content:
-            issues.append(f"☸️ K8S BEST PRACTICE: {issue}")
+    if "kind: Deployment" in content:
+        for rule in RULES["infrastructure.kubernetes.best_practices"].missing(content):
+            issues.append(f"☸️ K8S BEST PRACTICE: {rule.description}")
             if risk_level == "LOW":
                 risk_level = "MEDIUM"
     
@@ -121,7 +94,7 @@ def validate_kubernetes_configuration(tool_input: dict) -> tuple[bool, str, str]
 def validate_terraform_configuration(tool_input: dict) -> tuple[bool, str, str]:
     """Validate Terraform configurations"""
     
-    file_path = tool_input.get("filePath", "")
+    file_path = HookUtils.tool_file_path(tool_input)
     content = tool_input.get("content", "")
     
     if not file_path.endswith(".tf"):
@@ -130,32 +103,16 @@ def validate_terraform_configuration(tool_input: dict) -> tuple[bool, str, str]:
     issues = []
     risk_level = "LOW"
     
-    terraform_security_issues = [
-        (r'default\s*=\s*".*password.*"', "Hardcoded password in Terraform"),
-        (r'default\s*=\s*".*secret.*"', "Hardcoded secret in Terraform"),
-        (r'default\s*=\s*".*key.*"', "Hardcoded key in Terraform"),
-        (r"public_access_block.*=.*false", "S3 public access not blocked"),
-        (r"acl.*=.*public-read", "Public read ACL - security risk"),
-    ]
-    
-    terraform_best_practices = [
-        (r"terraform\s*{", "Terraform version constraint not specified"),
-        (r"backend\s*\"", "Remote backend configuration missing"),
-        (r"tags\s*=", "Resource tagging not implemented"),
-    ]
-    
-    for pattern, issue in terraform_security_issues:
-        if re.search(pattern, content, re.IGNORECASE):
-            issues.append(f"🏗️ TERRAFORM SECURITY: {issue}")
-            risk_level = "HIGH"
+    for rule in RULES["infrastructure.terraform.security"].matching(content):
+        issues.append(f"🏗️ TERRAFORM SECURITY: {rule.description}")
+        risk_level = "HIGH"
     
     # Check for missing best practices
     if "resource " in content:
-        for pattern, issue in terraform_best_practices:
-            if not re.search(pattern, content, re.IGNORECASE):
-                issues.append(f"🏗️ TERRAFORM BEST PRACTICE: {issue}")
-                if risk_level == "LOW":
-                    risk_level = "MEDIUM"
+        for rule in RULES["infrastructure.terraform.best_practices"].missing(content):
+            issues.append(f"🏗️ TERRAFORM BEST PRACTICE: {rule.description}")
+            if risk_level == "LOW":
+                risk_level = "MEDIUM"
     
     if issues:
         return False, risk_level, "; ".join(issues)
@@ -165,7 +122,7 @@ def validate_terraform_configuration(tool_input: dict) -> tuple[bool, str, str]:
 def check_infrastructure_dependencies(project_dir: str, tool_input: dict) -> tuple[bool, str]:
     """Check for infrastructure dependencies and coordination"""
     
-    file_path = tool_input.get("filePath", "")
+    file_path = HookUtils.tool_file_path(tool_input)
     
     # If creating infrastructure files, ensure proper coordination
     infra_files = ["docker-compose.yml", "Dockerfile", "terraform", "kubernetes", ".tf", ".yaml"]
@@ -191,13 +148,15 @@ def main():
         
         tool_name = input_data.get("tool_name", "")
         tool_input = input_data.get("tool_input", {})
+        # Edit/MultiEdit carry replacements, not content; scan the file as they would leave it
+        tool_input = HookUtils.resolve_edit(tool_name, tool_input)
         
         # Only process infrastructure-related tools
         if tool_name not in ["Write", "Edit", "MultiEdit", "Task"]:
             sys.exit(0)
         
         # Check if this is infrastructure-related
-        file_path = tool_input.get("filePath", "")
+        file_path = HookUtils.tool_file_path(tool_input)
         infra_keywords = ["docker", "kubernetes", "terraform", ".tf", ".yaml", ".yml", "compose"]
         if not any(keyword in file_path.lower() for keyword in infra_keywords):
             sys.exit(0)
@@ -205,18 +164,23 @@ def main():
         work_status = WorkStatusManager(project_dir)
         orchestration = OrchestrationManager(project_dir)
         
-        # Check file locks
+        # Check file locks (with $CLAUDE_LOCK_WAIT set, queue for a held lock instead of refusing)
         if file_path:
-            is_locked, lock_info = work_status.is_file_locked(file_path)
+            is_locked, lock_info = work_status.check_write(file_path, HookUtils.lock_holder(input_data))
             if is_locked:
                 HookUtils.block_with_error(f"🔒 FILE LOCKED: {lock_info}")
         
-        # Validate configurations
+        # Validate configurations (reused from the verdict cache when this content was already scanned)
+        (docker_valid, docker_risk, docker_msg), (k8s_valid, k8s_risk, k8s_msg), (tf_valid, tf_risk, tf_msg) = HookUtils.cached_scan(
+            __file__, file_path, tool_input.get("content", ""), lambda: (
+                validate_docker_configuration(project_dir, tool_input),
+                validate_kubernetes_configuration(tool_input),
+                validate_terraform_configuration(tool_input),
+            ))
         all_issues = []
         highest_risk = "LOW"
         
         # Docker validation
-        docker_valid, docker_risk, docker_msg = validate_docker_configuration(project_dir, tool_input)
         if not docker_valid:
             all_issues.append(docker_msg)
             if docker_risk == "HIGH":
@@ -225,7 +189,6 @@ def main():
                 highest_risk = "MEDIUM"
         
         # Kubernetes validation
-        k8s_valid, k8s_risk, k8s_msg = validate_kubernetes_configuration(tool_input)
         if not k8s_valid:
             all_issues.append(k8s_msg)
             if k8s_risk == "HIGH":
@@ -234,7 +197,6 @@ def main():
                 highest_risk = "MEDIUM"
         
         # Terraform validation
-        tf_valid, tf_risk, tf_msg = validate_terraform_configuration(tool_input)
         if not tf_valid:
             all_issues.append(tf_msg)
             if tf_risk == "HIGH":
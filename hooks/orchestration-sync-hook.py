@@ -10,6 +10,7 @@ import os
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 from hook_utils import HookUtils, WorkStatusManager, OrchestrationManager
+from signal_routing import route_signals
 
 def main():
     try:
@@ -24,7 +25,7 @@ def main():
         if tool_name not in ["Write", "Edit", "MultiEdit"]:
             sys.exit(0)
         
-        file_path = tool_input.get("filePath", "")
+        file_path = HookUtils.tool_file_path(tool_input)
         if not file_path:
             sys.exit(0)
         
@@ -35,39 +36,30 @@ def main():
         agent_name = os.environ.get("CLAUDE_AGENT_NAME", "unknown-agent")
         operation = f"{tool_name} operation on {os.path.basename(file_path)}"
         
-        work_status.log_activity(
-            agent=agent_name,
-            operation=operation,
-            file_path=file_path,
-            status="completed"
-        )
-        
-        # Release any file locks
-        work_status.unlock_file(file_path)
-        
-        # Signal completion to dependent agents
-        if tool_name in ["Write", "Edit"]:
-            # Determine which agents might be interested
-            dependent_agents = []
+        # One store transaction and one render of the coordination files (in the background) for the whole sync
+        with work_status.transaction(), orchestration.transaction():
+            work_status.log_activity(
+                agent=agent_name,
+                operation=operation,
+                file_path=file_path,
+                status="completed"
+            )
             
-            # File type based dependencies
-            if file_path.endswith(('.py', '.pyi')):
-                dependent_agents.extend(['test-automation-expert', 'security-auditor'])
-            elif file_path.endswith(('.js', '.jsx', '.ts', '.tsx')):
-                dependent_agents.extend(['test-automation-expert', 'ui-ux-designer'])
-            elif file_path.endswith(('.sql', '.py')) and 'model' in file_path.lower():
-                dependent_agents.extend(['database-expert', 'security-auditor'])
-            elif file_path.endswith(('.yml', '.yaml', '.dockerfile')):
-                dependent_agents.extend(['docker-expert', 'security-auditor'])
-            elif file_path.endswith(('.md', '.rst', '.txt')):
-                dependent_agents.extend(['technical-writer'])
+            # Release any file locks
+            work_status.unlock_file(file_path)
             
-            # Signal dependent agents - log coordination needs
-            for dep_agent in dependent_agents:
-                orchestration.update_progress(dep_agent, "coordination_signal", file_path, "pending_review")
-        
-        # Update orchestration index with completion
-        orchestration.update_progress(agent_name, operation, file_path, "completed")
+            # Signal completion to dependent agents
+            if tool_name in ["Write", "Edit"]:
+                # Every route the file's extension, path or content matches (see signal_routing.py)
+                content = tool_input.get("content") or tool_input.get("new_string", "")
+                dependent_agents = route_signals(HookUtils.get_relative_path(file_path, project_dir), content)
+                
+                # Signal dependent agents - one event for all of them, and a review in each one's inbox
+                orchestration.signal_agents(dependent_agents, file_path, "pending_review", agent_name,
+                                            tool_input.get("content") if tool_name == "Write" else None)
+            
+            # Log completion to the orchestration log (orchestration-index.md is rendered from it)
+            orchestration.update_progress(agent_name, operation, file_path, "completed")
         
         # Success output
         HookUtils.output_json({
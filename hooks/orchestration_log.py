@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Event log behind orchestration-index.md.
+Progress updates and containerization alerts are appended as events to a journal
+(activity_journal.py, in LOG_DIR) instead of being edited into the markdown, so recording one
+is a single append however large the index has grown. The current state - the latest progress,
+each agent's latest progress and the open containerization alerts - is a reduction of the log
+kept in memory and folded forward from where it was last read, so a query only reads the
+events logged since. A coordination signal names every agent it is for in one event, so telling
+dozens of subscribers about a file is one append; each agent keeps the signals for its
+SIGNALS_KEPT most recently signalled files until it drains them from its review inbox. The reduction is checkpointed to STATE_NAME whenever the journal starts
+a segment and whenever the view is rendered: a new process starts from there, and compaction
+never drops an event that is not yet part of a checkpoint.
+orchestration-index.md stays the document agents read and edit. Only the sections the hooks
+own (Latest Progress, Coordination Signals and the containerization alerts) are generated, and only when the view
+is stale: its last line records the log position it was rendered at. The first render adopts
+the alerts and progress an index written before the log existed already shows.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from activity_journal import ActivityJournal
+from coordination_files import read_text, state_dir, update_file
+
+# Directory in the project's state directory holding the event journal, and the checkpointed
+# reduction beside it (outside the journal, whose listing is only reused while the directory is unchanged)
+LOG_DIR = "orchestration.journal"
+STATE_NAME = "orchestration.state.json"
+
+EVENT_FIELDS = ("at", "kind", "agent", "operation", "path", "status", "files", "agents")
+
+# Event kinds: an agent's progress, a signal to the agents concerned with a file and an agent taking
+# its signals from its inbox, a containerization review request, and its approval
+PROGRESS = "progress"
+SIGNAL = "coordination_signal"
+SIGNALS_DRAINED = "coordination_signals_drained"
+CONTAINERIZATION = "containerization"
+CONTAINERIZATION_RESOLVED = "containerization_resolved"
+
+PROGRESS_HEADING = "### Latest Progress"
+SIGNAL_HEADING = "### 📣 Coordination Signals"
+
+# Files whose latest signal each agent keeps in the reduction (and the view), the most recent ones
+SIGNALS_KEPT = 20
+ALERT_HEADING = "### 🐳 CONTAINERIZATION REVIEW REQUIRED"
+CONTAINERIZATION_SECTION = "## Containerization Status"
+CONTAINERIZATION_COMMENT = "<!-- Docker and deployment readiness -->"
+
+POSITION_MARKER = re.compile(r"<!-- orchestration log position: (\d+):(\d+) -->")
+LEGACY_PROGRESS = re.compile(r"^### Latest Progress \((?P<at>.*)\)\n"
+                             r"- \*\*Agent\*\*: (?P<agent>.*)\n"
+                             r"- \*\*Operation\*\*: (?P<operation>.*)\n"
+                             r"- \*\*File\*\*: `(?P<path>.*)`\n"
+                             r"- \*\*Status\*\*: (?P<status>.*)$", re.M)
+LEGACY_ALERT = re.compile(r"^### 🐳 CONTAINERIZATION REVIEW REQUIRED \((?P<at>.*)\)\n"
+                          r"- \*\*Requested by\*\*: (?P<agent>.*)\n"
+                          r"- \*\*Files needing containerization\*\*: (?P<files>.*)$", re.M)
+
+_logs: Dict[str, "OrchestrationLog"] = {}
+
+
+class OrchestrationState:
+    """What the log adds up to at position: the latest progress, each agent's, the signals each agent
+    was sent (the latest per file, as {"at", "from", "status"}) and the open alerts"""
+
+    def __init__(self, position: Tuple[int, int] = (0, 0), latest: Optional[Dict] = None,
+                 agents: Optional[Dict[str, Dict]] = None, alerts: Optional[List[Dict]] = None,
+                 signals: Optional[Dict[str, Dict[str, Dict]]] = None):
+        self.position = tuple(position)
+        self.latest = latest
+        self.agents = agents or {}
+        self.alerts = alerts or []
+        self.signals = signals or {}
+
+    def apply(self, event: Dict):
+        kind = event.get("kind")
+        if kind == PROGRESS:
+            self.latest = self.agents[event.get("agent", "")] = event
+        elif kind == SIGNAL:
+            signal = {"at": event["at"], "from": event.get("agent", ""), "status": event["status"]}
+            for agent in event.get("agents") or []:
+                signals = self.signals.setdefault(agent, {})
+                # Re-signalled files move to the end, so each agent's signals stay oldest first
+                signals.pop(event["path"], None)
+                signals[event["path"]] = signal
+                if len(signals) > SIGNALS_KEPT:
+                    del signals[next(iter(signals))]
+        elif kind == SIGNALS_DRAINED:
+            signals = self.signals.get(event.get("agent", ""), {})
+            for path in event.get("files") or []:
+                signals.pop(path, None)
+            if not signals:
+                self.signals.pop(event.get("agent", ""), None)
+        elif kind == CONTAINERIZATION:
+            self.alerts.append(event)
+        elif kind == CONTAINERIZATION_RESOLVED:
+            self.alerts = []
+
+    def to_dict(self) -> Dict:
+        return {"position": list(self.position), "latest": self.latest, "agents": self.agents, "alerts": self.alerts,
+                "signals": self.signals}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "OrchestrationState":
+        return cls(data.get("position", (0, 0)), data.get("latest"), data.get("agents"), data.get("alerts"),
+                   data.get("signals"))
+
+
+def view_position(content: str) -> Optional[Tuple[int, int]]:
+    """The log position an orchestration-index.md was rendered at, None if it never was"""
+    match = POSITION_MARKER.search(content)
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+
+def progress_lines(event: Dict) -> List[str]:
+    return [f"{PROGRESS_HEADING} ({event['at']})",
+            f"- **Agent**: {event['agent']}",
+            f"- **Operation**: {event['operation']}",
+            f"- **File**: `{event['path']}`",
+            f"- **Status**: {event['status']}"]
+
+
+def signal_lines(signals: Dict[str, Dict[str, Dict]]) -> List[str]:
+    """One line per agent and status, listing the files it was signalled about"""
+    lines = [SIGNAL_HEADING]
+    for agent in sorted(signals):
+        by_status: Dict[str, List[str]] = {}
+        for path, event in signals[agent].items():
+            by_status.setdefault(event["status"], []).append(f"`{path}`")
+        lines += [f"- **{agent}** ({status}): {', '.join(paths)}" for status, paths in by_status.items()]
+    return lines
+
+
+def alert_lines(event: Dict) -> List[str]:
+    return [f"{ALERT_HEADING} ({event['at']})",
+            f"- **Requested by**: {event['agent']}",
+            f"- **Files needing containerization**: {', '.join(f'`{f}`' for f in event['files'])}",
+            "- **Status**: PENDING docker-expert review",
+            "- **Action Required**: docker-expert must review and approve containerization"]
+
+
+def parse_legacy(content: str) -> List[Dict]:
+    """Containerization alerts and the latest progress written into orchestration-index.md, as events, oldest first"""
+    # Each alert was inserted above the ones before it
+    events = [{"at": match.group("at"), "kind": CONTAINERIZATION, "agent": match.group("agent"),
+               "files": re.findall(r"`([^`]*)`", match.group("files"))}
+              for match in LEGACY_ALERT.finditer(content)][::-1]
+    events.extend(dict(match.groupdict(), kind=PROGRESS) for match in LEGACY_PROGRESS.finditer(content))
+    return events
+
+
+def render_view(content: str, state: OrchestrationState) -> str:
+    """content with its generated sections replaced by state's, and the position marker last"""
+    lines = []
+    skipping = False
+    for line in content.split("\n"):
+        if POSITION_MARKER.fullmatch(line):
+            continue
+        # A section the log has nothing for yet (a progress note written by hand) is left alone
+        if (line.startswith(ALERT_HEADING) or line.startswith(SIGNAL_HEADING)
+                or (state.latest and line.startswith(PROGRESS_HEADING))):
+            skipping = True
+            continue
+        if skipping:
+            if line.startswith("- **") or not line.strip():
+                continue
+            skipping = False
+        lines.append(line)
+
+    if state.alerts and CONTAINERIZATION_SECTION in lines:
+        at = lines.index(CONTAINERIZATION_SECTION) + 1
+        if at < len(lines) and lines[at] == CONTAINERIZATION_COMMENT:
+            at += 1
+        # Newest first, as they were inserted before
+        lines[at:at] = [line for alert in reversed(state.alerts) for line in alert_lines(alert) + [""]]
+
+    while lines and not lines[-1].strip():
+        lines.pop()
+    if state.signals:
+        lines += [""] + signal_lines(state.signals)
+    if state.latest:
+        lines += [""] + progress_lines(state.latest)
+    lines += ["", f"<!-- orchestration log position: {state.position[0]}:{state.position[1]} -->", ""]
+    return "\n".join(lines)
+
+
+class OrchestrationLog:
+    """Orchestration events for one project, their reduction, and the view rendered from it"""
+
+    def __init__(self, project_dir: str):
+        self.directory = state_dir(project_dir) / LOG_DIR
+        self.state_path = state_dir(project_dir) / STATE_NAME
+        self.journal = ActivityJournal(self.directory, fields=EVENT_FIELDS)
+        self._state: Optional[OrchestrationState] = None
+
+    def record(self, events: Iterable[Dict]):
+        """Append events to the log"""
+        for event in events:
+            number, offset = self.journal.append(event)
+            if offset == 0 and number > 1:
+                # The journal just started a segment: checkpoint, so compacting older ones loses nothing
+                self.checkpoint()
+
+    def state(self) -> OrchestrationState:
+        """The reduction of every event logged so far, reading only those since the last call"""
+        if self._state is None:
+            self._state = self._saved()
+        segments = self.journal.segments()
+        if segments and self._state.position[0] < segments[0][0]:
+            # Segments this reduction had not read yet were compacted away: go on from the checkpoint instead
+            saved = self._saved()
+            if saved.position > self._state.position:
+                self._state = saved
+        for position, event in self.journal.since(self._state.position):
+            self._state.apply(event)
+            self._state.position = position
+        return self._state
+
+    def _saved(self) -> OrchestrationState:
+        try:
+            return OrchestrationState.from_dict(json.loads(read_text(self.state_path)))
+        except ValueError:
+            return OrchestrationState()
+
+    def checkpoint(self):
+        """Save the reduction, unless another process already saved a later one"""
+        state = self.state()
+
+        def newer(content: str) -> str:
+            try:
+                if tuple(json.loads(content)["position"]) >= state.position:
+                    return content
+            except (ValueError, KeyError, TypeError):
+                pass
+            return json.dumps(state.to_dict(), ensure_ascii=False)
+        update_file(self.state_path, newer)
+
+    def render(self, content: str) -> str:
+        """content as the view of the log; alerts and progress written into it before the log existed are
+        adopted first"""
+        state = self.state()
+        if view_position(content) is None:
+            known = {(alert["at"], alert["agent"], tuple(alert["files"])) for alert in state.alerts}
+            adopted = [event for event in parse_legacy(content) if event["kind"] == CONTAINERIZATION and
+                       (event["at"], event["agent"], tuple(event["files"])) not in known
+                       or event["kind"] == PROGRESS and state.latest is None]
+            if adopted:
+                self.record(adopted)
+                state = self.state()
+        return render_view(content, state)
+
+
+def orchestration_log(project_dir: str) -> OrchestrationLog:
+    """The process-wide log for a project"""
+    log = _logs.get(project_dir)
+    if log is None:
+        log = _logs[project_dir] = OrchestrationLog(project_dir)
+    return log
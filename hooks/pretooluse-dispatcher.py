@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Single PreToolUse dispatcher - replaces one hook entry per agent family
+Parses the payload once, shares file facts and lock state across hooks,
+runs only the rule modules routed to the current agent in-process,
+and merges their allow/ask/deny decisions with a fixed precedence.
+A tool call on orchestration-index.md first brings that view up to date with the orchestration log,
+and one on WORK_STATUS.md renders it if a background render is still pending
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+sys.path.append(str(Path(__file__).parent))
+from coordination_renderer import render_pending
+from hook_utils import HookUtils, OrchestrationManager, WorkStatusManager
+from hook_runtime import HookResult, run_hook, settings_path
+
+# Higher wins when hooks disagree
+DECISION_PRECEDENCE = {"deny": 3, "ask": 2, "allow": 1}
+
+# Tools whose file_path is written: only these take (or queue for) the file's lock, which the sync hook releases
+WRITE_TOOLS = ("Write", "Edit", "MultiEdit")
+
+_routes_cache: Dict[str, object] = {}
+
+
+def load_routes() -> Dict[str, List[str]]:
+    """Load hook -> agent names routing, re-reading only when the settings file changes"""
+    path = settings_path()
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return {}
+
+    if _routes_cache.get("key") != (str(path), mtime):
+        with open(path, 'r') as f:
+            settings = json.load(f)
+        _routes_cache["key"] = (str(path), mtime)
+        _routes_cache["routes"] = settings.get("claude.dispatcher", {}).get("routes", {})
+
+    return _routes_cache["routes"]
+
+
+def select_hooks(agent_name: str, routes: Dict[str, List[str]]) -> List[str]:
+    """Pick the rule modules that apply to this agent"""
+    return [hook for hook, agents in routes.items() if agent_name in agents or "*" in agents]
+
+
+def parse_decision(result: HookResult) -> dict:
+    """Extract the JSON decision a hook printed, if any"""
+    if not result.stdout.strip():
+        return {}
+    try:
+        return json.loads(result.stdout)
+    except ValueError:
+        return {}
+
+
+def merge_results(results: Dict[str, HookResult]) -> Tuple[int, Optional[str], str, bool]:
+    """Merge hook outcomes: exit 2 > deny > ask > allow > no output.
+    Returns (exit code, winning decision or None, its reasons, whether to suppress them)"""
+    errors = "".join(result.stderr for result in results.values())
+    if errors:
+        sys.stderr.write(errors)
+
+    if any(result.exit_code == 2 for result in results.values()):
+        return 2, None, "", False
+
+    decisions = []
+    for hook, result in results.items():
+        output = parse_decision(result)
+        specific = output.get("hookSpecificOutput", {})
+        decision = specific.get("permissionDecision")
+        if decision in DECISION_PRECEDENCE:
+            decisions.append((decision, specific.get("permissionDecisionReason", ""), output.get("suppressOutput", False)))
+
+    if not decisions:
+        return max([result.exit_code for result in results.values()] or [0]), None, "", False
+
+    winner = max(decisions, key=lambda d: DECISION_PRECEDENCE[d[0]])[0]
+    reasons = [reason for decision, reason, _ in decisions if decision == winner and reason]
+    return 0, winner, "\n\n".join(dict.fromkeys(reasons)), all(suppress for _, _, suppress in decisions)
+
+
+def emit_decision(exit_code: int, decision: Optional[str], reason: str, suppress: bool):
+    """Print the merged decision and exit"""
+    if decision is None:
+        sys.exit(exit_code)
+
+    if decision == "deny":
+        HookUtils.block_with_error(reason)
+
+    if decision == "ask":
+        HookUtils.output_json({
+            "hookSpecificOutput": {
+                "hookEventName": "PreToolUse",
+                "permissionDecision": "ask",
+                "permissionDecisionReason": reason
+            }
+        })
+
+    HookUtils.allow_with_message(reason, suppress=suppress)
+
+
+def main():
+    try:
+        input_data = HookUtils.read_json_input()
+        project_dir = HookUtils.get_project_dir()
+
+        tool_input = input_data.get("tool_input", {})
+        file_path = HookUtils.tool_file_path(tool_input)
+        if file_path and os.path.basename(file_path) == "orchestration-index.md":
+            # The index is a view of the orchestration log: bring it up to date before it is read or edited
+            OrchestrationManager(project_dir).materialize()
+        elif file_path and os.path.basename(file_path) == "WORK_STATUS.md" and render_pending(project_dir):
+            WorkStatusManager(project_dir).render()
+
+        agent_name = input_data.get("agent_name") or os.environ.get("CLAUDE_AGENT_NAME", "")
+        hooks = select_hooks(agent_name, load_routes())
+        if not hooks:
+            sys.exit(0)
+
+        results = {}
+        with HookUtils.request_scope(input_data):
+            # Warm the shared lock fact (or queue for the lock) once; every hook's lock check reuses it
+            if file_path and input_data.get("tool_name", "") in WRITE_TOOLS:
+                WorkStatusManager(project_dir).check_write(file_path, HookUtils.lock_holder(input_data))
+
+            for hook in hooks:
+                try:
+                    results[hook] = run_hook(hook, "")
+                except Exception as e:
+                    results[hook] = HookResult(1, "", f"Dispatcher could not run {hook}: {e}\n")
+
+        exit_code, decision, reason, suppress = merge_results(results)
+        try:
+            emit_decision(exit_code, decision, reason, suppress)
+        finally:
+            # A write that is not going ahead never reaches the sync hook that would release the locks it queued for
+            if exit_code == 2 or decision in ("deny", "ask"):
+                WorkStatusManager.release_grants()
+
+    except Exception as e:
+        print(f"Dispatcher hook error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,12 @@ Validates Python code quality, dependencies, virtual environments, and container
 import json
 import sys
 import os
-import re
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 from hook_utils import HookUtils, WorkStatusManager, OrchestrationManager
+from rule_registry import load_rule_pack
+
+RULES = load_rule_pack()
 
 def validate_python_environment(project_dir: str, tool_input: dict) -> tuple[bool, str]:
     """Validate Python environment and dependencies"""
@@ -23,7 +25,7 @@ def validate_python_environment(project_dir: str, tool_input: dict) -> tuple[boo
         return False, "🐍 PYTHON PROJECT: Missing dependency file (requirements.txt, pyproject.toml, setup.py, or Pipfile)"
     
     # Check virtual environment recommendations
-    file_path = tool_input.get("filePath", tool_input.get("file_path", ""))
+    file_path = HookUtils.tool_file_path(tool_input)
     if file_path.endswith(".py"):
         venv_files = [".venv", "venv", ".env"]
         has_venv = any(os.path.exists(os.path.join(project_dir, vf)) for vf in venv_files)
@@ -37,39 +39,21 @@ def check_python_code_quality(tool_input: dict) -> tuple[str, str]:
     """Check Python code for common issues"""
     
     content = tool_input.get("content", "")
-    file_path = tool_input.get("filePath", tool_input.get("file_path", ""))
+    file_path = HookUtils.tool_file_path(tool_input)
     
     if not file_path.endswith(".py"):
         return "LOW", "Non-Python file"
     
-    high_risk_patterns = [
-        (r"exec\s*\(", "exec() usage detected - security risk"),
-        (r"eval\s*\(", "eval() usage detected - security risk"), 
-        (r"__import__\s*\(", "Dynamic imports detected - review required"),
-        (r"os\.system\s*\(", "os.system() usage - security risk"),
-        (r"subprocess\.call.*shell=True", "subprocess with shell=True - security risk"),
-        (r"input\s*\(\s*\)", "input() without validation - potential security issue"),
-    ]
-    
-    medium_risk_patterns = [
-        (r"DEBUG\s*=\s*True", "DEBUG=True detected - should be False in production"),
-        (r"SECRET_KEY\s*=\s*['\"][^'\"]{1,20}['\"]", "Weak SECRET_KEY detected"),
-        (r"password\s*=\s*['\"][^'\"]*['\"]", "Hardcoded password detected"),
-        (r"api_key\s*=\s*['\"][^'\"]*['\"]", "Hardcoded API key detected"),
-    ]
-    
     issues = []
     
-    for pattern, message in high_risk_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            issues.append(f"HIGH RISK: {message}")
+    for rule in RULES["python.quality.high"].matching(content):
+        issues.append(f"HIGH RISK: {rule.description}")
     
     if issues:
         return "HIGH", "; ".join(issues)
     
-    for pattern, message in medium_risk_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            issues.append(f"MEDIUM RISK: {message}")
+    for rule in RULES["python.quality.medium"].matching(content):
+        issues.append(f"MEDIUM RISK: {rule.description}")
     
     if issues:
         return "MEDIUM", "; ".join(issues)
@@ -80,7 +64,7 @@ def check_containerization_requirements(project_dir: str, tool_input: dict) -> t
     """Check if Python service needs containerization"""
     
     content = tool_input.get("content", "")
-    file_path = tool_input.get("filePath", tool_input.get("file_path", ""))
+    file_path = HookUtils.tool_file_path(tool_input)
     
     # Check for web framework imports
     web_frameworks = [
@@ -109,22 +93,24 @@ def main():
         
         tool_name = input_data.get("tool_name", "")
         tool_input = input_data.get("tool_input", {})
+        # Edit/MultiEdit carry replacements, not content; scan the file as they would leave it
+        tool_input = HookUtils.resolve_edit(tool_name, tool_input)
         
         # Only process Python-related tools
         if tool_name not in ["Write", "Edit", "MultiEdit", "Task"]:
             sys.exit(0)
         
         # Skip non-Python files for most checks
-        file_path = tool_input.get("filePath", tool_input.get("file_path", ""))
+        file_path = HookUtils.tool_file_path(tool_input)
         if file_path and not (file_path.endswith(".py") or "requirements" in file_path or "pyproject" in file_path):
             sys.exit(0)
         
         work_status = WorkStatusManager(project_dir)
         orchestration = OrchestrationManager(project_dir)
         
-        # Check file locks
+        # Check file locks (with $CLAUDE_LOCK_WAIT set, queue for a held lock instead of refusing)
         if file_path:
-            is_locked, lock_info = work_status.is_file_locked(file_path)
+            is_locked, lock_info = work_status.check_write(file_path, HookUtils.lock_holder(input_data))
             if is_locked:
                 HookUtils.block_with_error(f"🔒 FILE LOCKED: {lock_info}")
         
@@ -133,8 +119,9 @@ def main():
         if not env_valid:
             HookUtils.block_with_error(env_msg)
         
-        # Check code quality
-        risk_level, risk_msg = check_python_code_quality(tool_input)
+        # Check code quality (reused from the verdict cache when this content was already scanned)
+        risk_level, risk_msg = HookUtils.cached_scan(
+            __file__, file_path, tool_input.get("content", ""), lambda: check_python_code_quality(tool_input))
         
         # Check containerization
         container_valid, container_msg = check_containerization_requirements(project_dir, tool_input)
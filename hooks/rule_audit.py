@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Static backtracking analysis for hook rules.
+Classifies each pattern by the worst-case cost of re.search (linear, quadratic,
+polynomial or exponential), extracts a linear-time chain form for patterns that are
+pieces joined by `.*`/`.+` (or alternations of them), and builds adversarial inputs for the audit.
+"""
+
+import re
+import sys
+from typing import List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+RISK_LEVELS = ("linear", "quadratic", "polynomial", "exponential")
+
+UNBOUNDED = sre_parse.MAXREPEAT
+
+_REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT))
+
+_AT_CODES = {sre_parse.AT_BOUNDARY: r"\b", sre_parse.AT_NON_BOUNDARY: r"\B"}
+
+# Characters used to decide whether two pieces of a pattern can match the same text
+ALPHABET = frozenset(chr(code) for code in [9, 10, 13] + list(range(32, 127)))
+
+_CATEGORY_PATTERNS = {
+    sre_parse.CATEGORY_DIGIT: r"\d", sre_parse.CATEGORY_NOT_DIGIT: r"\D",
+    sre_parse.CATEGORY_SPACE: r"\s", sre_parse.CATEGORY_NOT_SPACE: r"\S",
+    sre_parse.CATEGORY_WORD: r"\w", sre_parse.CATEGORY_NOT_WORD: r"\W",
+}
+
+_category_sets = {}
+
+# Every code point, for checking exactly whether two character classes overlap, and the answers so far
+_every_char: List[str] = []
+_disjoint_classes = {}
+
+
+def _category_set(category) -> frozenset:
+    if category not in _category_sets:
+        pattern = re.compile(_CATEGORY_PATTERNS.get(category, r"[\s\S]"))
+        _category_sets[category] = frozenset(char for char in ALPHABET if pattern.match(char))
+    return _category_sets[category]
+
+
+def _cased(chars: set, flags: int) -> frozenset:
+    if flags & re.IGNORECASE:
+        chars = set(chars) | {char.swapcase() for char in chars}
+    return frozenset(chars) & ALPHABET
+
+
+def _class_set(items, flags: int) -> frozenset:
+    """Characters of ALPHABET a character class accepts"""
+    chars = set()
+    negate = False
+    for op, av in items:
+        if op is sre_parse.NEGATE:
+            negate = True
+        elif op is sre_parse.LITERAL:
+            chars.add(chr(av))
+        elif op is sre_parse.RANGE:
+            chars.update(chr(code) for code in range(av[0], min(av[1], 127) + 1))
+        elif op is sre_parse.CATEGORY:
+            chars.update(_category_set(av))
+        else:
+            chars.update(ALPHABET)
+    chars = _cased(chars, flags)
+    return ALPHABET - chars if negate else chars
+
+
+def _first(items, flags: int, follow: Tuple[frozenset, bool]) -> Tuple[frozenset, bool]:
+    """(characters a match of items then follow can start with, whether both can be empty)"""
+    chars = set()
+    for op, av in items:
+        first, nullable = _first_item(op, av, flags)
+        chars |= first
+        if not nullable:
+            return frozenset(chars), False
+    return frozenset(chars | follow[0]), follow[1]
+
+
+def _first_item(op, av, flags: int) -> Tuple[frozenset, bool]:
+    if op is sre_parse.LITERAL:
+        return _cased({chr(av)}, flags), False
+    if op is sre_parse.NOT_LITERAL:
+        return ALPHABET - _cased({chr(av)}, flags), False
+    if op is sre_parse.ANY:
+        return (ALPHABET if flags & re.DOTALL else ALPHABET - {"\n"}), False
+    if op is sre_parse.IN:
+        return _class_set(av, flags), False
+    if op is sre_parse.SUBPATTERN:
+        return _first(av[3], (flags | av[1]) & ~av[2], (frozenset(), True))
+    if op is sre_parse.BRANCH:
+        results = [_first(branch, flags, (frozenset(), True)) for branch in av[1]]
+        return frozenset().union(*(first for first, _ in results)), any(nullable for _, nullable in results)
+    if op in _REPEATS:
+        first, nullable = _first(av[2], flags, (frozenset(), True))
+        return first, nullable or av[0] == 0
+    if op is getattr(sre_parse, "ATOMIC_GROUP", None):
+        return _first(av, flags, (frozenset(), True))
+    if op is sre_parse.GROUPREF:
+        return ALPHABET, True
+    # Anchors, boundaries and lookaround consume nothing
+    return frozenset(), True
+
+
+def _degree(items, flags: int, follow: Tuple[frozenset, bool]) -> Tuple[int, bool]:
+    """
+    (unbounded repeats on the worst path that must backtrack, whether one nests another);
+    a repeat backtracks when whatever must follow it can start inside it
+    """
+    items = list(items)
+    total = 0
+    nested = False
+    for index, (op, av) in enumerate(items):
+        rest = _first(items[index + 1:], flags, follow)
+        if op in _REPEATS:
+            low, high, body = av
+            inner, inner_nested = _degree(body, flags, rest)
+            nested = nested or inner_nested
+            if high == UNBOUNDED:
+                if inner:
+                    nested = True
+                body_first = _first(body, flags, (frozenset(), True))[0]
+                if not rest[1] and body_first & rest[0]:
+                    total += 1
+            else:
+                total += inner
+        elif op is sre_parse.SUBPATTERN:
+            inner, inner_nested = _degree(av[3], (flags | av[1]) & ~av[2], rest)
+            total += inner
+            nested = nested or inner_nested
+        elif op is sre_parse.BRANCH:
+            results = [_degree(branch, flags, rest) for branch in av[1]]
+            total += max(result[0] for result in results)
+            nested = nested or any(result[1] for result in results)
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            # A lookaround that scans ahead costs up to a full line at every attempt
+            inner, inner_nested = _degree(av[1], flags, (frozenset(), True))
+            lookahead_scan = any(
+                sub_op in _REPEATS and sub_av[1] == UNBOUNDED for sub_op, sub_av in av[1]
+            )
+            total += inner + (1 if lookahead_scan and not inner else 0)
+            nested = nested or inner_nested
+        elif op is getattr(sre_parse, "ATOMIC_GROUP", None):
+            nested = nested or _degree(av, flags, rest)[1]
+    return total, nested
+
+
+def backtracking_risk(pattern: str, flags: int) -> Tuple[str, int]:
+    """Worst-case class of re.search on pattern and the number of backtracking repeats it chains"""
+    parsed = sre_parse.parse(pattern, flags)
+    degree, nested = _degree(parsed, parsed.state.flags, (frozenset(), True))
+    if nested:
+        return "exponential", degree
+    if degree >= 2:
+        return "polynomial", degree
+    if degree == 1:
+        return "quadratic", degree
+    return "linear", degree
+
+
+def _unparse_class(op, av) -> Optional[str]:
+    """Source for an item matching exactly one character (a literal, `.` or a class), or None"""
+    if op is sre_parse.LITERAL:
+        return r"\n" if av == 10 else re.escape(chr(av))
+    if op is sre_parse.NOT_LITERAL:
+        return f"[^{re.escape(chr(av))}]"
+    if op is sre_parse.ANY:
+        return "."
+    if op is not sre_parse.IN:
+        return None
+    if len(av) == 1 and av[0][0] is sre_parse.CATEGORY and av[0][1] in _CATEGORY_PATTERNS:
+        return _CATEGORY_PATTERNS[av[0][1]]
+    parts = []
+    for item_op, item_av in av:
+        if item_op is sre_parse.NEGATE:
+            parts.append("^")
+        elif item_op is sre_parse.LITERAL:
+            parts.append(re.escape(chr(item_av)))
+        elif item_op is sre_parse.RANGE:
+            parts.append(f"{re.escape(chr(item_av[0]))}-{re.escape(chr(item_av[1]))}")
+        elif item_op is sre_parse.CATEGORY and item_av in _CATEGORY_PATTERNS:
+            parts.append(_CATEGORY_PATTERNS[item_av])
+        else:
+            return None
+    return "[" + "".join(parts) + "]"
+
+
+def _unparse_segment(items) -> Optional[str]:
+    """Source for a piece of pattern made of characters, classes, boundaries, groups and exact repeats, or None"""
+    parts = []
+    for op, av in items:
+        char = _unparse_class(op, av)
+        if char is not None:
+            parts.append(char)
+        elif op is sre_parse.AT and av in _AT_CODES:
+            parts.append(_AT_CODES[av])
+        elif op is sre_parse.SUBPATTERN and not av[1] and not av[2]:
+            inner = _unparse_segment(av[3])
+            if inner is None:
+                return None
+            parts.append(f"(?:{inner})")
+        elif op is sre_parse.BRANCH:
+            branches = [_unparse_segment(branch) for branch in av[1]]
+            if any(branch is None for branch in branches):
+                return None
+            parts.append("(?:" + "|".join(branches) + ")")
+        elif op is sre_parse.MAX_REPEAT and av[0] == av[1]:
+            inner = _unparse_class(*av[2][0]) if len(av[2]) == 1 else None
+            if inner is None:
+                inner = _unparse_segment(av[2])
+                if inner is None:
+                    return None
+                inner = f"(?:{inner})"
+            parts.append(inner if av[0] == 1 else f"{inner}{{{av[0]}}}")
+        else:
+            return None
+    return "".join(parts)
+
+
+def _is_gap(op, av) -> Optional[int]:
+    """Minimum length when op is `.*`, `.+` or a lazy variant, else None"""
+    if op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+        low, high, body = av
+        if high == UNBOUNDED and low <= 1 and list(body) == [(sre_parse.ANY, None)]:
+            return low
+    return None
+
+
+def _run(op, av) -> Optional[Tuple[int, int, str]]:
+    """(minimum, maximum, class source) when op repeats one character class a varying number of times"""
+    if op in _REPEATS and av[0] != av[1] and len(av[2]) == 1:
+        source = _unparse_class(*av[2][0])
+        if source is not None:
+            return av[0], av[1], source
+    return None
+
+
+def _first_class(op, av) -> Optional[str]:
+    """Source for the class of the first character op consumes, None unless that is one class"""
+    if op in _REPEATS and av[0] >= 1 and len(av[2]) == 1:
+        return _first_class(*av[2][0])
+    return _unparse_class(op, av)
+
+
+def _disjoint(first: str, second: str, flags: int) -> bool:
+    """Whether no character at all matches both one-character sources under flags"""
+    key = (first, second, flags)
+    if key not in _disjoint_classes:
+        if not _every_char:
+            _every_char.append("".join(map(chr, range(sys.maxunicode + 1))))
+        _disjoint_classes[key] = re.search(f"(?={first}){second}", _every_char[0], flags) is None
+    return _disjoint_classes[key]
+
+
+def _quantifier(low: int, high: int) -> str:
+    shorthand = {(0, UNBOUNDED): "*", (1, UNBOUNDED): "+", (0, 1): "?"}
+    if (low, high) in shorthand:
+        return shorthand[low, high]
+    return f"{{{low},}}" if high == UNBOUNDED else f"{{{low},{high}}}"
+
+
+def _fixed_width(source: str, flags: int) -> bool:
+    width = sre_parse.parse(source, flags).getwidth()
+    return width[0] == width[1]
+
+
+def _segment_source(items, flags: int, last: bool) -> Optional[str]:
+    """
+    Source for one chain segment: fixed-width pieces, and runs of one character class
+    (`\\s*`, `\\d{2,}`) each followed by a character the run cannot match. Such a segment
+    matches at most one way from any start, and a match starting later never ends earlier.
+    Some character before each run must be one the run cannot match, so that no attempt
+    starting inside a run scans that run again and searching for the segment stays linear.
+    A run ending the segment only needs its minimum, so it is cut down to that when what
+    follows cannot tell the difference: the end of the pattern, or a gap the run cannot
+    carry onto another line. Only the start of the last segment matters, so its pieces
+    need not be fixed-width.
+    """
+    items = list(items)
+    while items and _run(*items[-1]) is not None:
+        if not last and not flags & re.DOTALL and not _disjoint(_run(*items[-1])[2], r"\n", flags):
+            break
+        _, (low, _, body) = items.pop()
+        if low:
+            items.append((sre_parse.MAX_REPEAT, (low, low, body)))
+            break
+    parts = []
+    fixed: list = []
+    before: List[str] = []
+    for index, (op, av) in enumerate(items):
+        run = _run(op, av)
+        if run is None:
+            fixed.append((op, av))
+            char = _first_class(op, av)
+            if char is not None:
+                before.append(char)
+            continue
+        follow = _first_class(*items[index + 1]) if index + 1 < len(items) else None
+        source = _unparse_segment(fixed)
+        if (follow is None or source is None or not (last or _fixed_width(source, flags))
+                or not _disjoint(run[2], follow, flags) or not any(_disjoint(run[2], char, flags) for char in before)):
+            return None
+        parts += [source, run[2] + _quantifier(run[0], run[1])]
+        fixed = []
+    source = _unparse_segment(fixed)
+    if source is None or not (last or _fixed_width(source, flags)):
+        return None
+    segment = "".join(parts) + source
+    if not segment or sre_parse.parse(segment, flags).getwidth()[0] == 0:
+        return None
+    return segment
+
+
+def linear_chain(pattern: str, flags: int) -> Optional[dict]:
+    """
+    Split a pattern shaped like `A.*B.+C` into segments (see _segment_source) and gap
+    minimums, or each branch of a top-level alternation of such patterns; None when any
+    piece has another shape, or the pattern sets inline flags
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return None
+    effective = parsed.state.flags
+    if effective != flags | re.UNICODE and effective != flags:
+        return None
+
+    items = list(parsed)
+    if items and items[-1][0] is sre_parse.BRANCH:
+        # sre_parse moves a prefix every branch shares out in front of them: give it back to each
+        branches = [_chain(items[:-1] + list(branch), flags) for branch in items[-1][1][1]]
+        if any(branch is None for branch in branches) or not any(branch["gaps"] for branch in branches):
+            return None
+        return {"branches": branches}
+    chain = _chain(items, flags)
+    return chain if chain and chain["gaps"] else None
+
+
+def _spans_lines(items, flags: int) -> bool:
+    """Whether a match of items can contain a newline"""
+    for op, av in items:
+        if op is sre_parse.SUBPATTERN:
+            nested = [av[3]]
+        elif op is sre_parse.BRANCH:
+            nested = av[1]
+        elif op in _REPEATS:
+            nested = [av[2]]
+        else:
+            if "\n" in _first_item(op, av, flags)[0]:
+                return True
+            continue
+        if any(_spans_lines(branch, flags) for branch in nested):
+            return True
+    return False
+
+
+def repeat_classes(pattern: str, flags: int) -> Optional[List[str]]:
+    """
+    Sources of the character classes of pattern's unbounded repeats, lookarounds included. A
+    repeat only backtracks over a run of its own class, so the longest such run in the input
+    bounds the work of one match attempt. None when a repeat is not of one class, or flags
+    change inside the pattern
+    """
+    def collect(items, classes: set) -> bool:
+        for op, av in items:
+            if op in _REPEATS:
+                if av[1] == UNBOUNDED:
+                    source = _unparse_class(*av[2][0]) if len(av[2]) == 1 else None
+                    if source is None:
+                        return False
+                    classes.add(source)
+                elif not collect(av[2], classes):
+                    return False
+            elif op is sre_parse.SUBPATTERN:
+                if av[1] or av[2] or not collect(av[3], classes):
+                    return False
+            elif op is sre_parse.BRANCH:
+                if not all(collect(branch, classes) for branch in av[1]):
+                    return False
+            elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+                if not collect(av[1], classes):
+                    return False
+            elif op is getattr(sre_parse, "ATOMIC_GROUP", None):
+                if not collect(av, classes):
+                    return False
+            elif op in (sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS):
+                return False
+        return True
+
+    parsed = sre_parse.parse(pattern, flags)
+    effective = parsed.state.flags
+    if effective != flags | re.UNICODE and effective != flags:
+        return None
+    classes: set = set()
+    return sorted(classes) if collect(parsed, classes) else None
+
+
+def _chain(items, flags: int) -> Optional[dict]:
+    """
+    Segments and gaps for one sequence; a trailing gap joins the last segment, cut to its
+    minimum. head_spans_lines marks a first segment that can match across a newline.
+    """
+    items = list(items)
+    trailing = []
+    while items and _is_gap(*items[-1]) is not None:
+        trailing.insert(0, items.pop())
+
+    segments: List[list] = [[]]
+    gaps: List[int] = []
+    for op, av in items:
+        gap = _is_gap(op, av)
+        if gap is None:
+            segments[-1].append((op, av))
+            continue
+        if not segments[-1]:
+            return None
+        segments.append([])
+        gaps.append(gap)
+    segments[-1] += trailing
+
+    sources = [_segment_source(segment, flags, index == len(segments) - 1) for index, segment in enumerate(segments)]
+    if any(source is None for source in sources):
+        return None
+    chain = {"segments": sources, "gaps": gaps}
+    if _spans_lines(sre_parse.parse(sources[0], flags), flags):
+        chain["head_spans_lines"] = True
+    return chain
+
+
+def _sample(items, flags: int) -> str:
+    """Shortest-ish text matching a parsed sequence, for seeding adversarial inputs"""
+    out = []
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            out.append(chr(av))
+        elif op is sre_parse.ANY:
+            out.append("a")
+        elif op is sre_parse.IN:
+            out.append(_sample_set(av))
+        elif op is sre_parse.SUBPATTERN:
+            out.append(_sample(av[3], flags))
+        elif op is sre_parse.BRANCH:
+            out.append(_sample(av[1][0], flags))
+        elif op in _REPEATS:
+            low, high, body = av
+            out.append(_sample(body, flags) * max(low, 1 if high else 0))
+        elif op is getattr(sre_parse, "ATOMIC_GROUP", None):
+            out.append(_sample(av, flags))
+    return "".join(out)
+
+
+def _sample_set(items) -> str:
+    if items and items[0][0] is sre_parse.NEGATE:
+        excluded = {av for op, av in items[1:] if op is sre_parse.LITERAL}
+        return next(char for char in "azAZ09 _" if ord(char) not in excluded)
+    op, av = items[0]
+    if op is sre_parse.LITERAL:
+        return chr(av)
+    if op is sre_parse.RANGE:
+        return chr(av[0])
+    if op is sre_parse.CATEGORY:
+        return {sre_parse.CATEGORY_DIGIT: "0", sre_parse.CATEGORY_SPACE: " "}.get(av, "a")
+    return "a"
+
+
+def adversarial_input(pattern: str, flags: int, repeat: int) -> str:
+    """
+    One long line repeating a sample of every element but the last, so each start
+    position re-explores all the earlier repeats before the match finally fails
+    """
+    parsed = sre_parse.parse(pattern, flags)
+    items = list(parsed)
+    if len(items) == 1 and items[0][0] is sre_parse.BRANCH:
+        # Attack the branch with the most chained repeats
+        items = list(max(items[0][1][1], key=lambda branch: _degree(branch, flags, (frozenset(), True))[0]))
+    while len(items) > 1 and _is_gap(*items[-1]) is not None:
+        items.pop()
+    prefix = _sample(items[:-1], flags) if len(items) > 1 else _sample(items, flags)[:-1]
+    return (prefix or "a") * repeat
@@ -0,0 +1,770 @@
+#!/usr/bin/env python3
+"""
+Source of truth for every agent hook's regex rules
+Each rule set is scanned by one check loop: rules keep their declaration order,
+share the set's re flags, and are addressed as "<set>.<index>" in the rule pack
+Edit rules here, then run build-rule-pack.py to regenerate rule-pack.json
+"""
+
+# Bump when the rule-pack layout changes, not when rules change - rule edits change the digest
+RULE_PACK_SCHEMA = 1
+
+RULE_SETS = {
+    "business.api.rest": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # REST API patterns
+            (r"@app\.route\(['\"].*[A-Z].*['\"]", "REST: Avoid uppercase in URL paths"),
+            (r"@app\.route\(['\"].*/\{[^}]+\}\{[^}]+\}['\"]", "REST: Avoid consecutive path parameters"),
+            (r"/api/v\d+/.*get.*", "REST: Avoid verbs in URL paths (GET is implicit)"),
+            (r"/api/v\d+/.*post.*", "REST: Avoid verbs in URL paths (POST is implicit)"),
+            (r"@app\.route.*methods=.*GET.*POST", "REST: Single endpoint should not handle both GET and POST"),
+        ],
+    },
+    "business.api.graphql": {
+        "flags": [],
+        "rules": [
+            # GraphQL patterns
+            (r"type.*\{[^}]*String[^!][^}]*\}", "GraphQL: Consider making required fields non-nullable (!)"),
+            (r"query.*\{[^}]*\{[^}]*\{[^}]*\{", "GraphQL: Query nesting too deep (>3 levels)"),
+            (r"mutation.*[A-Z][a-z]", "GraphQL: Mutations should use camelCase"),
+        ],
+    },
+    "business.api.status_codes": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # HTTP status code patterns
+            (r"return.*200.*error", "HTTP: Don't return 200 for error conditions"),
+            (r"return.*404.*created", "HTTP: Don't return 404 for successful creation"),
+            (r"return.*500.*validation", "HTTP: Use 400 for validation errors, not 500"),
+        ],
+    },
+    "business.logic.validation": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Business rule validation
+            (r"if.*age.*<.*0", "Business: Age cannot be negative - add validation"),
+            (r"if.*price.*<.*0", "Business: Price cannot be negative - add validation"),
+            (r"if.*quantity.*<.*0", "Business: Quantity cannot be negative - add validation"),
+            (r"email.*@.*\..*", "Business: Email validation should use proper regex or library"),
+            (r"phone.*\d{10}", "Business: Phone validation too simplistic - consider international formats"),
+        ],
+    },
+    "business.logic.ddd": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Domain-driven design patterns
+            (r"class.*Service.*\{", "DDD: Services should focus on domain logic, not data access"),
+            (r"def.*calculate.*total.*\(.*\).*:", "DDD: Business calculations should be in domain entities"),
+            (r"class.*Repository.*save.*business", "DDD: Repositories should not contain business logic"),
+        ],
+    },
+    "business.logic.errors": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Error handling in business logic
+            (r"try:.*business.*except.*pass", "Business: Empty exception handling can hide business rule violations"),
+            (r"if.*business.*:.*raise.*Exception\(", "Business: Use specific business exceptions instead of generic Exception"),
+        ],
+    },
+    "business.requirements.incomplete": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Check for incomplete implementations
+            (r"NotImplementedError", "Implementation incomplete - NotImplementedError found"),
+            (r"pass\s*#.*implement", "Implementation incomplete - placeholder found"),
+            (r"raise.*NotImplemented", "Implementation incomplete - NotImplementedError raised"),
+        ],
+    },
+    "business.product.features": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Feature flag patterns
+            (r"if.*feature[_-]?flag", "FEATURE: Feature flag detected - ensure proper rollout strategy"),
+            (r"experiment.*enabled", "A/B TEST: Experiment code detected - ensure proper metrics tracking"),
+            (r"beta[_-]?feature", "BETA: Beta feature detected - ensure feedback collection"),
+        ],
+    },
+    "business.product.ux": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # User experience patterns
+            (r"loading.*true.*false.*true", "UX: Loading state flickering - improve user experience"),
+            (r"error.*message.*generic", "UX: Generic error messages - provide specific user guidance"),
+            (r"timeout.*30\d\d\d", "UX: Long timeout (>30s) - consider user experience impact"),
+        ],
+    },
+    "business.product.analytics": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Analytics and metrics
+            (r"track[_-]?event", "ANALYTICS: Event tracking found - ensure privacy compliance"),
+            (r"user[_-]?id.*log", "PRIVACY: User ID in logs - review data privacy requirements"),
+            (r"metrics.*user", "METRICS: User metrics collection - ensure consent obtained"),
+        ],
+    },
+    "creative.design_system": {
+        "flags": [],
+        "rules": [
+            # CSS/SCSS design patterns
+            (r'color:\s*#[0-9a-fA-F]{6}(?!.*var\()', "DESIGN: Hardcoded hex colors - use CSS variables for consistency"),
+            (r'font-size:\s*\d+px(?!.*var\()', "DESIGN: Hardcoded font sizes - use design system scale"),
+            (r'margin:\s*\d+px.*margin:\s*\d+px', "DESIGN: Inconsistent margin values - standardize spacing"),
+            (r'padding:\s*\d+px.*padding:\s*\d+px', "DESIGN: Inconsistent padding values - standardize spacing"),
+            (r'border-radius:\s*\d+px(?!.*var\()', "DESIGN: Hardcoded border radius - use design tokens"),
+            (r'box-shadow:\s*[^;]+(?!.*var\()', "DESIGN: Custom shadows - use elevation system"),
+            (r'z-index:\s*\d{3,}', "DESIGN: High z-index values - review stacking context"),
+            # React/Component patterns
+            (r'style=\{\{[^}]*color:\s*[\'"][#a-zA-Z]', "REACT: Inline color styles - use design system"),
+            (r'className.*btn.*className.*button', "REACT: Inconsistent button class naming"),
+            (r'<div.*style=.*backgroundColor', "REACT: Inline background colors - use CSS classes"),
+            (r'fontSize:\s*\d+(?!.*theme)', "REACT: Hardcoded font sizes in JSX - use theme"),
+            # Accessibility patterns
+            (r'<img(?!.*alt=)', "A11Y: Image without alt attribute - accessibility violation"),
+            (r'<button(?!.*aria-label|.*title)', "A11Y: Button without accessible name - screen reader issue"),
+            (r'onClick.*<div(?!.*role=)', "A11Y: Click handler on div without role - keyboard accessibility"),
+            (r'color.*contrast.*ratio', "A11Y: Color contrast mentioned - ensure WCAG compliance"),
+            (r'font-size:\s*[1-9]px', "A11Y: Font size below 10px - readability concern"),
+        ],
+    },
+    "creative.content": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Writing quality patterns
+            (r'\b(very|really|quite|pretty)\s+\w+', "WRITING: Weak qualifiers - use stronger, specific language"),
+            (r'\.{3,}', "WRITING: Excessive ellipses - improve sentence structure"),
+            (r'\b(thing|stuff|things)\b', "WRITING: Vague terms - be more specific"),
+            (r'\b(obviously|clearly|simply)\b', "WRITING: Assumptive language - may alienate readers"),
+            (r'!!+', "WRITING: Multiple exclamation marks - reduce emphasis"),
+            (r'\b(click here|read more|learn more)\b', "WRITING: Generic link text - use descriptive links"),
+            # Technical writing patterns
+            (r'we\s+(recommend|suggest|advise)', "TECH WRITING: 'We recommend' - use active voice"),
+            (r'you\s+(should|must|need to)', "TECH WRITING: Prescriptive language - consider softer alternatives"),
+            (r'simply\s+(do|use|add)', "TECH WRITING: 'Simply' assumes ease - may not be simple for users"),
+            (r'just\s+(add|remove|change)', "TECH WRITING: 'Just' minimizes complexity - acknowledge difficulty"),
+            (r'easy|simple|straightforward', "TECH WRITING: Subjective difficulty - let users judge complexity"),
+            # Documentation patterns
+            (r'TODO:.*documentation', "DOCS: TODO for documentation - incomplete content"),
+            (r'FIXME:.*content', "DOCS: FIXME for content - needs revision"),
+            (r'lorem ipsum', "DOCS: Lorem ipsum placeholder - replace with real content"),
+            (r'example\.com|test\.example', "DOCS: Example.com in production docs - use real examples"),
+            (r'INSERT_.*_HERE', "DOCS: Placeholder text - replace with actual content"),
+        ],
+    },
+    "creative.brand": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Brand voice patterns
+            (r'awesome|amazing|incredible', "BRAND: Superlative overuse - may weaken brand voice"),
+            (r'we\'re\s+excited|thrilled|delighted', "BRAND: Emotional language - ensure brand voice consistency"),
+            (r'revolutionar(y|ize)|cutting-edge|state-of-the-art', "BRAND: Buzzwords - consider more authentic language"),
+            (r'industry[- ]leading|best-in-class|world-class', "BRAND: Unsubstantiated claims - provide evidence"),
+            # Typography patterns
+            (r'font-family:.*Arial.*font-family:.*Helvetica', "BRAND: Mixed fonts - establish typography hierarchy"),
+            (r'font-weight:\s*bold.*font-weight:\s*\d00', "BRAND: Inconsistent font weights - standardize weight scale"),
+            (r'text-transform:\s*uppercase.*text-transform:\s*lowercase', "BRAND: Mixed text transforms - establish text casing rules"),
+            # Color brand patterns
+            (r'#ff0000|red.*#00ff00|green', "BRAND: Primary colors - ensure brand color palette"),
+            (r'color:.*blue.*color:.*blue', "BRAND: Multiple blue shades - standardize color system"),
+            (r'background.*gradient.*background.*gradient', "BRAND: Multiple gradients - establish gradient system"),
+        ],
+    },
+    "creative.assets": {
+        "flags": [],
+        "rules": [
+            # Image optimization patterns
+            (r'\.jpg|\.png.*width.*height.*\d{4,}', "ASSETS: Large image dimensions - optimize for web"),
+            (r'background-image.*url\(.*\.jpg\)', "ASSETS: JPG for UI elements - consider SVG or PNG"),
+            (r'<img.*src.*\.bmp|\.tiff', "ASSETS: Unoptimized image format - use web formats"),
+            (r'data:image/.*base64.*[A-Za-z0-9+/]{1000,}', "ASSETS: Large base64 images - use external files"),
+            # SVG patterns
+            (r'<svg.*width="\d{3,}".*height="\d{3,}"', "ASSETS: Large SVG dimensions - optimize viewBox"),
+            (r'<svg(?!.*viewBox)', "ASSETS: SVG without viewBox - scalability issue"),
+            (r'fill="#\w+".*fill="#\w+".*svg', "ASSETS: Hardcoded SVG colors - use CSS for theming"),
+            # Font patterns
+            (r'@import.*fonts\.googleapis\.com.*@import', "ASSETS: Multiple font imports - combine requests"),
+            (r'font-display:.*swap.*font-display:.*block', "ASSETS: Inconsistent font display - standardize loading"),
+            (r'woff2|woff.*ttf|otf', "ASSETS: Mixed font formats - prioritize modern formats"),
+        ],
+    },
+    "data_ai.data_quality": {
+        "flags": [],
+        "rules": [
+            # Data loading patterns
+            (r'pd\.read_csv\([^)]*\)(?!.*na_values)', "Pandas: read_csv without na_values - missing data handling"),
+            (r'pd\.read_csv\([^)]*\)(?!.*dtype)', "Pandas: read_csv without dtype specification - memory inefficiency"),
+            (r'\.dropna\(\)(?!.*subset)', "Pandas: dropna() without subset - may remove too much data"),
+            (r'\.fillna\(0\)(?!.*method)', "Pandas: fillna(0) without method - may introduce bias"),
+            (r'df\[.*\]\.values(?!.*copy)', "Pandas: .values without copy() - may cause view issues"),
+            # Data validation patterns
+            (r'df\.shape(?!.*print|.*log)', "Data: Checking shape without logging - missing data validation"),
+            (r'df\.head\(\)(?!.*print|.*display)', "Data: head() without display - missing data inspection"),
+            (r'df\.isnull\(\)(?!.*sum|.*any)', "Data: isnull() without aggregation - incomplete null check"),
+            (r'df\.duplicated\(\)(?!.*sum|.*any)', "Data: duplicated() without aggregation - incomplete duplicate check"),
+            (r'df.*==.*df.*(?!.*all|.*any)', "Data: DataFrame comparison without all()/any() - boolean array"),
+            # Statistical patterns
+            (r'\.mean\(\)(?!.*axis)', "Stats: mean() without axis specification - may aggregate incorrectly"),
+            (r'np\.random\.seed\(\d+\)(?!.*reproducib)', "Random: Fixed seed without documentation - reproducibility concern"),
+            (r'train_test_split(?!.*random_state)', "ML: train_test_split without random_state - not reproducible"),
+            (r'\.sample\((?!.*random_state)', "Sampling: sample() without random_state - not reproducible"),
+        ],
+    },
+    "data_ai.ml_model": {
+        "flags": [],
+        "rules": [
+            # Model training patterns
+            (r'\.fit\(X.*y\)(?!.*validation)', "ML: fit() without validation - no overfitting check"),
+            (r'GridSearchCV(?!.*cv=)', "ML: GridSearchCV without explicit CV - default may not be appropriate"),
+            (r'RandomForestClassifier\(\)(?!.*n_estimators)', "ML: RandomForest without n_estimators - using default"),
+            (r'\.predict\((?!.*reshape|.*values)', "ML: predict() on raw data - may need preprocessing"),
+            (r'accuracy_score(?!.*average)', "ML: accuracy_score without average parameter for multiclass"),
+            # Feature engineering patterns
+            (r'StandardScaler\(\)\.fit_transform\(X\)(?!.*train)', "ML: StandardScaler on full dataset - data leakage"),
+            (r'LabelEncoder\(\)\.fit_transform(?!.*train)', "ML: LabelEncoder on full dataset - data leakage"),
+            (r'df\.get_dummies\((?!.*drop_first)', "ML: get_dummies without drop_first - multicollinearity"),
+            (r'from sklearn\.preprocessing import \*', "ML: Wildcard sklearn imports - namespace pollution"),
+            # Model evaluation patterns
+            (r'\.score\(X.*y\)(?!.*cross_val)', "ML: model.score() without cross-validation - single metric"),
+            (r'confusion_matrix(?!.*normalize)', "ML: confusion_matrix without normalization - hard to interpret"),
+            (r'classification_report(?!.*target_names)', "ML: classification_report without target_names"),
+            (r'roc_auc_score(?!.*multi_class)', "ML: roc_auc_score for multiclass without multi_class parameter"),
+        ],
+    },
+    "data_ai.leakage": {
+        "flags": [],
+        "rules": [
+            # Time series leakage
+            (r'train_test_split.*shuffle=True.*time|date', "LEAKAGE: Shuffling time series data - future information leak"),
+            (r'\.sort_values.*train_test_split(?!.*shuffle=False)', "LEAKAGE: Sorting before split without shuffle=False"),
+            (r'pd\.to_datetime.*train_test_split.*shuffle=True', "LEAKAGE: Time data with shuffle=True - temporal order lost"),
+            # Target leakage
+            (r'X.*=.*df.*y.*=.*df.*X.*y', "LEAKAGE: Features include target variable"),
+            (r'StandardScaler.*fit.*X.*y.*transform.*X_test', "LEAKAGE: Scaler fitted on target - indirect information"),
+            (r'df\.corr\(\).*target.*\.drop.*target', "LEAKAGE: Feature selection using target correlation on full dataset"),
+            # Cross-validation leakage
+            (r'cross_val_score.*StandardScaler.*fit_transform', "LEAKAGE: Preprocessing before CV - information leak"),
+            (r'SelectKBest.*fit.*cross_val_score', "LEAKAGE: Feature selection before CV - selection bias"),
+            (r'SMOTE.*fit_resample.*cross_val_score', "LEAKAGE: SMOTE before CV - data generation bias"),
+        ],
+    },
+    "data_ai.privacy": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # PII patterns
+            (r'df.*name.*email.*phone', "PRIVACY: PII columns detected - ensure anonymization"),
+            (r'social.*security|ssn', "PRIVACY: SSN data detected - high sensitivity"),
+            (r'credit.*card|payment.*info', "PRIVACY: Payment data detected - PCI compliance required"),
+            (r'medical.*record|health.*data', "PRIVACY: Health data detected - HIPAA compliance required"),
+            # Data export patterns
+            (r'\.to_csv\(.*personal|\.to_excel\(.*personal', "PRIVACY: Exporting personal data - review data handling"),
+            (r'plt\.savefig.*personal|sns\..*personal', "PRIVACY: Visualizing personal data - anonymize before plotting"),
+            (r'print\(df.*personal\)|display\(df.*personal\)', "PRIVACY: Displaying personal data - potential exposure"),
+            # Bias patterns
+            (r'gender.*==.*male.*female', "ETHICS: Gender binary assumption - consider inclusivity"),
+            (r'race.*ethnicity.*model', "ETHICS: Race/ethnicity features - potential discrimination"),
+            (r'age.*>\s*\d+.*reject|age.*<\s*\d+.*reject', "ETHICS: Age-based filtering - potential age discrimination"),
+        ],
+    },
+    "data_ai.performance": {
+        "flags": [],
+        "rules": [
+            # Pandas performance patterns
+            (r'for.*in.*df\.iterrows\(\)', "PERFORMANCE: iterrows() is slow - use vectorized operations or itertuples()"),
+            (r'df\.apply.*lambda.*axis=1', "PERFORMANCE: apply with lambda on rows - slow for large datasets"),
+            (r'pd\.concat.*for.*in.*loop', "PERFORMANCE: concat in loop - collect then concat once"),
+            (r'df\[df\[.*\] == .*\]\[df\[.*\] == .*\]', "PERFORMANCE: Multiple boolean indexing - combine conditions"),
+            (r'df\.groupby.*\.apply.*lambda', "PERFORMANCE: groupby.apply with lambda - consider agg() or transform()"),
+            # NumPy performance patterns
+            (r'for.*in.*range.*arr\[i\]', "PERFORMANCE: Manual array iteration - use vectorized operations"),
+            (r'np\.append.*for.*in', "PERFORMANCE: np.append in loop - preallocate array"),
+            (r'list\(arr\).*for.*in', "PERFORMANCE: Converting array to list in loop - unnecessary overhead"),
+            # Memory patterns
+            (r'df\.copy\(\)(?!.*deep=False)', "MEMORY: Deep copy without necessity - memory usage"),
+            (r'pd\.read_csv.*chunksize(?!.*iterator)', "MEMORY: chunksize without iterator - not processing chunks"),
+            (r'np\.zeros\(\d{6,}\)', "MEMORY: Large array allocation - consider memory constraints"),
+        ],
+    },
+    "database.injection.high": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # High-risk SQL injection patterns
+            (r"SELECT.*\+.*input\(", "SQL injection via string concatenation with user input"),
+            (r"INSERT.*\+.*input\(", "SQL injection in INSERT statement"),
+            (r"UPDATE.*\+.*input\(", "SQL injection in UPDATE statement"),
+            (r"DELETE.*\+.*input\(", "SQL injection in DELETE statement"),
+            (r"WHERE.*\+.*input\(", "SQL injection in WHERE clause"),
+            (r"execute\s*\(\s*['\"].*\+", "SQL injection via execute() with concatenation"),
+            (r"query\s*\(\s*['\"].*\+", "SQL injection via query() with concatenation"),
+            (r"f['\"].*\{.*input\(.*\}.*['\"].*execute", "SQL injection via f-string with user input"),
+            (r"%s.*format.*input\(", "SQL injection via string formatting"),
+        ],
+    },
+    "database.injection.medium": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Medium-risk patterns
+            (r"ORDER BY.*\+", "Potential SQL injection in ORDER BY clause"),
+            (r"LIMIT.*\+", "Potential SQL injection in LIMIT clause"),
+            (r"raw\(\s*['\"].*\+", "Raw SQL with concatenation"),
+            (r"\.sql\s*=.*\+", "SQL property assignment with concatenation"),
+        ],
+    },
+    "database.dangerous.schema": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Schema-altering operations
+            (r"DROP\s+TABLE", "DROP TABLE - permanent data loss risk"),
+            (r"DROP\s+DATABASE", "DROP DATABASE - catastrophic data loss risk"),
+            (r"TRUNCATE", "TRUNCATE - all data deletion risk"),
+            (r"DELETE\s+FROM.*WHERE", "DELETE operation - verify WHERE clause"),
+            (r"ALTER\s+TABLE.*DROP", "ALTER TABLE DROP - column/data loss risk"),
+            (r"UPDATE.*WHERE", "UPDATE operation - verify WHERE clause scope"),
+        ],
+    },
+    "database.dangerous.privileges": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Privilege escalation
+            (r"GRANT\s+ALL", "GRANT ALL privileges - excessive permissions"),
+            (r"GRANT.*SUPER", "SUPER privilege grant - administrative access"),
+            (r"CREATE\s+USER.*IDENTIFIED\s+BY\s*['\"][^'\"]*['\"]", "Hardcoded password in user creation"),
+            (r"ALTER\s+USER.*PASSWORD", "Password change operation"),
+        ],
+    },
+    "database.dangerous.mass_operations": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Mass operations
+            (r"DELETE\s+FROM\s+\w+\s*;", "DELETE without WHERE - all records deletion"),
+            (r"UPDATE\s+\w+\s+SET.*[^WHERE]", "UPDATE without WHERE - all records modification"),
+            (r"INSERT.*SELECT.*FROM", "Mass INSERT operation"),
+            (r"LOAD\s+DATA", "LOAD DATA operation - bulk import"),
+        ],
+    },
+    "database.migrations": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Check for migration patterns
+            (r"ADD\s+COLUMN.*NOT\s+NULL", "Adding NOT NULL column without default - may fail on existing data"),
+            (r"ALTER.*COLUMN.*TYPE", "Column type change - potential data loss"),
+            (r"DROP\s+COLUMN", "Column drop - permanent data loss"),
+            (r"ADD.*UNIQUE", "Adding unique constraint - may fail if duplicates exist"),
+            (r"ADD.*FOREIGN\s+KEY", "Adding foreign key - may fail if referential integrity violated"),
+        ],
+    },
+    "frontend.accessibility": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Check for common accessibility issues
+            (r"<img(?![^>]*alt=)", "Images without alt attributes"),
+            (r"<button(?![^>]*aria-label)(?![^>]*>.*</button>)", "Buttons without accessible labels"),
+            (r"<input(?![^>]*aria-label)(?![^>]*id=)", "Form inputs without labels"),
+            (r"onClick.*div|onClick.*span", "Non-interactive elements with click handlers"),
+            (r"style.*color.*#[0-9a-fA-F]{6}.*background.*#[0-9a-fA-F]{6}", "Potential color contrast issues"),
+        ],
+    },
+    "frontend.security": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Check for security vulnerabilities
+            (r"innerHTML\s*=", "innerHTML usage - XSS risk"),
+            (r"dangerouslySetInnerHTML", "dangerouslySetInnerHTML usage - XSS risk"),
+            (r"eval\s*\(", "eval() usage - code injection risk"),
+            (r"document\.write\s*\(", "document.write() usage - security risk"),
+            (r"window\.location\s*=.*\+", "Dynamic window.location - open redirect risk"),
+            (r"localStorage\.setItem.*token|sessionStorage\.setItem.*token", "Token storage in localStorage - security risk"),
+        ],
+    },
+    "frontend.performance": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Check for performance anti-patterns
+            (r"useEffect\s*\(\s*[^,]*,\s*\[\s*\]", "useEffect with empty dependency array - consider optimization"),
+            (r"useState\s*\(\s*.*\.map\(", "useState with map operation - consider useMemo"),
+            (r"\.map\s*\([^)]*\)\s*\.map\s*\(", "Chained map operations - performance concern"),
+            (r"document\.querySelector.*loop|for.*document\.querySelector", "DOM queries in loops"),
+        ],
+    },
+    "game.performance": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Unity C# patterns
+            (r'Update\(\).*GameObject\.Find|Update\(\).*FindObjectOfType', "Unity: GameObject.Find in Update() - cache references"),
+            (r'Update\(\).*GetComponent', "Unity: GetComponent in Update() - cache component references"),
+            (r'Update\(\).*Instantiate.*Destroy', "Unity: Instantiate/Destroy in Update() - use object pooling"),
+            (r'foreach.*GameObject.*FindObjectsOfType', "Unity: FindObjectsOfType in loop - expensive operation"),
+            (r'OnGUI\(\).*GUI\..*for.*in', "Unity: Complex GUI operations in OnGUI() - use UI system"),
+            (r'String\.Concat.*\+.*Update\(\)', "Unity: String concatenation in Update() - causes GC pressure"),
+            (r'new.*Vector3.*Update\(\)', "Unity: Vector3 allocation in Update() - cache or use static"),
+            # Unreal C++ patterns
+            (r'Tick.*GetWorld\(\)->GetAllActorsOfClass', "Unreal: GetAllActorsOfClass in Tick - cache results"),
+            (r'Tick.*FVector.*new', "Unreal: Vector allocation in Tick - use stack allocation"),
+            (r'BeginPlay.*while.*true', "Unreal: Infinite loop in BeginPlay - will freeze game"),
+            (r'UPROPERTY.*BlueprintReadWrite.*private', "Unreal: Private BlueprintReadWrite - inconsistent access"),
+            (r'TArray.*Add.*RemoveAt.*for', "Unreal: TArray manipulation in tight loops - performance hit"),
+            # General game patterns
+            (r'while.*true.*update|while.*true.*render', "Game: Infinite loop without frame limiting - CPU overuse"),
+            (r'sleep\(\d+\).*game.*loop', "Game: Sleep in game loop - inconsistent frame timing"),
+            (r'render.*for.*in.*objects.*\d{3,}', "Game: Rendering large object collections - batch operations"),
+            (r'physics.*calculate.*\d+.*times', "Game: Excessive physics calculations - optimize timestep"),
+        ],
+    },
+    "game.memory": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Unity memory patterns
+            (r'Resources\.Load.*Update\(\)', "Unity: Resources.Load in Update() - memory fragmentation"),
+            (r'Instantiate.*gameObject.*Destroy.*null', "Unity: Missing null check after Destroy - memory reference"),
+            (r'StartCoroutine.*while.*true.*yield.*null', "Unity: Infinite coroutine without break condition"),
+            (r'OnDestroy.*StopAllCoroutines', "Unity: StopAllCoroutines in OnDestroy - may be too late"),
+            (r'List<GameObject>.*Clear\(\).*Add\(.*Update', "Unity: List operations in Update() - GC pressure"),
+            # Unreal memory patterns
+            (r'NewObject.*BeginPlay.*EndPlay', "Unreal: Object creation without proper cleanup"),
+            (r'UPROPERTY.*TArray.*UPROPERTY.*TArray.*class', "Unreal: Multiple large arrays - memory fragmentation"),
+            (r'FString.*Append.*for.*in.*Tick', "Unreal: String operations in Tick - memory allocation"),
+            (r'UGameInstance.*static.*TMap', "Unreal: Static containers in GameInstance - memory leak risk"),
+            # General memory patterns
+            (r'new.*\[\].*delete.*for.*i.*<.*1000', "Memory: Large array allocations in loops - fragment memory"),
+            (r'malloc.*free.*game.*loop', "Memory: Manual memory management in game loop - error prone"),
+            (r'std::vector.*reserve.*push_back.*erase', "Memory: Vector without proper capacity planning"),
+        ],
+    },
+    "game.mechanics": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Physics and movement patterns
+            (r'transform\.position.*=.*Input\.|rigidbody\.velocity.*Input\.', "Physics: Direct transform manipulation with input - bypasses physics"),
+            (r'FixedUpdate\(\).*Time\.deltaTime', "Unity: Time.deltaTime in FixedUpdate - use fixedDeltaTime"),
+            (r'Rigidbody\.velocity.*=.*new.*Vector3\(0.*0.*0\)', "Physics: Zeroing velocity directly - use physics methods"),
+            (r'collision.*health.*--.*death', "Game: Direct health manipulation - missing validation"),
+            # Game state patterns
+            (r'static.*bool.*gameState|static.*int.*score', "Game: Static game state - multiplayer issues"),
+            (r'PlayerPrefs.*Save.*Update\(\)', "Unity: PlayerPrefs.Save in Update() - performance hit"),
+            (r'if.*gameState.*==.*"playing".*gameState.*=.*"paused"', "Game: String-based state - error prone"),
+            (r'public.*health.*public.*score.*class.*Player', "Game: Public game variables - encapsulation issue"),
+            # Input patterns
+            (r'Input\.GetKey.*Update\(\).*Input\.GetKey', "Input: Multiple Input.GetKey calls - cache input state"),
+            (r'Input\.mousePosition.*Screen\.width.*Update', "Input: Screen calculations in Update() - cache screen data"),
+            (r'KeyCode\..*KeyCode\..*KeyCode\..*Update', "Input: Multiple key checks - use input mapping"),
+        ],
+    },
+    "game.audio_visual": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Audio patterns
+            (r'AudioSource\.Play\(\).*Update\(\)', "Audio: AudioSource.Play in Update() - audio spam"),
+            (r'AudioClip.*Resources\.Load.*Play', "Audio: Loading audio clips synchronously - hitches"),
+            (r'AudioSource.*volume.*Random\.Range.*Update', "Audio: Random volume changes in Update() - jarring"),
+            # Visual patterns
+            (r'Camera\.main\..*Update\(\)', "Unity: Camera.main access in Update() - cache camera reference"),
+            (r'Renderer\.material.*Update\(\)', "Unity: Material access in Update() - creates instances"),
+            (r'Light\.intensity.*Mathf\.Sin.*Update', "Unity: Light calculations in Update() - performance hit"),
+            (r'Shader\.SetGlobalFloat.*Update\(\)', "Unity: Global shader properties in Update() - expensive"),
+            # Rendering patterns
+            (r'Graphics\.DrawMesh.*for.*in.*Update', "Rendering: DrawMesh in loops - batch draw calls"),
+            (r'Material.*new.*Material.*Renderer', "Rendering: Creating materials at runtime - memory leak"),
+            (r'Texture2D.*SetPixel.*Apply.*Update', "Rendering: SetPixel operations in Update() - very slow"),
+        ],
+    },
+    "infrastructure.dockerfile": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Dockerfile validation
+            (r"FROM.*:latest", "Using :latest tag - specify explicit versions"),
+            (r"RUN.*apt-get update.*&&.*apt-get install", "apt-get without cleanup - increases image size"),
+            (r"ADD\s+http", "Using ADD for URLs - prefer RUN with wget/curl"),
+            (r"USER\s+root", "Running as root user - security risk"),
+            (r"COPY\s+\.\s+", "Copying entire context - use .dockerignore"),
+        ],
+    },
+    "infrastructure.compose": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            (r"image:.*:latest", "Using :latest tag in compose - specify versions"),
+            (r"privileged:\s*true", "privileged mode enabled - security risk"),
+            (r"network_mode:\s*host", "host network mode - security concern"),
+            (r"volumes:.*:/var/run/docker.sock", "Mounting docker socket - high security risk"),
+        ],
+    },
+    "infrastructure.kubernetes.security": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            (r"runAsUser:\s*0", "Running as root user (UID 0) - security risk"),
+            (r"privileged:\s*true", "Privileged container - high security risk"),
+            (r"hostNetwork:\s*true", "Host network access - security risk"),
+            (r"hostPID:\s*true", "Host PID namespace - security risk"),
+            (r"allowPrivilegeEscalation:\s*true", "Privilege escalation allowed - security risk"),
+        ],
+    },
+    "infrastructure.kubernetes.best_practices": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            (r"resources:", "Resource limits/requests not defined"),
+            (r"livenessProbe:", "Liveness probe not configured"),
+            (r"readinessProbe:", "Readiness probe not configured"),
+        ],
+    },
+    "infrastructure.terraform.security": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            (r'default\s*=\s*".*password.*"', "Hardcoded password in Terraform"),
+            (r'default\s*=\s*".*secret.*"', "Hardcoded secret in Terraform"),
+            (r'default\s*=\s*".*key.*"', "Hardcoded key in Terraform"),
+            (r"public_access_block.*=.*false", "S3 public access not blocked"),
+            (r"acl.*=.*public-read", "Public read ACL - security risk"),
+        ],
+    },
+    "infrastructure.terraform.best_practices": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            (r"terraform\s*{", "Terraform version constraint not specified"),
+            (r"backend\s*\"", "Remote backend configuration missing"),
+            (r"tags\s*=", "Resource tagging not implemented"),
+        ],
+    },
+    "mobile.performance": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # iOS/Swift patterns
+            (r'UIImageView.*image.*UIImage\(named:', "iOS: Loading images on main thread - consider background loading"),
+            (r'viewDidLoad.*for.*in.*array', "iOS: Heavy computation in viewDidLoad - move to background"),
+            (r'tableView.*cellForRowAt.*UIImage\(data:', "iOS: Image processing in table cells - causes scrolling lag"),
+            (r'@objc.*func.*while.*true', "iOS: Infinite loops in main thread - will freeze UI"),
+            (r'URLSession.*dataTask.*DispatchQueue\.main', "iOS: Network on main thread - use background queues"),
+            # Android/Kotlin patterns
+            (r'onCreate.*for.*in.*large', "Android: Heavy work in onCreate - move to AsyncTask or coroutines"),
+            (r'getView.*findViewById', "Android: findViewById in getView - use ViewHolder pattern"),
+            (r'onDraw.*Canvas.*for.*in', "Android: Complex drawing in onDraw - pre-compute or cache"),
+            (r'SharedPreferences.*edit\(\).*apply\(\).*for', "Android: Multiple SharedPreferences writes - batch operations"),
+            (r'Thread\(\s*\{.*UI.*\}\s*\)\.start', "Android: Direct UI updates from background threads"),
+            # React Native patterns
+            (r'FlatList.*data.*\.map\(', "RN: Avoid map() with FlatList - use data prop directly"),
+            (r'ScrollView.*\.map\(.*\>.*100', "RN: Large ScrollView lists - use FlatList for performance"),
+            (r'Image.*source.*require\(.*\.map', "RN: Dynamic require() in loops - preload images"),
+            (r'Animated\.timing.*loop.*while', "RN: Infinite animations without cleanup - memory leaks"),
+            (r'console\.log.*render\(\)', "RN: Console logs in render - impacts performance"),
+            # Flutter patterns
+            (r'build.*for.*in.*large', "Flutter: Heavy computation in build method - use builders"),
+            (r'StatefulWidget.*setState.*for.*in', "Flutter: Multiple setState calls - batch updates"),
+            (r'Image\.asset.*ListView\.builder', "Flutter: Loading images in ListView - use caching"),
+            (r'FutureBuilder.*ListView\.builder', "Flutter: Nested async builders - performance issues"),
+        ],
+    },
+    "mobile.security": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # iOS Security patterns
+            (r'NSUserDefaults.*password|UserDefaults.*password', "iOS: Password in UserDefaults - use Keychain"),
+            (r'NSLog.*password|print.*password', "iOS: Password in logs - security risk"),
+            (r'allowsArbitraryLoads.*true', "iOS: ATS disabled - security vulnerability"),
+            (r'NSURLRequest.*HTTPMethod.*POST.*password', "iOS: Password in HTTP request - use HTTPS"),
+            (r'kSecAttrAccessibleAlways', "iOS: Keychain always accessible - reduce accessibility"),
+            # Android Security patterns
+            (r'SharedPreferences.*password', "Android: Password in SharedPreferences - use KeyStore"),
+            (r'Log\.[devi].*password|println.*password', "Android: Password in logs - security risk"),
+            (r'HTTP://|http://', "Android: HTTP usage - migrate to HTTPS"),
+            (r'WebView.*setJavaScriptEnabled\(true\)', "Android: JavaScript enabled without validation - XSS risk"),
+            (r'Intent.*FLAG_ACTIVITY_NEW_TASK.*data', "Android: Intent with sensitive data - validate recipient"),
+            # React Native Security
+            (r'AsyncStorage.*password|SecureStore.*password', "RN: Password storage - ensure proper encryption"),
+            (r'fetch\([\'"]http://|axios.*http://', "RN: HTTP requests - use HTTPS only"),
+            (r'WebView.*source.*uri.*http://', "RN: HTTP in WebView - security risk"),
+            (r'__DEV__.*false.*console\.log.*token', "RN: Tokens in production logs - remove debug code"),
+            # Flutter Security
+            (r'SharedPreferences.*password', "Flutter: Password in SharedPreferences - use flutter_secure_storage"),
+            (r'http\.get\(|http\.post\(', "Flutter: HTTP package usage - migrate to HTTPS"),
+            (r'WebView.*initialUrl.*http://', "Flutter: HTTP in WebView - security vulnerability"),
+        ],
+    },
+    "mobile.ui": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Accessibility patterns
+            (r'Button.*accessibilityLabel.*nil|Button\(.*\).*{', "Missing accessibility labels for buttons"),
+            (r'Image.*contentDescription.*null|Image\(.*\)', "Missing content descriptions for images"),
+            (r'TouchableOpacity.*accessibilityRole.*undefined', "RN: Missing accessibility roles"),
+            (r'Text.*fontSize.*[56789]\d+', "Font size too large (>50) - may cause layout issues"),
+            (r'Text.*fontSize.*[1-9]\.', "Font size too small (<10) - accessibility concern"),
+            # Layout patterns
+            (r'position.*absolute.*top.*\d+.*left.*\d+', "Hardcoded absolute positioning - responsive issues"),
+            (r'width.*\d+.*height.*\d+.*View', "Fixed dimensions - responsive design concern"),
+            (r'ScrollView.*horizontal.*vertical', "Conflicting scroll directions - UX issue"),
+            (r'FlatList.*horizontal.*showsVerticalScrollIndicator', "Inconsistent scroll indicators"),
+            # Platform-specific patterns
+            (r'Platform\.OS.*ios.*backgroundColor.*blue', "iOS: Blue background may conflict with system colors"),
+            (r'Platform\.OS.*android.*elevation.*[0-9]{2,}', "Android: High elevation values - may cause shadows overlap"),
+            (r'StatusBar.*backgroundColor.*android.*barStyle.*ios', "Mixed platform status bar styling"),
+        ],
+    },
+    "mobile.memory": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # iOS Memory patterns
+            (r'strong.*self.*completion', "iOS: Strong self reference in completion - potential retain cycle"),
+            (r'@IBOutlet.*strong', "iOS: Strong IBOutlet reference - should be weak"),
+            (r'Timer.*scheduledTimer.*self', "iOS: Timer with strong self reference - retain cycle"),
+            (r'NotificationCenter.*addObserver.*self.*removeObserver', "iOS: Observer not removed - memory leak"),
+            # Android Memory patterns
+            (r'static.*Context|static.*Activity', "Android: Static context reference - memory leak"),
+            (r'Handler.*Activity.*Message', "Android: Handler holding Activity reference - leak potential"),
+            (r'AsyncTask.*Activity.*onPostExecute', "Android: AsyncTask holding Activity - rotation leak"),
+            (r'Bitmap.*createBitmap.*recycle', "Android: Bitmap not recycled - memory usage"),
+            # React Native Memory
+            (r'useEffect.*\[\].*return.*clearInterval', "RN: Missing cleanup in useEffect - memory leak"),
+            (r'Animated\.timing.*start.*loop.*true', "RN: Looping animation without stop condition"),
+            (r'setInterval.*this\.state.*componentWillUnmount', "RN: Interval not cleared on unmount"),
+        ],
+    },
+    "python.quality.high": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            (r"exec\s*\(", "exec() usage detected - security risk"),
+            (r"eval\s*\(", "eval() usage detected - security risk"),
+            (r"__import__\s*\(", "Dynamic imports detected - review required"),
+            (r"os\.system\s*\(", "os.system() usage - security risk"),
+            (r"subprocess\.call.*shell=True", "subprocess with shell=True - security risk"),
+            (r"input\s*\(\s*\)", "input() without validation - potential security issue"),
+        ],
+    },
+    "python.quality.medium": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            (r"DEBUG\s*=\s*True", "DEBUG=True detected - should be False in production"),
+            (r"SECRET_KEY\s*=\s*['\"][^'\"]{1,20}['\"]", "Weak SECRET_KEY detected"),
+            (r"password\s*=\s*['\"][^'\"]*['\"]", "Hardcoded password detected"),
+            (r"api_key\s*=\s*['\"][^'\"]*['\"]", "Hardcoded API key detected"),
+        ],
+    },
+    "security.secrets.high": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # High-confidence secret patterns
+            (r"-----BEGIN [A-Z ]+-----", "Private key detected"),
+            (r"['\"]?[A-Za-z0-9]{32,}['\"]?\s*[:=]\s*['\"][A-Za-z0-9+/]{20,}={0,2}['\"]", "Base64 encoded secret"),
+            (r"sk_live_[A-Za-z0-9]{24,}", "Stripe live secret key"),
+            (r"sk_test_[A-Za-z0-9]{24,}", "Stripe test secret key"),
+            (r"pk_live_[A-Za-z0-9]{24,}", "Stripe live publishable key"),
+            (r"AKIA[0-9A-Z]{16}", "AWS access key ID"),
+            (r"['\"]?[A-Za-z0-9/+]{40}['\"]?", "AWS secret access key pattern"),
+            (r"ghp_[A-Za-z0-9]{36}", "GitHub personal access token"),
+            (r"ghs_[A-Za-z0-9]{36}", "GitHub app token"),
+        ],
+    },
+    "security.secrets.medium": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Medium-confidence patterns
+            (r"password\s*[:=]\s*['\"][^'\"]{8,}['\"]", "Hardcoded password"),
+            (r"api[_-]?key\s*[:=]\s*['\"][^'\"]{10,}['\"]", "API key"),
+            (r"secret[_-]?key\s*[:=]\s*['\"][^'\"]{10,}['\"]", "Secret key"),
+            (r"auth[_-]?token\s*[:=]\s*['\"][^'\"]{20,}['\"]", "Authentication token"),
+            (r"access[_-]?token\s*[:=]\s*['\"][^'\"]{20,}['\"]", "Access token"),
+            (r"private[_-]?key\s*[:=]\s*['\"][^'\"]{20,}['\"]", "Private key"),
+            (r"database[_-]?url\s*[:=]\s*['\"].*://.*:.*@.*['\"]", "Database connection string with credentials"),
+        ],
+    },
+    "security.vulnerabilities": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Code injection vulnerabilities
+            (r"eval\s*\(.*\+", "Code injection via eval with concatenation"),
+            (r"exec\s*\(.*\+", "Code injection via exec with concatenation"),
+            (r"__import__\s*\(.*input\(", "Dynamic import with user input"),
+            (r"subprocess\.[a-zA-Z]*\(.*shell=True.*\+", "Command injection via subprocess"),
+            (r"os\.system\s*\(.*\+", "Command injection via os.system"),
+            (r"sql.*\+.*input\(", "SQL injection pattern"),
+            (r"\.format\s*\(.*input\(", "Format string vulnerability"),
+            # XSS and web vulnerabilities
+            (r"innerHTML\s*=.*\+", "XSS via innerHTML"),
+            (r"document\.write\s*\(.*\+", "XSS via document.write"),
+            (r"dangerouslySetInnerHTML.*\+", "XSS via dangerouslySetInnerHTML"),
+            (r"window\.location\s*=.*\+", "Open redirect vulnerability"),
+            (r"postMessage\s*\(.*,\s*\*", "PostMessage to any origin - security risk"),
+            # Crypto vulnerabilities
+            (r"md5\s*\(", "MD5 usage - cryptographically broken"),
+            (r"sha1\s*\(", "SHA1 usage - cryptographically weak"),
+            (r"DES|3DES", "DES encryption - weak algorithm"),
+            (r"RC4", "RC4 encryption - broken algorithm"),
+            (r"random\.random\(\)", "Weak random number generator for security"),
+        ],
+    },
+    "security.compliance.privacy": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Data privacy patterns
+            (r"personal[_-]?data", "Personal data handling detected - ensure GDPR compliance"),
+            (r"pii|personally[_-]?identifiable", "PII detected - privacy review required"),
+            (r"medical|health[_-]?record", "Health data detected - HIPAA compliance required"),
+            (r"credit[_-]?card|payment[_-]?info", "Payment data detected - PCI DSS compliance required"),
+            (r"ssn|social[_-]?security", "SSN detected - sensitive data handling required"),
+            (r"cookie.*tracking", "Tracking cookies - privacy policy required"),
+        ],
+    },
+    "security.compliance.audit": {
+        "flags": ["IGNORECASE"],
+        "rules": [
+            # Logging and audit patterns
+            (r"log.*password|log.*secret", "Sensitive data in logs - compliance violation"),
+            (r"print.*password|print.*token", "Sensitive data in output - security risk"),
+            (r"console\.log.*password", "Password in console logs - security risk"),
+        ],
+    },
+    "testing.coverage.essential": {
+        "flags": [],
+        "rules": [
+            # Check for essential test patterns
+            (r'assert|expect', "Assertions found"),
+            (r'mock|Mock|patch', "Mocking found"),
+            (r'setUp|tearDown|beforeEach|afterEach', "Setup/teardown found"),
+        ],
+    },
+    "testing.quality.anti_patterns": {
+        "flags": [],
+        "rules": [
+            # Test anti-patterns
+            (r'time\.sleep\(\d+\)', "ANTI-PATTERN: Hard-coded sleep in tests - use proper synchronization"),
+            (r'assert\s+True\s*==\s*True|assert\s+1\s*==\s*1', "ANTI-PATTERN: Meaningless assertions"),
+            (r'except.*:.*pass', "ANTI-PATTERN: Silently ignoring exceptions in tests"),
+            (r'test.*\n.*test.*\n.*test', "ANTI-PATTERN: Multiple test methods without clear separation"),
+            (r'random\.|Math\.random', "ANTI-PATTERN: Non-deterministic random values in tests"),
+        ],
+    },
+    "testing.quality.smells": {
+        "flags": [],
+        "rules": [
+            # Test smells
+            (r'assert.*and.*assert', "SMELL: Multiple assertions in single test - consider splitting"),
+            (r'for.*in.*:.*assert', "SMELL: Assertions in loops - may mask failures"),
+            (r'if.*assert.*else.*assert', "SMELL: Conditional assertions - tests should be deterministic"),
+            (r'len\(.*\)\s*>\s*\d+.*assert', "SMELL: Testing collection size instead of specific content"),
+        ],
+    },
+    "testing.quality.performance": {
+        "flags": [],
+        "rules": [
+            # Performance issues in tests
+            (r'requests\.(get|post)', "PERFORMANCE: HTTP requests in tests - consider mocking"),
+            (r'open\(.*[\'"]w[\'"]', "PERFORMANCE: File I/O in tests - consider in-memory alternatives"),
+            (r'subprocess\.|os\.system', "PERFORMANCE: System calls in tests - consider mocking"),
+            (r'Thread\(|Process\(', "PERFORMANCE: Threading/multiprocessing in tests - may cause flakiness"),
+        ],
+    },
+    "testing.environment.setup": {
+        "flags": [],
+        "rules": [
+            # Check for proper test setup
+            (r'@pytest\.fixture', "Pytest fixtures detected"),
+            (r'setUp|tearDown', "xUnit setup detected"),
+            (r'beforeEach|afterEach', "JavaScript test setup detected"),
+            (r'@mock\.patch', "Python mocking detected"),
+        ],
+    },
+    "testing.environment.cleanup": {
+        "flags": [],
+        "rules": [
+            # Check for resource cleanup
+            (r'close\(\)|cleanup\(\)', "Resource cleanup detected"),
+            (r'finally:|tearDown|afterEach', "Cleanup blocks detected"),
+        ],
+    },
+}
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Required-literal extraction for the rule prefilter.
+A rule's requirement is a set of literals at least one of which must occur in any
+text the rule matches; when none occur the regex cannot match and is skipped.
+Literals under IGNORECASE are stored lowercased and looked up in rule_registry.fold_case(content).
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+from rule_registry import NON_ASCII_CASE_FOLDS
+
+# Shorter literals are present in nearly every file and not worth a lookup
+MIN_LITERAL_LENGTH = 3
+
+_REPEATS = (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT, getattr(sre_parse, "POSSESSIVE_REPEAT", sre_parse.MAX_REPEAT))
+
+# (literal, folded) alternatives - any one present means the rule may match
+Requirement = List[Tuple[str, bool]]
+
+
+def non_ascii_case_folds() -> dict:
+    """Every non-ASCII character re.IGNORECASE treats as an ASCII letter, per this interpreter"""
+    import string
+
+    folds = {}
+    for codepoint in range(128, 0x110000):
+        char = chr(codepoint)
+        lowered, raised = char.lower(), char.upper()
+        # Only characters whose case mappings touch ASCII can be case-insensitive ASCII matches
+        if lowered.isascii() or raised.isascii() or char in NON_ASCII_CASE_FOLDS:
+            for letter in string.ascii_lowercase:
+                if re.fullmatch(letter, char, re.IGNORECASE):
+                    folds[char] = letter
+    return folds
+
+
+def _score(requirement: Requirement) -> Tuple[int, int]:
+    """Prefer requirements whose shortest literal is longest, then fewer alternatives"""
+    return (min(len(text) for text, _ in requirement), -len(requirement))
+
+
+def _best(candidates: List[Requirement]) -> Optional[Requirement]:
+    candidates = [candidate for candidate in candidates if candidate]
+    return max(candidates, key=_score) if candidates else None
+
+
+def _requirement(items, flags: int) -> Optional[Requirement]:
+    """Strongest literal requirement of a parsed sequence, or None when nothing is required"""
+    candidates: List[Requirement] = []
+    run: List[str] = []
+    folded = bool(flags & re.IGNORECASE)
+
+    def flush():
+        if run:
+            candidates.append([("".join(run), folded)])
+            run.clear()
+
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            char = chr(av)
+            if folded and not char.isascii() and (char.lower() != char or char.upper() != char):
+                # Cased non-ASCII characters fold in ways a lowercase copy cannot mirror
+                flush()
+                continue
+            run.append(char.lower() if folded else char)
+            continue
+
+        flush()
+        if op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, pattern = av
+            candidates.append(_requirement(pattern, (flags | add_flags) & ~del_flags))
+        elif op is getattr(sre_parse, "ATOMIC_GROUP", None):
+            candidates.append(_requirement(av, flags))
+        elif op in _REPEATS:
+            low, _, pattern = av
+            if low >= 1:
+                candidates.append(_requirement(pattern, flags))
+        elif op is sre_parse.ASSERT:
+            # A positive lookaround's text still has to be somewhere in the content
+            candidates.append(_requirement(av[1], flags))
+        elif op is sre_parse.BRANCH:
+            branches = [_requirement(branch, flags) for branch in av[1]]
+            if branches and all(branches):
+                candidates.append([alternative for branch in branches for alternative in branch])
+    flush()
+
+    candidates = [
+        candidate for candidate in candidates
+        if candidate and all(len(text) >= MIN_LITERAL_LENGTH for text, _ in candidate)
+    ]
+    return _best(candidates)
+
+
+def required_literals(pattern: str, flags: int) -> Optional[Requirement]:
+    """Literals of which any match of pattern must contain at least one, deduplicated"""
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return None
+    requirement = _requirement(parsed, parsed.state.flags)
+    if not requirement:
+        return None
+    return sorted(set(requirement))
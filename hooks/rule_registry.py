@@ -0,0 +1,691 @@
+#!/usr/bin/env python3
+"""
+Central registry for agent hook regex rules.
+Loads the versioned rule pack (rule-pack.json) once per process and compiles each
+rule set on first use, so hooks never hand raw pattern strings to re's small cache.
+Each set scans through one of two engines that return identical results:
+  per_rule  - one re.search per rule (default; fastest under CPython's sre)
+  combined  - one alternation of the set's rules, restarted at each leftmost hit
+Set $CLAUDE_RULE_ENGINE=combined to switch; bench-rule-engine.py compares them.
+Before either engine runs, rules whose required literals (extracted by rule_literals
+when the pack is built) are all absent from the content are skipped outright.
+Rules rule_audit classifies as super-linear run under a per-rule time budget, through
+a linear-time chain matcher where their shape allows; a rule that still runs out of
+time is reported as inconclusive instead of stalling the tool call.
+"""
+
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Match, Optional, Pattern, Tuple, Union
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+HOOKS_DIR = Path(__file__).parent
+RULE_PACK_FILE = HOOKS_DIR / "rule-pack.json"
+
+ENGINES = ("per_rule", "combined")
+
+# Combined matchers kept per set, keyed by which rules are still unmatched
+MAX_COMBINED_PER_SET = 32
+
+_packs: Dict[str, "RulePack"] = {}
+
+# Non-ASCII characters that re.IGNORECASE matches against ASCII letters
+# (build-rule-pack.py re-derives this from the running Unicode database)
+NON_ASCII_CASE_FOLDS = {
+    "İ": "i",  # LATIN CAPITAL LETTER I WITH DOT ABOVE
+    "ı": "i",  # LATIN SMALL LETTER DOTLESS I
+    "ſ": "s",  # LATIN SMALL LETTER LONG S
+    "K": "k",  # KELVIN SIGN
+}
+
+# Per rule set: [regex evaluations run, evaluations skipped by the literal prefilter]
+_prefilter_stats: Dict[str, List[int]] = {}
+
+# Time a super-linear rule may spend on one file before it is abandoned
+DEFAULT_RULE_BUDGET_MS = 50
+
+# Longest run of input one of a rule's repeats may backtrack over, by the rule's worst-case class, where
+# no alarm can enforce the budget (no SIGALRM, or off the main thread); past it the rule is reported
+# inconclusive instead
+UNBOUNDED_INPUT_LIMITS = {"quadratic": 4000, "polynomial": 500, "exponential": 0}
+
+# Rules that ran out of time since the hook read its input
+_inconclusive: List["Rule"] = []
+
+# Incremental scan of an edited file in progress (incremental_scan.ScanSession), if any
+_scan_session = None
+
+
+class RuleTimeout(Exception):
+    """A rule exceeded its time budget, or its input was too long to search without one"""
+
+
+def flags_from_names(names: List[str]) -> int:
+    """Turn ["IGNORECASE", "DOTALL"] into the matching re flag bits"""
+    flags = 0
+    for name in names:
+        flag = getattr(re, name, None)
+        if not isinstance(flag, re.RegexFlag):
+            raise ValueError(f"Unknown regex flag: {name}")
+        flags |= flag
+    return flags
+
+
+def default_engine() -> str:
+    """Scan engine for rule sets, overridable with $CLAUDE_RULE_ENGINE"""
+    engine = os.environ.get("CLAUDE_RULE_ENGINE", "per_rule")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown rule engine: {engine} (expected one of {', '.join(ENGINES)})")
+    return engine
+
+
+def fold_case(content: str) -> str:
+    """Lowercase content so every IGNORECASE match of an ASCII literal becomes a plain substring"""
+    if not content.isascii():
+        # str.replace per fold is far cheaper than translate() over large non-ASCII content
+        for char, letter in NON_ASCII_CASE_FOLDS.items():
+            if char in content:
+                content = content.replace(char, letter)
+    return content.lower()
+
+
+def rule_budget() -> float:
+    """Per-rule budget in seconds from $CLAUDE_RULE_BUDGET_MS; 0 disables the budget"""
+    try:
+        return max(0.0, float(os.environ.get("CLAUDE_RULE_BUDGET_MS", DEFAULT_RULE_BUDGET_MS)) / 1000)
+    except ValueError:
+        return DEFAULT_RULE_BUDGET_MS / 1000
+
+
+def run_with_budget(func: Callable, budget: float, *args, span: Optional[Callable[[], int]] = None,
+                    risk: str = "linear"):
+    """
+    Call func(*args), raising RuleTimeout after budget seconds. Where no alarm can interrupt
+    it (no setitimer, or off the main thread), RuleTimeout is raised up front instead when
+    span() - the longest run of input a repeat can backtrack over - exceeds the
+    UNBOUNDED_INPUT_LIMITS of its worst-case risk; without span the call is not bounded there
+    """
+    import signal
+
+    if budget <= 0:
+        return func(*args)
+
+    def expire(signum, frame):
+        raise RuleTimeout()
+
+    armed = False
+    if hasattr(signal, "setitimer"):
+        try:
+            previous = signal.signal(signal.SIGALRM, expire)
+            armed = True
+        except ValueError:
+            pass  # Signals can only be handled on the main thread
+    if not armed:
+        limit = UNBOUNDED_INPUT_LIMITS.get(risk)
+        if limit is not None and span is not None:
+            longest = span()
+            if longest > limit:
+                raise RuleTimeout(f"a run of {longest} characters is too long to search without a time limit")
+        return func(*args)
+    # re checks for pending signals while matching, so the alarm interrupts a runaway search
+    signal.setitimer(signal.ITIMER_REAL, budget)
+    try:
+        return func(*args)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def record_inconclusive(rule: "Rule", timeout: Optional[RuleTimeout] = None):
+    """Note a rule that ran out of time so the hook can say its verdict is incomplete"""
+    _inconclusive.append(rule)
+    reason = str(timeout) if timeout is not None and timeout.args else f"exceeded {rule_budget() * 1000:.0f} ms budget"
+    print(f"⏱️ Rule {rule.rule_id} inconclusive: {reason}", file=sys.stderr)
+
+
+def inconclusive_rules() -> List["Rule"]:
+    """Rules that timed out since the last reset"""
+    return list(_inconclusive)
+
+
+def reset_inconclusive():
+    """Forget timed-out rules - done whenever a hook starts on a new input"""
+    _inconclusive.clear()
+
+
+def prefilter_enabled() -> bool:
+    """Literal prefilter switch; CLAUDE_RULE_PREFILTER=0 turns it off for comparison"""
+    return os.environ.get("CLAUDE_RULE_PREFILTER", "1") != "0"
+
+
+def prefilter_stats() -> Dict[str, Dict[str, int]]:
+    """Regex evaluations run and skipped per rule set since the last reset"""
+    return {name: {"evaluated": counts[0], "skipped": counts[1]} for name, counts in _prefilter_stats.items()}
+
+
+def reset_prefilter_stats():
+    """Clear the prefilter counters - the hook server does this between reports"""
+    _prefilter_stats.clear()
+
+
+def set_scan_session(session) -> None:
+    """Route scans of session.content through session (incremental_scan) until cleared with None"""
+    global _scan_session
+    _scan_session = session
+
+
+class ContentView:
+    """Content plus lazily folded text and memoized literal lookups, shared by every set in a check"""
+
+    __slots__ = ("content", "_folded", "_present")
+
+    def __init__(self, content: str):
+        self.content = content
+        self._folded: Optional[str] = None
+        self._present: Dict[Tuple[str, bool], bool] = {}
+
+    def contains(self, literal: str, folded: bool) -> bool:
+        key = (literal, folded)
+        present = self._present.get(key)
+        if present is None:
+            if folded:
+                if self._folded is None:
+                    self._folded = fold_case(self.content)
+                present = literal in self._folded
+            else:
+                present = literal in self.content
+            self._present[key] = present
+        return present
+
+
+_last_view: Optional[ContentView] = None
+
+
+def content_view(content: str) -> ContentView:
+    """View of content, reused while hooks keep scanning the same string"""
+    global _last_view
+    if _last_view is None or _last_view.content is not content:
+        _last_view = ContentView(content)
+    return _last_view
+
+
+def combinable(pattern: str, flags: int) -> bool:
+    """Whether a pattern keeps its meaning as one branch of a larger alternation"""
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except re.error:
+        return False
+    # Named groups would collide, backreferences renumber, inline global flags must lead
+    if parsed.state.groupdict or parsed.state.flags & ~(flags | re.UNICODE):
+        return False
+
+    def walk(items) -> bool:
+        for op, av in items:
+            if op in (sre_parse.GROUPREF, sre_parse.GROUPREF_EXISTS):
+                return False
+            if isinstance(av, (list, tuple)):
+                for item in av:
+                    if isinstance(item, sre_parse.SubPattern) and not walk(item):
+                        return False
+                    if isinstance(item, list) and not walk_branches(item):
+                        return False
+            elif isinstance(av, sre_parse.SubPattern) and not walk(av):
+                return False
+        return True
+
+    def walk_branches(items) -> bool:
+        return all(walk(item) for item in items if isinstance(item, sre_parse.SubPattern))
+
+    return walk(parsed)
+
+
+class LinearChain:
+    """
+    Linear-time matcher for rules shaped like `A.*B.+C`: segments (see rule_audit) joined by
+    gaps that stay on one line. A segment matches at most one way from any start, and a later
+    start never ends earlier, so a chain completes from a head exactly when each later segment,
+    taken at its earliest start after the previous one ends, starts on that one's last line.
+    Heads are tried in order and those positions only move forward, so each segment's next
+    occurrence is looked up once and reused until a head passes it. Unless the head itself
+    can span lines, a later head on the same line can only do worse, so a failed line is
+    abandoned as a whole.
+    """
+
+    def __init__(self, segments: List[str], gaps: List[int], flags: int, head_spans_lines: bool = False):
+        self.segments = [re.compile(segment, flags) for segment in segments]
+        self.gaps = gaps
+        self.dotall = bool(flags & re.DOTALL)
+        self.head_spans_lines = head_spans_lines
+
+    def search_start(self, content: str, pos: int = 0, endpos: Optional[int] = None) -> Optional[int]:
+        """Start of the leftmost match of the whole chain in content[pos:endpos], or None when there is none"""
+        size = len(content) if endpos is None else min(endpos, len(content))
+        # Per segment, and for the next newline: (searched from, what was found there)
+        found: List[Optional[Tuple[int, object]]] = [None] * (len(self.segments) + 1)
+        first = self.segments[0]
+        while True:
+            head = first.search(content, pos, size)
+            if head is None:
+                return None
+            if self._completes(content, head.end(), size, found):
+                return head.start()
+            if self.dotall:
+                # Without lines, a later head only ends later and can do no better
+                return None
+            if self.head_spans_lines:
+                pos = head.start() + 1
+                continue
+            newline = content.find("\n", head.start(), size)
+            if newline < 0:
+                return None
+            pos = newline + 1
+
+    def _completes(self, content: str, end: int, size: int, found: list) -> bool:
+        for index, gap in enumerate(self.gaps, 1):
+            line_end = size if self.dotall else self._line_end(content, end, size, found)
+            low = end + gap
+            if low > line_end:
+                return False
+            match = self._next(index, content, low, size, found)
+            if match is None or match.start() > line_end:
+                return False
+            end = match.end()
+        return True
+
+    def _next(self, index: int, content: str, low: int, size: int, found: list) -> Optional[Match]:
+        """The segment's match starting first at or after low"""
+        cached = found[index]
+        if cached is not None and cached[0] <= low and (cached[1] is None or low <= cached[1].start()):
+            return cached[1]
+        match = self.segments[index].search(content, low, size)
+        found[index] = (low, match)
+        return match
+
+    @staticmethod
+    def _line_end(content: str, end: int, size: int, found: list) -> int:
+        """Position of the first newline at or after end, size when there is none"""
+        cached = found[-1]
+        if cached is not None and cached[0] <= end <= cached[1]:
+            return cached[1]
+        newline = content.find("\n", end, size)
+        found[-1] = (end, size if newline < 0 else newline)
+        return found[-1][1]
+
+
+class ChainAlternation:
+    """Linear-time matcher for an alternation of chains: its leftmost match starts where the earliest branch does"""
+
+    def __init__(self, chains: List[LinearChain]):
+        self.chains = chains
+
+    def search_start(self, content: str, pos: int = 0, endpos: Optional[int] = None) -> Optional[int]:
+        starts = [chain.search_start(content, pos, endpos) for chain in self.chains]
+        return min((start for start in starts if start is not None), default=None)
+
+
+def chain_matcher(spec: dict, flags: int):
+    """LinearChain (or ChainAlternation) for a chain spec from rule_audit.linear_chain"""
+    if "branches" in spec:
+        return ChainAlternation([chain_matcher(branch, flags) for branch in spec["branches"]])
+    return LinearChain(spec["segments"], spec["gaps"], flags, spec.get("head_spans_lines", False))
+
+
+class RuleMatch:
+    """A rule together with the span of one of its matches (the first, from RuleSet.scan)"""
+
+    __slots__ = ("rule", "span")
+
+    def __init__(self, rule: "Rule", span: Tuple[int, int]):
+        self.rule = rule
+        self.span = span
+
+    def __repr__(self) -> str:
+        return f"RuleMatch({self.rule.rule_id!r}, {self.span})"
+
+
+class Rule:
+    """One pattern with its flags and the message hooks report when it matches"""
+
+    __slots__ = ("rule_id", "pattern", "flags", "description", "literals", "risk", "chain_spec", "repeat_classes",
+                 "_regex", "_chain", "_runs")
+
+    def __init__(self, rule_id: str, pattern: str, flags: int, description: str,
+                 literals: Optional[List[Tuple[str, bool]]] = None, risk: str = "linear",
+                 chain: Optional[dict] = None, repeat_classes: Optional[List[str]] = None):
+        self.rule_id = rule_id
+        self.pattern = pattern
+        self.flags = flags
+        self.description = description
+        # Any one of these (literal, folded) pairs must be present for the pattern to match
+        self.literals = tuple((text, bool(folded)) for text, folded in literals or ())
+        # Worst-case class from rule_audit; anything but "linear" runs under the time budget
+        self.risk = risk
+        self.chain_spec = chain
+        # Classes of its unbounded repeats (rule_audit.repeat_classes), None when they are unknown
+        self.repeat_classes = repeat_classes
+        self._regex: Optional[Pattern] = None
+        self._chain: Optional[Union[LinearChain, ChainAlternation]] = None
+        self._runs: Optional[List[Pattern]] = None
+
+    @property
+    def regex(self) -> Pattern:
+        """Compiled pattern, built once per process"""
+        if self._regex is None:
+            self._regex = re.compile(self.pattern, self.flags)
+        return self._regex
+
+    @property
+    def chain(self) -> Optional[Union[LinearChain, ChainAlternation]]:
+        """Linear-time matcher for chain-shaped rules, None for everything else"""
+        if self._chain is None and self.chain_spec:
+            self._chain = chain_matcher(self.chain_spec, self.flags)
+        return self._chain
+
+    def search(self, content: str, pos: int = 0, endpos: Optional[int] = None) -> Optional[Match]:
+        """First match in content[pos:endpos], like Pattern.search; may raise RuleTimeout"""
+        if endpos is None:
+            endpos = len(content)
+        if self.risk == "linear":
+            return self.regex.search(content, pos, endpos)
+        budget = rule_budget()
+        if self.chain is not None:
+            start = self.chain.search_start(content, pos, endpos)
+            if start is None:
+                return None
+            # Anchored at the leftmost start, re reproduces search()'s span without rescanning;
+            # one attempt backtracks through one gap fewer than a search would, so it needs no input bound
+            match = run_with_budget(self.regex.match, budget, content, start, endpos)
+            if match is not None:
+                return match
+        return run_with_budget(self.regex.search, budget, content, pos, endpos,
+                               span=lambda: self.attempt_span(content, pos, endpos), risk=self.risk)
+
+    def finditer(self, content: str, pos: int = 0, endpos: Optional[int] = None) -> Iterator[Match]:
+        """Every non-overlapping match in content[pos:endpos]; a timed-out rule yields none and is recorded"""
+        if endpos is None:
+            endpos = len(content)
+        if self.risk == "linear":
+            return self.regex.finditer(content, pos, endpos)
+        try:
+            return iter(run_with_budget(lambda: list(self.regex.finditer(content, pos, endpos)), rule_budget(),
+                                        span=lambda: self.attempt_span(content, pos, endpos), risk=self.risk))
+        except RuleTimeout as timeout:
+            record_inconclusive(self, timeout)
+            return iter(())
+
+    def attempt_span(self, content: str, pos: int, endpos: int) -> int:
+        """Longest run in content[pos:endpos] of one of the rule's repeat classes - as far as a repeat can
+        backtrack - or all of it when the classes are unknown"""
+        if self.repeat_classes is None:
+            return endpos - pos
+        if self._runs is None:
+            self._runs = [re.compile(f"(?:{source})+", self.flags) for source in self.repeat_classes]
+        return max((max(map(len, run.findall(content, pos, endpos)), default=0) for run in self._runs), default=0)
+
+    def eligible(self, view: ContentView) -> bool:
+        """False only when the pattern provably cannot match - none of its required literals occur"""
+        if not self.literals:
+            return True
+        return any(view.contains(text, folded) for text, folded in self.literals)
+
+    def __repr__(self) -> str:
+        return f"Rule({self.rule_id!r}, {self.pattern!r})"
+
+
+class RuleSet:
+    """Ordered rules scanned together by one hook check"""
+
+    def __init__(self, name: str, flags: List[str], rules: List[Rule], engine: Optional[str] = None):
+        self.name = name
+        self.flag_names = flags
+        self.rules = rules
+        self.engine = engine or default_engine()
+        self.prefilter = prefilter_enabled()
+        self._flags = flags_from_names(flags)
+        self._combinable: Optional[Tuple[int, ...]] = None
+        self._combined: Dict[Tuple[int, ...], Pattern] = {}
+
+    def __iter__(self) -> Iterator[Rule]:
+        return iter(self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def compile(self):
+        """Compile every rule in the set now rather than on first match"""
+        for rule in self.rules:
+            rule.regex
+        if self.engine == "combined":
+            self._combined_for(self._combinable_indexes())
+
+    def scan(self, content: str) -> List[RuleMatch]:
+        """Every rule that matches content with its first-match span, in declaration order"""
+        return self._scan(content)[0]
+
+    def _scan(self, content: str) -> Tuple[List[RuleMatch], List[Rule]]:
+        """Matches plus the rules that ran out of time and so neither matched nor missed"""
+        session = _scan_session
+        if session is not None and session.content is content:
+            return session.scan(self)
+        return self.scan_full(content)
+
+    def scan_full(self, content: str) -> Tuple[List[RuleMatch], List[Rule]]:
+        """_scan over the whole of content, bypassing any incremental session"""
+        eligible = self._eligible(content)
+        if self.engine == "combined":
+            return self._scan_combined(content, eligible)
+        matches = []
+        timed_out = []
+        for index in eligible:
+            rule = self.rules[index]
+            match = self._search(rule, content, timed_out)
+            if match:
+                matches.append(RuleMatch(rule, match.span()))
+        return matches, timed_out
+
+    @staticmethod
+    def _search(rule: Rule, content: str, timed_out: List[Rule]) -> Optional[Match]:
+        try:
+            return rule.search(content)
+        except RuleTimeout as timeout:
+            record_inconclusive(rule, timeout)
+            timed_out.append(rule)
+            return None
+
+    def candidates(self, content: str) -> List[Rule]:
+        """Rules the literal prefilter cannot rule out - for callers that walk every match"""
+        return [self.rules[index] for index in self._eligible(content)]
+
+    def find_all(self, content: str) -> List[RuleMatch]:
+        """Every non-overlapping match of every rule, grouped by rule in declaration order"""
+        session = _scan_session
+        if session is not None and session.content is content:
+            return session.find_all(self)
+        return self.find_all_full(content)
+
+    def find_all_full(self, content: str) -> List[RuleMatch]:
+        """find_all over the whole of content, bypassing any incremental session"""
+        return [RuleMatch(rule, match.span()) for rule in self.candidates(content) for match in rule.finditer(content)]
+
+    def matching(self, content: str) -> List[Rule]:
+        """Rules that match somewhere in content, in declaration order"""
+        return [hit.rule for hit in self.scan(content)]
+
+    def missing(self, content: str) -> List[Rule]:
+        """Rules that match nowhere in content - for required-pattern checks"""
+        matches, timed_out = self._scan(content)
+        found = {id(hit.rule) for hit in matches} | {id(rule) for rule in timed_out}
+        return [rule for rule in self.rules if id(rule) not in found]
+
+    def any_match(self, content: str) -> bool:
+        """True as soon as one rule matches"""
+        session = _scan_session
+        if session is not None and session.content is content:
+            return bool(session.scan(self)[0])
+        eligible = self._eligible(content)
+        if self.engine == "combined":
+            combinable = set(self._combinable_indexes())
+            indexes = tuple(index for index in eligible if index in combinable)
+            if indexes and self._combined_for(indexes).search(content):
+                return True
+            return any(self._search(self.rules[index], content, []) for index in eligible if index not in combinable)
+        return any(self._search(self.rules[index], content, []) for index in eligible)
+
+    def _eligible(self, content: str) -> Tuple[int, ...]:
+        """Indexes of rules the literal prefilter cannot rule out, counted per set"""
+        counts = _prefilter_stats.setdefault(self.name, [0, 0])
+        if not self.prefilter:
+            counts[0] += len(self.rules)
+            return tuple(range(len(self.rules)))
+        view = content_view(content)
+        eligible = tuple(index for index, rule in enumerate(self.rules) if rule.eligible(view))
+        counts[0] += len(eligible)
+        counts[1] += len(self.rules) - len(eligible)
+        return eligible
+
+    def _combinable_indexes(self) -> Tuple[int, ...]:
+        """Positions of rules that can share the set's alternation"""
+        if self._combinable is None:
+            self._combinable = tuple(
+                index for index, rule in enumerate(self.rules)
+                if rule.risk == "linear" and combinable(rule.pattern, rule.flags)
+            )
+        return self._combinable
+
+    def _combined_for(self, indexes: Tuple[int, ...]) -> Pattern:
+        """Alternation of the given rules, compiled once per distinct remainder"""
+        pattern = self._combined.get(indexes)
+        if pattern is None:
+            if len(self._combined) >= MAX_COMBINED_PER_SET:
+                self._combined.clear()
+            pattern = re.compile("|".join(f"(?:{self.rules[index].pattern})" for index in indexes), self._flags)
+            self._combined[indexes] = pattern
+        return pattern
+
+    def _scan_combined(self, content: str, eligible: Tuple[int, ...]) -> Tuple[List[RuleMatch], List[Rule]]:
+        """
+        Leftmost hit of the alternation is the earliest first match of any remaining
+        rule, so anchoring each remaining rule there yields exactly the span its own
+        search would; matched rules drop out and the scan resumes from that position
+        """
+        spans: Dict[int, Tuple[int, int]] = {}
+        combinable = set(self._combinable_indexes())
+        remaining = tuple(index for index in eligible if index in combinable)
+        pos = 0
+        while remaining:
+            hit = self._combined_for(remaining).search(content, pos)
+            if hit is None:
+                break
+            pos = hit.start()
+            for index in remaining:
+                match = self.rules[index].regex.match(content, pos)
+                if match:
+                    spans[index] = match.span()
+            remaining = tuple(index for index in remaining if index not in spans)
+
+        timed_out: List[Rule] = []
+        for index in eligible:
+            if index in combinable:
+                continue
+            match = self._search(self.rules[index], content, timed_out)
+            if match:
+                spans[index] = match.span()
+
+        return [RuleMatch(self.rules[index], spans[index]) for index in sorted(spans)], timed_out
+
+
+class RulePack:
+    """Versioned collection of rule sets, addressed by set name"""
+
+    def __init__(self, data: dict):
+        self.schema = data["schema"]
+        self.version = data["version"]
+        self.rule_sets: Dict[str, RuleSet] = {}
+        for name, spec in data["rule_sets"].items():
+            flags = flags_from_names(spec["flags"])
+            rules = [
+                Rule(rule["id"], rule["pattern"], flags, rule["description"], rule.get("literals"),
+                     rule.get("risk", "linear"), rule.get("chain"), rule.get("repeat_classes"))
+                for rule in spec["rules"]
+            ]
+            self.rule_sets[name] = RuleSet(name, spec["flags"], rules)
+
+    def __getitem__(self, name: str) -> RuleSet:
+        return self.rule_sets[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.rule_sets
+
+    def compile_all(self) -> int:
+        """Compile every rule up front - for warm servers and the zygote"""
+        for rule_set in self.rule_sets.values():
+            rule_set.compile()
+        return sum(len(rule_set) for rule_set in self.rule_sets.values())
+
+
+def build_pack_data(rule_sets: dict, schema: int) -> dict:
+    """Serialize rule definitions into pack form, versioned by a digest of their content"""
+    import hashlib
+    from rule_audit import backtracking_risk, linear_chain, repeat_classes
+    from rule_literals import required_literals
+
+    serialized = {}
+    for name, spec in rule_sets.items():
+        flags = flags_from_names(spec["flags"])
+        rules = []
+        for index, (pattern, description) in enumerate(spec["rules"]):
+            rule = {"id": f"{name}.{index:02d}", "pattern": pattern, "description": description}
+            literals = required_literals(pattern, flags)
+            if literals:
+                rule["literals"] = [[text, folded] for text, folded in literals]
+            risk, _ = backtracking_risk(pattern, flags)
+            if risk != "linear":
+                rule["risk"] = risk
+                chain = linear_chain(pattern, flags)
+                if chain:
+                    rule["chain"] = chain
+                classes = repeat_classes(pattern, flags)
+                if classes is not None:
+                    rule["repeat_classes"] = classes
+            rules.append(rule)
+        serialized[name] = {"flags": list(spec["flags"]), "rules": rules}
+
+    canonical = json.dumps({"schema": schema, "rule_sets": serialized}, sort_keys=True, ensure_ascii=True)
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+    return {"schema": schema, "version": f"{schema}.{digest}", "rule_sets": serialized}
+
+
+def rule_pack_path() -> Path:
+    """Rule pack location, overridable for testing alternate packs"""
+    return Path(os.environ.get("CLAUDE_RULE_PACK", RULE_PACK_FILE))
+
+
+def load_rule_pack(path: Optional[Path] = None) -> RulePack:
+    """Load a rule pack once per process; falls back to the source definitions if the file is missing"""
+    path = Path(path) if path else rule_pack_path()
+    key = str(path)
+    if key in _packs:
+        return _packs[key]
+
+    if path.exists():
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    else:
+        from rule_definitions import RULE_PACK_SCHEMA, RULE_SETS
+        print(f"Rule pack {path} not found - using rule_definitions.py (run build-rule-pack.py)", file=sys.stderr)
+        data = build_pack_data(RULE_SETS, RULE_PACK_SCHEMA)
+
+    _packs[key] = RulePack(data)
+    return _packs[key]
+
+
+def rule_pack_version() -> str:
+    """Version of the active rule pack, for keying caches of scan results"""
+    return load_rule_pack().version
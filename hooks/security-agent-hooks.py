@@ -7,55 +7,29 @@ Validates security practices, compliance requirements, and vulnerability detecti
 import json
 import sys
 import os
-import re
-import hashlib
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 from hook_utils import HookUtils, WorkStatusManager, OrchestrationManager
+from rule_registry import load_rule_pack
+
+RULES = load_rule_pack()
 
 def detect_secrets_and_credentials(content: str, file_path: str) -> tuple[str, list]:
     """Detect potential secrets and credentials in code"""
     
     secrets_found = []
     
-    # High-confidence secret patterns
-    high_confidence_patterns = [
-        (r"-----BEGIN [A-Z ]+-----", "Private key detected"),
-        (r"['\"]?[A-Za-z0-9]{32,}['\"]?\s*[:=]\s*['\"][A-Za-z0-9+/]{20,}={0,2}['\"]", "Base64 encoded secret"),
-        (r"sk_live_[A-Za-z0-9]{24,}", "Stripe live secret key"),
-        (r"sk_test_[A-Za-z0-9]{24,}", "Stripe test secret key"),
-        (r"pk_live_[A-Za-z0-9]{24,}", "Stripe live publishable key"),
-        (r"AKIA[0-9A-Z]{16}", "AWS access key ID"),
-        (r"['\"]?[A-Za-z0-9/+]{40}['\"]?", "AWS secret access key pattern"),
-        (r"ghp_[A-Za-z0-9]{36}", "GitHub personal access token"),
-        (r"ghs_[A-Za-z0-9]{36}", "GitHub app token"),
-    ]
-    
-    # Medium-confidence patterns
-    medium_confidence_patterns = [
-        (r"password\s*[:=]\s*['\"][^'\"]{8,}['\"]", "Hardcoded password"),
-        (r"api[_-]?key\s*[:=]\s*['\"][^'\"]{10,}['\"]", "API key"),
-        (r"secret[_-]?key\s*[:=]\s*['\"][^'\"]{10,}['\"]", "Secret key"),
-        (r"auth[_-]?token\s*[:=]\s*['\"][^'\"]{20,}['\"]", "Authentication token"),
-        (r"access[_-]?token\s*[:=]\s*['\"][^'\"]{20,}['\"]", "Access token"),
-        (r"private[_-]?key\s*[:=]\s*['\"][^'\"]{20,}['\"]", "Private key"),
-        (r"database[_-]?url\s*[:=]\s*['\"].*://.*:.*@.*['\"]", "Database connection string with credentials"),
-    ]
-    
     # Check high confidence patterns
-    for pattern, description in high_confidence_patterns:
-        matches = re.finditer(pattern, content, re.IGNORECASE)
-        for match in matches:
-            secrets_found.append(f"🔒 HIGH CONFIDENCE: {description}")
+    for found in RULES["security.secrets.high"].find_all(content):
+        secrets_found.append(f"🔒 HIGH CONFIDENCE: {found.rule.description}")
     
     # Check medium confidence patterns
-    for pattern, description in medium_confidence_patterns:
-        matches = re.finditer(pattern, content, re.IGNORECASE)
-        for match in matches:
-            # Exclude common test/example values
-            matched_text = match.group(0).lower()
-            if not any(test_val in matched_text for test_val in ["test", "example", "demo", "placeholder", "xxx"]):
-                secrets_found.append(f"⚠️ MEDIUM CONFIDENCE: {description}")
+    for found in RULES["security.secrets.medium"].find_all(content):
+        # Exclude common test/example values
+        start, end = found.span
+        matched_text = content[start:end].lower()
+        if not any(test_val in matched_text for test_val in ["test", "example", "demo", "placeholder", "xxx"]):
+            secrets_found.append(f"⚠️ MEDIUM CONFIDENCE: {found.rule.description}")
     
     if len([s for s in secrets_found if "HIGH CONFIDENCE" in s]) >= 1:
         return "HIGH", secrets_found
@@ -71,40 +45,8 @@ def check_security_vulnerabilities(content: str, file_path: str) -> tuple[str, l
     
     vulnerabilities = []
     
-    # Code injection vulnerabilities
-    injection_patterns = [
-        (r"eval\s*\(.*\+", "Code injection via eval with concatenation"),
-        (r"exec\s*\(.*\+", "Code injection via exec with concatenation"),
-        (r"__import__\s*\(.*input\(", "Dynamic import with user input"),
-        (r"subprocess\.[a-zA-Z]*\(.*shell=True.*\+", "Command injection via subprocess"),
-        (r"os\.system\s*\(.*\+", "Command injection via os.system"),
-        (r"sql.*\+.*input\(", "SQL injection pattern"),
-        (r"\.format\s*\(.*input\(", "Format string vulnerability"),
-    ]
-    
-    # XSS and web vulnerabilities
-    web_patterns = [
-        (r"innerHTML\s*=.*\+", "XSS via innerHTML"),
-        (r"document\.write\s*\(.*\+", "XSS via document.write"),
-        (r"dangerouslySetInnerHTML.*\+", "XSS via dangerouslySetInnerHTML"),
-        (r"window\.location\s*=.*\+", "Open redirect vulnerability"),
-        (r"postMessage\s*\(.*,\s*\*", "PostMessage to any origin - security risk"),
-    ]
-    
-    # Crypto vulnerabilities
-    crypto_patterns = [
-        (r"md5\s*\(", "MD5 usage - cryptographically broken"),
-        (r"sha1\s*\(", "SHA1 usage - cryptographically weak"),
-        (r"DES|3DES", "DES encryption - weak algorithm"),
-        (r"RC4", "RC4 encryption - broken algorithm"),
-        (r"random\.random\(\)", "Weak random number generator for security"),
-    ]
-    
-    all_patterns = injection_patterns + web_patterns + crypto_patterns
-    
-    for pattern, description in all_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            vulnerabilities.append(f"🚨 VULNERABILITY: {description}")
+    for rule in RULES["security.vulnerabilities"].matching(content):
+        vulnerabilities.append(f"🚨 VULNERABILITY: {rule.description}")
     
     # Determine risk level
     if len(vulnerabilities) >= 3:
@@ -119,30 +61,11 @@ def check_compliance_requirements(content: str, file_path: str) -> tuple[str, li
     
     compliance_issues = []
     
-    # Data privacy patterns
-    privacy_patterns = [
-        (r"personal[_-]?data", "Personal data handling detected - ensure GDPR compliance"),
-        (r"pii|personally[_-]?identifiable", "PII detected - privacy review required"),
-        (r"medical|health[_-]?record", "Health data detected - HIPAA compliance required"),
-        (r"credit[_-]?card|payment[_-]?info", "Payment data detected - PCI DSS compliance required"),
-        (r"ssn|social[_-]?security", "SSN detected - sensitive data handling required"),
-        (r"cookie.*tracking", "Tracking cookies - privacy policy required"),
-    ]
-    
-    # Logging and audit patterns
-    audit_patterns = [
-        (r"log.*password|log.*secret", "Sensitive data in logs - compliance violation"),
-        (r"print.*password|print.*token", "Sensitive data in output - security risk"),
-        (r"console\.log.*password", "Password in console logs - security risk"),
-    ]
+    for rule in RULES["security.compliance.privacy"].matching(content):
+        compliance_issues.append(f"⚖️ COMPLIANCE: {rule.description}")
     
-    for pattern, description in privacy_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            compliance_issues.append(f"⚖️ COMPLIANCE: {description}")
-    
-    for pattern, description in audit_patterns:
-        if re.search(pattern, content, re.IGNORECASE):
-            compliance_issues.append(f"📋 AUDIT: {description}")
+    for rule in RULES["security.compliance.audit"].matching(content):
+        compliance_issues.append(f"📋 AUDIT: {rule.description}")
     
     if len(compliance_issues) >= 2:
         return "HIGH", compliance_issues
@@ -181,32 +104,39 @@ def main():
         
         tool_name = input_data.get("tool_name", "")
         tool_input = input_data.get("tool_input", {})
+        # Edit/MultiEdit carry replacements, not content; scan the file as they would leave it
+        tool_input = HookUtils.resolve_edit(tool_name, tool_input)
         
         # Process all file operations for security scanning
         if tool_name not in ["Write", "Edit", "MultiEdit", "Task"]:
             sys.exit(0)
         
-        file_path = tool_input.get("filePath", "")
+        file_path = HookUtils.tool_file_path(tool_input)
         content = tool_input.get("content", "")
         
-        # Skip binary files and very large files
-        if not content or len(content) > 100000:
-            sys.exit(0)
-        
         work_status = WorkStatusManager(project_dir)
         orchestration = OrchestrationManager(project_dir)
         
-        # Check file locks
+        # Check file locks (with $CLAUDE_LOCK_WAIT set, queue for a held lock instead of refusing)
         if file_path:
-            is_locked, lock_info = work_status.is_file_locked(file_path)
+            is_locked, lock_info = work_status.check_write(file_path, HookUtils.lock_holder(input_data))
             if is_locked:
                 HookUtils.block_with_error(f"🔒 FILE LOCKED: {lock_info}")
         
-        # Security analysis
-        secrets_risk, secrets_found = detect_secrets_and_credentials(content, file_path)
-        vuln_risk, vulnerabilities = check_security_vulnerabilities(content, file_path)
-        compliance_risk, compliance_issues = check_compliance_requirements(content, file_path)
-        recommendations = check_secure_coding_practices(content, file_path)
+        # Skip binary files and very large files; of a large file an edit leaves, scan just the text around its hunks
+        if len(content) > 100000:
+            content = HookUtils.edit_windows(content) or ""
+        if not content or len(content) > 100000:
+            sys.exit(0)
+        
+        # Security analysis (reused from the verdict cache when this content was already scanned)
+        (secrets_risk, secrets_found), (vuln_risk, vulnerabilities), (compliance_risk, compliance_issues), recommendations = HookUtils.cached_scan(
+            __file__, file_path, content, lambda: (
+                detect_secrets_and_credentials(content, file_path),
+                check_security_vulnerabilities(content, file_path),
+                check_compliance_requirements(content, file_path),
+                check_secure_coding_practices(content, file_path),
+            ))
         
         # Determine overall security risk
         all_risks = [secrets_risk, vuln_risk, compliance_risk]
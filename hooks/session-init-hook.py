@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 """
 Session initialization hook - runs at session start
-Initializes work status, checks project state, and prepares orchestration
+Initializes work status, checks project state, and prepares orchestration.
+Keeps the hooks' state directory (.claude/state) out of git
 """
 
 import json
@@ -9,41 +10,36 @@ import sys
 import os
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
+from coordination_files import STATE_DIR, state_dir, update_file
 from hook_utils import HookUtils, WorkStatusManager, OrchestrationManager
 
+def ignore_state_dir(project_dir: str) -> bool:
+    """Give the state directory a .gitignore that ignores everything in it, itself included, so git never
+    sees the hooks' state and the project's own .gitignore is left alone; True when it is in place"""
+    ignore = state_dir(project_dir) / ".gitignore"
+    try:
+        if not ignore.exists():
+            ignore.parent.mkdir(parents=True, exist_ok=True)
+            update_file(ignore, lambda content: content or "*\n")
+        return True
+    except OSError as e:
+        print(f"Could not write {STATE_DIR.as_posix()}/.gitignore: {e}", file=sys.stderr)
+        return False
+
 def main():
     try:
         input_data = HookUtils.read_json_input()
         project_dir = HookUtils.get_project_dir()
         
+        state_ignored = ignore_state_dir(project_dir)
+        
         work_status = WorkStatusManager(project_dir)
         orchestration = OrchestrationManager(project_dir)
         
-        # Initialize work status and orchestration files
-        work_status.ensure_exists()
-        orchestration.ensure_exists()
-        
         # Get agent information
         agent_name = os.environ.get("CLAUDE_AGENT_NAME", "unknown-agent")
         timestamp = HookUtils.get_timestamp()
         
-        # Log session start
-        work_status.log_activity(
-            agent=agent_name,
-            operation="session_start",
-            file_path="",
-            status="initialized",
-            details=f"Claude Code session initialized at {timestamp}"
-        )
-        
-        # Update orchestration with session start
-        orchestration.update_progress(
-            agent=agent_name,
-            operation="session_initialized",
-            file_path="",
-            status="active"
-        )
-        
         # Check if containerization requirements are met
         container_files = []
         project_path = Path(project_dir)
@@ -56,12 +52,35 @@ def main():
         dockerfile_exists = any(f.name.lower().startswith("dockerfile") for f in project_path.glob("*"))
         docker_compose_exists = (project_path / "docker-compose.yml").exists() or (project_path / "docker-compose.yaml").exists()
         
-        # Signal containerization needs if appropriate
-        if container_files and not (dockerfile_exists or docker_compose_exists):
-            orchestration.signal_containerization_needed(
+        # One store transaction and one write of each coordination file for the whole session start
+        with work_status.transaction(), orchestration.transaction():
+            # Initialize work status and orchestration files
+            work_status.ensure_exists()
+            orchestration.ensure_exists()
+            
+            # Log session start
+            work_status.log_activity(
+                agent=agent_name,
+                operation="session_start",
+                file_path="",
+                status="initialized",
+                details=f"Claude Code session initialized at {timestamp}"
+            )
+            
+            # Update orchestration with session start
+            orchestration.update_progress(
                 agent=agent_name,
-                files=[f.name for f in container_files[:5]]  # Limit to first 5 files
+                operation="session_initialized",
+                file_path="",
+                status="active"
             )
+            
+            # Signal containerization needs if appropriate
+            if container_files and not (dockerfile_exists or docker_compose_exists):
+                orchestration.signal_containerization_needed(
+                    agent=agent_name,
+                    files=[f.name for f in container_files[:5]]  # Limit to first 5 files
+                )
         
         # Success output
         session_info = {
@@ -70,7 +89,8 @@ def main():
             "project_files": len(container_files),
             "containerization_ready": dockerfile_exists or docker_compose_exists,
             "work_status_initialized": True,
-            "orchestration_ready": True
+            "orchestration_ready": True,
+            "state_dir_ignored": state_ignored
         }
         
         HookUtils.output_json({
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Routing table deciding which agents the sync hook signals to review a written file.
+Each route maps file extensions, path globs (`**` spans directories) or content markers to the
+agents subscribed to them; every route a file matches adds its agents, in table order. The
+table (SIGNAL_ROUTES, or "signalRoutes" under "claude.orchestration" in the hook settings)
+is compiled once into an index: extensions into a dict, globs into a trie keyed by their
+literal leading directories, markers into one alternation. Routing a path is then one dict
+probe plus the globs hung from the trie nodes on its own path - O(depth) nodes, however many
+routes there are - and a single scan of the content when marker routes exist. Paths and extensions match case-insensitively.
+"""
+
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from hook_runtime import settings_path
+
+# Each route: "extensions", "paths" (globs against the project-relative path) and/or "markers"
+# (substrings of the written content), and the "agents" subscribed to them
+SIGNAL_ROUTES = [
+    {"extensions": [".py", ".pyi"], "agents": ["test-automation-expert", "security-auditor"]},
+    {"extensions": [".js", ".jsx", ".ts", ".tsx"], "agents": ["test-automation-expert", "ui-ux-designer"]},
+    {"paths": ["**/*model*.py", "**/*model*.sql", "**/*model*/**/*.py", "**/*model*/**/*.sql"],
+     "agents": ["database-expert", "security-auditor"]},
+    {"markers": ["CREATE TABLE", "ALTER TABLE", "DROP TABLE"], "agents": ["database-expert"]},
+    {"extensions": [".yml", ".yaml", ".dockerfile"], "paths": ["**/dockerfile"],
+     "agents": ["docker-expert", "security-auditor"]},
+    {"extensions": [".md", ".rst", ".txt"], "agents": ["technical-writer"]},
+]
+
+_tables: Dict[str, object] = {}
+
+
+def _is_glob(part: str) -> bool:
+    return any(char in part for char in "*?[")
+
+
+def glob_regex(glob: str) -> str:
+    """A path glob as a regex: * and ? stay within a directory, ** spans any number of them"""
+    pattern = []
+    index = 0
+    while index < len(glob):
+        if glob.startswith("**/", index):
+            pattern.append("(?:.*/)?")
+            index += 3
+        elif glob.startswith("**", index):
+            pattern.append(".*")
+            index += 2
+        elif glob[index] == "*":
+            pattern.append("[^/]*")
+            index += 1
+        elif glob[index] == "?":
+            pattern.append("[^/]")
+            index += 1
+        elif glob[index] == "[" and "]" in glob[index + 1:]:
+            end = glob.index("]", index + 1)
+            pattern.append("[" + glob[index + 1:end].replace("\\", "\\\\").replace("!", "^", 1) + "]")
+            index = end + 1
+        else:
+            pattern.append(re.escape(glob[index]))
+            index += 1
+    return "".join(pattern) + r"\Z"
+
+
+class RoutingTable:
+    """A compiled routing table"""
+
+    def __init__(self, routes: Iterable[Dict]):
+        self.by_extension: Dict[str, List[int]] = {}
+        # Trie of literal directories: node = (children, [(compiled glob, route index)])
+        self.trie: Tuple[Dict, List] = ({}, [])
+        self.markers: Dict[str, List[int]] = {}
+        self.agents: List[List[str]] = []
+        for index, route in enumerate(routes):
+            self.agents.append(list(route.get("agents", [])))
+            for extension in route.get("extensions", []):
+                self.by_extension.setdefault(extension.lower(), []).append(index)
+            for glob in route.get("paths", []):
+                self._add_glob(glob.lower().strip("/"), index)
+            for marker in route.get("markers", []):
+                self.markers.setdefault(marker, []).append(index)
+        self.marker_scan = (re.compile("|".join(re.escape(marker) for marker in
+                                                sorted(self.markers, key=len, reverse=True)))
+                            if self.markers else None)
+
+    def _add_glob(self, glob: str, index: int):
+        node = self.trie
+        parts = glob.split("/")
+        # Hang the glob from the node of its directories before the first wildcard
+        for part in parts[:-1]:
+            if _is_glob(part):
+                break
+            node = node[0].setdefault(part, ({}, []))
+        node[1].append((re.compile(glob_regex(glob)), index))
+
+    def route(self, relative_path: str, content: str = "") -> List[str]:
+        """Every agent subscribed to the path or its content, each once, in table order"""
+        key = relative_path.replace("\\", "/").strip("/").lower()
+        matched = set(self.by_extension.get(os.path.splitext(key)[1], ()))
+        node = self.trie
+        for part in key.split("/"):
+            matched.update(index for glob, index in node[1] if glob.match(key))
+            node = node[0].get(part)
+            if node is None:
+                break
+        if content and self.marker_scan is not None:
+            for marker in set(self.marker_scan.findall(content)):
+                matched.update(self.markers[marker])
+        return list(dict.fromkeys(agent for index in sorted(matched) for agent in self.agents[index]))
+
+
+def routing_table(routes: Optional[List[Dict]] = None) -> RoutingTable:
+    """The compiled table for routes, or for the settings' signalRoutes (re-read only when the file changes)
+    falling back to SIGNAL_ROUTES"""
+    if routes is not None:
+        return RoutingTable(routes)
+    path = settings_path()
+    try:
+        key = (str(path), path.stat().st_mtime_ns)
+    except OSError:
+        key = None
+    if _tables.get("key") != key or "table" not in _tables:
+        configured = None
+        if key is not None:
+            try:
+                with open(path, 'r') as f:
+                    configured = json.load(f).get("claude.orchestration", {}).get("signalRoutes")
+            except (OSError, ValueError):
+                pass
+        _tables["key"], _tables["table"] = key, RoutingTable(configured or SIGNAL_ROUTES)
+    return _tables["table"]
+
+
+def route_signals(relative_path: str, content: str = "") -> List[str]:
+    """The agents to signal about a written file"""
+    return routing_table().route(relative_path, content)
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Stress the coordination files with concurrent writers
+Starts --writers processes at once against one scratch project. Each locks a file, logs an
+activity, records progress and raises a containerization alert the way the hooks do, then
+bumps a shared counter file --increments times through HookUtils.update_file. Afterwards
+every writer's lock, activity, alert and increment must be present and both markdown files,
+once the background renderer is flushed, well formed. --unguarded first runs
+the counter with the plain read/write the managers used before, to show the updates it loses
+"""
+
+import argparse
+import multiprocessing
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from coordination_renderer import flush
+from hook_utils import HookUtils, OrchestrationManager, WorkStatusManager
+
+COUNTER = "stress-counter.txt"
+
+
+def increment(content: str) -> str:
+    return str(int(content or "0") + 1)
+
+
+def writer(project_dir: str, index: int, increments: int, start_at: float, guarded: bool):
+    time.sleep(max(0.0, start_at - time.time()))
+    if not guarded:
+        path = Path(project_dir) / COUNTER
+        for _ in range(increments):
+            content = path.read_text() if path.exists() else ""
+            path.write_text(increment(content))
+        return
+    agent = f"agent-{index}"
+    file_path = f"{project_dir}/src/module_{index}.py"
+    work_status = WorkStatusManager(project_dir)
+    orchestration = OrchestrationManager(project_dir)
+    work_status.lock_file(file_path, agent)
+    work_status.log_activity(agent, "write operation", file_path, "completed")
+    orchestration.update_progress(agent, "write operation", file_path, "completed")
+    orchestration.signal_containerization_needed(agent, [f"module_{index}.py"])
+    for _ in range(increments):
+        HookUtils.update_file(project_dir, COUNTER, increment)
+
+
+def run(project_dir: str, writers: int, increments: int, guarded: bool) -> float:
+    start_at = time.time() + 0.5
+    processes = [multiprocessing.Process(target=writer, args=(project_dir, index, increments, start_at, guarded))
+                 for index in range(writers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    if any(process.exitcode for process in processes):
+        print(f"❌ {sum(1 for process in processes if process.exitcode)} writers failed")
+        sys.exit(1)
+    return time.time() - start_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that concurrent writers lose no coordination-file updates")
+    parser.add_argument("--writers", type=int, default=50, help="Concurrent writer processes")
+    parser.add_argument("--increments", type=int, default=20, help="Counter updates per writer")
+    parser.add_argument("--unguarded", action="store_true", help="Also run the counter with unlocked read/write")
+    args = parser.parse_args()
+    expected = args.writers * args.increments
+    failures = []
+
+    print(f"🧵 COORDINATION STRESS: {args.writers} concurrent writers, {args.increments} counter updates each")
+    print("=" * 80)
+    if args.unguarded:
+        with tempfile.TemporaryDirectory() as project_dir:
+            run(project_dir, args.writers, args.increments, guarded=False)
+            counted = int(HookUtils.read_file(project_dir, COUNTER) or "0")
+            print(f"unguarded read/write    counter {counted:6} of {expected}   lost {expected - counted}")
+
+    with tempfile.TemporaryDirectory() as project_dir:
+        elapsed = run(project_dir, args.writers, args.increments, guarded=True)
+        counted = int(HookUtils.read_file(project_dir, COUNTER) or "0")
+        print(f"locked atomic update    counter {counted:6} of {expected}   lost {expected - counted}   ({elapsed:.2f}s)")
+        if counted != expected:
+            failures.append(f"counter lost {expected - counted} updates")
+
+        work_status = WorkStatusManager(project_dir)
+        flush(project_dir)
+        status = HookUtils.read_file(project_dir, "WORK_STATUS.md")
+        index = HookUtils.read_file(project_dir, "orchestration-index.md")
+        checks = {
+            "locks in store": len(work_status.store.locks()),
+            "activities in store": work_status.store.activity_count(),
+            "locks in WORK_STATUS.md": status.count("LOCKED: `src/module_"),
+            "containerization alerts": index.count("CONTAINERIZATION REVIEW REQUIRED"),
+        }
+        for name, count in checks.items():
+            print(f"{name:24}{count:6} of {args.writers}")
+            if count != args.writers:
+                failures.append(f"{args.writers - count} {name} lost")
+        if not index.startswith("# Orchestration Index") or index.count("### Latest Progress") != 1:
+            failures.append("orchestration-index.md is malformed")
+        if not status.startswith("# Work Status"):
+            failures.append("WORK_STATUS.md is malformed")
+        leftovers = [path.name for path in Path(project_dir).glob(".*.tmp")]
+        if leftovers:
+            failures.append(f"temporary files left behind: {', '.join(leftovers)}")
+
+    if failures:
+        print(f"\n❌ {'; '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ No updates lost and no torn files")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Inspect or clear the persistent verdict cache (verdict_cache.py)
+`stats` prints hit/miss/store/eviction totals and the cache size; `clear` empties it
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from verdict_cache import verdict_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or clear the hook verdict cache")
+    parser.add_argument("command", choices=["stats", "clear"], nargs="?", default="stats")
+    parser.add_argument("--json", action="store_true", help="Print stats as JSON")
+    args = parser.parse_args()
+
+    cache = verdict_cache()
+    if cache is None:
+        print("Verdict cache disabled (CLAUDE_VERDICT_CACHE=0)")
+        return
+
+    if args.command == "clear":
+        cache.clear()
+        print(f"🧹 Cleared verdict cache {cache.path}")
+        return
+
+    stats = cache.stats()
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    print(f"🗃️ VERDICT CACHE: {stats['path']}")
+    print("=" * 60)
+    print(f"entries    {stats['entries']:>10}   {stats['bytes'] / 1024:8.1f} KB of {stats['max_bytes'] / 1024 / 1024:.0f} MB")
+    print(f"hits       {stats['hits']:>10}   hit rate {stats['hit_rate']:.1%}")
+    print(f"misses     {stats['misses']:>10}")
+    print(f"stores     {stats['stores']:>10}")
+    print(f"evictions  {stats['evictions']:>10}")
+
+
+if __name__ == "__main__":
+    main()
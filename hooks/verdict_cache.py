@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Persistent verdict cache shared by agent hooks across processes and sessions.
+A hook's scan results are stored under (rule-pack version, hook, normalized file path,
+content SHA-256) in a SQLite database, so re-Writing identical content - retries,
+formatting passes, several agents touching one file - skips the regex scan entirely.
+Only scan results are cached; file locks and project checks still run on every call.
+The database runs in WAL mode (concurrent readers, one writer at a time) and is kept
+under a byte budget by evicting the least recently used verdicts. A lookup is a plain read;
+its hit/miss count and the hit's LRU timestamp are batched in the process and written back
+with the next store, every LOOKUP_BATCH lookups, or at exit, so readers never queue for the
+write lock.
+"""
+
+import atexit
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+# Bump when the table layout or the verdict encoding changes; old caches are dropped
+SCHEMA_VERSION = 1
+
+DEFAULT_MAX_MB = 32
+
+# Eviction frees down to this share of the budget so it does not run on every store
+EVICT_TO = 0.9
+
+# Seconds a writer waits for another process's transaction before giving up
+BUSY_TIMEOUT = 2.0
+
+COUNTERS = ("hits", "misses", "stores", "evictions", "errors")
+
+# Lookups batched in a process before their counts and LRU timestamps are written back
+LOOKUP_BATCH = 32
+
+_cache: Optional["VerdictCache"] = None
+
+# (content, SHA-256) of the last content hashed, since one hook hashes the same string repeatedly
+_last_digest: Optional[Tuple[str, str]] = None
+
+
+def cache_path() -> Optional[Path]:
+    """Cache database location from $CLAUDE_VERDICT_CACHE ("0" disables the cache)"""
+    explicit = os.environ.get("CLAUDE_VERDICT_CACHE", "")
+    if explicit == "0":
+        return None
+    if explicit:
+        return Path(explicit)
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(cache_home) / "claude-hooks" / "verdicts.sqlite"
+
+
+def max_bytes() -> int:
+    """Size budget for stored verdicts from $CLAUDE_VERDICT_CACHE_MB"""
+    try:
+        return int(float(os.environ.get("CLAUDE_VERDICT_CACHE_MB", DEFAULT_MAX_MB)) * 1024 * 1024)
+    except ValueError:
+        return DEFAULT_MAX_MB * 1024 * 1024
+
+
+def normalize_path(file_path: str) -> str:
+    """One spelling per file, so ./src/a.py and src//a.py share a verdict"""
+    return os.path.normcase(os.path.normpath(os.path.abspath(file_path))) if file_path else ""
+
+
+def hook_identity(hook_file: str) -> str:
+    """Hook name plus the size and mtime of its source, so editing a hook invalidates its verdicts"""
+    path = Path(hook_file)
+    try:
+        stat = path.stat()
+    except OSError:
+        return path.stem
+    return f"{path.stem}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def content_digest(content: str) -> str:
+    """SHA-256 of content, remembered for the last string hashed"""
+    global _last_digest
+    if _last_digest is not None and _last_digest[0] is content:
+        return _last_digest[1]
+    import hashlib
+
+    digest = hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
+    _last_digest = (content, digest)
+    return digest
+
+
+def verdict_key(pack_version: str, hook: str, file_path: str, content: str) -> str:
+    """Digest of (pack version, hook, normalized path, content SHA-256)"""
+    import hashlib
+
+    parts = "\0".join((pack_version, hook, normalize_path(file_path), content_digest(content)))
+    return hashlib.sha256(parts.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class VerdictCache:
+    """SQLite-backed LRU store of JSON-encoded scan results"""
+
+    def __init__(self, path: Path, limit: int):
+        self.path = Path(path)
+        self.limit = limit
+        # This process's lookups, alongside the persistent totals in the database
+        self.session = {name: 0 for name in COUNTERS}
+        # Lookups not written back yet: hit/miss counts, and each hit key's latest use
+        self._lookups = {"hits": 0, "misses": 0}
+        self._used: Dict[str, float] = {}
+        self._conn = None
+        self._pid = 0
+
+    def _connect(self):
+        """Open the database once per process; a forked child reopens instead of sharing the parent's handle"""
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        import sqlite3
+
+        if self._pid:
+            # A forked child: the lookups batched so far are the parent's to write back
+            self._lookups, self._used = {"hits": 0, "misses": 0}, {}
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._create_schema(conn)
+        self._conn, self._pid = conn, os.getpid()
+        return conn
+
+    @staticmethod
+    def _create_schema(conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another process may have created the schema while this one waited for the lock
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS verdicts")
+                conn.execute("DROP TABLE IF EXISTS counters")
+                conn.execute(
+                    "CREATE TABLE verdicts (key TEXT PRIMARY KEY, hook TEXT, path TEXT, "
+                    "verdict TEXT, size INTEGER, used REAL)"
+                )
+                conn.execute("CREATE INDEX verdicts_used ON verdicts (used)")
+                conn.execute("CREATE TABLE counters (name TEXT PRIMARY KEY, value INTEGER)")
+                conn.executemany("INSERT INTO counters VALUES (?, 0)", [(name,) for name in COUNTERS])
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _count(self, conn, name: str, amount: int = 1):
+        self.session[name] += amount
+        conn.execute("UPDATE counters SET value = value + ? WHERE name = ?", (amount, name))
+
+    def get(self, key: str):
+        """Cached verdict for key, or None on a miss"""
+        conn = self._connect()
+        row = conn.execute("SELECT verdict FROM verdicts WHERE key = ?", (key,)).fetchone()
+        name = "misses" if row is None else "hits"
+        self.session[name] += 1
+        self._lookups[name] += 1
+        if row is not None:
+            self._used[key] = time.time()
+        if sum(self._lookups.values()) >= LOOKUP_BATCH:
+            try:
+                self.flush()
+            except Exception:
+                pass  # kept for the next write-back
+        return None if row is None else json.loads(row[0])
+
+    def peek(self, key: str):
+        """Cached value for key without counting a lookup or refreshing its age"""
+        row = self._connect().execute("SELECT verdict FROM verdicts WHERE key = ?", (key,)).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, key: str, hook: str, file_path: str, verdict_json: str):
+        """Store a verdict, then evict least recently used ones past the size budget"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO verdicts VALUES (?, ?, ?, ?, ?, ?)",
+                (key, hook, normalize_path(file_path), verdict_json, len(verdict_json), time.time())
+            )
+            self._count(conn, "stores")
+            self._write_lookups(conn)
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._lookups, self._used = {"hits": 0, "misses": 0}, {}
+
+    def _write_lookups(self, conn):
+        """Add the batched lookups to the counters and refresh the hit verdicts' LRU timestamps"""
+        for name, amount in self._lookups.items():
+            if amount:
+                conn.execute("UPDATE counters SET value = value + ? WHERE name = ?", (amount, name))
+        conn.executemany("UPDATE verdicts SET used = MAX(used, ?) WHERE key = ?",
+                         [(used, key) for key, used in self._used.items()])
+
+    def flush(self):
+        """Write the batched lookups back"""
+        if not any(self._lookups.values()):
+            return
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._write_lookups(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._lookups, self._used = {"hits": 0, "misses": 0}, {}
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM verdicts").fetchone()[0]
+        if total <= self.limit:
+            return
+        excess = total - int(self.limit * EVICT_TO)
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM verdicts ORDER BY used"):
+            doomed.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM verdicts WHERE key = ?", doomed)
+        self._count(conn, "evictions", len(doomed))
+
+    def record_error(self, error: Exception):
+        """Count a database failure; the hook carries on with a fresh scan"""
+        self.session["errors"] += 1
+        print(f"⚠️ Verdict cache unavailable ({self.path}): {error}", file=sys.stderr)
+
+    def stats(self) -> Dict[str, object]:
+        """Persistent hit/miss/store/eviction totals plus current size"""
+        conn = self._connect()
+        self.flush()
+        totals = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM verdicts").fetchone()
+        lookups = totals.get("hits", 0) + totals.get("misses", 0)
+        return dict(
+            totals,
+            entries=entries,
+            bytes=size,
+            max_bytes=self.limit,
+            hit_rate=round(totals.get("hits", 0) / lookups, 4) if lookups else 0.0,
+            path=str(self.path),
+        )
+
+    def clear(self):
+        """Drop every verdict and reset the counters"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute("DELETE FROM verdicts")
+        conn.execute("UPDATE counters SET value = 0")
+        conn.execute("COMMIT")
+        conn.execute("VACUUM")
+        self.session = {name: 0 for name in COUNTERS}
+        self._lookups, self._used = {"hits": 0, "misses": 0}, {}
+
+
+def verdict_cache() -> Optional[VerdictCache]:
+    """The process-wide cache for the configured path, or None when disabled"""
+    global _cache
+    path = cache_path()
+    if path is None:
+        return None
+    if _cache is None or _cache.path != path:
+        if _cache is None:
+            atexit.register(_flush_at_exit)
+        else:
+            _flush_at_exit()
+        _cache = VerdictCache(path, max_bytes())
+    _cache.limit = max_bytes()
+    return _cache
+
+
+def _flush_at_exit():
+    """Write the process's batched lookups back; losing them only skews statistics and LRU order"""
+    if _cache is not None and _cache._pid == os.getpid():
+        try:
+            _cache.flush()
+        except Exception:
+            pass
+
+
+def cached_scan(hook_file: str, file_path: str, content: str, scan: Callable):
+    """
+    Return scan()'s result for this content, from the cache when the same hook already
+    scanned identical content at the same path under the same rule pack.
+    Results go through JSON either way, so a hit and a miss hand back the same shapes.
+    """
+    cache = verdict_cache()
+    # A MultiEdit's findings are traced to its hunks during the scan, so it always scans
+    edits = sys.modules.get("incremental_scan")
+    attribute = edits is not None and edits.attributes(content)
+    if cache is None:
+        if not attribute:
+            return scan()
+        with edits.scan_session(content, None, ""):
+            return scan()
+
+    import rule_registry
+
+    hook = hook_identity(hook_file)
+    key = verdict_key(rule_registry.rule_pack_version(), hook, file_path, content)
+    try:
+        verdict = None if attribute else cache.get(key)
+    except Exception as e:
+        cache.record_error(e)
+        return scan()
+    if verdict is not None:
+        return verdict
+
+    from incremental_scan import scan_session
+
+    # Large contents record per-rule-set spans, and edited files merge them (incremental_scan.py)
+    with scan_session(content, cache, rule_registry.rule_pack_version()):
+        verdict_json = json.dumps(scan())
+    # A rule that ran out of time left the verdict incomplete; scan again next time
+    if not rule_registry.inconclusive_rules():
+        try:
+            cache.put(key, hook, file_path, verdict_json)
+        except Exception as e:
+            cache.record_error(e)
+    return json.loads(verdict_json)
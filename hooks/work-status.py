@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Inspect file locks and activities in the work status store (work_status_store.py)
+`locks` lists active leases, `lock PATH...` takes them (a directory or a glob such as
+'src/api/**' locks everything it covers; --shared for read-only reviews), `unlock PATH...` releases them, `renew PATH...` extends an
+agent's leases (a heartbeat), `reclaim` drops every expired lease, `activities` shows the
+newest entries (--agent: that agent's, from the journal's index), `metrics` reports the most contended paths and the agents holding locks longest
+(--reset clears the timings), `orchestration` shows each agent's latest progress, the coordination
+signals sent to each agent (--agent: that agent's) and the open containerization alerts from the
+orchestration log (--resolve closes the alerts), `inbox` counts the reviews waiting for each agent
+(--agent: lists that agent's, oldest first; --drain also takes them out), `render`
+regenerates WORK_STATUS.md and orchestration-index.md and `flush` waits for the background
+renderer to finish and stop, then brings both up to date; the project defaults to $CLAUDE_PROJECT_DIR
+"""
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent))
+from coordination_renderer import flush
+from hook_utils import HookUtils, OrchestrationManager, WorkStatusManager
+from work_status_store import PERCENTILES, format_time, percentile
+
+
+def format_ms(ms: float) -> str:
+    """A duration for the metrics report"""
+    if ms < 1000:
+        return f"{ms:.0f}ms" if ms >= 1 else "<1ms"
+    return f"{ms / 1000:.1f}s" if ms < 60000 else f"{ms / 60000:.1f}m"
+
+
+def summarize(histograms: dict) -> dict:
+    """Count and p50/p95/p99 of each metric's histogram (refusals are only counted)"""
+    return {metric: dict(count=sum(histogram.values()), **({} if metric == "denied" else
+                         {f"p{q}": round(percentile(histogram, q), 3) for q in PERCENTILES}))
+            for metric, histogram in histograms.items()}
+
+
+def print_metrics(store, project: str, limit: int, as_json: bool):
+    """Most contended paths (refused or queued requests) and agents by how long they hold locks"""
+    empty = dict(count=0, **{f"p{q}": 0.0 for q in PERCENTILES})
+    paths = {name: summarize(histograms) for name, histograms in store.metrics("path").items()}
+    agents = {name: summarize(histograms) for name, histograms in store.metrics("agent").items()}
+    for summary in (*paths.values(), *agents.values()):
+        summary["contended"] = summary.get("wait", empty)["count"] + summary.get("denied", empty)["count"]
+    contended = sorted((name for name in paths if paths[name]["contended"]),
+                       key=lambda name: (-paths[name]["contended"], -paths[name].get("wait", empty)["p95"]))[:limit]
+    holders = sorted((name for name in agents if "hold" in agents[name]),
+                     key=lambda name: (-agents[name]["hold"]["p95"], -agents[name]["hold"]["count"]))[:limit]
+    if as_json:
+        print(json.dumps({"paths": {name: paths[name] for name in contended},
+                          "agents": {name: agents[name] for name in holders}}, indent=2))
+        return
+
+    def spread(summary: dict) -> str:
+        return " / ".join(format_ms(summary[f"p{q}"]) for q in PERCENTILES) if summary["count"] else "-"
+
+    print(f"📊 LOCK CONTENTION: {project}")
+    print("=" * 100)
+    print(f"{'most contended':40} {'refused':>8} {'queued':>7}  {'wait p50 / p95 / p99':22} hold p50 / p95 / p99")
+    for name in contended:
+        summary = paths[name]
+        print(f"{name:40} {summary.get('denied', empty)['count']:8} {summary.get('wait', empty)['count']:7}  "
+              f"{spread(summary.get('wait', empty)):22} {spread(summary.get('hold', empty))}")
+    if not contended:
+        print("No contended locks")
+    print()
+    print(f"{'longest holders':40} {'locks':>8} {'refused':>7}  {'hold p50 / p95 / p99':22} acquire p95")
+    for name in holders:
+        summary = agents[name]
+        print(f"{name:40} {summary['hold']['count']:8} {summary.get('denied', empty)['count']:7}  "
+              f"{spread(summary['hold']):22} {format_ms(summary.get('acquire', empty)['p95'])}")
+    if not holders:
+        print("No released locks yet")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or change the work status store")
+    parser.add_argument("command", choices=["locks", "lock", "unlock", "renew", "reclaim", "activities", "metrics", "orchestration", "inbox", "render", "flush"], nargs="?", default="locks")
+    parser.add_argument("paths", nargs="*", help="Files, directories or globs, relative to the project")
+    parser.add_argument("--project", default=os.environ.get("CLAUDE_PROJECT_DIR") or os.getcwd(),
+                        help="Project directory (default: $CLAUDE_PROJECT_DIR or the current directory)")
+    parser.add_argument("--agent", help="Lease holder to lock or renew for (default: $CLAUDE_AGENT_NAME), "
+                                         "or whose activities or coordination signals to show")
+    parser.add_argument("--operation", help="What the lock is for (default: editing, or reviewing with --shared)")
+    parser.add_argument("--shared", action="store_true", help="Lock for reading, alongside other readers")
+    parser.add_argument("--ttl", type=float, help="Lease length in seconds (default: $CLAUDE_LOCK_TTL or 300)")
+    parser.add_argument("--limit", type=int, default=20,
+                        help="Activities, paths and agents in metrics, or inbox reviews to show")
+    parser.add_argument("--reset", action="store_true", help="With metrics: clear the lock timings")
+    parser.add_argument("--resolve", action="store_true",
+                        help="With orchestration: close the open containerization alerts (as --agent)")
+    parser.add_argument("--drain", action="store_true", help="With inbox: take the listed reviews out of --agent's inbox")
+    parser.add_argument("--json", action="store_true", help="Print as JSON")
+    args = parser.parse_args()
+
+    work_status = WorkStatusManager(args.project)
+    store = work_status.store
+
+    if args.command in ("lock", "unlock", "renew"):
+        if args.agent is None:
+            args.agent = os.environ.get("CLAUDE_AGENT_NAME", "")
+        if not args.paths or (args.command != "unlock" and not args.agent):
+            needs = "at least one path" if args.command == "unlock" else "at least one path and --agent"
+            print(f"❌ {args.command} needs {needs}", file=sys.stderr)
+            sys.exit(1)
+        conflicts = 0
+        for path in args.paths:
+            file_path = os.path.join(args.project, path)
+            target = work_status.lock_target(file_path)
+            if args.command == "lock":
+                mode = "shared" if args.shared else "exclusive"
+                operation = args.operation or ("reviewing" if args.shared else "editing")
+                acquired, holder = work_status.lock_file(file_path, args.agent, operation, args.ttl, mode)
+                conflicts += not acquired
+                print(f"🔒 Locked {target}" if acquired else f"❌ {target} overlaps {holder}")
+            elif args.command == "unlock":
+                # Every holder's locks, or just --agent's
+                released = work_status.unlock_file(file_path, agent=args.agent or None, mode=None)
+                print(f"🔓 Unlocked {target}" if released else f"⚠️ {target} was not locked")
+            else:
+                renewed = work_status.renew_lock(file_path, args.agent, args.ttl)
+                print(f"💓 Renewed {target}" if renewed else f"⚠️ {args.agent} holds no live lease on {target}")
+        if conflicts:
+            sys.exit(1)
+        return
+
+    if args.command == "reclaim":
+        reclaimed = store.reclaim_expired(HookUtils.get_timestamp())
+        if reclaimed:
+            work_status.render()
+        print(f"♻️ Reclaimed {reclaimed} expired lease{'s' if reclaimed != 1 else ''}")
+        return
+
+    if args.command == "metrics":
+        if args.reset:
+            store.reset_metrics()
+            print("🧹 Cleared lock metrics")
+            return
+        print_metrics(store, args.project, args.limit, args.json)
+        return
+
+    if args.command == "orchestration":
+        orchestration = OrchestrationManager(args.project)
+        if args.resolve:
+            alerts = len(orchestration.open_alerts())
+            orchestration.resolve_containerization(args.agent or os.environ.get("CLAUDE_AGENT_NAME", "unknown-agent"))
+            print(f"🐳 Resolved {alerts} containerization alert{'s' if alerts != 1 else ''}")
+            return
+        progress, alerts = orchestration.latest_progress(), orchestration.open_alerts()
+        signals = orchestration.signals(args.agent)
+        if args.json:
+            print(json.dumps({"progress": progress, "signals": signals, "alerts": alerts}, indent=2))
+            return
+        print(f"📊 ORCHESTRATION: {args.project}")
+        print("=" * 60)
+        for agent, event in sorted(progress.items(), key=lambda item: item[1]["at"], reverse=True)[:args.limit]:
+            print(f"{event['at']}  {agent:24} {event['operation']}  {event['path']}  [{event['status']}]")
+        if not progress:
+            print("No progress recorded")
+        print(f"\n📣 COORDINATION SIGNALS ({sum(len(by_path) for by_path in signals.values())})")
+        for agent, by_path in sorted(signals.items()):
+            for path, event in list(by_path.items())[-args.limit:]:
+                print(f"{event['at']}  {agent:24} {path}  [{event['status']}] from {event['from'] or '?'}")
+        print(f"\n🐳 OPEN CONTAINERIZATION ALERTS ({len(alerts)})")
+        for alert in alerts:
+            print(f"{alert['at']}  {alert['agent']:24} {', '.join(alert['files'])}")
+        return
+
+    if args.command == "inbox":
+        if args.agent is None:
+            if args.drain:
+                print("❌ inbox --drain needs --agent", file=sys.stderr)
+                sys.exit(1)
+            sizes = store.inbox_sizes()
+            if args.json:
+                print(json.dumps(sizes, indent=2))
+                return
+            print(f"📥 REVIEW INBOXES: {args.project}")
+            print("=" * 60)
+            for agent, size in sizes.items():
+                print(f"{agent:40} {size:6} pending")
+            if not sizes:
+                print("No reviews pending")
+            return
+        orchestration = OrchestrationManager(args.project)
+        items = (orchestration.drain_inbox if args.drain else orchestration.inbox)(args.agent, args.limit)
+        if args.json:
+            print(json.dumps(items, indent=2))
+            return
+        for item in items:
+            print(f"{item['queued_at']}  {item['path']}  [{item['status']}] from {item['source'] or '?'}  "
+                  f"{item['hash'][:12]}")
+        print(f"📥 {'Drained' if args.drain else 'Pending'}: {len(items)} review{'s' if len(items) != 1 else ''}"
+              f" for {args.agent}")
+        return
+
+    if args.command == "flush":
+        flush(args.project)
+        print(f"📝 Flushed pending renders of {work_status.file_path} and orchestration-index.md")
+        return
+
+    if args.command == "render":
+        work_status.render()
+        OrchestrationManager(args.project).materialize(force=True)
+        print(f"📝 Regenerated {work_status.file_path} and orchestration-index.md")
+        return
+
+    rows = store.locks() if args.command == "locks" else store.activities(args.limit, args.agent)
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    if args.command == "locks":
+        print(f"🔒 FILE LOCKS: {args.project}")
+        print("=" * 60)
+        for lock in rows:
+            expiry = f", expires {format_time(lock['expires_at'])}" if lock["expires_at"] else ""
+            shared = " [shared]" if lock["mode"] == "shared" else ""
+            print(f"{lock['path']:40} {lock['agent']} ({lock['operation']}){shared} at {lock['locked_at']}{expiry}")
+        if not rows:
+            print("No active locks")
+        return
+    whose = f" OF {args.agent}" if args.agent else ""
+    print(f"📋 RECENT ACTIVITIES{whose}: {args.project} ({store.activity_count()} kept)")
+    print("=" * 60)
+    for entry in rows:
+        print(f"{entry['at']}  {entry['agent']:24} {entry['operation']}  {entry['path']}  [{entry['status']}]")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,720 @@
+#!/usr/bin/env python3
+"""
+Indexed store behind WORK_STATUS.md.
+File locks live in a SQLite table keyed by the normalized project-relative path, so a lock
+check is one primary-key lookup however much activity history has built up, and a lock on
+`a.py` no longer matches `data.py`. Agent activities go to an append-only journal beside it
+(activity_journal.py, in JOURNAL_DIR). Both live in the project's state directory (STATE_DIR). WORK_STATUS.md is regenerated from both after changes (debounced,
+see coordination_renderer.py) as the human-readable view; edits made to the markdown are not read back
+(use work-status.py).
+A WORK_STATUS.md written before the store existed is imported once, when it is created.
+Locks are leases: each carries an expiry time, renewed by heartbeats while its holder works.
+A lookup that finds an expired lease reclaims it on the spot, so a crashed agent's lock
+stops blocking others after LEASE_SECONDS without anyone sweeping the table.
+A lock may also cover a directory (`src/api/**`) or a glob (`src/*.py`). Such a pattern hangs
+from the trie node of its literal directories (`src/api`, `src`), kept as an indexed anchor
+column, so checking a file probes only the nodes on its own path: O(path depth), however
+many locks exist. A lock that overlaps another agent's live lock is refused when taken.
+Locks are exclusive (writers) or shared (readers such as review agents): any number of
+agents may hold shared locks on one file together, and only an exclusive lock conflicts
+with them.
+An agent may also queue for a lock instead of being refused (WorkStatusManager.wait_for_lock):
+waiters are granted in FIFO order per overlapping path, and each sleeps on its own named pipe
+under WAIT_DIR until a release that could let it in writes to the pipe - no polling.
+Every lock also feeds timing histograms, per path and per agent: how long taking it (acquire)
+and releasing it (release) took, how long a queued request waited, how long it was held, and
+how often a request was refused (denied). Each histogram is a row of counts per logarithmic
+bucket (METRIC_BUCKET_BASE apart), so the store stays small however many locks are taken
+and p50/p95/p99 are read off to within one bucket.
+Each agent also has a review inbox: a queue of the files it was signalled to review, deduplicated
+by (file, content hash) so re-signalling unchanged content adds nothing. Items are kept in insertion
+order under an (agent, id) index, so an agent reads or drains its k oldest items in O(k) however
+many others are queued.
+"""
+
+import datetime
+import fnmatch
+import math
+import os
+import re
+import select
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from activity_journal import ACTIVITY_FIELDS, ActivityJournal
+from coordination_files import STATE_DIR, state_dir
+
+# Bump when the table layout changes; a store of any other version is rebuilt from WORK_STATUS.md
+SCHEMA_VERSION = 1
+
+# The store, in the project's state directory
+STORE_NAME = "work_status.sqlite"
+
+# Directory beside the store holding the activity journal's segments
+JOURNAL_DIR = "work_status.journal"
+
+# Directory beside the store holding one named pipe per waiting agent
+WAIT_DIR = "work_status.wait"
+
+# Without named pipes (Windows) waiters re-check this often instead
+WAIT_POLL_SECONDS = 0.05
+
+# Seconds a writer waits for another agent's transaction before giving up
+BUSY_TIMEOUT = 5.0
+
+# Activities shown in WORK_STATUS.md (the journal keeps many more)
+RECENT_ACTIVITIES = 20
+
+# Lease length when $CLAUDE_LOCK_TTL does not set one
+LEASE_SECONDS = 300
+
+# Seconds a write waits in the queue for a held lock when $CLAUDE_LOCK_WAIT does not say; 0 refuses at once
+LOCK_WAIT_SECONDS = 0.0
+
+# Lock timing histograms: bucket b > 0 counts durations up to METRIC_BUCKET_BASE ** b ms, bucket 0 those under 1 ms
+METRIC_BUCKET_BASE = 2 ** 0.25
+METRICS = ("acquire", "wait", "hold", "release", "denied")
+PERCENTILES = (50, 95, 99)
+
+EXCLUSIVE = "exclusive"
+SHARED = "shared"
+LOCK_MODES = (EXCLUSIVE, SHARED)
+
+VIEW_HEADER = """# Work Status
+
+This file tracks agent activities and file locks to prevent conflicts.
+It is generated from {store}; change locks with hooks/work-status.py, not by editing it.
+
+## File Locks
+<!-- Active file locks will be listed here -->
+"""
+
+VIEW_ACTIVITIES = """
+## Recent Activities
+<!-- Agent activities will be logged here -->
+"""
+
+LEGACY_LOCK = re.compile(
+    r"(?P<mode>LOCKED|SHARED): `(?P<path>[^`]*)` by (?P<agent>.*?) \((?P<operation>.*)\) at (?P<at>.*?)(?:, lease expires .*)?$"
+)
+LEGACY_ACTIVITY = re.compile(r"## (?P<at>\d{4}-\d{2}-\d{2}[ T][\d:]+(?: UTC)?) - (?P<operation>.*)$")
+LEGACY_FIELD = re.compile(r"- \*\*(?P<name>\w+)\*\*: (?P<value>.*)$")
+
+class LockConflict(Exception):
+    """A lock overlaps another agent's live lease (the message is that lease's lock line)"""
+
+
+LOCK_FIELDS = ("path", "agent", "operation", "locked_at", "expires_at", "mode")
+
+WAITERS_TABLE = ("CREATE TABLE waiters (id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT, path TEXT, agent TEXT, "
+                 "mode TEXT, pid INTEGER, queued_at TEXT, deadline REAL)")
+
+LOCKS_TABLE = ("CREATE TABLE locks (key TEXT, path TEXT, agent TEXT, operation TEXT, locked_at TEXT, "
+               "expires_at REAL, anchor TEXT, mode TEXT, acquired_at REAL, PRIMARY KEY (key, agent))")
+
+# Columns a lease is written with; acquired_at is kept when an agent re-takes its own lock
+LOCK_INSERT = ("INSERT INTO locks (key, path, agent, operation, locked_at, expires_at, anchor, mode, acquired_at) "
+               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (key, agent) DO UPDATE SET path = excluded.path, "
+               "operation = excluded.operation, locked_at = excluded.locked_at, expires_at = excluded.expires_at, "
+               "mode = excluded.mode")
+
+INBOX_TABLE = ("CREATE TABLE inbox (id INTEGER PRIMARY KEY AUTOINCREMENT, agent TEXT, path TEXT, hash TEXT, "
+               "source TEXT, status TEXT, queued_at TEXT, UNIQUE (agent, path, hash))")
+
+INBOX_FIELDS = ("id", "agent", "path", "hash", "source", "status", "queued_at")
+
+METRICS_TABLE = ("CREATE TABLE lock_metrics (metric TEXT, scope TEXT, name TEXT, bucket INTEGER, count INTEGER, "
+                 "PRIMARY KEY (metric, scope, name, bucket)) WITHOUT ROWID")
+
+_stores: Dict[str, "WorkStatusStore"] = {}
+
+
+def lock_key(relative_path: str) -> str:
+    """One spelling per path, so ./src//a.py and src/a.py (and SRC\\a.py on Windows) share a lock"""
+    return os.path.normcase(os.path.normpath(relative_path)).replace("\\", "/")
+
+
+def is_pattern(key: str) -> bool:
+    return any(char in key for char in "*?[")
+
+
+def lock_anchor(key: str) -> Optional[str]:
+    """The trie node a pattern hangs from: its directories before the first wildcard; None for a plain path"""
+    if not is_pattern(key):
+        return None
+    literal = []
+    for part in key.split("/"):
+        if is_pattern(part):
+            break
+        literal.append(part)
+    return "/".join(literal)
+
+
+def path_anchors(key: str) -> List[str]:
+    """Every trie node from the root down to key's directory: a/b/c.py -> "", a, a/b"""
+    parts = key.split("/")[:-1]
+    return [""] + ["/".join(parts[:depth]) for depth in range(1, len(parts) + 1)]
+
+
+def _overlap(first: List[str], second: List[str]) -> bool:
+    if not first or not second:
+        return all(part == "**" for part in first + second)
+    if first[0] == "**":
+        return _overlap(first[1:], second) or _overlap(first, second[1:])
+    if second[0] == "**":
+        return _overlap(first, second[1:]) or _overlap(first[1:], second)
+    if is_pattern(first[0]) and is_pattern(second[0]):
+        # Two wildcards in one component are assumed to meet
+        matches = True
+    elif is_pattern(first[0]):
+        matches = fnmatch.fnmatchcase(second[0], first[0])
+    else:
+        matches = fnmatch.fnmatchcase(first[0], second[0])
+    return matches and _overlap(first[1:], second[1:])
+
+
+def _components(key: str) -> List[str]:
+    parts = key.split("/")
+    # A trailing ** covers what is inside a directory, not the directory's own name: one component or more
+    return parts[:-1] + ["*", "**"] if parts[-1] == "**" and len(parts) > 1 else parts
+
+
+def scopes_overlap(first: str, second: str) -> bool:
+    """Whether two lock keys (paths or patterns, `**` spanning directories) can cover a common file"""
+    return _overlap(_components(first), _components(second))
+
+
+def lease_seconds() -> float:
+    """Lease length from $CLAUDE_LOCK_TTL"""
+    try:
+        return float(os.environ.get("CLAUDE_LOCK_TTL", LEASE_SECONDS))
+    except ValueError:
+        return LEASE_SECONDS
+
+
+def lock_wait_seconds() -> float:
+    """How long a write queues for a held lock, from $CLAUDE_LOCK_WAIT"""
+    try:
+        return max(0.0, float(os.environ.get("CLAUDE_LOCK_WAIT", LOCK_WAIT_SECONDS)))
+    except ValueError:
+        return LOCK_WAIT_SECONDS
+
+
+def metric_bucket(ms: float) -> int:
+    """Histogram bucket of a duration in milliseconds"""
+    return 0 if ms < 1 else 1 + int(math.log(ms) / math.log(METRIC_BUCKET_BASE))
+
+
+def bucket_ms(bucket: int) -> float:
+    """Upper bound of a histogram bucket in milliseconds"""
+    return METRIC_BUCKET_BASE ** bucket if bucket else 1.0
+
+
+def percentile(histogram: Dict[int, int], q: float) -> float:
+    """The q-th percentile of a bucket histogram, as its bucket's upper bound (0 when empty)"""
+    rank = math.ceil(sum(histogram.values()) * q / 100)
+    seen = 0
+    for bucket in sorted(histogram):
+        seen += histogram[bucket]
+        if seen >= rank:
+            return bucket_ms(bucket)
+    return 0.0
+
+
+def format_time(epoch: float) -> str:
+    """An expiry time in the format of HookUtils.get_timestamp()"""
+    return datetime.datetime.fromtimestamp(epoch).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+
+def modes_conflict(held: str, requested: str) -> bool:
+    """Only shared locks coexist"""
+    return not (held == SHARED and requested == SHARED)
+
+
+def lock_line(path: str, agent: str, operation: str, locked_at: str, expires_at: Optional[float] = None,
+              mode: str = EXCLUSIVE) -> str:
+    """A lock as WORK_STATUS.md and lock-check messages show it"""
+    line = f"{'SHARED' if mode == SHARED else 'LOCKED'}: `{path}` by {agent} ({operation}) at {locked_at}"
+    return f"{line}, lease expires {format_time(expires_at)}" if expires_at else line
+
+
+def parse_legacy(content: str) -> Tuple[List[tuple], List[tuple]]:
+    """(locks, activities) from a hand- or hook-written WORK_STATUS.md, activities oldest first"""
+    locks = []
+    activities = []
+    current = None
+    for line in content.split("\n"):
+        stripped = line.strip()
+        lock = LEGACY_LOCK.match(stripped)
+        if lock:
+            mode = SHARED if lock["mode"] == "SHARED" else EXCLUSIVE
+            locks.append((lock["path"], lock["agent"], lock["operation"], lock["at"], mode))
+            continue
+        heading = LEGACY_ACTIVITY.match(stripped)
+        if heading:
+            current = {"at": heading["at"], "operation": heading["operation"]}
+            activities.append(current)
+            continue
+        field = LEGACY_FIELD.match(stripped)
+        if field and current is not None:
+            current[field["name"].lower()] = field["value"].strip("`")
+        elif stripped.startswith("#"):
+            current = None
+    activities.sort(key=lambda entry: entry["at"])
+    return locks, [
+        (entry["at"], entry["operation"], entry.get("agent", ""), entry.get("file", ""),
+         entry.get("status", ""), entry.get("details", ""))
+        for entry in activities
+    ]
+
+
+def _process_alive(pid: int) -> bool:
+    if os.name == "nt":
+        # os.kill(pid, 0) would terminate the process on Windows; rely on the deadline there
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+class Waiter:
+    """One queued lock request and the named pipe its releases are announced on"""
+
+    def __init__(self, waiter_id: int, pipe: Optional[Path]):
+        self.id = waiter_id
+        self.pipe = pipe
+        self._fd = None
+        if pipe is not None:
+            os.mkfifo(pipe, 0o600)
+            # Read-write, so the pipe always has a writer and select() never reports a spurious EOF
+            self._fd = os.open(pipe, os.O_RDWR | os.O_NONBLOCK)
+
+    def wait(self, timeout: float):
+        """Sleep until notified or timeout seconds pass"""
+        if self._fd is None:
+            time.sleep(min(timeout, WAIT_POLL_SECONDS))
+            return
+        if select.select([self._fd], [], [], max(0.0, timeout))[0]:
+            try:
+                os.read(self._fd, 4096)
+            except BlockingIOError:
+                pass
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        if self.pipe is not None:
+            try:
+                self.pipe.unlink()
+            except OSError:
+                pass
+
+
+def notify(pipe: Path):
+    """Wake whoever waits on pipe; a waiter that is gone or already has a wake-up pending is skipped"""
+    try:
+        fd = os.open(pipe, os.O_WRONLY | os.O_NONBLOCK)
+    except OSError:
+        return
+    try:
+        os.write(fd, b"!")
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class WorkStatusStore:
+    """SQLite tables of file locks, and the journal of agent activities, for one project"""
+
+    def __init__(self, project_dir: str):
+        self.project_dir = project_dir
+        self.path = state_dir(project_dir) / STORE_NAME
+        self.view_path = Path(project_dir) / "WORK_STATUS.md"
+        self.wait_dir = state_dir(project_dir) / WAIT_DIR
+        self._journal = ActivityJournal(state_dir(project_dir) / JOURNAL_DIR)
+        # One connection per thread, so a heartbeat thread never joins another thread's transaction
+        self._local = threading.local()
+
+    def exists(self) -> bool:
+        """Whether there is anything to read: the store, or a WORK_STATUS.md to import"""
+        return self.path.exists() or self.view_path.exists()
+
+    @property
+    def journal(self) -> ActivityJournal:
+        """The activity journal, once WORK_STATUS.md has handed its activities over"""
+        if self.exists():
+            self._connect()
+        return self._journal
+
+    def _connect(self):
+        """Open the database once per thread; a forked child reopens instead of sharing the parent's handle"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        import sqlite3
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.path), timeout=BUSY_TIMEOUT, isolation_level=None)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._create_schema(conn)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _create_schema(self, conn):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another agent may have created the store while this one waited for the lock
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS locks")
+                conn.execute("DROP TABLE IF EXISTS waiters")
+                conn.execute("DROP TABLE IF EXISTS lock_metrics")
+                conn.execute("DROP TABLE IF EXISTS inbox")
+                conn.execute(LOCKS_TABLE)
+                conn.execute(WAITERS_TABLE)
+                conn.execute(METRICS_TABLE)
+                conn.execute(INBOX_TABLE)
+                conn.execute("CREATE INDEX locks_anchor ON locks (anchor)")
+                conn.execute("CREATE INDEX inbox_agent ON inbox (agent, id)")
+                try:
+                    legacy = self.view_path.read_text(encoding="utf-8", errors="replace")
+                except OSError:
+                    legacy = ""
+                locks, activities = parse_legacy(legacy)
+                # Imported locks get a fresh lease; their holders renew them or they lapse
+                expires_at = time.time() + lease_seconds()
+                conn.executemany(
+                    LOCK_INSERT,
+                    [(lock_key(path), path, agent, operation, at, expires_at, lock_anchor(lock_key(path)), mode, None)
+                     for path, agent, operation, at, mode in locks]
+                )
+                if not self._journal.segments():
+                    self._journal.extend(dict(zip(ACTIVITY_FIELDS, entry)) for entry in activities)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    @contextmanager
+    def transaction(self):
+        """Hold one write transaction across several changes; nested transactions join the outer one"""
+        conn = self._connect()
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.released = []
+            self._local.journaled = []
+        self._local.depth = depth + 1
+        try:
+            yield
+        except BaseException:
+            self._local.depth = depth
+            if depth == 0:
+                conn.execute("ROLLBACK")
+            raise
+        self._local.depth = depth
+        if depth == 0:
+            conn.execute("COMMIT")
+            # Activities logged in the transaction are journaled only once it has committed
+            self._journal.extend(self._local.journaled)
+            # Only after the commit, so a woken waiter sees the release
+            self._wake(self._local.released)
+
+    def _released(self, key: str):
+        """Note that key may have become available to waiters; they are woken at commit"""
+        self._local.released.append(key)
+
+    def _wake(self, keys: List[str]):
+        if not keys:
+            return
+        for waiter_id, key in self._connect().execute("SELECT id, key FROM waiters").fetchall():
+            if any(scopes_overlap(key, released) for released in keys):
+                notify(self.wait_dir / str(waiter_id))
+
+    def _write(self, statements: List[Tuple[str, tuple]]) -> int:
+        """Run statements in one transaction, returning the rows they changed"""
+        with self.transaction():
+            conn = self._connect()
+            return sum(conn.execute(sql, params).rowcount for sql, params in statements)
+
+    def _select(self, where: str, params: tuple) -> List[Dict]:
+        rows = self._connect().execute(
+            f"SELECT {', '.join(LOCK_FIELDS)} FROM locks WHERE {where}", params
+        ).fetchall()
+        return [dict(zip(LOCK_FIELDS, row)) for row in rows]
+
+    def covering(self, relative_path: str) -> List[Dict]:
+        """Leases covering this file, expired or not: its own lock first, then matching directory and glob locks"""
+        if not self.exists():
+            return []
+        key = lock_key(relative_path)
+        anchors = path_anchors(key)
+        leases = self._select(f"key = ? OR anchor IN ({', '.join('?' * len(anchors))})", (key, *anchors))
+        leases = [lease for lease in leases if scopes_overlap(lock_key(lease["path"]), key)]
+        return sorted(leases, key=lambda lease: is_pattern(lock_key(lease["path"])))
+
+    def overlapping(self, key: str) -> List[Dict]:
+        """Leases, expired or not, that cover some file the path or pattern key would"""
+        anchor = lock_anchor(key)
+        if anchor is None:
+            return self.covering(key)
+        if anchor:
+            # The pattern's own node and its ancestors, plus everything below it
+            anchors = path_anchors(f"{anchor}/-")
+            candidates = self._select(
+                f"anchor IN ({', '.join('?' * len(anchors))}) OR (key >= ? AND key < ?) OR (anchor >= ? AND anchor < ?)",
+                (*anchors, f"{anchor}/", f"{anchor}0", f"{anchor}/", f"{anchor}0")
+            )
+        else:
+            candidates = self._select("1", ())
+        return [lease for lease in candidates if scopes_overlap(lock_key(lease["path"]), key)]
+
+    def _queued_ahead(self, key: str, agent: str, mode: str, waiter_id: Optional[int]) -> Optional[Dict]:
+        """The first live waiter queued before waiter_id (before everyone when None) that key must not overtake"""
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT id, key, path, agent, mode, pid, queued_at, deadline FROM waiters WHERE id < ? ORDER BY id",
+            (waiter_id if waiter_id is not None else 1 << 62,)
+        ).fetchall()
+        now = time.time()
+        for row_id, row_key, path, row_agent, row_mode, pid, queued_at, deadline in rows:
+            if deadline <= now or not _process_alive(pid):
+                # Its hook timed out or crashed without leaving the queue
+                conn.execute("DELETE FROM waiters WHERE id = ?", (row_id,))
+                self._released(row_key)
+                continue
+            if row_agent != agent and modes_conflict(row_mode, mode) and scopes_overlap(row_key, key):
+                return dict(zip(LOCK_FIELDS, (path, row_agent, "queued", queued_at, deadline, row_mode)))
+        return None
+
+    def lock(self, relative_path: str, agent: str, operation: str, locked_at: str, expires_at: float,
+             mode: str = EXCLUSIVE, waiter_id: Optional[int] = None, since: Optional[float] = None) -> Optional[Dict]:
+        """Take or replace agent's lease on a path or pattern; returns instead another agent's live lease
+        that overlaps it in a conflicting mode, or a conflicting request queued ahead of waiter_id
+        (ahead of a caller that is not queued, for which every waiter counts). since is when a
+        queued caller first asked, for the wait histogram"""
+        started = time.perf_counter()
+        key = lock_key(relative_path)
+        with self.transaction():
+            now = time.time()
+            for lease in self.overlapping(key):
+                if (lease["agent"] != agent and modes_conflict(lease["mode"], mode)
+                        and (lease["expires_at"] is None or lease["expires_at"] > now)):
+                    return lease
+            ahead = self._queued_ahead(key, agent, mode, waiter_id)
+            if ahead:
+                return ahead
+            self._connect().execute(
+                LOCK_INSERT,
+                (key, relative_path, agent, operation, locked_at, expires_at, lock_anchor(key), mode, time.time())
+            )
+            if waiter_id is not None:
+                self._dequeue(waiter_id, key)
+            if since is not None:
+                self.observe("wait", key, agent, (time.time() - since) * 1000)
+            self.observe("acquire", key, agent, (time.perf_counter() - started) * 1000)
+        return None
+
+    @contextmanager
+    def queued(self, relative_path: str, agent: str, mode: str, queued_at: str, deadline: float):
+        """Join the wait queue for relative_path until the block exits (or the lock is granted)"""
+        key = lock_key(relative_path)
+        use_pipe = hasattr(os, "mkfifo")
+        if use_pipe:
+            self.wait_dir.mkdir(parents=True, exist_ok=True)
+        with self.transaction():
+            waiter_id = self._connect().execute(
+                "INSERT INTO waiters (key, path, agent, mode, pid, queued_at, deadline) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, relative_path, agent, mode, os.getpid(), queued_at, deadline)
+            ).lastrowid
+            # Created inside the transaction, so no release can be announced before the pipe exists
+            waiter = Waiter(waiter_id, self.wait_dir / str(waiter_id) if use_pipe else None)
+        try:
+            yield waiter
+        finally:
+            waiter.close()
+            with self.transaction():
+                self._dequeue(waiter_id, key)
+
+    def _dequeue(self, waiter_id: int, key: str):
+        if self._connect().execute("DELETE FROM waiters WHERE id = ?", (waiter_id,)).rowcount:
+            # Whoever queued behind it may be next now
+            self._released(key)
+
+    def renew(self, relative_path: str, agent: str, expires_at: float) -> bool:
+        """Extend agent's unexpired lease on relative_path; False when it no longer holds one"""
+        if not self.exists():
+            return False
+        return self._write([(
+            "UPDATE locks SET expires_at = ? WHERE key = ? AND agent = ? AND expires_at > ?",
+            (expires_at, lock_key(relative_path), agent, time.time())
+        )]) > 0
+
+    def reclaim(self, lease: Dict, at: str) -> bool:
+        """Drop an expired lease and record it; False when it was renewed, replaced or released meanwhile"""
+        key = lock_key(lease["path"])
+        with self.transaction():
+            conn = self._connect()
+            reclaimed = conn.execute(
+                "DELETE FROM locks WHERE key = ? AND agent = ? AND expires_at = ? RETURNING acquired_at",
+                (key, lease["agent"], lease["expires_at"])
+            ).fetchall()
+            if not reclaimed:
+                return False
+            self.log(at, "LEASE EXPIRED", lease["agent"], lease["path"], "reclaimed",
+                     f"Lock for {lease['operation']} taken at {lease['locked_at']}")
+            acquired_at = reclaimed[0][0]
+            if acquired_at is not None:
+                # The path was blocked until the lease ran out
+                self.observe("hold", key, lease["agent"], (lease["expires_at"] - acquired_at) * 1000)
+            self._released(key)
+        return True
+
+    def reclaim_expired(self, at: str) -> int:
+        """Reclaim every expired lease, returning how many there were"""
+        now = time.time()
+        return sum(self.reclaim(lease, at) for lease in self.locks(include_expired=True)
+                   if lease["expires_at"] is not None and lease["expires_at"] <= now)
+
+    def unlock(self, relative_path: str, agent: Optional[str] = None, mode: Optional[str] = None) -> bool:
+        """Release the locks on relative_path held by agent in mode (None: any); False when there were none"""
+        if not self.exists():
+            return False
+        started = time.perf_counter()
+        key = lock_key(relative_path)
+        with self.transaction():
+            released = self._connect().execute(
+                "DELETE FROM locks WHERE key = ? AND (? IS NULL OR agent = ?) AND (? IS NULL OR mode = ?) "
+                "RETURNING agent, acquired_at",
+                (key, agent, agent, mode, mode)
+            ).fetchall()
+            if released:
+                self._released(key)
+            now = time.time()
+            for holder, acquired_at in released:
+                if acquired_at is not None:
+                    self.observe("hold", key, holder, (now - acquired_at) * 1000)
+                self.observe("release", key, holder, (time.perf_counter() - started) * 1000)
+        return bool(released)
+
+    def observe(self, metric: str, key: str, agent: str, ms: float):
+        """Count one duration (ms) in metric's histograms for the path or pattern key and for agent"""
+        bucket = metric_bucket(max(0.0, ms))
+        self._write([(
+            "INSERT INTO lock_metrics VALUES (?, ?, ?, ?, 1) ON CONFLICT DO UPDATE SET count = count + 1",
+            (metric, scope, name, bucket)
+        ) for scope, name in (("path", key), ("agent", agent))])
+
+    def metrics(self, scope: str) -> Dict[str, Dict[str, Dict[int, int]]]:
+        """Every histogram for scope ("path" or "agent"): name -> metric -> bucket -> count"""
+        if not self.exists():
+            return {}
+        histograms: Dict[str, Dict[str, Dict[int, int]]] = {}
+        for metric, name, bucket, count in self._connect().execute(
+                "SELECT metric, name, bucket, count FROM lock_metrics WHERE scope = ?", (scope,)):
+            histograms.setdefault(name, {}).setdefault(metric, {})[bucket] = count
+        return histograms
+
+    def reset_metrics(self) -> int:
+        """Forget every lock timing, returning how many histogram buckets there were"""
+        if not self.exists():
+            return 0
+        return self._write([("DELETE FROM lock_metrics", ())])
+
+    def log(self, at: str, operation: str, agent: str, relative_path: str, status: str, details: str = ""):
+        """Record an activity in the journal, at once or when the current transaction commits"""
+        entry = dict(zip(ACTIVITY_FIELDS, (at, operation, agent, relative_path, status, details)))
+        if getattr(self._local, "depth", 0):
+            self._local.journaled.append(entry)
+        else:
+            self.journal.append(entry)
+
+    def enqueue(self, agents: List[str], relative_path: str, content_hash: str, source: str, status: str,
+                queued_at: str) -> int:
+        """Queue a review of relative_path at content_hash for each agent that has none pending; returns how many"""
+        key = lock_key(relative_path)
+        return self._write([(
+            "INSERT OR IGNORE INTO inbox (agent, path, hash, source, status, queued_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (agent, key, content_hash, source, status, queued_at)
+        ) for agent in agents])
+
+    def inbox(self, agent: str, limit: Optional[int] = None) -> List[Dict]:
+        """agent's oldest limit (or all) pending reviews, oldest first"""
+        if not self.exists():
+            return []
+        rows = self._connect().execute(
+            f"SELECT {', '.join(INBOX_FIELDS)} FROM inbox WHERE agent = ? ORDER BY id LIMIT ?",
+            (agent, -1 if limit is None else limit)
+        ).fetchall()
+        return [dict(zip(INBOX_FIELDS, row)) for row in rows]
+
+    def drain(self, agent: str, limit: Optional[int] = None) -> List[Dict]:
+        """Take agent's oldest limit (or all) pending reviews out of its inbox, oldest first"""
+        if not self.exists():
+            return []
+        with self.transaction():
+            items = self.inbox(agent, limit)
+            if items:
+                self._connect().execute("DELETE FROM inbox WHERE agent = ? AND id <= ?", (agent, items[-1]["id"]))
+        return items
+
+    def inbox_sizes(self) -> Dict[str, int]:
+        """Pending reviews per agent"""
+        if not self.exists():
+            return {}
+        return dict(self._connect().execute("SELECT agent, COUNT(*) FROM inbox GROUP BY agent ORDER BY agent"))
+
+    def locks(self, include_expired: bool = False) -> List[Dict]:
+        """Every unexpired lease (or every lease), by path"""
+        if not self.exists():
+            return []
+        rows = self._connect().execute(
+            f"SELECT {', '.join(LOCK_FIELDS)} FROM locks "
+            "WHERE ? OR expires_at IS NULL OR expires_at > ? ORDER BY key, agent", (include_expired, time.time())
+        ).fetchall()
+        return [dict(zip(LOCK_FIELDS, row)) for row in rows]
+
+    def activities(self, limit: int = RECENT_ACTIVITIES, agent: Optional[str] = None) -> List[Dict[str, str]]:
+        """The newest activities (of agent, through its index), newest first"""
+        return self.journal.recent(limit, agent)
+
+    def activity_count(self) -> int:
+        return self.journal.count()
+
+    def render(self) -> str:
+        """WORK_STATUS.md as generated from the store"""
+        parts = [VIEW_HEADER.format(store=(STATE_DIR / STORE_NAME).as_posix())]
+        parts.extend(lock_line(**lock) + "\n" for lock in self.locks())
+        parts.append(VIEW_ACTIVITIES)
+        activities = self.activities(RECENT_ACTIVITIES + 1)
+        for entry in activities[:RECENT_ACTIVITIES]:
+            details = f"- **Details**: {entry['details']}\n" if entry["details"] else ""
+            parts.append(
+                f"\n## {entry['at']} - {entry['operation']}\n"
+                f"- **Agent**: {entry['agent']}\n"
+                f"- **File**: `{entry['path']}`\n"
+                f"- **Status**: {entry['status']}\n"
+                f"{details}"
+            )
+        if len(activities) > RECENT_ACTIVITIES:
+            parts.append("\n<!-- Older activities trimmed -->\n")
+        return "".join(parts)
+
+
+def work_status_store(project_dir: str) -> WorkStatusStore:
+    """The process-wide store for a project"""
+    store = _stores.get(project_dir)
+    if store is None:
+        store = _stores[project_dir] = WorkStatusStore(project_dir)
+    return store